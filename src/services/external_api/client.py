@@ -1,22 +1,37 @@
 import asyncio
+import contextlib
 import dataclasses
 import logging
 import os
+import random
 import ssl
 from abc import abstractmethod
 from http import HTTPStatus
-from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+)
 from urllib.parse import urljoin
 
 import aiohttp
 
 from services.external_api.has_uri_prefix import HasUriPrefix
 from starkware.python.object_utils import generic_object_repr
+from starkware.python.utils import as_non_optional
 from starkware.starkware_utils.validated_dataclass import ValidatedDataclass
 
 logger = logging.getLogger(__name__)
 JsonObject = Dict[str, Any]
 FlexibleJsonObject = Union[str, List[Any], JsonObject]
+TClientBase = TypeVar("TClientBase", bound="ClientBase")
 
 
 class JrpcOk(NamedTuple):
@@ -102,6 +117,40 @@ class RetryConfig(ValidatedDataclass):
         HTTPStatus.SERVICE_UNAVAILABLE,
         HTTPStatus.GATEWAY_TIMEOUT,
     )
+    # The delay (in seconds) before the first retry. The delay is multiplied by backoff_factor
+    # after each failure, up to max_backoff, and a random jitter of up to backoff_jitter times the
+    # delay is subtracted (so that clients that failed together do not retry together).
+    # The defaults keep a fixed delay of 5 seconds; for example, initial_backoff=0.5,
+    # backoff_factor=2 and backoff_jitter=0.5 retry sooner after a transient failure.
+    initial_backoff: float = 5.0
+    backoff_factor: float = 1.0
+    max_backoff: float = 5.0
+    backoff_jitter: float = 0.0
+
+    def get_backoff(self, n_failures: int) -> float:
+        """
+        Returns the delay (in seconds) before the next attempt, after n_failures failed attempts.
+        """
+        # Bound the exponent, to avoid an overflow in case of unlimited retries.
+        exponent = min(n_failures - 1, 64)
+        delay = min(self.max_backoff, self.initial_backoff * self.backoff_factor**exponent)
+        return delay * (1 - random.uniform(0, self.backoff_jitter))
+
+
+@dataclasses.dataclass(frozen=True)
+class ConnectionPoolConfig(ValidatedDataclass):
+    """
+    A configuration of the connections of an HTTP client.
+    """
+
+    # The maximal number of simultaneous connections; 0 for unlimited.
+    max_connections: int = 100
+    # The maximal number of simultaneous connections to the same endpoint; 0 for unlimited.
+    max_connections_per_host: int = 0
+    # The time (in seconds) an idle connection is kept open for reuse.
+    keepalive_timeout: float = 30.0
+    # The time (in seconds) resolved host names are cached; None to cache them forever.
+    dns_cache_ttl: Optional[int] = 300
 
 
 class ClientBase(HasUriPrefix):
@@ -117,6 +166,7 @@ class ClientBase(HasUriPrefix):
         request_timeout: Optional[int] = None,
         headers: Optional[Mapping[str, str]] = None,
         log_errors: bool = True,
+        connection_pool_config: Optional[ConnectionPoolConfig] = None,
     ):
         self.url = url
         self.ssl_context: Optional[ssl.SSLContext] = None
@@ -146,9 +196,58 @@ class ClientBase(HasUriPrefix):
             # Enforce usage of server certificate authentication.
             self.ssl_context.load_verify_locations(os.path.join(certificates_path, "server.crt"))
 
+        self.connection_pool_config = (
+            ConnectionPoolConfig() if connection_pool_config is None else connection_pool_config
+        )
+        # The session shared by the requests sent inside `async with self:` blocks.
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._n_session_users = 0
+
     def __repr__(self) -> str:
         return generic_object_repr(obj=self)
 
+    async def __aenter__(self: TClientBase) -> TClientBase:
+        """
+        Opens a pool of keep-alive connections, used by all the requests sent until the matching
+        __aexit__; outside such blocks, each request opens (and closes) a connection of its own.
+        Blocks may be nested; the pool is closed when the outermost one exits.
+        """
+        if self._n_session_users == 0:
+            self._session = self._create_session()
+        self._n_session_users += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._n_session_users -= 1
+        if self._n_session_users == 0:
+            session = as_non_optional(self._session)
+            self._session = None
+            await session.close()
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        config = self.connection_pool_config
+        connector = aiohttp.TCPConnector(
+            ssl=self.ssl_context,
+            limit=config.max_connections,
+            limit_per_host=config.max_connections_per_host,
+            keepalive_timeout=config.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=config.dns_cache_ttl,
+        )
+        return aiohttp.ClientSession(connector=connector)
+
+    @contextlib.asynccontextmanager
+    async def _get_session(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """
+        Returns the shared session if there is one, and a new (single-use) session otherwise.
+        """
+        if self._session is not None:
+            yield self._session
+            return
+
+        async with self._create_session() as session:
+            yield session
+
     @abstractmethod
     async def _parse_response(
         self,
@@ -177,7 +276,8 @@ class ClientBase(HasUriPrefix):
     ) -> str:
         """
         Sends an HTTP request to the target URI.
-        Retries upon failure according to the retry configuration:
+        Retries upon failure (with a jittered exponential backoff) according to the retry
+        configuration:
         1.  In case of unlimited retries (n_retries == -1): always retries upon failure.
         2.  In case of limited retries (n_retries > 0):
             a. Retries n_retries times for specified error types.
@@ -188,25 +288,25 @@ class ClientBase(HasUriPrefix):
         limited_retries = self.retry_config.n_retries > 0
         # n_retries > 0 means limited retries; n_retries == -1 means unlimited retries.
         n_retries_left = self.retry_config.n_retries
+        n_failures = 0
 
         while True:
             n_retries_left -= 1
 
             try:
-                async with aiohttp.TCPConnector(ssl=self.ssl_context) as connector:
-                    async with aiohttp.ClientSession(connector=connector) as session:
-                        async with session.request(
-                            method=send_method,
-                            url=url,
-                            data=self._prepare_data(data=data),
-                            params=params,
-                            **self.request_kwargs,
-                        ) as response:
-                            return await self._parse_response(
-                                request_url=url,
-                                request_data=data,
-                                response=response,
-                            )
+                async with self._get_session() as session:
+                    async with session.request(
+                        method=send_method,
+                        url=url,
+                        data=self._prepare_data(data=data),
+                        params=params,
+                        **self.request_kwargs,
+                    ) as response:
+                        return await self._parse_response(
+                            request_url=url,
+                            request_data=data,
+                            response=response,
+                        )
             except BadRequest as exception:
                 error_message = f"Got {type(exception).__name__} while trying to access {url}."
 
@@ -229,7 +329,8 @@ class ClientBase(HasUriPrefix):
                     raise
                 logger.debug(f"{error_message}, retrying...")
 
-            await asyncio.sleep(5)
+            n_failures += 1
+            await asyncio.sleep(self.retry_config.get_backoff(n_failures=n_failures))
 
     async def is_alive(self) -> str:
         return await self._send_request(send_method="GET", uri="/is_alive")
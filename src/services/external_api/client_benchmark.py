@@ -0,0 +1,73 @@
+"""
+Measures the throughput of ClientBase requests to a local stand-in server, with and without a
+connection pool.
+"""
+
+import argparse
+import asyncio
+import time
+
+from aiohttp import web
+
+from services.external_api.client import BaseRestClient, ConnectionPoolConfig
+from starkware.python.utils import gather_with_concurrency
+
+
+class BenchmarkClient(BaseRestClient):
+    prefix = ""
+
+
+async def start_server() -> web.AppRunner:
+    async def is_alive(request: web.Request) -> web.Response:
+        return web.Response(text="FeederGateway is alive!")
+
+    app = web.Application()
+    app.router.add_get("/is_alive", is_alive)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host="127.0.0.1", port=0).start()
+    return runner
+
+
+async def measure(client: BenchmarkClient, n_requests: int, concurrency: int) -> float:
+    """
+    Sends n_requests requests and returns the number of requests per second.
+    """
+    start_time = time.perf_counter()
+    await gather_with_concurrency(
+        awaitables=(client.is_alive() for _ in range(n_requests)), max_concurrency=concurrency
+    )
+    return n_requests / (time.perf_counter() - start_time)
+
+
+async def run_benchmark(n_requests: int, concurrency: int):
+    runner = await start_server()
+    try:
+        (host, port) = runner.addresses[0]
+        client = BenchmarkClient(
+            url=f"http://{host}:{port}",
+            connection_pool_config=ConnectionPoolConfig(max_connections=concurrency),
+        )
+        unpooled_rate = await measure(client=client, n_requests=n_requests, concurrency=concurrency)
+        async with client:
+            pooled_rate = await measure(
+                client=client, n_requests=n_requests, concurrency=concurrency
+            )
+    finally:
+        await runner.cleanup()
+
+    print(f"Without a connection pool: {unpooled_rate:.0f} requests/sec.")
+    print(f"With a connection pool: {pooled_rate:.0f} requests/sec.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the HTTP client of the services.")
+    parser.add_argument("--n_requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(n_requests=args.n_requests, concurrency=args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+from http import HTTPStatus
+from typing import AsyncIterator, List, Set, Tuple
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from services.external_api.client import BadRequest, BaseRestClient, RetryConfig
+
+
+class DummyClient(BaseRestClient):
+    prefix = ""
+
+
+class ServerState:
+    def __init__(self):
+        # The (host, port) pairs of the connections the requests were received on.
+        self.peers: Set[Tuple[str, int]] = set()
+        # The statuses of the next responses (OK once the list is exhausted).
+        self.statuses: List[int] = []
+
+
+@pytest_asyncio.fixture
+async def server() -> AsyncIterator[Tuple[str, ServerState]]:
+    state = ServerState()
+
+    async def handle(request: web.Request) -> web.Response:
+        assert request.transport is not None
+        state.peers.add(request.transport.get_extra_info("peername"))
+        status = state.statuses.pop(0) if len(state.statuses) > 0 else HTTPStatus.OK
+        return web.Response(status=status, text="alive")
+
+    app = web.Application()
+    app.router.add_get("/is_alive", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host="127.0.0.1", port=0)
+    await site.start()
+    (_, port) = runner.addresses[0]
+    try:
+        yield f"http://127.0.0.1:{port}", state
+    finally:
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_connection_reuse(server: Tuple[str, ServerState]):
+    url, state = server
+    client = DummyClient(url=url)
+
+    # Without a pool, each request opens a connection of its own.
+    for _ in range(3):
+        assert await client.is_alive() == "alive"
+    assert len(state.peers) == 3
+
+    state.peers.clear()
+    async with client:
+        async with client:
+            assert await client.is_alive() == "alive"
+        # The pool is kept open until the outermost block exits.
+        assert await client.is_alive() == "alive"
+        assert await client.is_alive() == "alive"
+    assert len(state.peers) == 1
+    assert client._session is None
+
+
+@pytest.mark.asyncio
+async def test_retries(server: Tuple[str, ServerState]):
+    url, state = server
+    retry_config = RetryConfig(n_retries=3, initial_backoff=0.01, max_backoff=0.01)
+    client = DummyClient(url=url, retry_config=retry_config, log_errors=False)
+
+    state.statuses = [HTTPStatus.SERVICE_UNAVAILABLE, HTTPStatus.BAD_GATEWAY]
+    async with client:
+        assert await client.is_alive() == "alive"
+
+    state.statuses = [HTTPStatus.SERVICE_UNAVAILABLE] * 3
+    with pytest.raises(BadRequest) as exception:
+        await client.is_alive()
+    assert exception.value.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+
+
+def test_backoff():
+    # By default, the delay is fixed.
+    for n_failures in [1, 2, 10**6]:
+        assert RetryConfig().get_backoff(n_failures=n_failures) == 5
+
+    retry_config = RetryConfig(
+        initial_backoff=1, backoff_factor=2, max_backoff=5, backoff_jitter=0.5
+    )
+    for n_failures, max_delay in [(1, 1), (2, 2), (3, 4), (4, 5), (10**6, 5)]:
+        delay = retry_config.get_backoff(n_failures=n_failures)
+        assert max_delay / 2 <= delay <= max_delay
@@ -23,8 +23,9 @@ from starkware.cairo.lang.builtins.signature.signature_builtin_runner import Sig
 from starkware.cairo.lang.compiler.program import Program
 from starkware.cairo.lang.compiler.scoped_name import ScopedName
 from starkware.cairo.lang.tracer.tracer import trace_runner
+from starkware.cairo.lang.vm.builtin_runner import BuiltinRunner
 from starkware.cairo.lang.vm.cairo_runner import CairoRunner, process_ecdsa, verify_ecdsa_sig
-from starkware.cairo.lang.vm.crypto import pedersen_hash
+from starkware.cairo.lang.vm.crypto import pedersen_hash, pedersen_hash_many
 from starkware.cairo.lang.vm.output_builtin_runner import OutputBuiltinRunner
 from starkware.cairo.lang.vm.relocatable import MaybeRelocatable, RelocatableValue
 from starkware.cairo.lang.vm.security import verify_secure_runner
@@ -36,11 +37,19 @@ from starkware.python.utils import safe_zip
 class CairoFunctionRunner(CairoRunner):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.initialize_segments()
+
+    def create_builtin_runners(self) -> Dict[str, BuiltinRunner]:
+        builtin_runners = super().create_builtin_runners()
 
         pedersen_builtin = HashBuiltinRunner(
-            name="pedersen", included=True, ratio=32, hash_func=pedersen_hash
+            name="pedersen",
+            included=True,
+            ratio=32,
+            hash_func=pedersen_hash,
+            hash_many_func=pedersen_hash_many,
         )
-        self.builtin_runners["pedersen_builtin"] = pedersen_builtin
+        builtin_runners["pedersen_builtin"] = pedersen_builtin
         range_check_builtin = RangeCheckBuiltinRunner(
             name="range_check",
             included=True,
@@ -49,9 +58,9 @@ class CairoFunctionRunner(CairoRunner):
             inner_rc_bound=2**16,
             n_parts=8,
         )
-        self.builtin_runners["range_check_builtin"] = range_check_builtin
+        builtin_runners["range_check_builtin"] = range_check_builtin
         output_builtin = OutputBuiltinRunner(included=True)
-        self.builtin_runners["output_builtin"] = output_builtin
+        builtin_runners["output_builtin"] = output_builtin
         signature_builtin = SignatureBuiltinRunner(
             name="ecdsa",
             included=True,
@@ -59,11 +68,11 @@ class CairoFunctionRunner(CairoRunner):
             process_signature=process_ecdsa,
             verify_signature=verify_ecdsa_sig,
         )
-        self.builtin_runners["ecdsa_builtin"] = signature_builtin
+        builtin_runners["ecdsa_builtin"] = signature_builtin
         bitwise_builtin = BitwiseBuiltinRunner(
             included=True, bitwise_builtin=BitwiseInstanceDef(ratio=1, total_n_bits=251)
         )
-        self.builtin_runners["bitwise_builtin"] = bitwise_builtin
+        builtin_runners["bitwise_builtin"] = bitwise_builtin
         ec_op_builtin = EcOpBuiltinRunner(
             included=True,
             ec_op_builtin=EcOpInstanceDef(
@@ -73,7 +82,7 @@ class CairoFunctionRunner(CairoRunner):
                 scalar_limit=None,
             ),
         )
-        self.builtin_runners["ec_op_builtin"] = ec_op_builtin
+        builtin_runners["ec_op_builtin"] = ec_op_builtin
         keccak_builtin = KeccakBuiltinRunner(
             included=True,
             instance_def=KeccakInstanceDef(
@@ -82,7 +91,7 @@ class CairoFunctionRunner(CairoRunner):
                 instances_per_component=16,
             ),
         )
-        self.builtin_runners["keccak_builtin"] = keccak_builtin
+        builtin_runners["keccak_builtin"] = keccak_builtin
         poseidon_builtin = PoseidonBuiltinRunner(
             included=True,
             instance_def=PoseidonInstanceDef(
@@ -90,7 +99,7 @@ class CairoFunctionRunner(CairoRunner):
                 partial_rounds_partition=[64, 22],
             ),
         )
-        self.builtin_runners["poseidon_builtin"] = poseidon_builtin
+        builtin_runners["poseidon_builtin"] = poseidon_builtin
         range_check96_builtin = RangeCheckBuiltinRunner(
             name="range_check96",
             included=True,
@@ -99,22 +108,26 @@ class CairoFunctionRunner(CairoRunner):
             inner_rc_bound=2**16,
             n_parts=6,
         )
-        self.builtin_runners["range_check96_builtin"] = range_check96_builtin
+        builtin_runners["range_check96_builtin"] = range_check96_builtin
         add_mod_builtin = AddModBuiltinRunner(
             included=True,
             instance_def=AddModInstanceDef(
                 word_bit_len=96, n_words=4, batch_size=1, ratio=1, ratio_den=1
             ),
         )
-        self.builtin_runners["add_mod_builtin"] = add_mod_builtin
+        builtin_runners["add_mod_builtin"] = add_mod_builtin
         mul_mod_builtin = MulModBuiltinRunner(
             included=True,
             instance_def=MulModInstanceDef(
                 word_bit_len=96, n_words=4, batch_size=1, ratio=1, ratio_den=1
             ),
         )
-        self.builtin_runners["mul_mod_builtin"] = mul_mod_builtin
+        builtin_runners["mul_mod_builtin"] = mul_mod_builtin
 
+        return builtin_runners
+
+    def reset(self):
+        super().reset()
         self.initialize_segments()
 
     @property
@@ -311,6 +324,11 @@ Got {type(ex).__name__} exception during the execution of {func_name}:
         if apply_modulo_to_args is None:
             apply_modulo_to_args = True
 
+        if verify_secure:
+            # Summarize the memory accesses during the run, so that verify_secure_runner() does not
+            # need to scan the entire memory.
+            self.vm_memory.enable_access_summary()
+
         if typed_args:
             assert len(args) == 1, "len(args) must be 1 when using typed args."
             real_args = self.segments.gen_typed_args(args=args[0])
@@ -0,0 +1,321 @@
+"""
+Native implementations of frequently executed hints of the Cairo common library
+(see starkware.cairo.lang.vm.native_hints).
+
+Each function must behave exactly as the code it is registered for. In particular, it should
+define the same variables in the scope as the original hint (including imported names).
+"""
+
+import itertools
+
+from starkware.cairo.common.math_utils import as_int, assert_integer
+from starkware.cairo.lang.vm.native_hints import NativeHintRegistry
+from starkware.cairo.lang.vm.relocatable import RelocatableValue
+
+# The native hints of the common library. They are used by the VM only if they are passed to it
+# explicitly (e.g., CairoRunner(native_hints=common_library_native_hints)).
+common_library_native_hints = NativeHintRegistry()
+
+# alloc.cairo.
+
+
+@common_library_native_hints.register("memory[ap] = segments.add()", uses_ids=False)
+def alloc(vm, ids, memory, ap, fp, scope):
+    memory[ap] = scope["segments"].add()
+
+
+# memcpy.cairo.
+
+
+@common_library_native_hints.register("vm_enter_scope({'n': ids.len})")
+def memcpy_enter_scope(vm, ids, memory, ap, fp, scope):
+    vm.enter_scope({"n": ids.len})
+
+
+@common_library_native_hints.register("n -= 1\nids.continue_copying = 1 if n > 0 else 0")
+def memcpy_continue_copying(vm, ids, memory, ap, fp, scope):
+    n = scope["n"] - 1
+    scope["n"] = n
+    ids.continue_copying = 1 if n > 0 else 0
+
+
+@common_library_native_hints.register("vm_exit_scope()", uses_ids=False)
+def exit_scope(vm, ids, memory, ap, fp, scope):
+    vm.exit_scope()
+
+
+# math.cairo.
+
+
+@common_library_native_hints.register(
+    """\
+from starkware.cairo.common.math_utils import assert_integer
+assert_integer(ids.value)
+assert ids.value % PRIME != 0, f'assert_not_zero failed: {ids.value} = 0.'"""
+)
+def assert_not_zero(vm, ids, memory, ap, fp, scope):
+    scope["assert_integer"] = assert_integer
+    value = ids.value
+    assert_integer(value)
+    assert value % vm.prime != 0, f"assert_not_zero failed: {value} = 0."
+
+
+@common_library_native_hints.register(
+    """\
+from starkware.cairo.lang.vm.relocatable import RelocatableValue
+both_ints = isinstance(ids.a, int) and isinstance(ids.b, int)
+both_relocatable = (
+    isinstance(ids.a, RelocatableValue) and isinstance(ids.b, RelocatableValue) and
+    ids.a.segment_index == ids.b.segment_index)
+assert both_ints or both_relocatable, \\
+    f'assert_not_equal failed: non-comparable values: {ids.a}, {ids.b}.'
+assert (ids.a - ids.b) % PRIME != 0, f'assert_not_equal failed: {ids.a} = {ids.b}.'"""
+)
+def assert_not_equal(vm, ids, memory, ap, fp, scope):
+    a = ids.a
+    b = ids.b
+    scope["RelocatableValue"] = RelocatableValue
+    scope["both_ints"] = both_ints = isinstance(a, int) and isinstance(b, int)
+    scope["both_relocatable"] = both_relocatable = (
+        isinstance(a, RelocatableValue)
+        and isinstance(b, RelocatableValue)
+        and a.segment_index == b.segment_index
+    )
+    assert (
+        both_ints or both_relocatable
+    ), f"assert_not_equal failed: non-comparable values: {a}, {b}."
+    assert (a - b) % vm.prime != 0, f"assert_not_equal failed: {a} = {b}."
+
+
+@common_library_native_hints.register(
+    """\
+from starkware.cairo.common.math_utils import assert_integer
+assert_integer(ids.a)
+assert 0 <= ids.a % PRIME < range_check_builtin.bound, f'a = {ids.a} is out of range.'"""
+)
+def assert_nn(vm, ids, memory, ap, fp, scope):
+    scope["assert_integer"] = assert_integer
+    a = ids.a
+    assert_integer(a)
+    assert 0 <= a % vm.prime < scope["range_check_builtin"].bound, f"a = {a} is out of range."
+
+
+@common_library_native_hints.register(
+    """\
+from starkware.cairo.common.math_utils import as_int
+
+# Correctness check.
+value = as_int(ids.value, PRIME) % PRIME
+assert value < ids.UPPER_BOUND, f'{value} is outside of the range [0, 2**250).'
+
+# Calculation for the assertion.
+ids.high, ids.low = divmod(ids.value, ids.SHIFT)"""
+)
+def assert_250_bit(vm, ids, memory, ap, fp, scope):
+    scope["as_int"] = as_int
+    scope["value"] = value = as_int(ids.value, vm.prime) % vm.prime
+    assert value < ids.UPPER_BOUND, f"{value} is outside of the range [0, 2**250)."
+    ids.high, ids.low = divmod(ids.value, ids.SHIFT)
+
+
+@common_library_native_hints.register(
+    """\
+from starkware.cairo.common.math_utils import assert_integer
+assert ids.MAX_HIGH < 2**128 and ids.MAX_LOW < 2**128
+assert PRIME - 1 == ids.MAX_HIGH * 2**128 + ids.MAX_LOW
+assert_integer(ids.value)
+ids.low = ids.value & ((1 << 128) - 1)
+ids.high = ids.value >> 128"""
+)
+def split_felt(vm, ids, memory, ap, fp, scope):
+    scope["assert_integer"] = assert_integer
+    max_high = ids.MAX_HIGH
+    max_low = ids.MAX_LOW
+    assert max_high < 2**128 and max_low < 2**128
+    assert vm.prime - 1 == max_high * 2**128 + max_low
+    value = ids.value
+    assert_integer(value)
+    ids.low = value & ((1 << 128) - 1)
+    ids.high = value >> 128
+
+
+@common_library_native_hints.register(
+    """\
+import itertools
+
+from starkware.cairo.common.math_utils import assert_integer
+assert_integer(ids.a)
+assert_integer(ids.b)
+a = ids.a % PRIME
+b = ids.b % PRIME
+assert a <= b, f'a = {a} is not less than or equal to b = {b}.'
+
+# Find an arc less than PRIME / 3, and another less than PRIME / 2.
+lengths_and_indices = [(a, 0), (b - a, 1), (PRIME - 1 - b, 2)]
+lengths_and_indices.sort()
+assert lengths_and_indices[0][0] <= PRIME // 3 and lengths_and_indices[1][0] <= PRIME // 2
+excluded = lengths_and_indices[2][1]
+
+memory[ids.range_check_ptr + 1], memory[ids.range_check_ptr + 0] = (
+    divmod(lengths_and_indices[0][0], ids.PRIME_OVER_3_HIGH))
+memory[ids.range_check_ptr + 3], memory[ids.range_check_ptr + 2] = (
+    divmod(lengths_and_indices[1][0], ids.PRIME_OVER_2_HIGH))"""
+)
+def assert_le_felt(vm, ids, memory, ap, fp, scope):
+    prime = vm.prime
+    scope["itertools"] = itertools
+    scope["assert_integer"] = assert_integer
+    assert_integer(ids.a)
+    assert_integer(ids.b)
+    scope["a"] = a = ids.a % prime
+    scope["b"] = b = ids.b % prime
+    assert a <= b, f"a = {a} is not less than or equal to b = {b}."
+
+    scope["lengths_and_indices"] = lengths_and_indices = [(a, 0), (b - a, 1), (prime - 1 - b, 2)]
+    lengths_and_indices.sort()
+    assert lengths_and_indices[0][0] <= prime // 3 and lengths_and_indices[1][0] <= prime // 2
+    scope["excluded"] = lengths_and_indices[2][1]
+
+    range_check_ptr = ids.range_check_ptr
+    memory[range_check_ptr + 1], memory[range_check_ptr + 0] = divmod(
+        lengths_and_indices[0][0], ids.PRIME_OVER_3_HIGH
+    )
+    memory[range_check_ptr + 3], memory[range_check_ptr + 2] = divmod(
+        lengths_and_indices[1][0], ids.PRIME_OVER_2_HIGH
+    )
+
+
+@common_library_native_hints.register("memory[ap] = 1 if excluded != 0 else 0", uses_ids=False)
+def assert_le_felt_excluded_0(vm, ids, memory, ap, fp, scope):
+    memory[ap] = 1 if scope["excluded"] != 0 else 0
+
+
+@common_library_native_hints.register("memory[ap] = 1 if excluded != 1 else 0", uses_ids=False)
+def assert_le_felt_excluded_1(vm, ids, memory, ap, fp, scope):
+    memory[ap] = 1 if scope["excluded"] != 1 else 0
+
+
+@common_library_native_hints.register("assert excluded == 2", uses_ids=False)
+def assert_le_felt_excluded_2(vm, ids, memory, ap, fp, scope):
+    assert scope["excluded"] == 2
+
+
+@common_library_native_hints.register(
+    """\
+from starkware.cairo.common.math_utils import assert_integer
+assert_integer(ids.a)
+assert_integer(ids.b)
+assert (ids.a % PRIME) < (ids.b % PRIME), \\
+    f'a = {ids.a % PRIME} is not less than b = {ids.b % PRIME}.'"""
+)
+def assert_lt_felt(vm, ids, memory, ap, fp, scope):
+    scope["assert_integer"] = assert_integer
+    assert_integer(ids.a)
+    assert_integer(ids.b)
+    a = ids.a % vm.prime
+    b = ids.b % vm.prime
+    assert a < b, f"a = {a} is not less than b = {b}."
+
+
+@common_library_native_hints.register(
+    """\
+from starkware.cairo.common.math_utils import assert_integer
+assert_integer(ids.div)
+assert 0 < ids.div <= PRIME // range_check_builtin.bound, \\
+    f'div={hex(ids.div)} is out of the valid range.'
+ids.q, ids.r = divmod(ids.value, ids.div)"""
+)
+def unsigned_div_rem(vm, ids, memory, ap, fp, scope):
+    scope["assert_integer"] = assert_integer
+    div = ids.div
+    assert_integer(div)
+    assert (
+        0 < div <= vm.prime // scope["range_check_builtin"].bound
+    ), f"div={hex(div)} is out of the valid range."
+    ids.q, ids.r = divmod(ids.value, div)
+
+
+# math_cmp.cairo.
+
+
+@common_library_native_hints.register(
+    "memory[ap] = 0 if 0 <= (ids.a % PRIME) < range_check_builtin.bound else 1"
+)
+def is_nn(vm, ids, memory, ap, fp, scope):
+    memory[ap] = 0 if 0 <= (ids.a % vm.prime) < scope["range_check_builtin"].bound else 1
+
+
+@common_library_native_hints.register(
+    "memory[ap] = 0 if 0 <= ((-ids.a - 1) % PRIME) < range_check_builtin.bound else 1"
+)
+def is_nn_out_of_range(vm, ids, memory, ap, fp, scope):
+    memory[ap] = 0 if 0 <= ((-ids.a - 1) % vm.prime) < scope["range_check_builtin"].bound else 1
+
+
+@common_library_native_hints.register("memory[ap] = 0 if (ids.a % PRIME) <= (ids.b % PRIME) else 1")
+def is_le_felt(vm, ids, memory, ap, fp, scope):
+    memory[ap] = 0 if (ids.a % vm.prime) <= (ids.b % vm.prime) else 1
+
+
+# uint256.cairo.
+
+
+@common_library_native_hints.register(
+    """\
+sum_low = ids.a.low + ids.b.low
+ids.carry_low = 1 if sum_low >= ids.SHIFT else 0
+sum_high = ids.a.high + ids.b.high + ids.carry_low
+ids.carry_high = 1 if sum_high >= ids.SHIFT else 0"""
+)
+def uint256_add(vm, ids, memory, ap, fp, scope):
+    a = ids.a
+    b = ids.b
+    shift = ids.SHIFT
+    scope["sum_low"] = sum_low = a.low + b.low
+    ids.carry_low = carry_low = 1 if sum_low >= shift else 0
+    scope["sum_high"] = sum_high = a.high + b.high + carry_low
+    ids.carry_high = 1 if sum_high >= shift else 0
+
+
+@common_library_native_hints.register(
+    """\
+ids.low = ids.a & ((1<<64) - 1)
+ids.high = ids.a >> 64"""
+)
+def split_64(vm, ids, memory, ap, fp, scope):
+    a = ids.a
+    ids.low = a & ((1 << 64) - 1)
+    ids.high = a >> 64
+
+
+@common_library_native_hints.register(
+    "memory[ap] = 1 if 0 <= (ids.a.high % PRIME) < 2 ** 127 else 0"
+)
+def uint256_signed_nn(vm, ids, memory, ap, fp, scope):
+    memory[ap] = 1 if 0 <= (ids.a.high % vm.prime) < 2**127 else 0
+
+
+@common_library_native_hints.register(
+    """\
+a = (ids.a.high << 128) + ids.a.low
+div = (ids.div.high << 128) + ids.div.low
+quotient, remainder = divmod(a, div)
+
+ids.quotient.low = quotient & ((1 << 128) - 1)
+ids.quotient.high = quotient >> 128
+ids.remainder.low = remainder & ((1 << 128) - 1)
+ids.remainder.high = remainder >> 128"""
+)
+def uint256_unsigned_div_rem(vm, ids, memory, ap, fp, scope):
+    a_struct = ids.a
+    div_struct = ids.div
+    scope["a"] = a = (a_struct.high << 128) + a_struct.low
+    scope["div"] = div = (div_struct.high << 128) + div_struct.low
+    quotient, remainder = divmod(a, div)
+    scope["quotient"] = quotient
+    scope["remainder"] = remainder
+
+    ids.quotient.low = quotient & ((1 << 128) - 1)
+    ids.quotient.high = quotient >> 128
+    ids.remainder.low = remainder & ((1 << 128) - 1)
+    ids.remainder.high = remainder >> 128
@@ -0,0 +1,118 @@
+import pytest
+
+from starkware.cairo.common.cairo_function_runner import CairoFunctionRunner
+from starkware.cairo.common.native_hints import common_library_native_hints
+from starkware.cairo.lang.cairo_constants import DEFAULT_PRIME
+from starkware.cairo.lang.compiler.cairo_compile import compile_cairo
+from starkware.cairo.lang.compiler.program import Program
+from starkware.cairo.lang.vm.cairo_run import print_non_native_hints
+from starkware.cairo.lang.vm.vm_exceptions import VmException
+
+CODE = """
+from starkware.cairo.common.alloc import alloc
+from starkware.cairo.common.math import (
+    assert_250_bit,
+    assert_le_felt,
+    assert_lt_felt,
+    assert_nn,
+    assert_not_equal,
+    assert_not_zero,
+    split_felt,
+    unsigned_div_rem,
+)
+from starkware.cairo.common.math_cmp import is_le_felt, is_nn
+from starkware.cairo.common.memcpy import memcpy
+from starkware.cairo.common.uint256 import (
+    Uint256,
+    split_64,
+    uint256_add,
+    uint256_signed_nn,
+    uint256_unsigned_div_rem,
+)
+
+func run_hints{range_check_ptr}(a, b) -> (res: felt) {
+    alloc_locals;
+    let (local dst: felt*) = alloc();
+    let (src: felt*) = alloc();
+    assert src[0] = a;
+    assert src[1] = b;
+    memcpy(dst=dst, src=src, len=2);
+    assert_not_zero(dst[0]);
+    assert_not_equal(a, b);
+    assert_nn(a);
+    assert_250_bit(a);
+    let (high, low) = split_felt(b);
+    assert_le_felt(a, b);
+    assert_lt_felt(a, b);
+    let (q, r) = unsigned_div_rem(b, 7);
+    let a_nn = is_nn(a);
+    let b_nn = is_nn(b);
+    let a_le_b = is_le_felt(a, b);
+    let (b_high, b_low) = split_64(b);
+    let (sum, carry) = uint256_add(Uint256(low=a, high=b_high), Uint256(low=b_low, high=a));
+    let (sum_nn) = uint256_signed_nn(sum);
+    let (quotient, remainder) = uint256_unsigned_div_rem(sum, Uint256(low=7, high=a));
+    return (
+        res=high + low + q + r + a_nn + b_nn + a_le_b + carry + sum_nn + quotient.low +
+        quotient.high + remainder.low + remainder.high,
+    );
+}
+"""
+
+
+@pytest.fixture(scope="module")
+def program() -> Program:
+    return compile_cairo(code=CODE, prime=DEFAULT_PRIME)
+
+
+def run_hints(program: Program, a: int, b: int, native_hints: bool = True) -> int:
+    runner = CairoFunctionRunner(
+        program, native_hints=common_library_native_hints if native_hints else None
+    )
+    _, (res,) = runner.run("run_hints", range_check_ptr=runner.range_check_builtin.base, a=a, b=b)
+    assert isinstance(res, int)
+    return res
+
+
+def test_all_native_hints_are_used(program: Program):
+    non_native_hints = common_library_native_hints.get_non_native_hints(program=program)
+    assert non_native_hints == {}
+    used_hints = {hint.code for hints in program.hints.values() for hint in hints}
+    assert set(common_library_native_hints.hints.keys()) <= used_hints
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [(3, 2**100 + 5), (1, 2**120), (2**64, 2**128 - 1)],
+)
+def test_native_hints(program: Program, a: int, b: int):
+    native_res = run_hints(program=program, a=a, b=b)
+    assert run_hints(program=program, a=a, b=b, native_hints=False) == native_res
+
+
+def test_native_hint_failure(program: Program):
+    with pytest.raises(VmException, match="assert_not_equal failed: 5 = 5."):
+        run_hints(program=program, a=5, b=5)
+
+
+def test_native_hints_are_opt_in(program: Program):
+    # By default, the hints are executed as Python code, so that their errors refer to the code of
+    # the hint.
+    runner = CairoFunctionRunner(program)
+    assert runner.native_hints is None
+    with pytest.raises(VmException) as exc_info:
+        runner.run("run_hints", range_check_ptr=runner.range_check_builtin.base, a=5, b=5)
+    assert 'File "<hint' in str(exc_info.value)
+    assert "native_hints.py" not in str(exc_info.value)
+
+
+def test_print_non_native_hints(program: Program, capsys):
+    print_non_native_hints(program=program, native_hints=None)
+    output = capsys.readouterr().out
+    n_hints = sum(len(hints) for hints in program.hints.values())
+    assert f"Hints without a native implementation: {n_hints} out of {n_hints}." in output
+    assert "memory[ap] = segments.add()" in output
+
+    print_non_native_hints(program=program, native_hints=common_library_native_hints)
+    output = capsys.readouterr().out
+    assert output == f"Hints without a native implementation: 0 out of {n_hints}.\n\n"
@@ -1,6 +1,10 @@
 from typing import Callable, List, Optional, Sequence
 
-from starkware.cairo.common.poseidon_utils import PoseidonParams, hades_permutation
+from starkware.cairo.common.poseidon_utils import (
+    PoseidonParams,
+    SmallMdsHadesPermutation,
+    hades_permutation,
+)
 from starkware.python.utils import blockify, from_bytes, to_bytes
 
 
@@ -9,7 +13,15 @@ def poseidon_perm(*elements: int) -> List[int]:
     Returns the poseidon permutation of the inputs.
     """
     assert len(elements) == 3, f"Only the case of 3 elements is supported, got {elements}."
-    return hades_permutation(list(elements), PoseidonParams.get_default_poseidon_params())
+    return SmallMdsHadesPermutation.get_default().permute(*elements)
+
+
+def poseidon_perm_many(states: Sequence[Sequence[int]]) -> List[List[int]]:
+    """
+    Returns the poseidon permutation of each of the given states (of 3 elements each).
+    Faster than calling poseidon_perm() for each state.
+    """
+    return SmallMdsHadesPermutation.get_default().permute_many(states)
 
 
 def poseidon_hash_func(x: bytes, y: bytes) -> bytes:
@@ -26,7 +38,7 @@ def poseidon_hash(x: int, y: int, poseidon_params: Optional[PoseidonParams] = No
     src/starkware/cairo/common/builtin_poseidon/poseidon.cairo
     """
     if poseidon_params is None:
-        poseidon_params = PoseidonParams.get_default_poseidon_params()
+        return poseidon_perm(x, y, 2)[0]
 
     return hades_permutation([x, y, 2], poseidon_params)[0]
 
@@ -38,7 +50,7 @@ def poseidon_hash_single(x: int, poseidon_params: Optional[PoseidonParams] = Non
     src/starkware/cairo/common/builtin_poseidon/poseidon.cairo
     """
     if poseidon_params is None:
-        poseidon_params = PoseidonParams.get_default_poseidon_params()
+        return poseidon_perm(x, 0, 1)[0]
 
     return hades_permutation([x, 0, 1], poseidon_params)[0]
 
@@ -58,6 +70,43 @@ def poseidon_hash_many(
     )
 
 
+def poseidon_hash_many_batch(arrays: Sequence[Sequence[int]]) -> List[int]:
+    """
+    Returns [poseidon_hash_many(array) for array in arrays], using the default Poseidon
+    parameters.
+    The permutations of the different arrays are computed together (see poseidon_perm_many()).
+    """
+    poseidon_params = PoseidonParams.get_default_poseidon_params()
+    r = poseidon_params.r
+    padded_arrays = []
+    for array in arrays:
+        # Pad input with 1 followed by 0's (if necessary).
+        values = list(array) + [1]
+        values += [0] * (-len(values) % r)
+        padded_arrays.append(values)
+
+    states = [[0] * poseidon_params.m for _ in padded_arrays]
+    n_blocks = max((len(values) // r for values in padded_arrays), default=0)
+    for block_index in range(n_blocks):
+        start = block_index * r
+        # The indices of the arrays that have a block at block_index.
+        indices = [i for i, values in enumerate(padded_arrays) if start < len(values)]
+        new_states = poseidon_perm_many(
+            [
+                [
+                    state_val + block_val
+                    for state_val, block_val in zip(states[i], padded_arrays[i][start : start + r])
+                ]
+                + states[i][r:]
+                for i in indices
+            ]
+        )
+        for i, state in zip(indices, new_states):
+            states[i] = state
+
+    return [state[0] for state in states]
+
+
 def poseidon_hash_many_given_poseidon_perm(
     array: Sequence[int],
     poseidon_perm: Callable[..., List[int]],
@@ -0,0 +1,58 @@
+import random
+from typing import List
+
+import pytest
+
+from starkware.cairo.common.poseidon_hash import (
+    poseidon_hash,
+    poseidon_hash_many,
+    poseidon_hash_many_batch,
+    poseidon_hash_many_given_poseidon_perm,
+    poseidon_hash_single,
+    poseidon_perm,
+    poseidon_perm_many,
+)
+from starkware.cairo.common.poseidon_utils import PoseidonParams, hades_permutation
+from starkware.cairo.lang.cairo_constants import DEFAULT_PRIME
+from starkware.python.random_test_utils import parametrize_random_object
+
+
+def reference_perm(*elements: int) -> List[int]:
+    return hades_permutation(list(elements), PoseidonParams.get_default_poseidon_params())
+
+
+@parametrize_random_object()
+def test_poseidon_perm(random_object: random.Random):
+    states = [[0, 0, 0], [DEFAULT_PRIME - 1] * 3, [1, 2, 3]] + [
+        [random_object.randrange(DEFAULT_PRIME) for _ in range(3)] for _ in range(20)
+    ]
+    expected = [reference_perm(*state) for state in states]
+    assert [poseidon_perm(*state) for state in states] == expected
+    assert poseidon_perm_many(states) == expected
+    assert poseidon_perm_many([]) == []
+
+    x, y = states[-1][:2]
+    assert poseidon_hash(x, y) == reference_perm(x, y, 2)[0]
+    assert poseidon_hash_single(x) == reference_perm(x, 0, 1)[0]
+
+
+def test_poseidon_perm_wrong_size():
+    with pytest.raises(AssertionError, match="Only the case of 3 elements is supported"):
+        poseidon_perm(1, 2)
+    with pytest.raises(AssertionError, match="Expected a state of 3 elements"):
+        poseidon_perm_many([[1, 2, 3], [1, 2]])
+
+
+@parametrize_random_object()
+def test_poseidon_hash_many_batch(random_object: random.Random):
+    arrays = [
+        [random_object.randrange(DEFAULT_PRIME) for _ in range(length)]
+        for length in [0, 1, 2, 3, 10, 5, 0]
+    ]
+    expected = [
+        poseidon_hash_many_given_poseidon_perm(array=array, poseidon_perm=reference_perm)
+        for array in arrays
+    ]
+    assert [poseidon_hash_many(array) for array in arrays] == expected
+    assert poseidon_hash_many_batch(arrays) == expected
+    assert poseidon_hash_many_batch([]) == []
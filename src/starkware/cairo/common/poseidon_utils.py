@@ -4,7 +4,7 @@ https://starkware.co/hash-challenge/hash-challenge-implementation-reference-code
 """
 
 import hashlib
-from typing import Iterable, List, Optional, Type
+from typing import Iterable, List, Optional, Sequence, Tuple, Type
 
 import numpy as np
 
@@ -151,3 +151,123 @@ def hades_permutation(values: List[int], params: PoseidonParams) -> List[int]:
         round_idx += 1
     assert round_idx == params.n_rounds
     return list(values)
+
+
+class SmallMdsHadesPermutation:
+    """
+    An optimized implementation of hades_permutation for parameters with m = 3 and the SmallMds
+    matrix (such as the default Poseidon parameters):
+    * The round constants of the first two elements in the partial rounds are folded (through the
+      MDS matrix) into the constants of the following rounds, so that each partial round adds a
+      single constant.
+    * The MDS multiplication is specialized to SmallMds.
+    * The first two elements are not reduced during the partial rounds (as they are only used
+      linearly).
+    """
+
+    _default: Optional["SmallMdsHadesPermutation"] = None
+
+    def __init__(self, params: PoseidonParams):
+        assert params.m == 3 and isinstance(
+            params.mds, SmallMds
+        ), "SmallMdsHadesPermutation only supports m = 3 and the SmallMds matrix."
+        self.field_prime = prime = params.field_prime
+        half_r_f = safe_div(params.r_f, 2)
+        ark = [[int(constant) for constant in round_constants] for round_constants in params.ark]
+
+        self.first_full_round_constants: List[Tuple[int, int, int]] = [
+            (k0, k1, k2) for k0, k1, k2 in ark[:half_r_f]
+        ]
+        self.partial_round_constants: List[int] = []
+        # The constants that are carried to the next round, by the folding described above.
+        carry = [0, 0, 0]
+        for round_constants in ark[half_r_f : half_r_f + params.r_p]:
+            k0, k1, k2 = [(k + c) % prime for k, c in zip(round_constants, carry)]
+            self.partial_round_constants.append(k2)
+            carry = params.mds.dot_mod([k0, k1, 0], prime)
+        self.last_full_round_constants: List[Tuple[int, int, int]] = [
+            (k0, k1, k2) for k0, k1, k2 in ark[half_r_f + params.r_p :]
+        ]
+        k0, k1, k2 = self.last_full_round_constants[0]
+        self.last_full_round_constants[0] = (
+            (k0 + carry[0]) % prime,
+            (k1 + carry[1]) % prime,
+            (k2 + carry[2]) % prime,
+        )
+
+    @classmethod
+    def get_default(cls) -> "SmallMdsHadesPermutation":
+        if cls._default is None:
+            cls._default = cls(params=PoseidonParams.get_default_poseidon_params())
+        return cls._default
+
+    def permute(self, s0: int, s1: int, s2: int) -> List[int]:
+        """
+        Returns hades_permutation([s0, s1, s2]).
+        """
+        prime = self.field_prime
+        for k0, k1, k2 in self.first_full_round_constants:
+            s0 = (s0 + k0) % prime
+            s1 = (s1 + k1) % prime
+            s2 = (s2 + k2) % prime
+            s0 = s0 * s0 % prime * s0
+            s1 = s1 * s1 % prime * s1
+            s2 = s2 * s2 % prime * s2
+            # SmallMds.
+            t = s0 + s1 + s2
+            s0, s1, s2 = t + 2 * s0, t - 2 * s1, t - 3 * s2
+        for k2 in self.partial_round_constants:
+            s2 = (s2 + k2) % prime
+            s2 = s2 * s2 % prime * s2
+            t = s0 + s1 + s2
+            s0, s1, s2 = t + 2 * s0, t - 2 * s1, t - 3 * s2
+        for k0, k1, k2 in self.last_full_round_constants:
+            s0 = (s0 + k0) % prime
+            s1 = (s1 + k1) % prime
+            s2 = (s2 + k2) % prime
+            s0 = s0 * s0 % prime * s0
+            s1 = s1 * s1 % prime * s1
+            s2 = s2 * s2 % prime * s2
+            t = s0 + s1 + s2
+            s0, s1, s2 = t + 2 * s0, t - 2 * s1, t - 3 * s2
+        return [s0 % prime, s1 % prime, s2 % prime]
+
+    def permute_many(self, states: Sequence[Sequence[int]]) -> List[List[int]]:
+        """
+        Returns [hades_permutation(state) for state in states].
+        The states are permuted together, using numpy object arrays (one array per element of the
+        state), which saves most of the interpreter overhead of permute().
+        """
+        if len(states) == 0:
+            return []
+        for state in states:
+            assert len(state) == 3, f"Expected a state of 3 elements, got {state}."
+
+        prime = self.field_prime
+        s0, s1, s2 = np.array(states, dtype=object).reshape(len(states), 3).T
+        for k0, k1, k2 in self.first_full_round_constants:
+            s0 = (s0 + k0) % prime
+            s1 = (s1 + k1) % prime
+            s2 = (s2 + k2) % prime
+            s0 = s0 * s0 % prime * s0
+            s1 = s1 * s1 % prime * s1
+            s2 = s2 * s2 % prime * s2
+            t = s0 + s1 + s2
+            s0, s1, s2 = t + 2 * s0, t - 2 * s1, t - 3 * s2
+        for k2 in self.partial_round_constants:
+            s2 = (s2 + k2) % prime
+            s2 = s2 * s2 % prime * s2
+            t = s0 + s1 + s2
+            s0, s1, s2 = t + 2 * s0, t - 2 * s1, t - 3 * s2
+        for k0, k1, k2 in self.last_full_round_constants:
+            s0 = (s0 + k0) % prime
+            s1 = (s1 + k1) % prime
+            s2 = (s2 + k2) % prime
+            s0 = s0 * s0 % prime * s0
+            s1 = s1 * s1 % prime * s1
+            s2 = s2 * s2 % prime * s2
+            t = s0 + s1 + s2
+            s0, s1, s2 = t + 2 * s0, t - 2 * s1, t - 3 * s2
+        return [
+            [int(x0), int(x1), int(x2)] for x0, x1, x2 in zip(s0 % prime, s1 % prime, s2 % prime)
+        ]
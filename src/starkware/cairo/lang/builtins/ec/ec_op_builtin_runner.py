@@ -141,6 +141,10 @@ class EcOpBuiltinRunner(SimpleBuiltinRunner):
         self.ec_op_builtin: EcOpInstanceDef = ec_op_builtin
         self.cache: Dict[MaybeRelocatable, int] = {}
 
+    def reset(self):
+        super().reset()
+        self.cache.clear()
+
     def get_instance_def(self):
         return self.ec_op_builtin
 
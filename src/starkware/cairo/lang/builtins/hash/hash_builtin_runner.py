@@ -1,13 +1,29 @@
-from typing import Any, Dict, Set
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
 
 from starkware.cairo.lang.builtins.hash.instance_def import CELLS_PER_HASH, INPUT_CELLS_PER_HASH
 from starkware.cairo.lang.vm.builtin_runner import BuiltinVerifier, SimpleBuiltinRunner
 from starkware.cairo.lang.vm.relocatable import MaybeRelocatable, RelocatableValue
 from starkware.python.math_utils import safe_div
 
+# The maximal number of instances deduced together by HashBuiltinRunner (see hash_many_func).
+MAX_DEDUCTION_BATCH_SIZE = 1024
+
 
 class HashBuiltinRunner(SimpleBuiltinRunner):
-    def __init__(self, name: str, included: bool, ratio: int, hash_func, instance_def=None):
+    def __init__(
+        self,
+        name: str,
+        included: bool,
+        ratio: int,
+        hash_func,
+        instance_def=None,
+        hash_many_func: Optional[Callable[[Sequence[Tuple[int, int]]], List[int]]] = None,
+    ):
+        """
+        hash_many_func, if given, computes hash_func on a list of pairs. It is used to deduce
+        consecutive instances, whose inputs are already in memory, together (this happens, for
+        example, when the auto deductions are verified on memory that was loaded from a CairoPie).
+        """
         super().__init__(
             name=name,
             included=included,
@@ -16,9 +32,17 @@ class HashBuiltinRunner(SimpleBuiltinRunner):
             n_input_cells=INPUT_CELLS_PER_HASH,
         )
         self.hash_func = hash_func
+        self.hash_many_func = hash_many_func
         self.verified_addresses: Set[MaybeRelocatable] = set()
+        # Results of instances that were deduced as part of a batch, but were not requested yet.
+        self.pending_results: Dict[RelocatableValue, int] = {}
         self.instance_def = instance_def
 
+    def reset(self):
+        super().reset()
+        self.verified_addresses.clear()
+        self.pending_results.clear()
+
     def get_instance_def(self):
         return self.instance_def
 
@@ -39,12 +63,44 @@ class HashBuiltinRunner(SimpleBuiltinRunner):
                 f"{self.name} builtin: Expected integer at address {addr - 1}. "
                 + f"Got: {memory[addr - 1]}."
             )
-            res = self.hash_func(memory[addr - 2], memory[addr - 1])
+            res = self.pending_results.pop(addr, None)
+            if res is None:
+                res = self.compute_hashes(vm=vm, addr=addr)
             verified_addresses.add(addr)
             return res
 
         runner.vm.add_auto_deduction_rule(self.base.segment_index, rule, self.verified_addresses)
 
+    def compute_hashes(self, vm, addr: RelocatableValue) -> int:
+        """
+        Returns the hash of the instance whose output is at addr. If hash_many_func is given, the
+        following instances, which are pending deduction, are computed as well and kept in
+        pending_results.
+        """
+        memory = vm.run_context.memory
+        if self.hash_many_func is None:
+            return self.hash_func(memory[addr - 2], memory[addr - 1])
+
+        output_addresses = []
+        pairs = []
+        output_addr = addr
+        while len(pairs) < MAX_DEDUCTION_BATCH_SIZE:
+            x = memory.get(output_addr - 2)
+            y = memory.get(output_addr - 1)
+            if not (vm.is_integer_value(x) and vm.is_integer_value(y)):
+                break
+            if output_addr in self.verified_addresses or output_addr in self.pending_results:
+                break
+            output_addresses.append(output_addr)
+            pairs.append((x, y))
+            output_addr += CELLS_PER_HASH
+
+        if len(pairs) == 1:
+            return self.hash_func(*pairs[0])
+        res, *pending_results = self.hash_many_func(pairs)
+        self.pending_results.update(zip(output_addresses[1:], pending_results))
+        return res
+
     def air_private_input(self, runner) -> Dict[str, Any]:
         assert self.base is not None, "Uninitialized self.base."
         res: Dict[int, Any] = {}
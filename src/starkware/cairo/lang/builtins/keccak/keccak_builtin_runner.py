@@ -83,6 +83,10 @@ class KeccakBuiltinRunner(SimpleBuiltinRunner):
         self.instance_def: KeccakInstanceDef = instance_def
         self.cache: Dict[MaybeRelocatable, int] = {}
 
+    def reset(self):
+        super().reset()
+        self.cache.clear()
+
     def get_instance_def(self):
         return self.instance_def
 
@@ -95,6 +95,10 @@ class ModBuiltinRunner(SimpleBuiltinRunnerWithLowRatio):
     def set_address_allocated_zeros(self, addr: RelocatableValue):
         self.zero_value = addr
 
+    def reset(self):
+        super().reset()
+        self.zero_value = None
+
     def get_instance_def(self):
         return self.instance_def
 
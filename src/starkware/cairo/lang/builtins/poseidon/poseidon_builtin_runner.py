@@ -20,6 +20,11 @@ class PoseidonBuiltinRunner(SimpleBuiltinRunner):
         self.verified_addresses: Set[MaybeRelocatable] = set()
         self.cache: Dict[MaybeRelocatable, int] = {}
 
+    def reset(self):
+        super().reset()
+        self.verified_addresses.clear()
+        self.cache.clear()
+
     def get_instance_def(self):
         return self.instance_def
 
@@ -98,6 +98,10 @@ class SignatureBuiltinRunner(SimpleBuiltinRunner):
         # A dict of address -> signature.
         self.signatures: Dict = {}
 
+    def reset(self):
+        super().reset()
+        self.signatures.clear()
+
     def get_instance_def(self):
         return self.instance_def
 
@@ -1,8 +1,12 @@
 import argparse
+import atexit
+import functools
+import io
 import json
 import os
 import sys
 import time
+from concurrent.futures import Executor, ProcessPoolExecutor
 from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple, Type, Union
 
 from starkware.cairo.lang.cairo_constants import DEFAULT_PRIME
@@ -16,12 +20,16 @@ from starkware.cairo.lang.compiler.identifier_utils import (
     get_type_definition,
 )
 from starkware.cairo.lang.compiler.module_reader import ModuleReader
+from starkware.cairo.lang.compiler.parse_cache import ParseCache
 from starkware.cairo.lang.compiler.preprocessor.auxiliary_info_collector import (
     AuxiliaryInfoCollector,
 )
 from starkware.cairo.lang.compiler.preprocessor.default_pass_manager import default_pass_manager
 from starkware.cairo.lang.compiler.preprocessor.pass_manager import PassManager
 from starkware.cairo.lang.compiler.preprocessor.preprocess_codes import preprocess_codes
+from starkware.cairo.lang.compiler.preprocessor.preprocessed_program_cache import (
+    PreprocessedProgramCache,
+)
 from starkware.cairo.lang.compiler.preprocessor.preprocessor import PreprocessedProgram
 from starkware.cairo.lang.compiler.program import Program
 from starkware.cairo.lang.compiler.scoped_name import ScopedName
@@ -76,6 +84,27 @@ def cairo_compile_add_common_args(parser: argparse.ArgumentParser):
         default=True,
         help="Disables unused function optimization.",
     )
+    parser.add_argument(
+        "--parse_cache_dir",
+        type=str,
+        help=(
+            "A directory of parsed Cairo files. Files that did not change since they were parsed "
+            "are not parsed again."
+        ),
+    )
+    parser.add_argument(
+        "--parse_processes",
+        type=int,
+        help="The number of processes in which Cairo files are parsed (by default, 1).",
+    )
+    parser.add_argument(
+        "--preprocessed_cache_dir",
+        type=str,
+        help=(
+            "A directory of preprocessed programs. Programs whose files (and compilation flags) "
+            "did not change since they were compiled are not preprocessed again."
+        ),
+    )
 
 
 def cairo_compile_common(
@@ -149,6 +178,47 @@ def cairo_compile_common(
             )
 
 
+def get_parse_cache(args: argparse.Namespace) -> Optional[ParseCache]:
+    parse_cache_dir = getattr(args, "parse_cache_dir", None)
+    return None if parse_cache_dir is None else ParseCache(cache_dir=parse_cache_dir)
+
+
+def close_file_args(args: argparse.Namespace):
+    """
+    Closes the files that were opened by the argparse.FileType arguments (e.g., --output), other
+    than the standard streams, so that they are flushed even if the process does not exit (e.g.,
+    in a compile server).
+    """
+    for value in vars(args).values():
+        if isinstance(value, io.IOBase) and value not in (sys.stdin, sys.stdout, sys.stderr):
+            value.close()
+
+
+def get_parse_executor(args: argparse.Namespace) -> Optional[Executor]:
+    parse_processes = getattr(args, "parse_processes", None)
+    if parse_processes is None or parse_processes <= 1:
+        return None
+    return get_process_pool(max_workers=parse_processes)
+
+
+@functools.lru_cache(None)
+def get_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Returns a process pool of the given size, which is shared by the compilations of the process,
+    and is shut down when the process exits.
+    """
+    process_pool = ProcessPoolExecutor(max_workers=max_workers)
+    atexit.register(process_pool.shutdown, wait=True)
+    return process_pool
+
+
+def get_preprocessed_program_cache(
+    args: argparse.Namespace,
+) -> Optional[PreprocessedProgramCache]:
+    cache_dir = getattr(args, "preprocessed_cache_dir", None)
+    return None if cache_dir is None else PreprocessedProgramCache(cache_dir=cache_dir)
+
+
 def get_module_reader(cairo_path: List[str]) -> ModuleReader:
     starkware_src = os.path.join(os.path.dirname(__file__), "../../../..")
     cairo_path = [
@@ -389,6 +459,9 @@ def cairo_compile_wrapper(args: argparse.Namespace):
             prime=args.prime,
             read_module=module_reader.read,
             opt_unused_functions=args.opt_unused_functions,
+            parse_cache=get_parse_cache(args=args),
+            parse_executor=get_parse_executor(args=args),
+            cache=get_preprocessed_program_cache(args=args),
         )
 
     cairo_compile_common(
@@ -414,6 +487,7 @@ def main():
         help="Disable proof mode (see --proof_mode).",
     )
 
+    args: Optional[argparse.Namespace] = None
     try:
         cairo_compile_add_common_args(parser)
         args = parser.parse_args()
@@ -421,6 +495,9 @@ def main():
     except LocationError as err:
         print(err, file=sys.stderr)
         return 1
+    finally:
+        if args is not None:
+            close_file_args(args=args)
     return 0
 
 
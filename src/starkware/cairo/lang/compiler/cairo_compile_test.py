@@ -1,8 +1,9 @@
+import argparse
 import re
 
 import pytest
 
-from starkware.cairo.lang.compiler.cairo_compile import compile_cairo
+from starkware.cairo.lang.compiler.cairo_compile import compile_cairo, get_parse_executor
 
 PRIME = 2**251 + 17 * 2**192 + 1
 
@@ -80,3 +81,10 @@ func main(output_ptr: felt*, range_check_ptr: felt*) -> (felt*,) {
 """,
             prime=PRIME,
         )
+
+
+def test_parse_executor_is_shared():
+    assert get_parse_executor(args=argparse.Namespace(parse_processes=1)) is None
+    # The compilations of a process share a single pool.
+    args = argparse.Namespace(parse_processes=2)
+    assert get_parse_executor(args=args) is get_parse_executor(args=args)
@@ -1,4 +1,6 @@
-from typing import Callable, Dict, List, Optional, Tuple
+import re
+from concurrent.futures import Executor, Future
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 from starkware.cairo.lang.compiler.ast.code_elements import (
     CodeBlock,
@@ -10,11 +12,22 @@ from starkware.cairo.lang.compiler.ast.module import CairoFile
 from starkware.cairo.lang.compiler.ast.visitor import Visitor, get_lang_from_file
 from starkware.cairo.lang.compiler.error_handling import Location, LocationError
 from starkware.cairo.lang.compiler.module_reader import ModuleNotFoundException
+from starkware.cairo.lang.compiler.parse_cache import ParseCache
 from starkware.cairo.lang.compiler.parser import parse_file
 
+# Patterns of the import-only scan of files (see ImportsCollector.prefetch()).
+HINT_PATTERN = re.compile(r"%\{.*?%\}", re.DOTALL)
+COMMENT_PATTERN = re.compile(r"//.*")
+IMPORT_PATTERN = re.compile(
+    r"^\s*from\s+([a-zA-Z_][a-zA-Z_0-9]*(?:\.[a-zA-Z_][a-zA-Z_0-9]*)*)\s+import\b", re.MULTILINE
+)
+
 
 def collect_imports(
-    curr_pkg_name: str, read_file: Callable[[str], Tuple[str, str]]
+    curr_pkg_name: str,
+    read_file: Callable[[str], Tuple[str, str]],
+    parse_cache: Optional[ParseCache] = None,
+    parse_executor: Optional[Executor] = None,
 ) -> Dict[str, CairoFile]:
     """
     Scans the graph of file imports (using DFS), starting with curr_pkg_name,
@@ -24,13 +37,31 @@ def collect_imports(
     'read_file' is a strategy to access code files. Given a package name
     (as written in the using directive) it returns a pair (file content, file name).
     curr_pkg_name must be provided in the same format.
+    If 'parse_cache' is given, files are parsed through it.
+    If 'parse_executor' is given (e.g., a ProcessPoolExecutor), files are parsed in it, in
+    parallel; the result (and the errors) are the same as without it.
     """
 
-    collector = ImportsCollector(read_file)
-    collector.collect(curr_pkg_name)
+    collector = ImportsCollector(read_file, parse_cache=parse_cache, parse_executor=parse_executor)
+    if parse_executor is not None:
+        collector.prefetch(curr_pkg_name)
+    try:
+        collector.collect(curr_pkg_name)
+    finally:
+        collector.cancel_prefetch()
     return collector.collected_data
 
 
+def scan_imports(code: str) -> List[str]:
+    """
+    Returns the names of the packages that are imported in the given code, without parsing it.
+    The result may contain packages that are not imported (or miss packages that are), so it
+    should only be used as a hint.
+    """
+    code = COMMENT_PATTERN.sub("", HINT_PATTERN.sub("", code))
+    return IMPORT_PATTERN.findall(code)
+
+
 class UsingCycleError(Exception):
     """
     Represents an error thrown when a cyclic dependency is found.
@@ -54,11 +85,74 @@ class ImportLoaderError(LocationError):
 
 
 class ImportsCollector:
-    def __init__(self, read_file: Callable[[str], Tuple[str, str]]):
+    def __init__(
+        self,
+        read_file: Callable[[str], Tuple[str, str]],
+        parse_cache: Optional[ParseCache] = None,
+        parse_executor: Optional[Executor] = None,
+    ):
         self.curr_ancestors: List[str] = []
         self.collected_data: Dict[str, CairoFile] = {}
         self.lang: Dict[str, Optional[str]] = {}
         self.read_file = read_file
+        self.parse_cache = parse_cache
+        self.parse_executor = parse_executor
+        # The files that were read by prefetch(), and the files that are parsed in
+        # parse_executor.
+        self.prefetched_files: Dict[str, Tuple[str, str]] = {}
+        self.parse_futures: Dict[str, Future] = {}
+
+    def prefetch(self, curr_pkg_name: str):
+        """
+        Discovers the packages that curr_pkg_name (transitively) imports, using an import-only
+        scan of the files (see scan_imports()), and starts parsing them in parse_executor.
+        collect() takes the parsed files, if they are ready, instead of parsing them. Errors are
+        ignored here; they are raised by collect(), in the same order as without prefetch().
+        """
+        assert self.parse_executor is not None, "prefetch() requires a parse executor."
+        pkg_names = [curr_pkg_name]
+        visited_pkg_names: Set[str] = {curr_pkg_name}
+        while len(pkg_names) > 0:
+            pkg_name = pkg_names.pop()
+            try:
+                code, filename = self.read_file(pkg_name)
+            except Exception:
+                continue
+
+            self.prefetched_files[pkg_name] = (code, filename)
+            if self.parse_cache is None or not self.parse_cache.contains(
+                code=code, filename=filename
+            ):
+                self.parse_futures[pkg_name] = self.parse_executor.submit(
+                    parse_file, code, filename
+                )
+            for imported_pkg_name in scan_imports(code):
+                if imported_pkg_name not in visited_pkg_names:
+                    visited_pkg_names.add(imported_pkg_name)
+                    pkg_names.append(imported_pkg_name)
+
+    def cancel_prefetch(self):
+        """
+        Cancels the parsing of prefetched files that were not collected (e.g., following an
+        error).
+        """
+        for future in self.parse_futures.values():
+            future.cancel()
+        self.parse_futures.clear()
+        self.prefetched_files.clear()
+
+    def parse_file(self, pkg_name: str, code: str, filename: str) -> CairoFile:
+        future = self.parse_futures.pop(pkg_name, None)
+
+        def parse() -> CairoFile:
+            # If parsing failed in the executor, parse the file again, to raise the error here.
+            if future is not None and future.exception() is None:
+                return future.result()
+            return parse_file(code, filename=filename)
+
+        if self.parse_cache is None:
+            return parse()
+        return self.parse_cache.parse_file(code=code, filename=filename, parse=parse)
 
     def collect(self, curr_pkg_name: str, location: Optional[Location] = None):
         # Check for circular dependencies.
@@ -70,7 +164,11 @@ class ImportsCollector:
             return
 
         try:
-            code, filename = self.read_file(curr_pkg_name)
+            code, filename = (
+                self.prefetched_files.pop(curr_pkg_name)
+                if curr_pkg_name in self.prefetched_files
+                else self.read_file(curr_pkg_name)
+            )
         except ModuleNotFoundException as e:
             raise ImportLoaderError(str(e), location=location)
         except Exception as e:
@@ -78,7 +176,7 @@ class ImportsCollector:
                 f"Could not load module '{curr_pkg_name}'.\nError: {e}", location=location
             )
 
-        parsed_file: CairoFile = parse_file(code, filename=filename)
+        parsed_file = self.parse_file(pkg_name=curr_pkg_name, code=code, filename=filename)
 
         lang = get_lang_from_file(parsed_file)
 
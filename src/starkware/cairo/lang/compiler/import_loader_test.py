@@ -1,6 +1,7 @@
 import re
+from concurrent.futures import ProcessPoolExecutor
 from random import sample
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
 import pytest
 
@@ -10,6 +11,7 @@ from starkware.cairo.lang.compiler.import_loader import (
     ImportLoaderError,
     UsingCycleError,
     collect_imports,
+    scan_imports,
 )
 from starkware.cairo.lang.compiler.parser import ParserError, parse_file
 from starkware.cairo.lang.compiler.test_utils import read_file_from_dict
@@ -263,3 +265,75 @@ def verify_exception(files: Dict[str, str], main_file: str, error: str):
         collect_imports(main_file, read_file_from_dict(files))
     # Remove line and column information from the error using a regular expression.
     assert re.sub(":[0-9]+:[0-9]+: ", ":?:?: ", str(e.value)) == error.strip()
+
+
+@pytest.fixture(scope="module")
+def parse_executor() -> Iterator[ProcessPoolExecutor]:
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+def test_scan_imports():
+    code = """
+from a import b
+from b.c.d.e import (
+    f as g,
+)
+// from vs.code import ide
+%{
+    from starkware.python.utils import safe_zip
+%}
+func foo() {
+    from pytest import cairo_stack_test as ci
+}
+"""
+    assert scan_imports(code) == ["a", "b.c.d.e", "pytest"]
+
+
+def test_parallel_collect_imports(parse_executor: ProcessPoolExecutor):
+    files = {
+        "root.file": """
+from a import aa
+from b import bb
+""",
+        "a": """
+from common.first import some1
+// from common.unused import some2
+""",
+        "b": """
+%{
+    from common.hint import some2
+%}
+from common.first import some1
+from common.second import some2
+""",
+        "common.first": "[ap] = 1;",
+        "common.second": "[ap] = 2;",
+    }
+
+    expected_res = collect_imports("root.file", read_file_from_dict(files))
+    res = collect_imports("root.file", read_file_from_dict(files), parse_executor=parse_executor)
+    assert res == expected_res
+    assert list(res.keys()) == list(expected_res.keys())
+
+
+@pytest.mark.parametrize(
+    "files",
+    [
+        {"root.file": "from foo import bar\nfrom baz import bar", "foo": "not cairo", "baz": "x"},
+        {"root.file": "from fo.o import aa"},
+        {f"a{i}": f"from a{(i+1) % 9} import b" for i in range(10)},
+    ],
+)
+def test_parallel_collect_imports_errors(
+    files: Dict[str, str], parse_executor: ProcessPoolExecutor
+):
+    """
+    Checks that the errors of collect_imports() with a parse executor are the same as without it.
+    """
+    root = next(iter(files.keys()))
+    with pytest.raises(Exception) as expected_error:
+        collect_imports(root, read_file_from_dict(files))
+    with pytest.raises(type(expected_error.value)) as error:
+        collect_imports(root, read_file_from_dict(files), parse_executor=parse_executor)
+    assert str(error.value) == str(expected_error.value)
@@ -0,0 +1,103 @@
+import hashlib
+import logging
+import os
+import pickle
+from typing import Callable, Optional
+
+from starkware.cairo.lang.compiler.ast.module import CairoFile
+from starkware.cairo.lang.compiler.parser import GRAMMER_FILE, parse_file
+from starkware.cairo.lang.version import __version__
+from starkware.python.utils import gc_disabled, remove_oldest_files, write_file_atomically
+
+logger = logging.getLogger(__name__)
+
+# The version of the format of the cache entries; should be increased when the format changes.
+PARSE_CACHE_VERSION = 1
+PICKLE_PROTOCOL = 5
+ENTRY_SUFFIX = ".ast"
+DEFAULT_MAX_ENTRIES = 2**14
+
+
+class ParseCache:
+    """
+    An on-disk cache of parsed Cairo files (pickled CairoFile ASTs), so that files that did not
+    change since the previous compilation are not parsed again.
+    An entry is keyed by the hash of the file content, the file name (which appears in the
+    locations of the AST), the cairo-lang version and the grammar; a new version of the
+    compiler or the grammar does not use the entries of the previous one.
+    Since entries are pickles, cache_dir must only be writable by trusted users.
+    Before a ParseCache stores its first entry, it removes the oldest entries of cache_dir beyond
+    max_entries, so that the cache does not grow without bound.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.removed_old_entries = False
+        with open(GRAMMER_FILE, "rb") as grammar_file:
+            self.grammar_hash = hashlib.sha256(grammar_file.read()).hexdigest()
+        # Statistics.
+        self.hits = 0
+        self.misses = 0
+
+    def get_entry_path(self, code: str, filename: str) -> str:
+        digest = hashlib.sha256(
+            f"{PARSE_CACHE_VERSION}:{__version__}:{self.grammar_hash}:{filename}:".encode("utf-8")
+        )
+        digest.update(code.encode("utf-8"))
+        return os.path.join(self.cache_dir, f"{digest.hexdigest()}{ENTRY_SUFFIX}")
+
+    def contains(self, code: str, filename: str) -> bool:
+        return os.path.isfile(self.get_entry_path(code=code, filename=filename))
+
+    def load(self, code: str, filename: str) -> Optional[CairoFile]:
+        """
+        Returns the cached AST of the given file, or None if it is not cached.
+        """
+        entry_path = self.get_entry_path(code=code, filename=filename)
+        try:
+            with open(entry_path, "rb") as entry_file:
+                data = entry_file.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            with gc_disabled():
+                cairo_file = pickle.loads(data)
+        except Exception as exception:
+            logger.warning(f"Ignoring invalid parse cache entry {entry_path}: {exception}")
+            return None
+
+        if not isinstance(cairo_file, CairoFile):
+            logger.warning(f"Ignoring unexpected parse cache entry {entry_path}.")
+            return None
+        return cairo_file
+
+    def store(self, code: str, filename: str, cairo_file: CairoFile):
+        if not self.removed_old_entries:
+            self.removed_old_entries = True
+            remove_oldest_files(
+                directory=self.cache_dir, suffix=ENTRY_SUFFIX, max_files=self.max_entries
+            )
+        write_file_atomically(
+            path=self.get_entry_path(code=code, filename=filename),
+            write=lambda entry_file: pickle.dump(cairo_file, entry_file, protocol=PICKLE_PROTOCOL),
+        )
+
+    def parse_file(
+        self, code: str, filename: str, parse: Optional[Callable[[], CairoFile]] = None
+    ) -> CairoFile:
+        """
+        Same as parser.parse_file(), using the cache.
+        parse - if given, it is used to parse the file on a cache miss (e.g., to take a result
+          that was parsed in another process).
+        """
+        cairo_file = self.load(code=code, filename=filename)
+        if cairo_file is not None:
+            self.hits += 1
+            return cairo_file
+
+        self.misses += 1
+        cairo_file = parse_file(code, filename=filename) if parse is None else parse()
+        self.store(code=code, filename=filename, cairo_file=cairo_file)
+        return cairo_file
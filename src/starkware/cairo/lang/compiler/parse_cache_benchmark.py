@@ -0,0 +1,76 @@
+"""
+Compares the time of compiling a program without a parse cache (see parse_cache.py), with a cold
+cache and with a warm cache, e.g.:
+    parse_cache_benchmark --files program.cairo --cairo_path .
+"""
+
+import argparse
+import tempfile
+import time
+from typing import List, Optional, Tuple
+
+from starkware.cairo.lang.cairo_constants import DEFAULT_PRIME
+from starkware.cairo.lang.compiler.cairo_compile import compile_cairo, get_codes, get_module_reader
+from starkware.cairo.lang.compiler.parse_cache import ParseCache
+from starkware.cairo.lang.compiler.parser import parse_file
+from starkware.cairo.lang.compiler.preprocessor.default_pass_manager import default_pass_manager
+
+# The program that is compiled if no files are given.
+BENCHMARK_CODE = """
+%builtins output pedersen range_check
+from starkware.cairo.common.cairo_secp.signature import verify_eth_signature
+from starkware.cairo.common.dict import dict_new
+from starkware.cairo.common.math import assert_nn
+from starkware.cairo.common.uint256 import uint256_add
+
+func main{output_ptr: felt*, pedersen_ptr: felt*, range_check_ptr}() {
+    assert_nn(1);
+    return ();
+}
+"""
+
+
+def measure_compile(
+    codes: List[Tuple[str, str]], cairo_path: List[str], parse_cache: Optional[ParseCache]
+) -> Tuple[float, str]:
+    module_reader = get_module_reader(cairo_path=cairo_path)
+    pass_manager = default_pass_manager(
+        prime=DEFAULT_PRIME, read_module=module_reader.read, parse_cache=parse_cache
+    )
+    start_time = time.perf_counter()
+    program = compile_cairo(code=codes, pass_manager=pass_manager, debug_info=True)
+    return time.perf_counter() - start_time, program.dumps()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the parse cache.")
+    parser.add_argument("--files", type=str, nargs="*", help="The Cairo files to compile.")
+    parser.add_argument("--cairo_path", type=str, nargs="*", default=[])
+    args = parser.parse_args()
+
+    codes = get_codes(args.files) if args.files else [(BENCHMARK_CODE, "")]
+    # Load the grammar, so that it is not a part of the first measurement.
+    parse_file("", filename="")
+    no_cache_time, no_cache_program = measure_compile(
+        codes=codes, cairo_path=args.cairo_path, parse_cache=None
+    )
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold_cache = ParseCache(cache_dir=cache_dir)
+        cold_time, cold_program = measure_compile(
+            codes=codes, cairo_path=args.cairo_path, parse_cache=cold_cache
+        )
+        warm_cache = ParseCache(cache_dir=cache_dir)
+        warm_time, warm_program = measure_compile(
+            codes=codes, cairo_path=args.cairo_path, parse_cache=warm_cache
+        )
+
+    assert no_cache_program == cold_program == warm_program, "The programs are different."
+    print(
+        f"{cold_cache.misses} modules: no cache={no_cache_time:.3f}s, "
+        f"cold cache={cold_time:.3f}s, warm cache={warm_time:.3f}s "
+        f"({no_cache_time / warm_time:.1f}x)."
+    )
+
+
+if __name__ == "__main__":
+    main()
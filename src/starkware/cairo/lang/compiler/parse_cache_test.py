@@ -0,0 +1,122 @@
+import os
+import pickle
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Optional
+
+from starkware.cairo.lang.compiler.parse_cache import ParseCache
+from starkware.cairo.lang.compiler.parser import parse_file
+from starkware.cairo.lang.compiler.program import Program
+from starkware.cairo.lang.compiler.test_utils import compile_with_modules
+
+MAIN_CODE = """
+from a import f
+from b import g
+
+func main() {
+    f();
+    g();
+    return ();
+}
+"""
+
+
+def compile_with_cache(
+    modules: Dict[str, str], parse_cache: ParseCache, parse_executor: Optional[Executor] = None
+) -> Program:
+    return compile_with_modules(
+        main_code=MAIN_CODE,
+        modules=modules,
+        parse_cache=parse_cache,
+        parse_executor=parse_executor,
+    )
+
+
+def test_parse_cache(tmp_path):
+    modules = {
+        "a": "func f() {\n    return ();\n}\n",
+        "b": "func g() {\n    [ap] = 1, ap++;\n    return ();\n}\n",
+    }
+    cache_dir = os.path.join(tmp_path, "cache")
+
+    # The imported modules (including the modules that are imported implicitly) are parsed
+    # through the cache.
+    parse_cache = ParseCache(cache_dir=cache_dir)
+    program = compile_with_cache(modules=modules, parse_cache=parse_cache)
+    n_modules = parse_cache.misses
+    assert parse_cache.hits == 0 and n_modules > len(modules)
+    assert len(os.listdir(cache_dir)) == n_modules
+
+    parse_cache = ParseCache(cache_dir=cache_dir)
+    cached_program = compile_with_cache(modules=modules, parse_cache=parse_cache)
+    assert (parse_cache.hits, parse_cache.misses) == (n_modules, 0)
+    assert cached_program.dumps() == program.dumps()
+
+    # Only the modified module is parsed again.
+    modules["b"] = "func g() {\n    [ap] = 2, ap++;\n    return ();\n}\n"
+    parse_cache = ParseCache(cache_dir=cache_dir)
+    compile_with_cache(modules=modules, parse_cache=parse_cache)
+    assert (parse_cache.hits, parse_cache.misses) == (n_modules - 1, 1)
+
+
+def test_parse_cache_with_executor(tmp_path):
+    modules = {"a": "func f() {\n    return ();\n}\n", "b": "func g() {\n    return ();\n}\n"}
+    cache_dir = os.path.join(tmp_path, "cache")
+    parse_cache = ParseCache(cache_dir=cache_dir)
+    compile_with_cache(modules=modules, parse_cache=parse_cache)
+    n_modules = parse_cache.misses
+
+    # Only the modified module is parsed in the executor (and added to the cache).
+    modules["b"] = "func g() {\n    [ap] = 2, ap++;\n    return ();\n}\n"
+    parse_cache = ParseCache(cache_dir=cache_dir)
+    with ProcessPoolExecutor(max_workers=2) as parse_executor:
+        program = compile_with_cache(
+            modules=modules, parse_cache=parse_cache, parse_executor=parse_executor
+        )
+    assert (parse_cache.hits, parse_cache.misses) == (n_modules - 1, 1)
+
+    expected_program = compile_with_cache(
+        modules=modules, parse_cache=ParseCache(cache_dir=os.path.join(tmp_path, "other_cache"))
+    )
+    assert program.dumps() == expected_program.dumps()
+
+
+def test_parse_cache_entries(tmp_path):
+    parse_cache = ParseCache(cache_dir=str(tmp_path))
+    code = "func f() {\n    return ();\n}\n"
+    assert parse_cache.load(code=code, filename="a.cairo") is None
+
+    cairo_file = parse_cache.parse_file(code=code, filename="a.cairo")
+    assert cairo_file == parse_file(code, filename="a.cairo")
+    assert parse_cache.load(code=code, filename="a.cairo") == cairo_file
+    # The locations of the AST refer to the file name, so it is a part of the key.
+    assert parse_cache.load(code=code, filename="b.cairo") is None
+
+    # Invalid entries are ignored, and replaced on the next parse.
+    entry_path = parse_cache.get_entry_path(code=code, filename="a.cairo")
+    with open(entry_path, "wb") as entry_file:
+        entry_file.write(b"invalid")
+    assert parse_cache.load(code=code, filename="a.cairo") is None
+    assert parse_cache.parse_file(code=code, filename="a.cairo") == cairo_file
+    assert parse_cache.load(code=code, filename="a.cairo") == cairo_file
+
+    # Entries of an unexpected type are ignored.
+    with open(entry_path, "wb") as entry_file:
+        pickle.dump("unexpected", entry_file)
+    assert parse_cache.load(code=code, filename="a.cairo") is None
+
+
+def test_parse_cache_max_entries(tmp_path):
+    codes = [f"func f{i}() {{\n    return ();\n}}\n" for i in range(3)]
+    parse_cache = ParseCache(cache_dir=str(tmp_path), max_entries=1)
+    for code in codes:
+        parse_cache.parse_file(code=code, filename="a.cairo")
+        # Make sure the entries have different modification times.
+        time.sleep(0.01)
+    assert len(os.listdir(tmp_path)) == 3
+
+    # The oldest entries are removed before the next cache stores its first entry.
+    parse_cache = ParseCache(cache_dir=str(tmp_path), max_entries=1)
+    parse_cache.parse_file(code="func g() {\n    return ();\n}\n", filename="a.cairo")
+    assert len(os.listdir(tmp_path)) == 2
+    assert parse_cache.load(code=codes[-1], filename="a.cairo") is not None
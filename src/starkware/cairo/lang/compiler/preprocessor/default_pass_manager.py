@@ -1,7 +1,10 @@
+import dataclasses
+from concurrent.futures import Executor
 from typing import Callable, Dict, Optional, Sequence, Set, Tuple, Type
 
-from starkware.cairo.lang.compiler.ast.module import CairoModule
+from starkware.cairo.lang.compiler.ast.module import CairoFile, CairoModule
 from starkware.cairo.lang.compiler.import_loader import collect_imports
+from starkware.cairo.lang.compiler.parse_cache import ParseCache
 from starkware.cairo.lang.compiler.preprocessor.auxiliary_info_collector import (
     AuxiliaryInfoCollector,
 )
@@ -12,6 +15,7 @@ from starkware.cairo.lang.compiler.preprocessor.identifier_collector import Iden
 from starkware.cairo.lang.compiler.preprocessor.if_labels import IfLabelAssigner
 from starkware.cairo.lang.compiler.preprocessor.pass_manager import (
     PassManager,
+    PassManagerCache,
     PassManagerContext,
     Stage,
     VisitorStage,
@@ -29,8 +33,25 @@ def default_pass_manager(
     auxiliary_info_cls: Optional[Type[AuxiliaryInfoCollector]] = None,
     preprocessor_kwargs: Optional[Dict] = None,
     additional_scopes_to_compile: Optional[Set[ScopedName]] = None,
+    parse_cache: Optional[ParseCache] = None,
+    parse_executor: Optional[Executor] = None,
+    cache: Optional[PassManagerCache] = None,
 ) -> PassManager:
-    manager = PassManager()
+    manager = PassManager(cache=cache)
+    manager.config.update(
+        prime=prime,
+        preprocessor_cls=None if preprocessor_cls is None else preprocessor_cls.__qualname__,
+        opt_unused_functions=opt_unused_functions,
+        auxiliary_info_cls=None if auxiliary_info_cls is None else auxiliary_info_cls.__qualname__,
+        # The values of the arguments are not a part of the configuration; callers that pass
+        # arguments should add the configuration they depend on.
+        preprocessor_kwargs=[] if preprocessor_kwargs is None else sorted(preprocessor_kwargs),
+        additional_scopes_to_compile=(
+            None
+            if additional_scopes_to_compile is None
+            else sorted(map(str, additional_scopes_to_compile))
+        ),
+    )
     manager.add_stage(
         "module_collector",
         ModuleCollector(
@@ -38,6 +59,8 @@ def default_pass_manager(
             additional_modules=[
                 "starkware.cairo.lang.compiler.lib.registers",
             ],
+            parse_cache=parse_cache,
+            parse_executor=parse_executor,
         ),
     )
     manager.add_stage("bool_expr_lowering", BoolExprLoweringStage())
@@ -108,14 +131,49 @@ class PreprocessorStage(Stage):
         context.preprocessed_program = preprocessor.get_program()
 
 
+@dataclasses.dataclass
+class ModuleSources:
+    """
+    The sources of the modules that were collected by ModuleCollector: a map from the name of the
+    module (or the file name, for the compiled files) to the pair (code, file name).
+    """
+
+    files: Dict[str, Tuple[str, str]] = dataclasses.field(default_factory=dict)
+
+
 class ModuleCollector(Stage):
     def __init__(
         self,
         read_module: Callable[[str], Tuple[str, str]],
         additional_modules: Optional[Sequence[str]] = None,
+        parse_cache: Optional[ParseCache] = None,
+        parse_executor: Optional[Executor] = None,
     ):
+        """
+        parse_cache - if given, modules that are in the cache are not parsed again (see
+          ParseCache).
+        parse_executor - if given (e.g., a ProcessPoolExecutor), modules are parsed in it, in
+          parallel (see collect_imports()).
+        """
         self.read_module = read_module
         self.additional_modules = [] if additional_modules is None else list(additional_modules)
+        self.parse_cache = parse_cache
+        self.parse_executor = parse_executor
+
+    @staticmethod
+    def add_module_sources(
+        context: PassManagerContext,
+        files: Dict[str, CairoFile],
+        read_files: Dict[str, Tuple[str, str]],
+    ):
+        """
+        Records the sources of the collected modules ('files') in the ModuleSources of the
+        context. Files that were read but not collected (e.g., by the prefetching of
+        collect_imports()) are not recorded.
+        """
+        module_sources = context.get_resource(ModuleSources)
+        for module_name in files.keys():
+            module_sources.files[module_name] = read_files[module_name]
 
     def collect_module(
         self, code: str, filename: str, context: PassManagerContext, visited_modules: Set[str]
@@ -125,12 +183,21 @@ class ModuleCollector(Stage):
         Updates 'context' and 'visited_modules'.
         """
 
+        read_files: Dict[str, Tuple[str, str]] = {}
+
         # Function used to read files given module names.
         # The root module (filename) is handled separately, for this module code is returned.
         def read_file_fixed(name):
-            return (code, filename) if name == filename else self.read_module(name)
-
-        files = collect_imports(filename, read_file=read_file_fixed)
+            read_files[name] = (code, filename) if name == filename else self.read_module(name)
+            return read_files[name]
+
+        files = collect_imports(
+            filename,
+            read_file=read_file_fixed,
+            parse_cache=self.parse_cache,
+            parse_executor=self.parse_executor,
+        )
+        self.add_module_sources(context=context, files=files, read_files=read_files)
         for module_name, ast in files.items():
             # Check if the module is one of the files given in 'context.codes'.
             is_main_scope = module_name == filename
@@ -150,8 +217,20 @@ class ModuleCollector(Stage):
                 code=code, filename=filename, context=context, visited_modules=visited_modules
             )
 
+        read_files: Dict[str, Tuple[str, str]] = {}
+
+        def read_module(name: str) -> Tuple[str, str]:
+            read_files[name] = self.read_module(name)
+            return read_files[name]
+
         for additional_module in self.additional_modules:
-            files = collect_imports(additional_module, read_file=self.read_module)
+            files = collect_imports(
+                additional_module,
+                read_file=read_module,
+                parse_cache=self.parse_cache,
+                parse_executor=self.parse_executor,
+            )
+            self.add_module_sources(context=context, files=files, read_files=read_files)
             for module_name, ast in files.items():
                 if module_name in visited_modules:
                     continue
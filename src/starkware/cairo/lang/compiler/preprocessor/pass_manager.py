@@ -54,18 +54,39 @@ class Stage(ABC):
         """
 
 
+class PassManagerCache(ABC):
+    """
+    Memoizes the output of the stages of a pass manager (see PassManager.cache).
+    """
+
+    @abstractmethod
+    def run(self, pass_manager: "PassManager", context: PassManagerContext):
+        """
+        Same as running the stages of pass_manager on the given context, using the cache.
+        """
+
+
 class PassManager:
     """
     Manages the preprocessor's stages.
     """
 
-    def __init__(self):
+    def __init__(self, cache: Optional[PassManagerCache] = None):
         # The list of stages.
         self.stages: List[Tuple[str, Stage]] = []
         # A set of stage names.
         self.stage_names: Set[str] = set()
+        self.cache = cache
+        # A description of the configuration of the stages (e.g., the arguments they were created
+        # with), used as a part of the key of the cache. Stages whose output depends on
+        # additional arguments should add them.
+        self.config: Dict[str, Any] = {}
 
     def run(self, context: PassManagerContext):
+        if self.cache is not None:
+            self.cache.run(pass_manager=self, context=context)
+            return
+
         for _, stage in self.stages:
             stage.run(context)
 
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+from typing import Optional
+
+from starkware.cairo.lang.compiler.preprocessor.default_pass_manager import ModuleSources
+from starkware.cairo.lang.compiler.preprocessor.pass_manager import (
+    PassManager,
+    PassManagerCache,
+    PassManagerContext,
+)
+from starkware.cairo.lang.compiler.preprocessor.preprocessor import PreprocessedProgram
+from starkware.cairo.lang.version import __version__
+from starkware.python.utils import gc_disabled, remove_oldest_files, write_file_atomically
+
+logger = logging.getLogger(__name__)
+
+# The version of the format of the cache entries; should be increased when the format changes.
+PREPROCESSED_PROGRAM_CACHE_VERSION = 1
+PICKLE_PROTOCOL = 5
+ENTRY_SUFFIX = ".preprocessed"
+DEFAULT_MAX_ENTRIES = 2**10
+# The stage that collects the modules; the stages that follow it are memoized.
+MODULE_COLLECTOR_STAGE = "module_collector"
+
+
+class PreprocessedProgramCache(PassManagerCache):
+    """
+    An on-disk cache of preprocessed programs, so that a program whose files did not change since
+    its previous compilation is not preprocessed again.
+    The stages up to the module collector always run; the stages that follow it are skipped if
+    the cache contains the output of a compilation of the same files (the compiled files and
+    all the modules they import), with the same stages and configuration (see
+    PassManager.config) and the same cairo-lang version. As the entry of a program is
+    the output of its preprocessing, the result is identical to that of a compilation without
+    the cache.
+    Since entries are pickles, cache_dir must only be writable by trusted users.
+    Before a PreprocessedProgramCache stores its first entry, it removes the oldest entries of
+    cache_dir beyond max_entries, so that the cache does not grow without bound.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.removed_old_entries = False
+        # Statistics.
+        self.hits = 0
+        self.misses = 0
+
+    def get_entry_path(self, pass_manager: PassManager, context: PassManagerContext) -> str:
+        """
+        Returns the path of the entry of the given context, after the module collector ran.
+        """
+        module_sources = context.get_resource(ModuleSources)
+        key = json.dumps(
+            [
+                PREPROCESSED_PROGRAM_CACHE_VERSION,
+                __version__,
+                [name for name, _ in pass_manager.stages],
+                sorted(pass_manager.config.items()),
+                str(context.main_scope),
+                context.start_codes,
+                context.codes,
+                sorted(module_sources.files.items()),
+            ],
+            default=str,
+        )
+        digest = hashlib.sha256(key.encode("utf-8"))
+        return os.path.join(self.cache_dir, f"{digest.hexdigest()}{ENTRY_SUFFIX}")
+
+    def load(self, entry_path: str) -> Optional[PreprocessedProgram]:
+        try:
+            with open(entry_path, "rb") as entry_file:
+                data = entry_file.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            with gc_disabled():
+                preprocessed_program = pickle.loads(data)
+        except Exception as exception:
+            logger.warning(
+                f"Ignoring invalid preprocessed program cache entry {entry_path}: {exception}"
+            )
+            return None
+
+        if not isinstance(preprocessed_program, PreprocessedProgram):
+            logger.warning(f"Ignoring unexpected preprocessed program cache entry {entry_path}.")
+            return None
+        return preprocessed_program
+
+    def store(self, entry_path: str, preprocessed_program: PreprocessedProgram):
+        if not self.removed_old_entries:
+            self.removed_old_entries = True
+            remove_oldest_files(
+                directory=self.cache_dir, suffix=ENTRY_SUFFIX, max_files=self.max_entries
+            )
+        write_file_atomically(
+            path=entry_path,
+            write=lambda entry_file: pickle.dump(
+                preprocessed_program, entry_file, protocol=PICKLE_PROTOCOL
+            ),
+        )
+
+    def run(self, pass_manager: PassManager, context: PassManagerContext):
+        n_collecting_stages = pass_manager.get_stage_index(MODULE_COLLECTOR_STAGE) + 1
+        for _, stage in pass_manager.stages[:n_collecting_stages]:
+            stage.run(context)
+
+        entry_path = self.get_entry_path(pass_manager=pass_manager, context=context)
+        preprocessed_program = self.load(entry_path=entry_path)
+        if preprocessed_program is not None:
+            self.hits += 1
+            context.preprocessed_program = preprocessed_program
+            return
+
+        self.misses += 1
+        for _, stage in pass_manager.stages[n_collecting_stages:]:
+            stage.run(context)
+        assert context.preprocessed_program is not None
+        self.store(entry_path=entry_path, preprocessed_program=context.preprocessed_program)
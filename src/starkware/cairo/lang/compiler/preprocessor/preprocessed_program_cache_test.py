@@ -0,0 +1,91 @@
+import os
+import pickle
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Optional
+
+from starkware.cairo.lang.compiler import import_loader
+from starkware.cairo.lang.compiler.preprocessor.preprocessed_program_cache import (
+    PreprocessedProgramCache,
+)
+from starkware.cairo.lang.compiler.program import Program
+from starkware.cairo.lang.compiler.test_utils import compile_with_modules
+
+MAIN_CODE = """
+from a import f
+
+func main() {
+    f();
+    return ();
+}
+"""
+
+
+def compile_with_cache(
+    modules: Dict[str, str],
+    cache: Optional[PreprocessedProgramCache],
+    opt_unused_functions: bool = True,
+    parse_executor: Optional[Executor] = None,
+) -> Program:
+    return compile_with_modules(
+        main_code=MAIN_CODE,
+        modules=modules,
+        opt_unused_functions=opt_unused_functions,
+        cache=cache,
+        parse_executor=parse_executor,
+    )
+
+
+def test_preprocessed_program_cache(tmp_path):
+    modules = {"a": "func f() {\n    return ();\n}\n"}
+    cache_dir = os.path.join(tmp_path, "cache")
+
+    cache = PreprocessedProgramCache(cache_dir=cache_dir)
+    program = compile_with_cache(modules=modules, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    cache = PreprocessedProgramCache(cache_dir=cache_dir)
+    cached_program = compile_with_cache(modules=modules, cache=cache)
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert cached_program.dumps() == program.dumps()
+
+    # A modified imported module or a different configuration is a cache miss.
+    modules["a"] = "func f() {\n    [ap] = 1, ap++;\n    return ();\n}\n"
+    cache = PreprocessedProgramCache(cache_dir=cache_dir)
+    modified_program = compile_with_cache(modules=modules, cache=cache)
+    compile_with_cache(modules=modules, cache=cache, opt_unused_functions=False)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert modified_program.dumps() != program.dumps()
+    assert modified_program.dumps() == compile_with_cache(modules=modules, cache=None).dumps()
+
+    # Invalid entries are ignored.
+    for entry in os.listdir(cache_dir):
+        with open(os.path.join(cache_dir, entry), "wb") as entry_file:
+            entry_file.write(b"invalid")
+    cache = PreprocessedProgramCache(cache_dir=cache_dir)
+    assert compile_with_cache(modules=modules, cache=cache).dumps() == modified_program.dumps()
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    # Entries of an unexpected type are ignored.
+    for entry in os.listdir(cache_dir):
+        with open(os.path.join(cache_dir, entry), "wb") as entry_file:
+            pickle.dump("unexpected", entry_file)
+    cache = PreprocessedProgramCache(cache_dir=cache_dir)
+    assert compile_with_cache(modules=modules, cache=cache).dumps() == modified_program.dumps()
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_preprocessed_program_cache_module_sources(tmp_path, monkeypatch):
+    # Make the import-only scan of the prefetching of the imports read a module that is not
+    # imported.
+    scan_imports = import_loader.scan_imports
+    monkeypatch.setattr(import_loader, "scan_imports", lambda code: scan_imports(code) + ["b"])
+
+    cache_dir = os.path.join(tmp_path, "cache")
+    modules = {"a": "func f() {\n    return ();\n}\n", "b": "func g() {\n    return ();\n}\n"}
+    with ProcessPoolExecutor(max_workers=2) as parse_executor:
+        for code_b in ["func g() {\n    return ();\n}\n", "func g() {\n    ret;\n}\n"]:
+            modules["b"] = code_b
+            cache = PreprocessedProgramCache(cache_dir=cache_dir)
+            compile_with_cache(modules=modules, cache=cache, parse_executor=parse_executor)
+    # The module is not a part of the key of the entry.
+    assert (cache.hits, cache.misses) == (1, 0)
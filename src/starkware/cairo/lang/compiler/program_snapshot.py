@@ -0,0 +1,181 @@
+"""
+A binary snapshot format of compiled programs, which loads much faster than the JSON format (see
+Program.loads()).
+
+The snapshot holds the pickled fields of the program; identifiers, reference_manager and debug_info,
+which make up most of the program, are pickled separately and unpickled only on first access (see
+LazyProgram).
+Since snapshots are pickles, they must only be loaded from a trusted source, such as a cache
+directory written by load_program().
+"""
+
+import dataclasses
+import hashlib
+import logging
+import os
+import pickle
+import struct
+import threading
+from typing import Any, Dict, Optional
+
+from starkware.cairo.lang.compiler.program import Program
+from starkware.cairo.lang.version import __version__
+from starkware.python.utils import gc_disabled, remove_oldest_files, write_file_atomically
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"CAIRO_PROGRAM_SNAPSHOT"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct(f">{len(SNAPSHOT_MAGIC)}sH")
+PICKLE_PROTOCOL = 5
+# The fields of Program that are unpickled on first access.
+LAZY_FIELDS = ("identifiers", "reference_manager", "debug_info")
+# The name of the environment variable of the default snapshot cache directory.
+SNAPSHOT_CACHE_DIR_ENV_VAR = "CAIRO_PROGRAM_SNAPSHOT_CACHE_DIR"
+SNAPSHOT_SUFFIX = ".snapshot"
+# The maximal number of snapshots in a cache directory; the oldest ones are removed first.
+MAX_SNAPSHOTS = 256
+
+# Guards the unpickling of lazy fields, so that each field is unpickled once.
+lazy_field_lock = threading.Lock()
+
+
+class ProgramSnapshotError(Exception):
+    pass
+
+
+class LazyField:
+    """
+    A field of a LazyProgram, which is unpickled from the snapshot on first access.
+    """
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+
+    def __get__(self, program: Optional["LazyProgram"], owner: Optional[type] = None) -> Any:
+        if program is None:
+            return self
+
+        values = program.__dict__
+        if self.name not in values:
+            with lazy_field_lock:
+                if self.name not in values:
+                    with gc_disabled():
+                        values[self.name] = pickle.loads(program.pickled_fields.pop(self.name))
+        return values[self.name]
+
+    def __set__(self, program: "LazyProgram", value: Any):
+        program.__dict__[self.name] = value
+
+
+class ProgramSchema:
+    """
+    Returns the schema of Program.
+    Program.Schema is created on first access, on the class it is accessed through, and only
+    once; accessing it through LazyProgram first would break it for Program.
+    """
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        return Program.Schema
+
+
+class LazyProgram(Program):
+    """
+    A program loaded from a snapshot (see load_program_snapshot()).
+    """
+
+    Schema = ProgramSchema()  # type: ignore[assignment]
+    identifiers = LazyField()  # type: ignore[assignment]
+    reference_manager = LazyField()  # type: ignore[assignment]
+    debug_info = LazyField()  # type: ignore[assignment]
+
+    # The pickled values of the lazy fields that were not accessed yet.
+    pickled_fields: Dict[str, bytes]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Program):
+            return NotImplemented
+        return all(
+            getattr(self, field.name) == getattr(other, field.name)
+            for field in dataclasses.fields(Program)
+            if field.compare
+        )
+
+
+def dump_program_snapshot(program: Program) -> bytes:
+    eager_fields = {
+        field.name: getattr(program, field.name)
+        for field in dataclasses.fields(Program)
+        if field.name not in LAZY_FIELDS
+    }
+    pickled_fields = {
+        name: pickle.dumps(getattr(program, name), protocol=PICKLE_PROTOCOL) for name in LAZY_FIELDS
+    }
+    return SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION) + pickle.dumps(
+        (eager_fields, pickled_fields), protocol=PICKLE_PROTOCOL
+    )
+
+
+def load_program_snapshot(data: bytes) -> LazyProgram:
+    if len(data) < SNAPSHOT_HEADER.size or data[: len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+        raise ProgramSnapshotError("Invalid program snapshot.")
+    _, version = SNAPSHOT_HEADER.unpack_from(data)
+    if version != SNAPSHOT_VERSION:
+        raise ProgramSnapshotError(f"Unsupported program snapshot version: {version}.")
+
+    with gc_disabled():
+        eager_fields, pickled_fields = pickle.loads(memoryview(data)[SNAPSHOT_HEADER.size :])
+    program = LazyProgram.__new__(LazyProgram)
+    program.__dict__.update(eager_fields)
+    program.pickled_fields = pickled_fields
+    return program
+
+
+def get_snapshot_path(cache_dir: str, data: str) -> str:
+    """
+    Returns the path of the snapshot of the program with the given JSON serialization in the
+    given cache directory. The path depends on the version of the snapshot format and of
+    cairo-lang, as the snapshot is a pickle of the cairo-lang classes.
+    """
+    digest = hashlib.sha256(f"{SNAPSHOT_VERSION}:{__version__}:{data}".encode("utf-8"))
+    return os.path.join(cache_dir, f"{digest.hexdigest()}{SNAPSHOT_SUFFIX}")
+
+
+def get_snapshot_cache_dir() -> Optional[str]:
+    return os.environ.get(SNAPSHOT_CACHE_DIR_ENV_VAR)
+
+
+def load_program(data: str, cache_dir: Optional[str] = None) -> Program:
+    """
+    Loads a program from its JSON serialization.
+    If cache_dir is given, the program is loaded from its snapshot in cache_dir, which is written
+    on the first load; failures to read or write the snapshot are logged, and the program is
+    loaded from data.
+    """
+    if cache_dir is None:
+        return Program.loads(data=data)
+
+    snapshot_path = get_snapshot_path(cache_dir=cache_dir, data=data)
+    try:
+        with open(snapshot_path, "rb") as snapshot_file:
+            snapshot = snapshot_file.read()
+    except FileNotFoundError:
+        snapshot = None
+    except OSError as exception:
+        logger.warning(f"Failed to read program snapshot {snapshot_path}: {exception}")
+        snapshot = None
+
+    if snapshot is not None:
+        try:
+            return load_program_snapshot(data=snapshot)
+        except Exception as exception:
+            logger.warning(f"Ignoring invalid program snapshot {snapshot_path}: {exception}")
+
+    program = Program.loads(data=data)
+    # Failing to write the snapshot does not fail the load.
+    remove_oldest_files(directory=cache_dir, suffix=SNAPSHOT_SUFFIX, max_files=MAX_SNAPSHOTS - 1)
+    write_file_atomically(
+        path=snapshot_path,
+        write=lambda snapshot_file: snapshot_file.write(dump_program_snapshot(program=program)),
+    )
+    return program
@@ -0,0 +1,80 @@
+"""
+Compares the time of loading a compiled program from its JSON serialization to the time of
+loading it from its snapshot (see program_snapshot.py), e.g., for the Starknet OS program:
+    program_snapshot_benchmark --program starknet_os_compiled.json
+"""
+
+import argparse
+import time
+from typing import Callable, TypeVar
+
+from starkware.cairo.lang.cairo_constants import DEFAULT_PRIME
+from starkware.cairo.lang.compiler.cairo_compile import compile_cairo
+from starkware.cairo.lang.compiler.program import Program
+from starkware.cairo.lang.compiler.program_snapshot import (
+    LAZY_FIELDS,
+    dump_program_snapshot,
+    load_program_snapshot,
+)
+
+T = TypeVar("T")
+
+# The program that is used if no program is given.
+BENCHMARK_CODE = """
+%builtins output pedersen range_check
+from starkware.cairo.common.cairo_secp.signature import verify_eth_signature
+from starkware.cairo.common.dict import dict_new
+from starkware.cairo.common.math import assert_nn
+from starkware.cairo.common.uint256 import uint256_add
+
+func main{output_ptr: felt*, pedersen_ptr: felt*, range_check_ptr}() {
+    assert_nn(1);
+    return ();
+}
+"""
+
+
+def measure(func: Callable[[], T]) -> float:
+    start_time = time.perf_counter()
+    func()
+    return time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the loading of program snapshots.")
+    parser.add_argument("--program", type=str, help="The path of a compiled program (JSON).")
+    parser.add_argument("--cairo_path", type=str, default=".")
+    args = parser.parse_args()
+
+    if args.program is not None:
+        with open(args.program, "r") as program_file:
+            program_json = program_file.read()
+    else:
+        program = compile_cairo(
+            code=BENCHMARK_CODE,
+            prime=DEFAULT_PRIME,
+            cairo_path=[args.cairo_path],
+            debug_info=True,
+            add_start=True,
+        )
+        program_json = program.dumps()
+
+    json_time = measure(lambda: Program.loads(data=program_json))
+    snapshot = dump_program_snapshot(program=Program.loads(data=program_json))
+    lazy_program = load_program_snapshot(data=snapshot)
+    snapshot_time = measure(lambda: load_program_snapshot(data=snapshot))
+    field_times = {name: measure(lambda: getattr(lazy_program, name)) for name in LAZY_FIELDS}
+
+    print(f"JSON ({len(program_json)} bytes): {json_time * 1000:.1f}ms.")
+    print(
+        f"Snapshot ({len(snapshot)} bytes): {snapshot_time * 1000:.1f}ms "
+        f"({json_time / snapshot_time:.0f}x); first access of "
+        + ", ".join(
+            f"{name}: {field_time * 1000:.1f}ms" for name, field_time in field_times.items()
+        )
+        + "."
+    )
+
+
+if __name__ == "__main__":
+    main()
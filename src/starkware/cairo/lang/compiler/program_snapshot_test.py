@@ -0,0 +1,109 @@
+import dataclasses
+import os
+import pickle
+
+import pytest
+
+from starkware.cairo.lang.cairo_constants import DEFAULT_PRIME
+from starkware.cairo.lang.compiler import program_snapshot
+from starkware.cairo.lang.compiler.cairo_compile import compile_cairo
+from starkware.cairo.lang.compiler.program import Program
+from starkware.cairo.lang.compiler.program_snapshot import (
+    LAZY_FIELDS,
+    SNAPSHOT_HEADER,
+    SNAPSHOT_MAGIC,
+    LazyProgram,
+    ProgramSnapshotError,
+    dump_program_snapshot,
+    get_snapshot_path,
+    load_program,
+    load_program_snapshot,
+)
+
+CODE = """
+%builtins range_check
+
+func add(x, y) -> felt {
+    let z = x + y;
+    %{ memory[ap] = ids.z %}
+    return z;
+}
+
+func main{range_check_ptr}() {
+    let res = add(1, 2);
+    assert res = 3;
+    return ();
+}
+"""
+
+
+@pytest.fixture(scope="module")
+def program() -> Program:
+    return compile_cairo(code=CODE, prime=DEFAULT_PRIME, debug_info=True)
+
+
+def test_snapshot_round_trip(program: Program):
+    lazy_program = load_program_snapshot(data=dump_program_snapshot(program=program))
+    assert isinstance(lazy_program, LazyProgram)
+    assert lazy_program.data == program.data
+    assert lazy_program.hints == program.hints
+    assert all(name not in lazy_program.__dict__ for name in LAZY_FIELDS)
+
+    # The lazy fields are unpickled on first access.
+    assert lazy_program.get_label("add") == program.get_label("add")
+    assert "identifiers" in lazy_program.__dict__
+    assert "debug_info" not in lazy_program.__dict__
+    assert lazy_program == program and program == lazy_program
+    assert lazy_program.dumps() == program.dumps()
+
+    # A lazy program can be replaced and pickled like a program.
+    replaced_program = dataclasses.replace(lazy_program, builtins=[])
+    assert replaced_program.builtins == [] and replaced_program.data == program.data
+    assert pickle.loads(pickle.dumps(lazy_program)) == program
+
+
+def test_invalid_snapshot(program: Program):
+    with pytest.raises(ProgramSnapshotError, match="Invalid program snapshot."):
+        load_program_snapshot(data=program.dumps().encode("ascii"))
+
+    snapshot = dump_program_snapshot(program=program)
+    other_version_snapshot = (
+        SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, 0) + snapshot[SNAPSHOT_HEADER.size :]
+    )
+    with pytest.raises(ProgramSnapshotError, match="Unsupported program snapshot version: 0."):
+        load_program_snapshot(data=other_version_snapshot)
+
+
+def test_load_program_with_cache(program: Program, tmp_path):
+    cache_dir = os.path.join(tmp_path, "snapshots")
+    data = program.dumps()
+    program = load_program(data=data)
+    assert not isinstance(program, LazyProgram)
+
+    # The first load writes the snapshot.
+    loaded_program = load_program(data=data, cache_dir=cache_dir)
+    assert not isinstance(loaded_program, LazyProgram)
+    snapshot_path = get_snapshot_path(cache_dir=cache_dir, data=data)
+    assert os.listdir(cache_dir) == [os.path.basename(snapshot_path)]
+
+    loaded_program = load_program(data=data, cache_dir=cache_dir)
+    assert isinstance(loaded_program, LazyProgram)
+    assert loaded_program == program
+
+    # An invalid snapshot is replaced.
+    with open(snapshot_path, "wb") as snapshot_file:
+        snapshot_file.write(b"invalid")
+    assert load_program(data=data, cache_dir=cache_dir) == program
+    assert isinstance(load_program(data=data, cache_dir=cache_dir), LazyProgram)
+
+
+def test_load_program_snapshot_write_failure(program: Program, tmp_path, monkeypatch):
+    def failing_dump_program_snapshot(program: Program) -> bytes:
+        raise RecursionError("maximum recursion depth exceeded")
+
+    monkeypatch.setattr(program_snapshot, "dump_program_snapshot", failing_dump_program_snapshot)
+    cache_dir = os.path.join(tmp_path, "snapshots")
+    # The program is loaded, and no snapshot (or temporary file) is left behind.
+    data = program.dumps()
+    assert load_program(data=data, cache_dir=cache_dir).dumps() == data
+    assert os.listdir(cache_dir) == []
@@ -1,8 +1,12 @@
-from typing import Dict
+from typing import Any, Dict, Tuple
 
+from starkware.cairo.lang.cairo_constants import DEFAULT_PRIME
+from starkware.cairo.lang.compiler.cairo_compile import compile_cairo, get_module_reader
 from starkware.cairo.lang.compiler.identifier_definition import IdentifierDefinition
 from starkware.cairo.lang.compiler.parser_transformer import DEFAULT_SHORT_STRING_MAX_LENGTH
+from starkware.cairo.lang.compiler.preprocessor.default_pass_manager import default_pass_manager
 from starkware.cairo.lang.compiler.preprocessor.preprocessor import Preprocessor
+from starkware.cairo.lang.compiler.program import Program
 from starkware.cairo.lang.compiler.scoped_name import ScopedName
 from starkware.python.utils import to_ascii_string
 
@@ -15,6 +19,29 @@ def read_file_from_dict(dct):
     return lambda x: (dct[x], x)
 
 
+def compile_with_modules(
+    main_code: str, modules: Dict[str, str], **pass_manager_kwargs: Any
+) -> Program:
+    """
+    Compiles main_code, which may import the given modules (a mapping from a module name to its
+    code) and the modules of the standard library. pass_manager_kwargs are passed to
+    default_pass_manager() (e.g., the caches).
+    """
+    module_reader = get_module_reader(cairo_path=[])
+
+    def read_module(module_name: str) -> Tuple[str, str]:
+        if module_name not in modules:
+            return module_reader.read(module_name)
+        return modules[module_name], f"{module_name}.cairo"
+
+    pass_manager = default_pass_manager(
+        prime=DEFAULT_PRIME, read_module=read_module, **pass_manager_kwargs
+    )
+    return compile_cairo(
+        code=[(main_code, "main.cairo")], pass_manager=pass_manager, debug_info=True
+    )
+
+
 def short_string_to_felt(short_string: str) -> int:
     """
     Returns a felt representation of the given short string.
@@ -58,7 +58,9 @@ setuptools.setup(
         "starkware/cairo/lang/scripts/cairo-sharp",
         "starkware/starknet/scripts/starknet-class-hash",
         "starkware/starknet/scripts/starknet-compiled-class-hash",
+        "starkware/starknet/scripts/starknet-compile-client",
         "starkware/starknet/scripts/starknet-compile-deprecated",
+        "starkware/starknet/scripts/starknet-compile-server",
         "starkware/starknet/scripts/starknet",
     ],
 )
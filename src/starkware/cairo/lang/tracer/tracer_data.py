@@ -1,6 +1,9 @@
 import dataclasses
 import json
 import math
+import mmap
+import os
+import struct
 from typing import Dict, List, Optional
 
 from starkware.cairo.lang.compiler.ast.cairo_types import TypeStruct
@@ -244,18 +247,17 @@ def read_trace(trace_path: str) -> List[TraceEntry]:
     """
     Returns the trace (as a list of trace entries).
     """
-    entries = []
     serialization_size = TraceEntry.serialization_size()
     with open(trace_path, "rb") as trace_file:
-        while True:
-            entry_serialized = trace_file.read(serialization_size)
-            if not entry_serialized:
-                break
-            assert len(entry_serialized) == serialization_size, "Size of trace file is invalid."
-            entry = TraceEntry.deserialize(entry_serialized)
-            entries.append(entry)
-
-    return entries
+        if os.fstat(trace_file.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(trace_file.fileno(), 0, access=mmap.ACCESS_READ) as trace_data:
+            assert len(trace_data) % serialization_size == 0, "Size of trace file is invalid."
+            # See TraceEntry.serialize() for the order of the registers.
+            return [
+                TraceEntry(pc=pc, ap=ap, fp=fp)
+                for ap, fp, pc in struct.iter_unpack("<3Q", trace_data)
+            ]
 
 
 def field_element_repr(val: int, prime: int) -> str:
@@ -0,0 +1,154 @@
+import io
+import struct
+import tempfile
+from typing import IO, Dict, Iterator, Optional, Tuple
+
+from starkware.cairo.lang.vm.relocatable import MaybeRelocatable, RelocatableValue, relocate_value
+from starkware.cairo.lang.vm.trace_entry import TraceEntry
+
+# Each entry is encoded as the (segment_index, offset) pairs of pc, ap and fp, as signed 64-bit
+# integers. An integer register is encoded as its offset, so the registers (and the offsets of the
+# relocatable registers) must be in the range [-2**63, 2**63); registers are memory addresses, so
+# this holds for any run that fits in memory.
+RECORD_FORMAT = "<6q"
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+# The segment index of an encoded value that is an integer (rather than a RelocatableValue).
+INT_SEGMENT_INDEX = 2**63 - 1
+
+
+def encode_value(value: MaybeRelocatable) -> Tuple[int, int]:
+    if isinstance(value, RelocatableValue):
+        return value.segment_index, value.offset
+    assert isinstance(value, int), f"Unexpected trace value: {value}."
+    return INT_SEGMENT_INDEX, value
+
+
+def decode_value(segment_index: int, offset: int) -> MaybeRelocatable:
+    if segment_index == INT_SEGMENT_INDEX:
+        return offset
+    return RelocatableValue(segment_index=segment_index, offset=offset)
+
+
+def decode_entry(record: Tuple[int, ...]) -> TraceEntry[MaybeRelocatable]:
+    pc_segment, pc_offset, ap_segment, ap_offset, fp_segment, fp_offset = record
+    return TraceEntry(
+        pc=decode_value(pc_segment, pc_offset),
+        ap=decode_value(ap_segment, ap_offset),
+        fp=decode_value(fp_segment, fp_offset),
+    )
+
+
+class BinaryTrace:
+    """
+    An append-only execution trace, which stores the entries as fixed-width binary records
+    instead of TraceEntry objects.
+    The records are written to a preallocated buffer of chunk_size entries. Whenever the buffer
+    is full, it is spilled to spill_file (a temporary file, by default), so that the memory
+    consumption does not grow with the number of steps.
+
+    Supports the parts of the list interface used for traces: append(), len(), iteration and
+    indexing.
+    """
+
+    def __init__(self, chunk_size: int = 2**16, spill_file: Optional[IO[bytes]] = None):
+        assert chunk_size > 0, f"Invalid chunk size: {chunk_size}."
+        self.chunk_size = chunk_size
+        self.buffer = bytearray(chunk_size * RECORD_SIZE)
+        self.n_buffered_entries = 0
+        self.spill_file = spill_file
+        self.n_spilled_entries = 0
+
+    def append(self, entry: TraceEntry[MaybeRelocatable]):
+        if self.n_buffered_entries == self.chunk_size:
+            self.spill()
+        try:
+            struct.pack_into(
+                RECORD_FORMAT,
+                self.buffer,
+                self.n_buffered_entries * RECORD_SIZE,
+                *encode_value(entry.pc),
+                *encode_value(entry.ap),
+                *encode_value(entry.fp),
+            )
+        except struct.error:
+            raise ValueError(
+                f"Trace entry {entry} cannot be encoded: the registers must be in the range "
+                "[-2**63, 2**63)."
+            ) from None
+        self.n_buffered_entries += 1
+
+    def spill(self):
+        """
+        Writes the buffered entries to the spill file and clears the buffer.
+        """
+        if self.spill_file is None:
+            self.spill_file = tempfile.TemporaryFile()
+        self.spill_file.seek(0, io.SEEK_END)
+        self.spill_file.write(memoryview(self.buffer)[: self.n_buffered_entries * RECORD_SIZE])
+        self.n_spilled_entries += self.n_buffered_entries
+        self.n_buffered_entries = 0
+
+    def __len__(self) -> int:
+        return self.n_spilled_entries + self.n_buffered_entries
+
+    def __getitem__(self, index: int) -> TraceEntry[MaybeRelocatable]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Trace index out of range.")
+
+        if index >= self.n_spilled_entries:
+            record = struct.unpack_from(
+                RECORD_FORMAT, self.buffer, (index - self.n_spilled_entries) * RECORD_SIZE
+            )
+            return decode_entry(record)
+
+        assert self.spill_file is not None
+        self.spill_file.seek(index * RECORD_SIZE)
+        return decode_entry(struct.unpack(RECORD_FORMAT, self.spill_file.read(RECORD_SIZE)))
+
+    def __iter__(self) -> Iterator[TraceEntry[MaybeRelocatable]]:
+        # Read the spilled entries in chunks, to keep the memory consumption bounded.
+        for chunk_index in range(0, self.n_spilled_entries, self.chunk_size):
+            assert self.spill_file is not None
+            self.spill_file.seek(chunk_index * RECORD_SIZE)
+            n_entries = min(self.chunk_size, self.n_spilled_entries - chunk_index)
+            chunk = self.spill_file.read(n_entries * RECORD_SIZE)
+            yield from map(decode_entry, struct.iter_unpack(RECORD_FORMAT, chunk))
+
+        buffered = bytes(self.buffer[: self.n_buffered_entries * RECORD_SIZE])
+        yield from map(decode_entry, struct.iter_unpack(RECORD_FORMAT, buffered))
+
+
+class RelocatedTrace:
+    """
+    A lazily relocated view of a trace: the entries are relocated (using the given segment
+    offsets) only when they are accessed, rather than building a second, relocated, copy of the
+    trace.
+    """
+
+    def __init__(self, trace: BinaryTrace, segment_offsets: Dict[int, int], prime: int):
+        self.trace = trace
+        self.segment_offsets = segment_offsets
+        self.prime = prime
+
+    def relocate_entry(self, entry: TraceEntry[MaybeRelocatable]) -> TraceEntry[int]:
+        return TraceEntry(
+            pc=self.relocate_value(entry.pc),
+            ap=self.relocate_value(entry.ap),
+            fp=self.relocate_value(entry.fp),
+        )
+
+    def relocate_value(self, value: MaybeRelocatable) -> int:
+        relocated = relocate_value(value, self.segment_offsets, self.prime)
+        assert isinstance(relocated, int)
+        return relocated
+
+    def __len__(self) -> int:
+        return len(self.trace)
+
+    def __getitem__(self, index: int) -> TraceEntry[int]:
+        return self.relocate_entry(self.trace[index])
+
+    def __iter__(self) -> Iterator[TraceEntry[int]]:
+        return map(self.relocate_entry, self.trace)
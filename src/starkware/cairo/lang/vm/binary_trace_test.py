@@ -0,0 +1,97 @@
+import io
+
+import pytest
+
+from starkware.cairo.lang.compiler.cairo_compile import compile_cairo
+from starkware.cairo.lang.vm.binary_trace import RECORD_SIZE, BinaryTrace, RelocatedTrace
+from starkware.cairo.lang.vm.cairo_runner import CairoRunner
+from starkware.cairo.lang.vm.relocatable import RelocatableValue
+from starkware.cairo.lang.vm.trace_entry import TraceEntry
+
+PRIME = 2**251 + 17 * 2**192 + 1
+CODE = """
+func fib(a, b, n) -> felt {
+    if (n == 0) {
+        return a;
+    }
+    return fib(b, a + b, n - 1);
+}
+
+func main() {
+    let res = fib(1, 1, 100);
+    ret;
+}
+"""
+
+
+def get_entry(i: int) -> TraceEntry:
+    return TraceEntry(
+        pc=RelocatableValue(segment_index=0, offset=i),
+        ap=RelocatableValue(segment_index=1, offset=2 * i),
+        fp=i,
+    )
+
+
+@pytest.mark.parametrize("n_entries", [0, 1, 3, 4, 10])
+def test_binary_trace(n_entries: int):
+    spill_file = io.BytesIO()
+    trace = BinaryTrace(chunk_size=3, spill_file=spill_file)
+    entries = [get_entry(i) for i in range(n_entries)]
+    for entry in entries:
+        trace.append(entry)
+
+    assert len(trace) == n_entries
+    assert list(trace) == entries
+    assert [trace[i] for i in range(n_entries)] == entries
+    assert [trace[-i] for i in range(1, n_entries + 1)] == entries[::-1]
+    with pytest.raises(IndexError, match="out of range"):
+        trace[n_entries]
+    # A chunk is spilled only when the buffer is full and another entry is appended.
+    assert trace.n_spilled_entries == 3 * max(0, (n_entries - 1) // 3)
+    assert len(spill_file.getvalue()) == trace.n_spilled_entries * RECORD_SIZE
+
+
+def test_binary_trace_value_range():
+    trace = BinaryTrace(chunk_size=3)
+    entry = TraceEntry(pc=2**63 - 2, ap=-(2**63), fp=RelocatableValue(-1, 2**63 - 1))
+    trace.append(entry)
+    assert trace[0] == entry
+
+    with pytest.raises(ValueError, match="cannot be encoded"):
+        trace.append(TraceEntry(pc=0, ap=2**63, fp=0))
+    with pytest.raises(ValueError, match="cannot be encoded"):
+        trace.append(TraceEntry(pc=RelocatableValue(0, 2**64), ap=0, fp=0))
+    # The failed entries are not added to the trace.
+    assert list(trace) == [entry]
+
+
+def test_relocated_trace():
+    trace = BinaryTrace(chunk_size=2)
+    for i in range(5):
+        trace.append(get_entry(i))
+    relocated = RelocatedTrace(trace=trace, segment_offsets={0: 1, 1: 100}, prime=PRIME)
+    expected = [TraceEntry(pc=1 + i, ap=100 + 2 * i, fp=i) for i in range(5)]
+    assert len(relocated) == 5
+    assert list(relocated) == expected
+    assert relocated[-1] == expected[-1]
+
+
+def run(use_binary_trace: bool) -> CairoRunner:
+    program = compile_cairo(CODE, PRIME)
+    runner = CairoRunner(program, layout="plain", use_binary_trace=use_binary_trace)
+    runner.initialize_segments()
+    end = runner.initialize_main_entrypoint()
+    runner.initialize_vm({})
+    runner.run_until_pc(end)
+    runner.end_run()
+    runner.relocate()
+    return runner
+
+
+def test_runner_with_binary_trace():
+    list_runner = run(use_binary_trace=False)
+    binary_runner = run(use_binary_trace=True)
+    assert isinstance(binary_runner.vm.trace, BinaryTrace)
+    assert list(binary_runner.vm.trace) == list_runner.vm.trace
+    assert list(binary_runner.relocated_trace) == list_runner.relocated_trace
+    assert binary_runner.get_perm_range_check_limits() == list_runner.get_perm_range_check_limits()
@@ -102,6 +102,14 @@ class BuiltinRunner(ABC):
         """
         return
 
+    def reset(self):
+        """
+        Clears the state of the builtin from a previous run (e.g., its segment and caches), so
+        that it can be used for another run (see CairoRunner.reset()).
+        Raises NotImplementedError if the builtin does not support it.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support reset().")
+
     def add_auto_deduction_rules(self, runner):
         """
         Adds auto-deduction rules for this builtin (if applicable).
@@ -242,6 +250,10 @@ class SimpleBuiltinRunner(BuiltinRunner):
     def initialize_segments(self, runner):
         self._base = runner.segments.add()
 
+    def reset(self):
+        self._base = None
+        self.stop_ptr = None
+
     @property
     def base(self) -> RelocatableValue:
         assert self._base is not None, "Uninitialized self.base."
@@ -316,11 +328,7 @@ class SimpleBuiltinRunner(BuiltinRunner):
         }
 
     def run_security_checks(self, runner):
-        offsets = {
-            addr.offset
-            for addr in runner.vm_memory.keys()
-            if isinstance(addr, RelocatableValue) and addr.segment_index == self.base.segment_index
-        }
+        offsets = runner.vm_memory.get_segment_offsets(segment_index=self.base.segment_index)
         n = (max(offsets) // self.cells_per_instance + 1) if len(offsets) > 0 else 0
 
         # Verify that n is not too large to make sure the expected_offsets set that is constructed
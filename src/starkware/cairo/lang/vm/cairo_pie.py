@@ -9,6 +9,8 @@ import functools
 import io
 import json
 import math
+import mmap
+import os
 import zipfile
 from abc import ABC
 from dataclasses import field
@@ -32,6 +34,7 @@ from starkware.cairo.lang.compiler.program import (
 from starkware.cairo.lang.vm.memory_dict import MemoryDict, RelocateValueFunc
 from starkware.cairo.lang.vm.memory_segments import is_valid_memory_addr, is_valid_memory_value
 from starkware.cairo.lang.vm.relocatable import MaybeRelocatable, RelocatableValue, relocate_value
+from starkware.cairo.lang.vm.serialized_memory import SerializedMemoryView
 from starkware.python.utils import add_counters, multiply_counter_by_scalar, sub_counters
 from starkware.starkware_utils.marshmallow_dataclass_fields import additional_metadata
 from starkware.starkware_utils.validated_dataclass import ValidatedMarshmallowDataclass
@@ -191,6 +194,7 @@ class ExecutionResourcesStone(ExecutionResources):
     """
 
     n_steps: int
+
     def run_validity_checks(self):
         super().run_validity_checks()
         assert (
@@ -470,6 +474,7 @@ class CairoPie:
         EXECUTION_RESOURCES_FILENAME,
     ] + OPTIONAL_FILES
     MAX_SIZE = 5 * 1024**3
+    EXTRACT_CHUNK_SIZE = 2**20
 
     @classmethod
     def from_file(cls, fileobj) -> "CairoPie":
@@ -491,9 +496,8 @@ class CairoPie:
                     json.loads(fp.read(cls.MAX_SIZE).decode("ascii"))
                 )
             with zf.open(cls.MEMORY_FILENAME, "r") as fp:
-                memory = MemoryDict.deserialize(
-                    data=fp.read(cls.MAX_SIZE),
-                    field_bytes=metadata.field_bytes,
+                memory = MemoryDict.deserialize_from_file(
+                    fp=fp, field_bytes=metadata.field_bytes, max_size=cls.MAX_SIZE
                 )
             with zf.open(cls.ADDITIONAL_DATA_FILENAME, "r") as fp:
                 additional_data = json.loads(fp.read(cls.MAX_SIZE).decode("ascii"))
@@ -508,6 +512,50 @@ class CairoPie:
 
         return cls(metadata, memory, additional_data, execution_resources, version)
 
+    @classmethod
+    def load_memory_view(cls, fileobj, extract_dir: Optional[str] = None) -> SerializedMemoryView:
+        """
+        Returns a read-only view of the memory of the CairoPie in the given file, which decodes
+        the memory cells on demand (rather than loading the entire CairoPie).
+        `fileobj` can be a path or a file object.
+        If extract_dir is given, the memory file is extracted into it and memory-mapped, so the
+        memory is read from the disk as it is accessed. Otherwise, it is read into memory.
+        """
+        with contextlib.ExitStack() as stack:
+            if isinstance(fileobj, str):
+                fileobj = stack.enter_context(open(fileobj, "rb"))
+
+            verify_zip_file_prefix(fileobj=fileobj)
+
+            zf = stack.enter_context(zipfile.ZipFile(fileobj))
+            cls.verify_zip_format(zf)
+
+            with zf.open(cls.METADATA_FILENAME, "r") as fp:
+                metadata = CairoPieMetadata.Schema().load(
+                    json.loads(fp.read(cls.MAX_SIZE).decode("ascii"))
+                )
+            with zf.open(cls.MEMORY_FILENAME, "r") as fp:
+                if extract_dir is None:
+                    data: Any = fp.read(cls.MAX_SIZE)
+                else:
+                    memory_path = os.path.join(extract_dir, cls.MEMORY_FILENAME)
+                    with open(memory_path, "wb") as extracted_fp:
+                        # Copy in chunks and stop once MAX_SIZE is exceeded, like the in-memory
+                        # branch, rather than relying only on the size declared in the zip header.
+                        total_size = 0
+                        while True:
+                            chunk = fp.read(cls.EXTRACT_CHUNK_SIZE)
+                            if len(chunk) == 0:
+                                break
+                            total_size += len(chunk)
+                            assert (
+                                total_size <= cls.MAX_SIZE
+                            ), f"The memory file is larger than {cls.MAX_SIZE} bytes."
+                            extracted_fp.write(chunk)
+                    data = map_file(path=memory_path)
+
+        return SerializedMemoryView(data=data, field_bytes=metadata.field_bytes)
+
     def merge_extra_segments(self) -> Tuple[List[SegmentInfo], Dict[int, RelocatableValue]]:
         """
         Merges extra_segments to one segment.
@@ -562,13 +610,10 @@ class CairoPie:
             with zf.open(self.METADATA_FILENAME, "w") as fp:
                 fp.write(json.dumps(CairoPieMetadata.Schema().dump(metadata)).encode("ascii"))
             with zf.open(self.MEMORY_FILENAME, "w", force_zip64=True) as fp:
-                fp.write(
-                    self.memory.serialize(
-                        field_bytes=self.metadata.field_bytes,
-                        relocate_value=self.get_relocate_value_func(
-                            segment_offsets=segment_offsets
-                        ),
-                    )
+                self.memory.serialize_into(
+                    fp=fp,
+                    field_bytes=self.metadata.field_bytes,
+                    relocate_value=self.get_relocate_value_func(segment_offsets=segment_offsets),
                 )
             with zf.open(self.ADDITIONAL_DATA_FILENAME, "w") as fp:
                 fp.write(json.dumps(self.additional_data).encode("ascii"))
@@ -694,6 +739,17 @@ class CairoPie:
         return "\n".join(res)
 
 
+def map_file(path: str):
+    """
+    Returns a read-only memory map of the given file.
+    """
+    if os.path.getsize(path) == 0:
+        # Empty files cannot be mapped.
+        return b""
+    with open(path, "rb") as fp:
+        return mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+
 def verify_zip_file_prefix(fileobj):
     """
     Verifies that the file starts with the zip file prefix.
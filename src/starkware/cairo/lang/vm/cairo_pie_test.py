@@ -1,6 +1,7 @@
 import copy
 import io
 import random
+import zipfile
 from dataclasses import field
 from typing import ClassVar, Dict, Mapping, Type, no_type_check
 
@@ -270,6 +271,42 @@ func main(output_ptr: felt*, pedersen_ptr: felt*) -> (output_ptr: felt*, pederse
     return runner.get_cairo_pie()
 
 
+@pytest.mark.parametrize("extract", [False, True])
+def test_cairo_pie_load_memory_view(cairo_pie: CairoPie, extract: bool, tmp_path):
+    fileobj = io.BytesIO()
+    cairo_pie.to_file(fileobj)
+    memory = CairoPie.from_file(fileobj).memory
+
+    memory_view = CairoPie.load_memory_view(fileobj, extract_dir=str(tmp_path) if extract else None)
+    assert len(memory_view) == len(memory)
+    for addr, value in memory.items():
+        assert memory_view[addr] == value
+    assert memory_view.to_memory_dict() == memory
+
+
+def test_cairo_pie_load_memory_view_max_size(
+    cairo_pie: CairoPie, monkeypatch: MonkeyPatch, tmp_path
+):
+    # Make the memory file larger than the metadata file.
+    n_segments = len(cairo_pie.metadata.all_segments())
+    cairo_pie.memory.unfreeze_for_testing()
+    for i in range(100):
+        cairo_pie.memory[RelocatableValue(segment_index=n_segments, offset=i)] = i
+    pie_path = str(tmp_path / "cairo_pie.zip")
+    cairo_pie.to_file(pie_path)
+    with zipfile.ZipFile(pie_path) as zf:
+        metadata_size = zf.getinfo(CairoPie.METADATA_FILENAME).file_size
+        memory_size = zf.getinfo(CairoPie.MEMORY_FILENAME).file_size
+    assert metadata_size < memory_size
+
+    # Skip the check of the sizes in the zip header, to test the limit on the extracted file.
+    monkeypatch.setattr(CairoPie, "verify_zip_format", classmethod(lambda cls, zf: None))
+    monkeypatch.setattr(CairoPie, "MAX_SIZE", metadata_size)
+    monkeypatch.setattr(CairoPie, "EXTRACT_CHUNK_SIZE", 16)
+    with pytest.raises(AssertionError, match="The memory file is larger than"):
+        CairoPie.load_memory_view(pie_path, extract_dir=str(tmp_path))
+
+
 def test_cairo_pie_validity(cairo_pie):
     cairo_pie.run_validity_checks()
 
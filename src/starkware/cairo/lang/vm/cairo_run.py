@@ -5,9 +5,10 @@ import os
 import subprocess
 import sys
 import tempfile
+import textwrap
 import time
 import traceback
-from typing import IO, Dict, List, Tuple
+from typing import IO, Dict, Iterable, List, Optional, Tuple, Union
 
 import starkware.python.python_dependencies as python_dependencies
 from starkware.cairo.lang.compiler.debug_info import DebugInfo
@@ -16,10 +17,14 @@ from starkware.cairo.lang.dynamic_layout_params import CairoLayoutParams
 from starkware.cairo.lang.instances import LAYOUTS, CairoLayout
 from starkware.cairo.lang.version import __version__
 from starkware.cairo.lang.vm.air_public_input import PublicInput, PublicMemoryEntry
+from starkware.cairo.lang.vm.binary_trace import RelocatedTrace
 from starkware.cairo.lang.vm.cairo_pie import CairoPie
 from starkware.cairo.lang.vm.cairo_runner import CairoRunner
 from starkware.cairo.lang.vm.crypto import get_crypto_lib_context_manager
+from starkware.cairo.lang.vm.hint_cache import hint_compilation_cache
 from starkware.cairo.lang.vm.memory_dict import MemoryDict
+from starkware.cairo.lang.vm.memory_dict_backend import MEMORY_BACKENDS
+from starkware.cairo.lang.vm.native_hints import NativeHintRegistry
 from starkware.cairo.lang.vm.security import verify_secure_runner
 from starkware.cairo.lang.vm.trace_entry import TraceEntry
 from starkware.cairo.lang.vm.utils import MemorySegmentAddresses, RunResources
@@ -183,6 +188,14 @@ def main():
     parser.add_argument(
         "--proof_mode", action="store_true", help="Prepare a provable execution trace."
     )
+    parser.add_argument(
+        "--stream_trace",
+        action="store_true",
+        help=(
+            "Keep the execution trace as fixed-width binary records, which are spilled to a "
+            "temporary file, instead of in memory. Reduces the memory consumption of long runs."
+        ),
+    )
     parser.add_argument(
         "--show_trace",
         action="store_true",
@@ -203,6 +216,36 @@ def main():
         default=None,
         help="Allow cairo_run to run without all the builtins.",
     )
+    parser.add_argument(
+        "--memory_backend",
+        choices=list(MEMORY_BACKENDS.keys()),
+        default="dict",
+        help="The data structure used to store the memory cells during the run.",
+    )
+    parser.add_argument(
+        "--native_hints",
+        action="store_true",
+        help=(
+            "Execute the hints of the Cairo common library that have a native implementation "
+            "(see starkware/cairo/common/native_hints.py) natively, rather than with exec()."
+        ),
+    )
+    parser.add_argument(
+        "--print_non_native_hints",
+        action="store_true",
+        help=(
+            "Print the hints of the program that have no native implementation, together with "
+            "the number of times each of them appears in the program."
+        ),
+    )
+    parser.add_argument(
+        "--hint_cache_dir",
+        type=str,
+        help=(
+            "A directory in which the compiled hints are cached, so that they are not compiled "
+            "again by later runs."
+        ),
+    )
     python_dependencies.add_argparse_argument(parser)
 
     args = parser.parse_args()
@@ -288,12 +331,15 @@ def cairo_run(args):
         # If --tracer or --profile_output is used, use a temporary file as debug_info_file.
         debug_info_file = tempfile.NamedTemporaryFile(mode="w")
 
+    if args.hint_cache_dir is not None:
+        hint_compilation_cache.cache_dir = args.hint_cache_dir
+
     ret_code = 0
     cairo_pie_input = None
     if args.program is not None:
         assert args.run_from_cairo_pie is None
         program: ProgramBase = load_program(args.program)
-        initial_memory = MemoryDict()
+        initial_memory = MemoryDict(backend=MEMORY_BACKENDS[args.memory_backend])
         steps_input = args.steps
     else:
         assert args.run_from_cairo_pie is not None
@@ -311,9 +357,20 @@ def cairo_run(args):
             msg = str(exc)[:10000]
             raise CairoRunError(f"Security check for the CairoPIE input failed: {msg}")
         program = cairo_pie_input.program
-        initial_memory = cairo_pie_input.memory
+        initial_memory = MemoryDict(
+            cairo_pie_input.memory.items(), backend=MEMORY_BACKENDS[args.memory_backend]
+        )
         steps_input = cairo_pie_input.execution_resources.n_steps
 
+    native_hints: Optional[NativeHintRegistry] = None
+    if args.native_hints:
+        # The common library is not a dependency of the VM, so it is only imported if needed.
+        from starkware.cairo.common.native_hints import common_library_native_hints
+
+        native_hints = common_library_native_hints
+    if args.print_non_native_hints:
+        print_non_native_hints(program=program, native_hints=native_hints)
+
     layout: CairoLayout
     if args.layout == "dynamic":
         cairo_layout_params_dict = json.load(args.cairo_layout_params_file)
@@ -327,8 +384,15 @@ def cairo_run(args):
         memory=initial_memory,
         proof_mode=args.proof_mode,
         allow_missing_builtins=args.allow_missing_builtins,
+        use_binary_trace=args.stream_trace,
+        native_hints=native_hints,
     )
 
+    if args.secure_run:
+        # Summarize the memory accesses during the run, so that verify_secure_runner() does not
+        # need to scan the entire memory.
+        runner.vm_memory.enable_access_summary()
+
     runner.initialize_segments()
     end = runner.initialize_main_entrypoint()
     runner.initialize_zero_segment()
@@ -533,7 +597,28 @@ def cairo_run(args):
     return ret_code
 
 
-def write_binary_trace(trace_file: IO[bytes], trace: List[TraceEntry[int]]):
+def print_non_native_hints(program: ProgramBase, native_hints: Optional[NativeHintRegistry]):
+    """
+    Prints the hints of the given program that have no native implementation in native_hints (and
+    are thus executed with exec()), most common first.
+    """
+    if native_hints is None:
+        native_hints = NativeHintRegistry()
+    non_native_hints = (
+        native_hints.get_non_native_hints(program=program) if isinstance(program, Program) else {}
+    )
+    n_hints = (
+        sum(len(hints) for hints in program.hints.values()) if isinstance(program, Program) else 0
+    )
+    n_non_native_hints = sum(non_native_hints.values())
+    print(f"Hints without a native implementation: {n_non_native_hints} out of {n_hints}.")
+    for code, count in non_native_hints.items():
+        print(f"{count} occurrences of:")
+        print(textwrap.indent(code, "    "))
+    print()
+
+
+def write_binary_trace(trace_file: IO[bytes], trace: Iterable[TraceEntry[int]]):
     for trace_entry in trace:
         trace_file.write(trace_entry.serialize())
     trace_file.flush()
@@ -553,7 +638,7 @@ def write_air_public_input(
     layout: str,
     public_memory_addresses: List[Tuple[int, int]],
     memory_segment_addresses: Dict[str, MemorySegmentAddresses],
-    trace: List[TraceEntry[int]],
+    trace: Union[List[TraceEntry[int]], RelocatedTrace],
     rc_min: int,
     rc_max: int,
 ):
@@ -2,6 +2,7 @@ from typing import (
     Any,
     Callable,
     Dict,
+    FrozenSet,
     List,
     Mapping,
     Optional,
@@ -37,6 +38,7 @@ from starkware.cairo.lang.compiler.preprocessor.default_pass_manager import defa
 from starkware.cairo.lang.compiler.preprocessor.preprocessor import Preprocessor
 from starkware.cairo.lang.compiler.program import Program, ProgramBase
 from starkware.cairo.lang.instances import LAYOUTS, CairoLayout
+from starkware.cairo.lang.vm.binary_trace import BinaryTrace, RelocatedTrace
 from starkware.cairo.lang.vm.builtin_runner import BuiltinRunner, InsufficientAllocatedCells
 from starkware.cairo.lang.vm.cairo_pie import (
     CairoPie,
@@ -44,12 +46,13 @@ from starkware.cairo.lang.vm.cairo_pie import (
     ExecutionResourcesStone,
     SegmentInfo,
 )
-from starkware.cairo.lang.vm.crypto import pedersen_hash, verify_ecdsa
+from starkware.cairo.lang.vm.crypto import pedersen_hash, pedersen_hash_many, verify_ecdsa
 from starkware.cairo.lang.vm.memory_dict import MemoryDict
 from starkware.cairo.lang.vm.memory_segments import MemorySegmentManager
+from starkware.cairo.lang.vm.native_hints import NativeHintRegistry
 from starkware.cairo.lang.vm.output_builtin_runner import OutputBuiltinRunner
 from starkware.cairo.lang.vm.relocatable import MaybeRelocatable, RelocatableValue, relocate_value
-from starkware.cairo.lang.vm.trace_entry import relocate_trace
+from starkware.cairo.lang.vm.trace_entry import TraceEntry, relocate_trace
 from starkware.cairo.lang.vm.utils import (
     MemorySegmentAddresses,
     MemorySegmentRelocatableAddresses,
@@ -95,19 +98,29 @@ class CairoRunner:
         additional_builtin_factories: Optional[
             Dict[str, Callable[[str, bool], BuiltinRunner]]
         ] = None,
+        use_binary_trace: bool = False,
+        native_hints: Optional[NativeHintRegistry] = None,
     ):
+        """
+        use_binary_trace - Keep the execution trace in a BinaryTrace (which is spilled to a
+          temporary file during the run) rather than in a list, and relocate it lazily.
+        native_hints - Native implementations of hints, used by the VM instead of executing the
+          code of these hints (see native_hints.py).
+        """
         if additional_builtin_factories is None:
             additional_builtin_factories = {}
 
         self.program = program
         self.layout: CairoLayout = layout if isinstance(layout, CairoLayout) else LAYOUTS[layout]
-        self.builtin_runners: Dict[str, BuiltinRunner] = {}
+        self.additional_builtin_factories = additional_builtin_factories
         self.original_steps = None
         self.proof_mode = False if proof_mode is None else proof_mode
         self.allow_missing_builtins = (
             False if allow_missing_builtins is None else allow_missing_builtins
         )
         self.enable_instruction_trace = enable_instruction_trace
+        self.use_binary_trace = use_binary_trace
+        self.native_hints = native_hints
 
         if self.proof_mode:
             assert (
@@ -121,6 +134,31 @@ class CairoRunner:
                 len(non_existing_builtins) == 0
             ), f'Builtins {non_existing_builtins} are not present in layout "{layout_name}"'
 
+        self.builtin_runners: Dict[str, BuiltinRunner] = self.create_builtin_runners()
+
+        self.memory = memory if memory is not None else MemoryDict()
+        self.segments = MemorySegmentManager(memory=self.memory, prime=self.program.prime)
+        self.segment_offsets: Optional[Dict[int, int]] = None
+        self.final_pc: Optional[RelocatableValue] = None
+
+        # Flags used to ensure a safe use.
+        self._run_ended: bool = False
+        self._segments_finalized: bool = False
+        # A set of memory addresses accessed by the VM, after relocation of temporary segments into
+        # real ones.
+        self.accessed_addresses: Optional[Set[RelocatableValue]] = None
+
+        # A copy of the memory that contains only the loaded program and the addresses of the
+        # program, taken by reset(), and the base of the program in the memory (if it was already
+        # loaded by reset()).
+        self._program_memory: Optional[MemoryDict] = None
+        self._program_addresses: Optional[FrozenSet[MaybeRelocatable]] = None
+        self.preloaded_program_base: Optional[RelocatableValue] = None
+
+    def create_builtin_runners(self) -> Dict[str, BuiltinRunner]:
+        """
+        Creates the builtin runners of the program, according to the layout.
+        """
         builtin_factories = dict(
             output=lambda name, included: OutputBuiltinRunner(included=included),
             pedersen=lambda name, included: HashBuiltinRunner(
@@ -129,6 +167,7 @@ class CairoRunner:
                 ratio=self.layout.builtins["pedersen"].ratio,
                 hash_func=pedersen_hash,
                 instance_def=self.layout.builtins["pedersen"],
+                hash_many_func=pedersen_hash_many,
             ),
             range_check=lambda name, included: RangeCheckBuiltinRunner(
                 name="range_check",
@@ -172,16 +211,17 @@ class CairoRunner:
             mul_mod=lambda name, included: MulModBuiltinRunner(
                 included=included, instance_def=self.layout.builtins["mul_mod"]
             ),
-            **additional_builtin_factories,
+            **self.additional_builtin_factories,
         )
 
+        builtin_runners: Dict[str, BuiltinRunner] = {}
         for name in self.layout.builtins:
             factory = builtin_factories.get(name)
             assert factory is not None, f"The {name} builtin is not supported."
             included = name in self.program.builtins
             # In proof mode all the builtin_runners are required.
             if included or self.proof_mode:
-                self.builtin_runners[f"{name}_builtin"] = factory(  # type: ignore
+                builtin_runners[f"{name}_builtin"] = factory(  # type: ignore
                     name=name, included=included
                 )
 
@@ -192,17 +232,45 @@ class CairoRunner:
         )
         assert is_subsequence(self.program.builtins, supported_builtin_list), err_msg
 
-        self.memory = memory if memory is not None else MemoryDict()
-        self.segments = MemorySegmentManager(memory=self.memory, prime=self.program.prime)
-        self.segment_offsets: Optional[Dict[int, int]] = None
-        self.final_pc: Optional[RelocatableValue] = None
+        return builtin_runners
 
-        # Flags used to ensure a safe use.
-        self._run_ended: bool = False
-        self._segments_finalized: bool = False
-        # A set of memory addresses accessed by the VM, after relocation of temporary segments into
-        # real ones.
-        self.accessed_addresses: Optional[Set[RelocatableValue]] = None
+    def reset(self):
+        """
+        Resets the state of the runner (memory, segments, builtin runners, etc.), so that it can be
+        used for another run of the same program. Must be called after initialize_segments().
+
+        The new memory is a copy of a memory that contains only the program (the copy is taken on
+        the first reset), so initialize_state() does not need to load the program again.
+        """
+        if self._program_memory is None:
+            program_memory = MemoryDict(backend=self.memory.backend)
+            if self.memory.access_summary is not None:
+                program_memory.enable_access_summary()
+            MemorySegmentManager(memory=program_memory, prime=self.program.prime).load_data(
+                ptr=self.program_base, data=self.program.data
+            )
+            self._program_memory = program_memory
+            self._program_addresses = frozenset(program_memory.keys())
+
+        self.memory = self._program_memory.copy()
+        self.segments = MemorySegmentManager(memory=self.memory, prime=self.program.prime)
+        try:
+            for builtin_runner in self.builtin_runners.values():
+                builtin_runner.reset()
+        except NotImplementedError:
+            # Some builtin (e.g., one added by additional_builtin_factories) cannot be reset.
+            self.builtin_runners = self.create_builtin_runners()
+        self.preloaded_program_base = self.program_base
+        self.original_steps = None
+        self.segment_offsets = None
+        self.final_pc = None
+        self._run_ended = False
+        self._segments_finalized = False
+        self.accessed_addresses = None
+        # Drop the references to the previous run.
+        for name in ["vm", "relocated_memory", "relocated_trace"]:
+            if hasattr(self, name):
+                delattr(self, name)
 
     @classmethod
     def from_file(
@@ -306,8 +374,9 @@ class CairoRunner:
 
     def initialize_state(self, entrypoint: Union[str, int], stack: Sequence[MaybeRelocatable]):
         self.initial_pc = self.program_base + self._to_pc(entrypoint)
-        # Load program.
-        self.load_data(self.program_base, self.program.data)
+        # Load program (unless it is already in memory, see reset()).
+        if self.program_base != self.preloaded_program_base:
+            self.load_data(self.program_base, self.program.data)
         # Load stack.
         self.load_data(self.execution_base, stack)
 
@@ -327,6 +396,12 @@ class CairoRunner:
         if static_locals is None:
             static_locals = {}
 
+        vm_kwargs: Dict[str, Any] = {}
+        if self.program_base == self.preloaded_program_base:
+            vm_kwargs.update(program_addresses=self._program_addresses)
+        if self.native_hints is not None:
+            vm_kwargs.update(native_hints=self.native_hints)
+
         self.vm = vm_class(
             self.program,
             context,
@@ -335,6 +410,8 @@ class CairoRunner:
             builtin_runners=self.builtin_runners,
             program_base=self.program_base,
             enable_instruction_trace=self.enable_instruction_trace,
+            trace_sink=BinaryTrace() if self.use_binary_trace else None,
+            **vm_kwargs,
         )
 
         for builtin_runner in self.builtin_runners.values():
@@ -405,9 +482,13 @@ class CairoRunner:
     ):
         assert not self._run_ended, "end_run called twice."
 
-        self.accessed_addresses = {
-            self.vm_memory.relocate_value(addr) for addr in self.vm.accessed_addresses
-        }
+        if len(self.vm_memory.relocation_rules) == 0:
+            # Nothing to relocate.
+            self.accessed_addresses = set(self.vm.accessed_addresses)
+        else:
+            self.accessed_addresses = {
+                self.vm_memory.relocate_value(addr) for addr in self.vm.accessed_addresses
+            }
         self.vm_memory.relocate_memory()
         self.vm.end_run()
 
@@ -693,9 +774,16 @@ class CairoRunner:
         }
         self.relocated_memory = MemoryDict(initializer)
         if self.enable_instruction_trace:
-            self.relocated_trace = relocate_trace(
-                self.vm.trace, self.segment_offsets, self.program.prime
-            )
+            trace = self.vm.trace
+            self.relocated_trace: Union[List[TraceEntry[int]], RelocatedTrace]
+            if isinstance(trace, BinaryTrace):
+                self.relocated_trace = RelocatedTrace(
+                    trace=trace, segment_offsets=self.segment_offsets, prime=self.program.prime
+                )
+            else:
+                self.relocated_trace = relocate_trace(
+                    trace, self.segment_offsets, self.program.prime
+                )
         for builtin_runner in self.builtin_runners.values():
             builtin_runner.relocate(self.relocate_value)
 
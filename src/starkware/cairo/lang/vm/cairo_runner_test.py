@@ -4,8 +4,10 @@ import re
 import pytest
 
 from starkware.cairo.lang.compiler.cairo_compile import compile_cairo
+from starkware.cairo.lang.vm import cairo_runner
 from starkware.cairo.lang.vm.builtin_runner import InsufficientAllocatedCells
 from starkware.cairo.lang.vm.cairo_runner import CairoRunner, get_runner_from_code
+from starkware.cairo.lang.vm.crypto import pedersen_hash, pedersen_hash_many
 from starkware.cairo.lang.vm.utils import RunResources
 from starkware.cairo.lang.vm.vm_exceptions import VmException, VmExceptionBase
 
@@ -217,3 +219,92 @@ func main() {{
         == runner_touched_hint.get_memory_holes() + 1
         == 5
     )
+
+
+def test_hash_builtin_batch_deduction(monkeypatch):
+    code = """\
+%builtins pedersen
+
+from starkware.cairo.common.cairo_builtins import HashBuiltin
+
+func main(pedersen_ptr: HashBuiltin*) -> (pedersen_ptr: HashBuiltin*) {
+    assert pedersen_ptr[0].x = 1;
+    assert pedersen_ptr[0].y = 2;
+    assert pedersen_ptr[1].x = 3;
+    assert pedersen_ptr[1].y = 4;
+    assert pedersen_ptr[2].x = 5;
+    assert pedersen_ptr[2].y = 6;
+    // Deduces the three instances together.
+    assert pedersen_ptr[0].result = pedersen_ptr[0].result;
+    assert pedersen_ptr[2].result = pedersen_ptr[2].result;
+    assert pedersen_ptr[1].result = pedersen_ptr[1].result;
+    return (pedersen_ptr=pedersen_ptr + 3 * HashBuiltin.SIZE);
+}
+"""
+    batch_sizes = []
+
+    def hash_many_func(pairs):
+        batch_sizes.append(len(pairs))
+        return pedersen_hash_many(pairs)
+
+    monkeypatch.setattr(cairo_runner, "pedersen_hash_many", hash_many_func)
+    runner = get_runner_from_code(code=code, layout="small", prime=PRIME)
+    assert batch_sizes == [3]
+    pedersen_builtin = runner.builtin_runners["pedersen_builtin"]
+    assert pedersen_builtin.pending_results == {}
+    results = [runner.vm_memory[pedersen_builtin.base + 3 * i + 2] for i in range(3)]
+    assert results == [pedersen_hash(1, 2), pedersen_hash(3, 4), pedersen_hash(5, 6)]
+
+
+@pytest.mark.parametrize("access_summary", [False, True])
+def test_reset(access_summary: bool, monkeypatch):
+    program = compile_cairo(
+        code="""
+%builtins output pedersen
+func main{output_ptr: felt*, pedersen_ptr: felt*}() {
+    assert [pedersen_ptr] = 1;
+    assert [pedersen_ptr + 1] = 2;
+    assert [output_ptr] = [pedersen_ptr + 2];
+    let output_ptr = output_ptr + 1;
+    let pedersen_ptr = pedersen_ptr + 3;
+    return ();
+}
+""",
+        prime=PRIME,
+    )
+    runner = CairoRunner(program=program, layout="small")
+    if access_summary:
+        runner.vm_memory.enable_access_summary()
+
+    loaded_pointers = []
+    load_data = runner.load_data
+
+    def load_data_spy(ptr, data):
+        loaded_pointers.append(ptr)
+        return load_data(ptr, data)
+
+    monkeypatch.setattr(runner, "load_data", load_data_spy)
+
+    def run_main() -> list:
+        cairo_runner.run_main_entrypoint(runner=runner, hint_locals={})
+        output_base = runner.builtin_runners["output_builtin"].base
+        return [runner.vm_memory[output_base], len(runner.vm_memory)]
+
+    expected_result = run_main()
+    assert expected_result[0] == pedersen_hash(1, 2)
+    assert runner.program_base in loaded_pointers
+    builtin_runners = dict(runner.builtin_runners)
+
+    for _ in range(2):
+        runner.reset()
+        # The builtin runners are reset in place, rather than recreated.
+        assert runner.builtin_runners == builtin_runners
+        assert runner.builtin_runners["pedersen_builtin"].verified_addresses == set()
+        assert not runner.vm_memory.is_frozen()
+        assert (runner.vm_memory.access_summary is not None) == access_summary
+        assert len(runner.vm_memory) == len(program.data)
+
+        # The program is already in memory, so it is not loaded again.
+        loaded_pointers.clear()
+        assert run_main() == expected_result
+        assert runner.program_base not in loaded_pointers
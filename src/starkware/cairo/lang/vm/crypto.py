@@ -4,11 +4,15 @@ from starkware.cairo.common.poseidon_hash import (  # noqa
     poseidon_hash,
     poseidon_hash_func,
     poseidon_hash_many,
+    poseidon_hash_many_batch,
     poseidon_hash_single,
     poseidon_perm,
+    poseidon_perm_many,
 )
 from starkware.crypto.signature.fast_pedersen_hash import pedersen_hash  # noqa
 from starkware.crypto.signature.fast_pedersen_hash import pedersen_hash_func  # noqa
+from starkware.crypto.signature.fast_pedersen_hash import pedersen_hash_func_many  # noqa
+from starkware.crypto.signature.fast_pedersen_hash import pedersen_hash_many  # noqa
 from starkware.crypto.signature.signature import verify as verify_ecdsa  # noqa
 
 
@@ -0,0 +1,127 @@
+"""
+A process-wide cache of compiled hints, so that constructing a VM for a program whose hints were
+already compiled (for example, when the same contract is executed many times) does not compile
+them again.
+
+The cache is keyed by the source code of the hint and the filename it is compiled with (which is
+part of the code object, see VirtualMachineBase.load_hints()). Optionally, the compiled code
+objects are also stored, using marshal, in a directory on the disk, which allows sharing them
+between processes.
+"""
+
+import dataclasses
+import hashlib
+import importlib.util
+import marshal
+import os
+import threading
+from collections import OrderedDict
+from types import CodeType
+from typing import Optional, Tuple
+
+from starkware.python.utils import remove_oldest_files, write_file_atomically
+
+DISK_ENTRY_SUFFIX = ".marshal"
+
+
+@dataclasses.dataclass
+class HintCacheMetrics:
+    # The number of hints that were found in the in-memory cache.
+    hits: int = 0
+    # The number of hints that were loaded from the on-disk cache.
+    disk_hits: int = 0
+    # The number of hints that were compiled.
+    misses: int = 0
+
+
+class HintCompilationCache:
+    def __init__(
+        self, max_size: int = 2**16, cache_dir: Optional[str] = None, max_disk_size: int = 2**16
+    ):
+        """
+        max_size - the maximal number of code objects kept in memory (the least recently used
+          ones are evicted first).
+        cache_dir - if not None, a directory in which the compiled hints are stored.
+        max_disk_size - the maximal number of code objects kept in cache_dir; the oldest ones are
+          removed before the first code object is stored.
+        """
+        self.max_size = max_size
+        self.cache_dir = cache_dir
+        self.max_disk_size = max_disk_size
+        self.removed_old_disk_entries = False
+        self.metrics = HintCacheMetrics()
+        self.code_objects: "OrderedDict[Tuple[str, str], CodeType]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def compile(self, source: str, filename: str) -> CodeType:
+        """
+        Returns compile(source, filename, mode="exec"), using the cache if possible.
+        """
+        key = (source, filename)
+        with self.lock:
+            code = self.code_objects.get(key)
+            if code is not None:
+                self.code_objects.move_to_end(key)
+                self.metrics.hits += 1
+                return code
+
+        code = self.load_from_disk(source=source, filename=filename)
+        if code is None:
+            code = compile(source, filename, mode="exec")
+            self.store_to_disk(source=source, filename=filename, code=code)
+            metric_name = "misses"
+        else:
+            metric_name = "disk_hits"
+
+        with self.lock:
+            setattr(self.metrics, metric_name, getattr(self.metrics, metric_name) + 1)
+            self.code_objects[key] = code
+            if len(self.code_objects) > self.max_size:
+                self.code_objects.popitem(last=False)
+        return code
+
+    def get_disk_path(self, source: str, filename: str) -> str:
+        assert self.cache_dir is not None
+        digest = hashlib.sha256()
+        # Marshal is not compatible between Python versions; include the bytecode version in the
+        # key.
+        digest.update(importlib.util.MAGIC_NUMBER)
+        digest.update(filename.encode("utf-8") + b"\0")
+        digest.update(source.encode("utf-8"))
+        return os.path.join(self.cache_dir, f"{digest.hexdigest()}{DISK_ENTRY_SUFFIX}")
+
+    def load_from_disk(self, source: str, filename: str) -> Optional[CodeType]:
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self.get_disk_path(source=source, filename=filename), "rb") as fp:
+                code = marshal.load(fp)
+        except (OSError, EOFError, ValueError, TypeError):
+            # A missing or corrupted file is treated as a cache miss.
+            return None
+        return code if isinstance(code, CodeType) else None
+
+    def store_to_disk(self, source: str, filename: str, code: CodeType):
+        if self.cache_dir is None:
+            return
+        if not self.removed_old_disk_entries:
+            self.removed_old_disk_entries = True
+            remove_oldest_files(
+                directory=self.cache_dir, suffix=DISK_ENTRY_SUFFIX, max_files=self.max_disk_size
+            )
+        write_file_atomically(
+            path=self.get_disk_path(source=source, filename=filename),
+            write=lambda fp: marshal.dump(code, fp),
+        )
+
+    def clear(self):
+        """
+        Clears the in-memory cache and resets the metrics (the on-disk cache is not affected).
+        """
+        with self.lock:
+            self.code_objects.clear()
+            self.metrics = HintCacheMetrics()
+
+
+# The cache used by VirtualMachineBase.compile_hint().
+hint_compilation_cache = HintCompilationCache()
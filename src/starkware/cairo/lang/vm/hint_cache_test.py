@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from starkware.cairo.lang.compiler.cairo_compile import compile_cairo
+from starkware.cairo.lang.vm.cairo_runner import CairoRunner
+from starkware.cairo.lang.vm.hint_cache import HintCacheMetrics, HintCompilationCache
+from starkware.cairo.lang.vm.vm_exceptions import VmException
+
+PRIME = 2**251 + 17 * 2**192 + 1
+
+
+def test_compile():
+    cache = HintCompilationCache()
+    code = cache.compile(source="x = 1", filename="<hint0>")
+    assert code.co_filename == "<hint0>"
+    assert cache.compile(source="x = 1", filename="<hint0>") is code
+    # The filename is part of the key.
+    assert cache.compile(source="x = 1", filename="<hint1>") is not code
+    assert cache.metrics == HintCacheMetrics(hits=1, disk_hits=0, misses=2)
+
+    cache.clear()
+    assert cache.compile(source="x = 1", filename="<hint0>") is not code
+    assert cache.metrics == HintCacheMetrics(hits=0, disk_hits=0, misses=1)
+
+
+def test_max_size():
+    cache = HintCompilationCache(max_size=2)
+    for source in ["x = 0", "x = 1", "x = 0", "x = 2", "x = 0", "x = 1"]:
+        cache.compile(source=source, filename="<hint0>")
+    # "x = 1" is evicted when "x = 2" is added, as "x = 0" was used more recently.
+    assert cache.metrics == HintCacheMetrics(hits=2, disk_hits=0, misses=4)
+
+
+def test_disk_cache(tmpdir):
+    cache_dir = str(tmpdir)
+    cache = HintCompilationCache(cache_dir=cache_dir)
+    code = cache.compile(source="x = 1", filename="<hint0>")
+    (path,) = os.listdir(cache_dir)
+
+    other_cache = HintCompilationCache(cache_dir=cache_dir)
+    loaded_code = other_cache.compile(source="x = 1", filename="<hint0>")
+    assert loaded_code == code
+    assert other_cache.metrics == HintCacheMetrics(hits=0, disk_hits=1, misses=0)
+
+    # A corrupted file is ignored.
+    with open(os.path.join(cache_dir, path), "wb") as fp:
+        fp.write(b"corrupted")
+    other_cache.clear()
+    assert other_cache.compile(source="x = 1", filename="<hint0>") == code
+    assert other_cache.metrics == HintCacheMetrics(hits=0, disk_hits=0, misses=1)
+
+
+def test_syntax_error_is_not_cached():
+    cache = HintCompilationCache()
+    for _ in range(2):
+        with pytest.raises(SyntaxError):
+            cache.compile(source="x = ", filename="<hint0>")
+    assert cache.metrics == HintCacheMetrics()
+
+
+def test_runner_uses_cache(monkeypatch):
+    cache = HintCompilationCache()
+    monkeypatch.setattr(
+        "starkware.cairo.lang.vm.virtual_machine_base.hint_compilation_cache", cache
+    )
+    program = compile_cairo(
+        code="""
+func main() {
+    %{ x = 1 %}
+    %{ assert x == 1 %}
+    ret;
+}
+""",
+        prime=PRIME,
+    )
+    for _ in range(3):
+        runner = CairoRunner(program, layout="plain")
+        runner.initialize_segments()
+        end = runner.initialize_main_entrypoint()
+        runner.initialize_vm({})
+        runner.run_until_pc(end)
+    assert cache.metrics == HintCacheMetrics(hits=4, disk_hits=0, misses=2)
+
+
+def test_hint_syntax_error_location():
+    program = compile_cairo(
+        code="""
+func main() {
+    %{ x = %}
+    ret;
+}
+""",
+        prime=PRIME,
+        debug_info=True,
+    )
+    runner = CairoRunner(program, layout="plain")
+    runner.initialize_segments()
+    runner.initialize_main_entrypoint()
+    with pytest.raises(VmException, match="Got an exception while compiling a hint"):
+        runner.initialize_vm({})
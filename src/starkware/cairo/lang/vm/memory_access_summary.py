@@ -0,0 +1,74 @@
+from typing import Dict, Iterable, Tuple
+
+from starkware.cairo.lang.vm.relocatable import MaybeRelocatable, RelocatableValue
+
+
+class MemoryAccessSummary:
+    """
+    A summary of the cells written to a MemoryDict: the minimal and maximal offsets accessed in
+    each segment, both as addresses and as (relocatable) values.
+    The summary is updated as cells are written, which allows checking the bounds of the entire
+    memory in time proportional to the number of segments, rather than to the number of cells
+    (see verify_secure_runner()).
+
+    Cells that do not fit the summary (e.g., non-relocatable addresses) set requires_full_scan, in
+    which case the users of the summary should fall back to scanning the memory.
+    """
+
+    def __init__(self, cells: Iterable[Tuple[MaybeRelocatable, MaybeRelocatable]] = ()):
+        # Maps a segment index to the minimal (maximal) offset of the addresses in that segment.
+        self.min_addr_offsets: Dict[int, int] = {}
+        self.max_addr_offsets: Dict[int, int] = {}
+        # Maps a segment index to the minimal (maximal) offset of the relocatable values pointing
+        # to that segment.
+        self.min_value_offsets: Dict[int, int] = {}
+        self.max_value_offsets: Dict[int, int] = {}
+        self.requires_full_scan = False
+
+        for addr, value in cells:
+            self.add(addr=addr, value=value)
+
+    def copy(self) -> "MemoryAccessSummary":
+        summary = MemoryAccessSummary()
+        summary.min_addr_offsets = dict(self.min_addr_offsets)
+        summary.max_addr_offsets = dict(self.max_addr_offsets)
+        summary.min_value_offsets = dict(self.min_value_offsets)
+        summary.max_value_offsets = dict(self.max_value_offsets)
+        summary.requires_full_scan = self.requires_full_scan
+        return summary
+
+    def add(self, addr: MaybeRelocatable, value: MaybeRelocatable):
+        if type(addr) is RelocatableValue and type(addr.offset) is int:
+            self._update_bounds(
+                min_offsets=self.min_addr_offsets,
+                max_offsets=self.max_addr_offsets,
+                segment_index=addr.segment_index,
+                offset=addr.offset,
+            )
+        else:
+            self.requires_full_scan = True
+
+        if type(value) is RelocatableValue and type(value.offset) is int:
+            self._update_bounds(
+                min_offsets=self.min_value_offsets,
+                max_offsets=self.max_value_offsets,
+                segment_index=value.segment_index,
+                offset=value.offset,
+            )
+        elif type(value) is not int:
+            self.requires_full_scan = True
+
+    def _update_bounds(
+        self, min_offsets: Dict[int, int], max_offsets: Dict[int, int], segment_index, offset: int
+    ):
+        if type(segment_index) is not int:
+            self.requires_full_scan = True
+            return
+
+        max_offset = max_offsets.get(segment_index)
+        if max_offset is None:
+            min_offsets[segment_index] = max_offsets[segment_index] = offset
+        elif offset > max_offset:
+            max_offsets[segment_index] = offset
+        elif offset < min_offsets[segment_index]:
+            min_offsets[segment_index] = offset
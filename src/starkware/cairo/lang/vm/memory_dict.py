@@ -1,9 +1,32 @@
-from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Type, Union, cast
-
-from starkware.cairo.lang.vm.memory_dict_backend import MemoryDictBackend
+import io
+import struct
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
+
+from starkware.cairo.lang.vm.memory_access_summary import MemoryAccessSummary
+from starkware.cairo.lang.vm.memory_dict_backend import (
+    MemoryDictBackend,
+    SegmentArrayMemoryBackend,
+)
 from starkware.cairo.lang.vm.relocatable import MaybeRelocatable, RelocatableValue
 
 ADDR_SIZE_IN_BYTES = 8
+# The number of memory cells encoded (or decoded) at a time when the memory is serialized to (or
+# deserialized from) a file.
+SERIALIZATION_CHUNK_SIZE = 2**16
 
 
 class UnknownMemoryError(KeyError):
@@ -41,6 +64,9 @@ class MemoryDict:
     * Checks that all memory addresses are valid.
     * getitem: Checks that the memory address is initialized.
     * setitem: Checks that memory value is not changed.
+
+    The cells are stored in 'backend', which is a dict by default. See
+    SegmentArrayMemoryBackend for an alternative backend.
     """
 
     def __init__(
@@ -52,6 +78,7 @@ class MemoryDict:
             values = []
         elif isinstance(values, dict):
             values = values.items()
+        self.backend = backend
         self.data = backend(values)
 
         self._frozen: bool = False
@@ -60,6 +87,9 @@ class MemoryDict:
         # See add_relocation_rule for more details.
         self.relocation_rules: Dict[int, RelocatableValue] = {}
 
+        # A summary of the written cells, maintained only after enable_access_summary() is called.
+        self.access_summary: Optional[MemoryAccessSummary] = None
+
     def get(
         self, addr, default_value: Optional[MaybeRelocatable] = None
     ) -> Optional[MaybeRelocatable]:
@@ -129,6 +159,24 @@ class MemoryDict:
 
         self.relocation_rules[segment_index] = dest_ptr
 
+    def copy(self) -> "MemoryDict":
+        """
+        Returns a copy of the memory (the copy is not frozen).
+        """
+        memory = MemoryDict(self.data.items(), backend=self.backend)
+        memory.relocation_rules = dict(self.relocation_rules)
+        if self.access_summary is not None:
+            memory.access_summary = self.access_summary.copy()
+        return memory
+
+    def enable_access_summary(self):
+        """
+        Starts maintaining self.access_summary, which summarizes the cells written so far and is
+        updated on every write from now on.
+        """
+        if self.access_summary is None:
+            self.access_summary = MemoryAccessSummary(cells=self.items())
+
     def freeze(self):
         """
         Freezes the memory - no changes can be made from now on.
@@ -172,15 +220,22 @@ class MemoryDict:
         if len(self.relocation_rules) == 0:
             return
 
-        relocated_memory: Dict[MaybeRelocatable, MaybeRelocatable] = {}
-        for addr, value in self.items():
-            relocated_addr = self.relocate_value(addr)
-            relocated_value = self.relocate_value(value)
-            current = relocated_memory.setdefault(relocated_addr, relocated_value)
-            self.verify_same_value(addr=relocated_addr, current=current, value=relocated_value)
+        if isinstance(self.data, SegmentArrayMemoryBackend):
+            self.data.relocate(
+                relocate_value=self.relocate_value, verify_same_value=self.verify_same_value
+            )
+        else:
+            relocated_memory = self.backend()
+            for addr, value in self.items():
+                relocated_addr = self.relocate_value(addr)
+                relocated_value = self.relocate_value(value)
+                current = relocated_memory.setdefault(relocated_addr, relocated_value)
+                self.verify_same_value(addr=relocated_addr, current=current, value=relocated_value)
+            self.data = relocated_memory
 
-        self.data = relocated_memory
         self.relocation_rules = {}
+        if self.access_summary is not None:
+            self.access_summary = MemoryAccessSummary(cells=self.items())
 
     def __getitem__(self, addr: MaybeRelocatable) -> MaybeRelocatable:
         self._check_element(addr, "Memory address", KeyError)
@@ -204,6 +259,8 @@ class MemoryDict:
 
         current = self.data.setdefault(addr, value)
         self.verify_same_value(addr, current, value)
+        if self.access_summary is not None:
+            self.access_summary.add(addr=addr, value=value)
 
     def verify_same_value(self, addr, current, value):
         """
@@ -219,20 +276,66 @@ class MemoryDict:
         This function should only be used in tests.
         """
         self.data[addr] = value
+        if self.access_summary is not None:
+            self.access_summary.add(addr=addr, value=value)
 
     def serialize(self, field_bytes, relocate_value: Optional[RelocateValueFunc] = None):
+        fp = io.BytesIO()
+        self.serialize_into(fp=fp, field_bytes=field_bytes, relocate_value=relocate_value)
+        return fp.getvalue()
+
+    def serialize_into(
+        self,
+        fp: BinaryIO,
+        field_bytes: int,
+        relocate_value: Optional[RelocateValueFunc] = None,
+    ):
+        """
+        Same as serialize(), but writes the serialized memory to the given file, in chunks of
+        SERIALIZATION_CHUNK_SIZE cells, so the entire serialized memory is never held in memory.
+        """
         assert (
             len(self.relocation_rules) == 0
         ), "Cannot serialize a MemoryDict with active segment relocation rules."
 
-        if relocate_value is None:
-            relocate_value = lambda val: val
-
-        return b"".join(
-            RelocatableValue.to_bytes(relocate_value(addr), ADDR_SIZE_IN_BYTES, "little")
-            + RelocatableValue.to_bytes(relocate_value(value), field_bytes, "little")
-            for addr, value in self.items()
-        )
+        to_int = RelocatableValue.to_int
+        chunk: List[bytes] = []
+        for addr, value in self.items():
+            if relocate_value is not None:
+                addr = relocate_value(addr)
+                value = relocate_value(value)
+            chunk.append(to_int(addr, ADDR_SIZE_IN_BYTES).to_bytes(ADDR_SIZE_IN_BYTES, "little"))
+            chunk.append(to_int(value, field_bytes).to_bytes(field_bytes, "little"))
+            if len(chunk) == 2 * SERIALIZATION_CHUNK_SIZE:
+                fp.write(b"".join(chunk))
+                chunk.clear()
+        fp.write(b"".join(chunk))
+
+    def get_segment_offsets(self, segment_index: int) -> Set[int]:
+        """
+        Returns the offsets of the addresses in the given segment.
+        If self.access_summary is maintained, only the offsets between the minimal and maximal
+        offsets of the segment are checked, rather than all the addresses.
+        """
+        summary = self.access_summary
+        if summary is not None and not summary.requires_full_scan:
+            if segment_index not in summary.max_addr_offsets:
+                return set()
+            min_offset = summary.min_addr_offsets[segment_index]
+            max_offset = summary.max_addr_offsets[segment_index]
+            # Fall back to scanning the addresses if the segment is too sparse.
+            if max_offset - min_offset < len(self.data):
+                return {
+                    offset
+                    for offset in range(min_offset, max_offset + 1)
+                    if RelocatableValue(segment_index, offset) in self.data
+                }
+
+        return {
+            addr.offset
+            for addr in self.data.keys()
+            if isinstance(addr, RelocatableValue) and addr.segment_index == segment_index
+        }
 
     def get_range(self, addr, size) -> List[MaybeRelocatable]:
         return [self[addr + i] for i in range(size)]
@@ -252,13 +355,56 @@ class MemoryDict:
         assert (
             len(data) % (pair_size) == 0
         ), f"Data must consist of pairs of address (8 bytes) and value ({field_bytes} bytes)."
-        pair_stream = (
-            data[pair_size * i : pair_size * (i + 1)] for i in range(len(data) // pair_size)
-        )
-        return cls(
-            (
-                RelocatableValue.from_bytes(pair[:ADDR_SIZE_IN_BYTES], "little"),
-                RelocatableValue.from_bytes(pair[ADDR_SIZE_IN_BYTES:], "little"),
-            )
-            for pair in pair_stream
+        return cls(iter_serialized_cells(data=data, field_bytes=field_bytes))
+
+    @classmethod
+    def deserialize_from_file(
+        cls, fp: BinaryIO, field_bytes: int, max_size: Optional[int] = None
+    ) -> "MemoryDict":
+        """
+        Same as deserialize(), but reads the serialized memory from the given file, in chunks
+        (so the entire serialized memory is never held in memory).
+        If max_size is given, fails if the serialized memory is larger than max_size bytes.
+        """
+        pair_size = ADDR_SIZE_IN_BYTES + field_bytes
+
+        def iter_cells() -> Iterator[Tuple[MaybeRelocatable, MaybeRelocatable]]:
+            total_size = 0
+            leftover = b""
+            while True:
+                chunk = fp.read(SERIALIZATION_CHUNK_SIZE * pair_size)
+                if len(chunk) == 0:
+                    break
+                total_size += len(chunk)
+                assert (
+                    max_size is None or total_size <= max_size
+                ), f"The serialized memory is larger than {max_size} bytes."
+
+                data = leftover + chunk
+                n_complete_bytes = len(data) - len(data) % pair_size
+                yield from iter_serialized_cells(
+                    data=memoryview(data)[:n_complete_bytes], field_bytes=field_bytes
+                )
+                leftover = data[n_complete_bytes:]
+
+            assert (
+                len(leftover) == 0
+            ), f"Data must consist of pairs of address (8 bytes) and value ({field_bytes} bytes)."
+
+        return cls(iter_cells())
+
+
+def iter_serialized_cells(
+    data, field_bytes: int
+) -> Iterator[Tuple[MaybeRelocatable, MaybeRelocatable]]:
+    """
+    Yields the (address, value) pairs of the given serialized memory (see MemoryDict.serialize()).
+    data may be any object that supports the buffer protocol (e.g., bytes, memoryview or mmap); it
+    is not copied.
+    """
+    from_int = RelocatableValue.from_int
+    for addr_num, value_bytes in struct.iter_unpack(f"<Q{field_bytes}s", data):
+        yield (
+            from_int(addr_num, ADDR_SIZE_IN_BYTES),
+            from_int(int.from_bytes(value_bytes, "little"), field_bytes),
         )
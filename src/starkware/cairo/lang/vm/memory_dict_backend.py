@@ -1 +1,293 @@
+from array import array
+from typing import Callable, Dict, Iterator, List, MutableMapping, Optional, Tuple
+
+from starkware.cairo.lang.vm.relocatable import MaybeRelocatable, RelocatableValue
+
 MemoryDictBackend = dict
+
+# Tags of the cells in SegmentArrayMemoryBackend.
+EMPTY_CELL_TAG = 0
+INT_CELL_TAG = 1
+RELOCATABLE_CELL_TAG = 2
+
+# The cells of the segments of SegmentArrayMemoryBackend are identified in its write order by the
+# key (segment_index << OFFSET_BITS) + offset, so the addresses of the segments are limited to
+# MAX_SEGMENTS segments of MAX_OFFSET cells.
+OFFSET_BITS = 40
+MAX_OFFSET = 2**OFFSET_BITS
+MAX_SEGMENTS = 2 ** (63 - OFFSET_BITS)
+# A write to an offset that is more than SPARSE_OFFSET_SLACK cells beyond twice the size of the
+# arrays of its segment does not grow the arrays (which would allocate memory for all the cells up
+# to the offset); the cell is kept in extra_cells instead.
+SPARSE_OFFSET_SLACK = 2**20
+# Entries of the write order that are not keys of segment cells.
+EXTRA_CELL_ENTRY = -1
+DELETED_ENTRY = -2
+
+_MISSING = object()
+
+
+class SegmentArrayMemoryBackend(MutableMapping[MaybeRelocatable, MaybeRelocatable]):
+    """
+    A memory backend for MemoryDict that keeps one growable array per memory segment, indexed by
+    the offset of the address, instead of hashing RelocatableValue keys.
+    Each segment also has a dense tag array (see *_CELL_TAG above) that marks which cells are
+    initialized and whether they hold an int or a RelocatableValue; relocate() uses it to visit
+    only the cells that hold a RelocatableValue.
+
+    Addresses that do not belong to a regular segment (integer addresses, temporary segments and
+    negative offsets), and addresses far beyond the written cells of their segment (see
+    SPARSE_OFFSET_SLACK), are kept in a regular dict. Each cell is kept in exactly one of them: a
+    cell that is not in the arrays of its segment is looked up in the dict.
+
+    Like a dict, the cells are iterated in the order in which they were first written, so that
+    MemoryDict.serialize() (and hence a CairoPie) is byte-identical with both backends.
+    """
+
+    def __init__(self, values=()):
+        # The values of the cells of segment i are stored in self.segment_values[i] and their tags
+        # are stored in self.segment_tags[i].
+        self.segment_values: List[List[MaybeRelocatable]] = []
+        self.segment_tags: List[bytearray] = []
+        # The number of initialized cells in self.segment_values.
+        self.n_segment_cells = 0
+        self.extra_cells: Dict[MaybeRelocatable, MaybeRelocatable] = {}
+        # The position of each extra cell in self.write_order.
+        self.extra_positions: Dict[MaybeRelocatable, int] = {}
+        # An entry per written cell, in write order: the key of a segment cell, EXTRA_CELL_ENTRY
+        # for an extra cell or DELETED_ENTRY for a cell that was deleted since.
+        self.write_order = array("q")
+        self.update(values)
+
+    def _get_segment_cell(self, addr) -> MaybeRelocatable:
+        """
+        Returns the value of the given address if it is kept in the arrays of the segments, and
+        _MISSING otherwise.
+        """
+        if type(addr) is not RelocatableValue or addr.segment_index < 0 or addr.offset < 0:
+            return _MISSING
+        try:
+            if self.segment_tags[addr.segment_index][addr.offset] != EMPTY_CELL_TAG:
+                return self.segment_values[addr.segment_index][addr.offset]
+        except IndexError:
+            pass
+        return _MISSING
+
+    def _allocate(self, segment_index: int, offset: int) -> Optional[bytearray]:
+        """
+        Makes sure that the arrays of the given segment can hold the given offset and returns the
+        tag array of the segment, or None if the address is beyond MAX_SEGMENTS or MAX_OFFSET, or
+        too far beyond the current size of the arrays (see SPARSE_OFFSET_SLACK); such addresses
+        are kept in self.extra_cells.
+        The arrays at least double their size on each allocation to amortize the cost of growing.
+        """
+        if segment_index >= MAX_SEGMENTS or offset >= MAX_OFFSET:
+            return None
+
+        n_segments = len(self.segment_values)
+        if segment_index >= n_segments:
+            self.segment_values.extend([] for _ in range(segment_index + 1 - n_segments))
+            self.segment_tags.extend(bytearray() for _ in range(segment_index + 1 - n_segments))
+
+        tags = self.segment_tags[segment_index]
+        if offset >= len(tags):
+            if offset > 2 * len(tags) + SPARSE_OFFSET_SLACK:
+                return None
+            new_size = min(max(offset + 1, 2 * len(tags)), MAX_OFFSET)
+            self.segment_values[segment_index].extend([0] * (new_size - len(tags)))
+            tags.extend(bytes(new_size - len(tags)))
+        return tags
+
+    def _setdefault_extra_cell(
+        self, addr: MaybeRelocatable, value: MaybeRelocatable
+    ) -> MaybeRelocatable:
+        current = self.extra_cells.get(addr, _MISSING)
+        if current is not _MISSING:
+            return current
+        self.extra_positions[addr] = len(self.write_order)
+        self.write_order.append(EXTRA_CELL_ENTRY)
+        self.extra_cells[addr] = value
+        return value
+
+    def get(self, addr, default=None):
+        if type(addr) is not RelocatableValue or addr.segment_index < 0 or addr.offset < 0:
+            return self.extra_cells.get(addr, default)
+
+        segment_index, offset = addr.segment_index, addr.offset
+        try:
+            if self.segment_tags[segment_index][offset] != EMPTY_CELL_TAG:
+                return self.segment_values[segment_index][offset]
+        except IndexError:
+            pass
+        # The cell may be kept in self.extra_cells (see SPARSE_OFFSET_SLACK).
+        return self.extra_cells.get(addr, default) if self.extra_cells else default
+
+    def __getitem__(self, addr: MaybeRelocatable) -> MaybeRelocatable:
+        value = self.get(addr, _MISSING)
+        if value is _MISSING:
+            raise KeyError(addr)
+        return value
+
+    def __contains__(self, addr) -> bool:
+        return self.get(addr, _MISSING) is not _MISSING
+
+    def setdefault(self, addr, default=None):
+        if type(addr) is not RelocatableValue or addr.segment_index < 0 or addr.offset < 0:
+            return self._setdefault_extra_cell(addr=addr, value=default)
+
+        segment_index, offset = addr.segment_index, addr.offset
+        try:
+            tags = self.segment_tags[segment_index]
+            if tags[offset] != EMPTY_CELL_TAG:
+                return self.segment_values[segment_index][offset]
+        except IndexError:
+            if addr in self.extra_cells:
+                return self.extra_cells[addr]
+            allocated_tags = self._allocate(segment_index=segment_index, offset=offset)
+            if allocated_tags is None:
+                return self._setdefault_extra_cell(addr=addr, value=default)
+            tags = allocated_tags
+        else:
+            if self.extra_cells and addr in self.extra_cells:
+                # The cell was written before the arrays of its segment grew to cover it.
+                return self.extra_cells[addr]
+
+        self.n_segment_cells += 1
+        self.write_order.append((segment_index << OFFSET_BITS) + offset)
+        tags[offset] = RELOCATABLE_CELL_TAG if type(default) is RelocatableValue else INT_CELL_TAG
+        self.segment_values[segment_index][offset] = default
+        return default
+
+    def __setitem__(self, addr: MaybeRelocatable, value: MaybeRelocatable):
+        if self.setdefault(addr, value) is value:
+            return
+
+        # The cell is already initialized.
+        if self._get_segment_cell(addr) is _MISSING:
+            self.extra_cells[addr] = value
+            return
+
+        assert isinstance(addr, RelocatableValue)
+        segment_index, offset = addr.segment_index, addr.offset
+        self.segment_tags[segment_index][offset] = (
+            RELOCATABLE_CELL_TAG if type(value) is RelocatableValue else INT_CELL_TAG
+        )
+        self.segment_values[segment_index][offset] = value
+
+    def __delitem__(self, addr: MaybeRelocatable):
+        if self._get_segment_cell(addr) is _MISSING:
+            del self.extra_cells[addr]
+            self.write_order[self.extra_positions.pop(addr)] = DELETED_ENTRY
+            return
+
+        assert isinstance(addr, RelocatableValue)
+        segment_index, offset = addr.segment_index, addr.offset
+        self.segment_tags[segment_index][offset] = EMPTY_CELL_TAG
+        self.segment_values[segment_index][offset] = 0
+        self.n_segment_cells -= 1
+        # Cells are rarely deleted, so the entry of the cell is searched for.
+        position = self.write_order.index((segment_index << OFFSET_BITS) + offset)
+        self.write_order[position] = DELETED_ENTRY
+
+    def __iter__(self) -> Iterator[MaybeRelocatable]:
+        for addr, _ in self.items():
+            yield addr
+
+    def items(self) -> Iterator[Tuple[MaybeRelocatable, MaybeRelocatable]]:  # type: ignore
+        extra_addrs = {position: addr for addr, position in self.extra_positions.items()}
+        segment_values = self.segment_values
+        offset_mask = MAX_OFFSET - 1
+        for position, entry in enumerate(self.write_order):
+            if entry >= 0:
+                values = segment_values[entry >> OFFSET_BITS]
+                offset = entry & offset_mask
+                yield RelocatableValue(entry >> OFFSET_BITS, offset), values[offset]
+            elif entry == EXTRA_CELL_ENTRY:
+                addr = extra_addrs[position]
+                yield addr, self.extra_cells[addr]
+
+    def relocate(
+        self,
+        relocate_value: Callable[[MaybeRelocatable], MaybeRelocatable],
+        verify_same_value: Callable[[MaybeRelocatable, MaybeRelocatable, MaybeRelocatable], None],
+    ):
+        """
+        Relocates the addresses and values of the cells in place (see
+        MemoryDict.relocate_memory()). The result, including the order of the cells, is the same
+        as that of writing the relocated cells to a new memory, in write order.
+        Only the extra cells and the segment cells that are tagged as relocatable are visited.
+        verify_same_value(addr, current, value) is called on every address to which more than
+        one cell is relocated; if it raises, the memory is not changed.
+        """
+        # Compute the relocated extra cells before changing the memory. Maps a relocated address
+        # to the position and value of its first cell in write order.
+        relocated_cells: Dict[MaybeRelocatable, Tuple[int, MaybeRelocatable]] = {}
+        for addr, position in sorted(self.extra_positions.items(), key=lambda item: item[1]):
+            relocated_addr = relocate_value(addr)
+            relocated_value = relocate_value(self.extra_cells[addr])
+            relocated_cell = relocated_cells.get(relocated_addr)
+            if relocated_cell is None:
+                current = self._get_segment_cell(relocated_addr)
+                if current is not _MISSING:
+                    current_position = self.write_order.index(
+                        (relocated_addr.segment_index << OFFSET_BITS) + relocated_addr.offset
+                    )
+                    relocated_cell = (current_position, relocate_value(current))
+            if relocated_cell is None:
+                relocated_cells[relocated_addr] = (position, relocated_value)
+                continue
+
+            first_position, first_value = relocated_cell
+            if first_position < position:
+                verify_same_value(relocated_addr, first_value, relocated_value)
+            else:
+                verify_same_value(relocated_addr, relocated_value, first_value)
+            relocated_cells[relocated_addr] = min(relocated_cell, (position, relocated_value))
+
+        # Relocate the values of the segment cells.
+        for tags, values in zip(self.segment_tags, self.segment_values):
+            offset = tags.find(RELOCATABLE_CELL_TAG)
+            while offset != -1:
+                value = values[offset] = relocate_value(values[offset])
+                if type(value) is not RelocatableValue:
+                    tags[offset] = INT_CELL_TAG
+                offset = tags.find(RELOCATABLE_CELL_TAG, offset + 1)
+
+        # Replace the extra cells with the relocated cells.
+        for position in self.extra_positions.values():
+            self.write_order[position] = DELETED_ENTRY
+        self.extra_cells = {}
+        self.extra_positions = {}
+        for addr, (position, value) in sorted(relocated_cells.items(), key=lambda item: item[1][0]):
+            tags = None
+            if type(addr) is RelocatableValue and addr.segment_index >= 0 and addr.offset >= 0:
+                tags = self._allocate(segment_index=addr.segment_index, offset=addr.offset)
+            if tags is None:
+                self.extra_cells[addr] = value
+                self.extra_positions[addr] = position
+                self.write_order[position] = EXTRA_CELL_ENTRY
+                continue
+
+            assert isinstance(addr, RelocatableValue)
+            segment_index, offset = addr.segment_index, addr.offset
+            key = (segment_index << OFFSET_BITS) + offset
+            if tags[offset] == EMPTY_CELL_TAG:
+                self.n_segment_cells += 1
+            else:
+                # The cell is moved to the position of the first cell that was relocated to it.
+                self.write_order[self.write_order.index(key)] = DELETED_ENTRY
+            tags[offset] = RELOCATABLE_CELL_TAG if type(value) is RelocatableValue else INT_CELL_TAG
+            self.segment_values[segment_index][offset] = value
+            self.write_order[position] = key
+
+    def __len__(self) -> int:
+        return self.n_segment_cells + len(self.extra_cells)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+
+MEMORY_BACKENDS = {
+    "dict": MemoryDictBackend,
+    "segment_array": SegmentArrayMemoryBackend,
+}
@@ -0,0 +1,111 @@
+"""
+Compares the performance of the MemoryDict backends (see memory_dict_backend.py), both on raw
+memory accesses and on a full run of a Cairo program.
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Callable
+
+from starkware.cairo.lang.cairo_constants import DEFAULT_PRIME
+from starkware.cairo.lang.compiler.cairo_compile import compile_cairo
+from starkware.cairo.lang.vm.cairo_runner import CairoRunner
+from starkware.cairo.lang.vm.memory_dict import MemoryDict
+from starkware.cairo.lang.vm.memory_dict_backend import MEMORY_BACKENDS
+from starkware.cairo.lang.vm.relocatable import RelocatableValue
+
+BENCHMARK_CODE = """\
+func fib(a: felt, b: felt, n: felt) -> felt {
+    if (n == 0) {
+        return a;
+    }
+    return fib(a=b, b=a + b, n=n - 1);
+}
+
+func main() {
+    fib(a=1, b=1, n={n_iterations});
+    ret;
+}
+"""
+
+
+def measure(func: Callable[[], None]) -> float:
+    start_time = time.perf_counter()
+    func()
+    return time.perf_counter() - start_time
+
+
+def benchmark_memory_accesses(backend, n_segments: int, segment_size: int):
+    memory = MemoryDict(backend=backend)
+    addresses = [
+        RelocatableValue(segment_index=segment_index, offset=offset)
+        for segment_index in range(n_segments)
+        for offset in range(segment_size)
+    ]
+
+    def write():
+        for i, addr in enumerate(addresses):
+            # Use a fresh address object, as the VM does, so that the memory held by the keys of
+            # the backend is measured.
+            memory[addr + 0] = i
+
+    def read():
+        for addr in addresses:
+            memory[addr]
+
+    def serialize():
+        memory.serialize(field_bytes=32)
+
+    tracemalloc.start()
+    write_time = measure(write)
+    memory_size_mb = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+
+    return {
+        "write": write_time,
+        "read": measure(read),
+        "serialize": measure(serialize),
+        "memory_size_mb": memory_size_mb,
+    }
+
+
+def benchmark_cairo_run(backend, n_iterations: int):
+    program = compile_cairo(
+        code=BENCHMARK_CODE.replace("{n_iterations}", str(n_iterations)), prime=DEFAULT_PRIME
+    )
+    runner = CairoRunner(program=program, layout="plain", memory=MemoryDict(backend=backend))
+    runner.initialize_segments()
+    end = runner.initialize_main_entrypoint()
+    runner.initialize_vm(hint_locals={})
+
+    def run():
+        runner.run_until_pc(end)
+        runner.end_run()
+        runner.relocate()
+
+    return {"run": measure(run), "n_steps": runner.vm.current_step}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the MemoryDict backends.")
+    parser.add_argument("--n_segments", type=int, default=10)
+    parser.add_argument("--segment_size", type=int, default=100000)
+    parser.add_argument("--n_iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    for name, backend in MEMORY_BACKENDS.items():
+        accesses_res = benchmark_memory_accesses(
+            backend=backend, n_segments=args.n_segments, segment_size=args.segment_size
+        )
+        run_res = benchmark_cairo_run(backend=backend, n_iterations=args.n_iterations)
+        print(
+            f"{name}: write={accesses_res['write']:.3f}s, read={accesses_res['read']:.3f}s, "
+            f"serialize={accesses_res['serialize']:.3f}s, "
+            f"memory={accesses_res['memory_size_mb']:.1f}MB, run={run_res['run']:.3f}s "
+            f"({run_res['n_steps'] / run_res['run']:.0f} steps/sec)."
+        )
+
+
+if __name__ == "__main__":
+    main()
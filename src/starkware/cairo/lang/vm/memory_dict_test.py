@@ -1,10 +1,15 @@
+import io
+import re
+
 import pytest
 
+from starkware.cairo.lang.vm import memory_dict, memory_dict_backend
 from starkware.cairo.lang.vm.memory_dict import (
     InconsistentMemoryError,
     MemoryDict,
     UnknownMemoryError,
 )
+from starkware.cairo.lang.vm.memory_dict_backend import SegmentArrayMemoryBackend
 from starkware.cairo.lang.vm.relocatable import RelocatableValue
 
 
@@ -172,3 +177,232 @@ def test_segment_relocation_failures():
         match=f"Inconsistent memory assignment at address {relocation_target}. 1 != 2.",
     ):
         memory.relocate_memory()
+
+
+def test_segment_array_backend():
+    backend = SegmentArrayMemoryBackend()
+    backend[RelocatableValue(1, 5)] = 7
+    backend[RelocatableValue(1, 2)] = RelocatableValue(3, 4)
+    backend[RelocatableValue(-2, 1)] = 8
+    backend[RelocatableValue(0, -1)] = 9
+    backend[10] = 11
+    assert len(backend) == 5
+    assert backend[RelocatableValue(1, 5)] == 7
+    assert backend.get(RelocatableValue(1, 4)) is None
+    assert RelocatableValue(1, 2) in backend
+    assert RelocatableValue(1, 3) not in backend
+    assert RelocatableValue(2, 0) not in backend
+    assert RelocatableValue(1, 100) not in backend
+    with pytest.raises(KeyError):
+        backend[RelocatableValue(1, 3)]
+    assert backend.setdefault(RelocatableValue(1, 5), 12) == 7
+    assert backend == {
+        RelocatableValue(1, 2): RelocatableValue(3, 4),
+        RelocatableValue(1, 5): 7,
+        RelocatableValue(-2, 1): 8,
+        RelocatableValue(0, -1): 9,
+        10: 11,
+    }
+    del backend[RelocatableValue(1, 5)]
+    assert len(backend) == 4
+    assert RelocatableValue(1, 5) not in backend
+
+
+def test_segment_array_backend_memory_dict():
+    segment_ptr = RelocatableValue(segment_index=2, offset=0)
+    temp_segment = RelocatableValue(segment_index=-1, offset=0)
+    memory = MemoryDict(backend=SegmentArrayMemoryBackend)
+    memory[segment_ptr] = temp_segment + 2
+    memory[segment_ptr + 1] = 5
+    memory[temp_segment + 3] = 17
+    with pytest.raises(InconsistentMemoryError):
+        memory[segment_ptr + 1] = 6
+    with pytest.raises(UnknownMemoryError):
+        memory[segment_ptr + 2]
+    assert memory.get_range(addr=segment_ptr, size=2) == [temp_segment + 2, 5]
+
+    relocation_target = RelocatableValue(segment_index=4, offset=25)
+    memory.add_relocation_rule(src_ptr=temp_segment, dest_ptr=relocation_target)
+    memory.relocate_memory()
+    assert isinstance(memory.data, SegmentArrayMemoryBackend)
+    assert memory == MemoryDict(
+        {
+            segment_ptr: relocation_target + 2,
+            segment_ptr + 1: 5,
+            relocation_target + 3: 17,
+        }
+    )
+
+    serialized = memory.serialize(field_bytes=32)
+    assert MemoryDict.deserialize(serialized, field_bytes=32) == memory
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 100])
+def test_memory_dict_serialize_into_file(chunk_size: int, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(memory_dict, "SERIALIZATION_CHUNK_SIZE", chunk_size)
+    memory = MemoryDict(
+        {
+            1: 2,
+            RelocatableValue(3, 4): RelocatableValue(6, 7),
+            5: 2**200,
+            RelocatableValue(0, 8): 0,
+            RelocatableValue(9, 0): RelocatableValue(1, 2**40),
+        }
+    )
+    fp = io.BytesIO()
+    memory.serialize_into(fp=fp, field_bytes=32)
+    assert fp.getvalue() == memory.serialize(field_bytes=32)
+
+    fp.seek(0)
+    assert MemoryDict.deserialize_from_file(fp=fp, field_bytes=32) == memory
+
+    fp.seek(0)
+    with pytest.raises(AssertionError, match="is larger than 160 bytes"):
+        MemoryDict.deserialize_from_file(fp=fp, field_bytes=32, max_size=40 * 4)
+
+
+def test_memory_dict_access_summary():
+    memory = MemoryDict({RelocatableValue(0, 3): 7})
+    memory.enable_access_summary()
+    memory[RelocatableValue(0, 1)] = RelocatableValue(2, 5)
+    memory[RelocatableValue(1, 4)] = RelocatableValue(2, 3)
+    memory[RelocatableValue(-1, 2)] = RelocatableValue(-1, 0)
+
+    summary = memory.access_summary
+    assert summary is not None
+    assert summary.min_addr_offsets == {0: 1, 1: 4, -1: 2}
+    assert summary.max_addr_offsets == {0: 3, 1: 4, -1: 2}
+    assert summary.min_value_offsets == {2: 3, -1: 0}
+    assert summary.max_value_offsets == {2: 5, -1: 0}
+    assert not summary.requires_full_scan
+
+    # The summary is recomputed when the memory is relocated.
+    memory.add_relocation_rule(
+        src_ptr=RelocatableValue(-1, 0), dest_ptr=RelocatableValue(segment_index=1, offset=10)
+    )
+    memory.relocate_memory()
+    summary = memory.access_summary
+    assert summary.max_addr_offsets == {0: 3, 1: 12}
+    assert summary.max_value_offsets == {2: 5, 1: 10}
+
+    memory.set_without_checks(5, 6)
+    assert summary.requires_full_scan
+
+
+def test_segment_array_backend_write_order():
+    cells = [
+        (RelocatableValue(2, 3), 1),
+        (RelocatableValue(-1, 0), 2),
+        (RelocatableValue(0, 7), RelocatableValue(2, 3)),
+        (5, 3),
+        (RelocatableValue(2, 1), 4),
+        (RelocatableValue(0, 0), 5),
+    ]
+    backend = SegmentArrayMemoryBackend(cells)
+    dict_backend = dict(cells)
+    for memory in (backend, dict_backend):
+        del memory[RelocatableValue(2, 3)]
+        del memory[RelocatableValue(-1, 0)]
+        memory[RelocatableValue(0, 7)] = 6
+        memory[RelocatableValue(-1, 0)] = 7
+        memory[RelocatableValue(2, 3)] = 8
+    assert list(backend.items()) == list(dict_backend.items())
+    assert list(backend) == list(dict_backend)
+
+
+@pytest.mark.parametrize("consistent", [True, False])
+def test_segment_array_backend_relocation(consistent: bool):
+    """
+    Checks that relocating a memory with SegmentArrayMemoryBackend results in the same memory,
+    serialized to the same bytes, as with the dict backend.
+    """
+    temp_segment = RelocatableValue(segment_index=-1, offset=0)
+    other_temp_segment = RelocatableValue(segment_index=-2, offset=0)
+    relocation_target = RelocatableValue(segment_index=3, offset=10)
+    cells = [
+        (RelocatableValue(0, 0), temp_segment + 1),
+        (relocation_target + 2, 5),
+        (temp_segment + 2, 5 if consistent else 6),
+        (RelocatableValue(1, 0), 7),
+        (temp_segment + 0, other_temp_segment),
+        (other_temp_segment + 4, RelocatableValue(1, 0)),
+        (relocation_target + 0, other_temp_segment),
+        (temp_segment + 1, 8),
+        (8, temp_segment + 3),
+    ]
+    memories = [MemoryDict(cells, backend=backend) for backend in (dict, SegmentArrayMemoryBackend)]
+    for memory in memories:
+        memory.add_relocation_rule(src_ptr=temp_segment, dest_ptr=relocation_target)
+    if not consistent:
+        expected_error = (
+            f"Inconsistent memory assignment at address {relocation_target + 2}. 5 != 6."
+        )
+        for memory in memories:
+            with pytest.raises(InconsistentMemoryError, match=re.escape(expected_error)):
+                memory.relocate_memory()
+        # The memory is not changed by a failed relocation.
+        assert list(memories[1].items()) == cells
+        return
+
+    for memory in memories:
+        memory.relocate_memory()
+    dict_memory, segment_array_memory = memories
+    assert list(segment_array_memory.items()) == list(dict_memory.items())
+    assert segment_array_memory.serialize(field_bytes=32) == dict_memory.serialize(field_bytes=32)
+
+
+def test_segment_array_backend_large_addresses():
+    backend = SegmentArrayMemoryBackend()
+    large_segment_addr = RelocatableValue(memory_dict_backend.MAX_SEGMENTS, 0)
+    large_offset_addr = RelocatableValue(0, memory_dict_backend.MAX_OFFSET)
+    backend[large_segment_addr] = 1
+    backend[large_offset_addr] = 2
+    assert backend.setdefault(large_offset_addr, 3) == 2
+    assert backend == {large_segment_addr: 1, large_offset_addr: 2}
+    assert backend.extra_cells == {large_segment_addr: 1, large_offset_addr: 2}
+
+
+def test_segment_array_backend_sparse_offsets():
+    backend = SegmentArrayMemoryBackend()
+    low_addr = RelocatableValue(0, 0)
+    sparse_addr = RelocatableValue(0, 2**39)
+    near_addr = RelocatableValue(0, memory_dict_backend.SPARSE_OFFSET_SLACK)
+    backend[low_addr] = 1
+    backend[sparse_addr] = 2
+    # The sparse cell does not grow the arrays of the segment.
+    assert len(backend.segment_tags[0]) <= 2
+    assert backend.extra_cells == {sparse_addr: 2}
+    assert backend[sparse_addr] == 2
+    assert sparse_addr in backend
+    assert RelocatableValue(0, 2**39 + 1) not in backend
+    backend[sparse_addr] = 3
+    assert backend.setdefault(sparse_addr, 4) == 3
+
+    # A cell within the slack grows the arrays.
+    backend[near_addr] = 5
+    assert len(backend.segment_tags[0]) > memory_dict_backend.SPARSE_OFFSET_SLACK
+    assert list(backend.items()) == [(low_addr, 1), (sparse_addr, 3), (near_addr, 5)]
+    assert len(backend) == 3
+
+    del backend[sparse_addr]
+    assert sparse_addr not in backend
+    assert list(backend.items()) == [(low_addr, 1), (near_addr, 5)]
+
+
+def test_segment_array_backend_sparse_offset_relocation():
+    temp_segment = RelocatableValue(segment_index=-1, offset=0)
+    cells = [
+        (RelocatableValue(0, 0), temp_segment),
+        (temp_segment + 0, 7),
+        (RelocatableValue(0, 2**39), temp_segment + 1),
+        (temp_segment + 1, 8),
+    ]
+    memories = [MemoryDict(cells, backend=backend) for backend in (dict, SegmentArrayMemoryBackend)]
+    for memory in memories:
+        memory.add_relocation_rule(src_ptr=temp_segment, dest_ptr=RelocatableValue(1, 2**39))
+        memory.relocate_memory()
+    dict_memory, segment_array_memory = memories
+    assert list(segment_array_memory.items()) == list(dict_memory.items())
+    assert segment_array_memory.serialize(field_bytes=32) == dict_memory.serialize(field_bytes=32)
+    # The relocated cells are kept out of the arrays of segment 1.
+    assert len(segment_array_memory.data.segment_tags[1]) == 0
@@ -104,6 +104,13 @@ class MemorySegmentManager:
         self._segment_used_sizes = {
             index: 0 for index in range(first_segment_index, self.n_segments)
         }
+        access_summary = self.memory.access_summary
+        if access_summary is not None and not access_summary.requires_full_scan:
+            for segment_index, max_offset in access_summary.max_addr_offsets.items():
+                previous_max_size = self._segment_used_sizes[segment_index]
+                self._segment_used_sizes[segment_index] = max(previous_max_size, max_offset + 1)
+            return
+
         for addr in self.memory:
             if not isinstance(addr, RelocatableValue):
                 raise SecurityError(
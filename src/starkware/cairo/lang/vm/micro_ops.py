@@ -0,0 +1,259 @@
+"""
+Specialized "micro-ops" for Cairo instructions.
+
+A micro-op is a Python function, generated for a specific encoded instruction, that performs the
+same computation as VirtualMachine.run_instruction() for that instruction: it computes the operand
+addresses, the operands and res, performs the opcode assertions and updates the registers.
+Since the shape and the offsets of the instruction are known in advance, all the decisions that
+depend on the instruction flags are taken once, when the micro-op is generated, instead of on
+every step.
+
+Rare flows (deductions of op0/op1 and failed assertions) are delegated to the corresponding
+VirtualMachine methods, so that the behavior (including error messages) is identical to the
+generic flow.
+"""
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, List, Optional
+
+from starkware.cairo.lang.compiler.encode import decode_instruction
+from starkware.cairo.lang.compiler.instruction import Instruction, Register
+from starkware.cairo.lang.vm.relocatable import RelocatableValue
+from starkware.cairo.lang.vm.trace_entry import TraceEntry
+from starkware.cairo.lang.vm.vm_exceptions import PureValueError
+
+if TYPE_CHECKING:
+    from starkware.cairo.lang.vm.vm_core import VirtualMachine
+
+MicroOp = Callable[["VirtualMachine"], None]
+
+
+def _register_name(register: Register) -> str:
+    return "ap" if register is Register.AP else "fp"
+
+
+def _add_offset(target: str, base: str, offset: str, indent: str = "    ") -> List[str]:
+    """
+    Returns lines that compute 'target = (base + offset) % prime', where base is either an int or
+    a RelocatableValue. In the latter case, only one RelocatableValue is constructed (instead of
+    one for the addition and one for the modulo operation).
+    """
+    return [
+        f"{indent}if type({base}) is RelocatableValue:",
+        f"{indent}    {target} = RelocatableValue("
+        f"{base}.segment_index, ({base}.offset + {offset}) % prime)",
+        f"{indent}else:",
+        f"{indent}    {target} = ({base} + {offset}) % prime",
+    ]
+
+
+def _generate_micro_op_source(instruction: Instruction) -> Optional[List[str]]:
+    """
+    Returns the lines of the body of the micro-op of the given instruction, or None if the
+    instruction is not supported (in which case the generic flow should be used).
+    """
+    opcode = instruction.opcode
+    res_type = instruction.res
+
+    # The following combinations are invalid and fail in the generic flow.
+    if res_type is Instruction.Res.UNCONSTRAINED and (
+        opcode is Instruction.Opcode.ASSERT_EQ
+        or instruction.ap_update is Instruction.ApUpdate.ADD
+        or instruction.pc_update in (Instruction.PcUpdate.JUMP, Instruction.PcUpdate.JUMP_REL)
+    ):
+        return None
+    if instruction.op1_addr is Instruction.Op1Addr.IMM and instruction.off2 != 1:
+        return None
+
+    dst_register = _register_name(instruction.dst_register)
+    op0_register = _register_name(instruction.op0_register)
+    lines = [
+        "run_context = vm.run_context",
+        "memory = vm.validated_memory",
+        "memory_get = memory.get",
+        "try:",
+        f"    base = run_context.{dst_register}",
+        *_add_offset(target="dst_addr", base="base", offset=str(instruction.off0)),
+        "    dst = memory_get(dst_addr)",
+        f"    base = run_context.{op0_register}",
+        *_add_offset(target="op0_addr", base="base", offset=str(instruction.off1)),
+        "    op0 = memory_get(op0_addr)",
+    ]
+
+    # Compute op1.
+    if instruction.op1_addr is Instruction.Op1Addr.IMM:
+        lines.append("    base = run_context.pc")
+    elif instruction.op1_addr is Instruction.Op1Addr.OP0:
+        lines += [
+            '    assert op0 is not None, "op0 must be known in double dereference."',
+            "    base = op0",
+        ]
+    else:
+        op1_register = "ap" if instruction.op1_addr is Instruction.Op1Addr.AP else "fp"
+        lines.append(f"    base = run_context.{op1_register}")
+    lines += [
+        *_add_offset(target="op1_addr", base="base", offset=str(instruction.off2)),
+        "    op1 = memory_get(op1_addr)",
+        # Auto deduction rules and deductions of the operands (see compute_operands()).
+        "    res = None",
+        "    if op0 is None:",
+        "        op0 = vm.deduce_memory_cell(op0_addr)",
+        "    if op1 is None:",
+        "        op1 = vm.deduce_memory_cell(op1_addr)",
+        "    should_update_dst = dst is None",
+        "    should_update_op0 = op0 is None",
+        "    should_update_op1 = op1 is None",
+        "    if op0 is None:",
+        "        op0, res = vm.deduce_op0(instruction, dst, op1)",
+        "    if op1 is None:",
+        "        op1, deduced_res = vm.deduce_op1(instruction, dst, op0)",
+        "        if res is None:",
+        "            res = deduced_res",
+        "    if op0 is None:",
+        "        op0 = memory[op0_addr]",
+        "    if op1 is None:",
+        "        op1 = memory[op1_addr]",
+    ]
+
+    # Compute res.
+    if res_type is Instruction.Res.OP1:
+        lines += ["    if res is None:", "        res = op1"]
+    elif res_type is Instruction.Res.ADD:
+        lines += ["    if res is None:", "        res = (op0 + op1) % prime"]
+    elif res_type is Instruction.Res.MUL:
+        lines += [
+            "    if res is None:",
+            "        if isinstance(op0, RelocatableValue) or isinstance(op1, RelocatableValue):",
+            '            raise PureValueError("*", op0, op1)',
+            "        res = (op0 * op1) % prime",
+        ]
+
+    # Deduce dst.
+    if opcode is Instruction.Opcode.ASSERT_EQ:
+        lines += ["    if dst is None:", "        dst = res"]
+    elif opcode is Instruction.Opcode.CALL:
+        lines += ["    if dst is None:", "        dst = run_context.fp"]
+    else:
+        lines += ["    if dst is None:", "        dst = memory[dst_addr]"]
+    lines += [
+        "    if should_update_dst:",
+        "        memory[dst_addr] = dst",
+        "    if should_update_op0:",
+        "        memory[op0_addr] = op0",
+        "    if should_update_op1:",
+        "        memory[op1_addr] = op1",
+    ]
+
+    # Opcode assertions. In case of a failure, opcode_assertions() is called to raise the error.
+    failed_assertion = (
+        "vm.opcode_assertions(instruction, Operands(dst=dst, res=res, op0=op0, op1=op1))"
+    )
+    if opcode is Instruction.Opcode.ASSERT_EQ:
+        lines += [
+            "    if dst != res and not vm.check_eq(dst, res):",
+            f"        {failed_assertion}",
+        ]
+    elif opcode is Instruction.Opcode.CALL:
+        lines += [
+            f"    return_pc = run_context.pc + {instruction.size}",
+            "    return_fp = run_context.fp",
+            "    if (op0 != return_pc and not vm.check_eq(op0, return_pc)) or (",
+            "        dst != return_fp and not vm.check_eq(dst, return_fp)",
+            "    ):",
+            f"        {failed_assertion}",
+        ]
+    lines += [
+        "except Exception as exc:",
+        "    raise vm.as_vm_exception(exc) from None",
+        # Write to trace.
+        "if vm.enable_instruction_trace:",
+        "    vm.trace.append(TraceEntry(pc=run_context.pc, ap=run_context.ap, fp=run_context.fp))",
+        "accessed_addresses = vm.accessed_addresses",
+        "accessed_addresses.update((dst_addr, op0_addr, op1_addr))",
+        "accessed_addresses.add(run_context.pc)",
+        "try:",
+    ]
+
+    # Update fp.
+    if instruction.fp_update is Instruction.FpUpdate.AP_PLUS2:
+        lines.append("    run_context.fp = run_context.ap + 2")
+    elif instruction.fp_update is Instruction.FpUpdate.DST:
+        lines.append("    run_context.fp = dst")
+
+    # Update ap.
+    if instruction.ap_update is Instruction.ApUpdate.ADD:
+        # res may be a RelocatableValue, in which case the addition fails.
+        lines += [
+            "    run_context.ap += res % prime",
+            "    run_context.ap = run_context.ap % prime",
+        ]
+    else:
+        ap_increment = {
+            Instruction.ApUpdate.REGULAR: 0,
+            Instruction.ApUpdate.ADD1: 1,
+            Instruction.ApUpdate.ADD2: 2,
+        }[instruction.ap_update]
+        lines += [
+            "    ap = run_context.ap",
+            *_add_offset(target="run_context.ap", base="ap", offset=str(ap_increment)),
+        ]
+
+    # Update pc.
+    if instruction.pc_update is Instruction.PcUpdate.REGULAR:
+        lines += [
+            "    pc = run_context.pc",
+            *_add_offset(target="run_context.pc", base="pc", offset=str(instruction.size)),
+        ]
+    elif instruction.pc_update is Instruction.PcUpdate.JUMP:
+        lines.append("    run_context.pc = res")
+    elif instruction.pc_update is Instruction.PcUpdate.JUMP_REL:
+        lines += [
+            "    if not isinstance(res, int):",
+            '        raise PureValueError("jmp rel", res)',
+            "    run_context.pc += res",
+        ]
+    elif instruction.pc_update is Instruction.PcUpdate.JNZ:
+        lines += [
+            "    if vm.is_zero(dst):",
+            f"        run_context.pc += {instruction.size}",
+            "    else:",
+            "        run_context.pc += op1",
+        ]
+    if instruction.pc_update is not Instruction.PcUpdate.REGULAR:
+        lines.append("    run_context.pc = run_context.pc % prime")
+    lines += [
+        "except Exception as exc:",
+        "    raise vm.as_vm_exception(exc) from None",
+        "vm.current_step += 1",
+    ]
+    return lines
+
+
+@lru_cache(None)
+def get_micro_op(encoded_instruction: int, prime: int) -> Optional[MicroOp]:
+    """
+    Returns the micro-op of the given encoded instruction, or None if the instruction should be
+    executed using the generic flow.
+    The micro-op does not depend on the value of the immediate (which is read from the memory, as
+    in the generic flow), so the same micro-op is shared by all the instances of an instruction.
+    """
+    # Pass a dummy immediate. It is only used to determine the size of the instruction.
+    instruction = decode_instruction(encoding=encoded_instruction, imm=0)
+    body = _generate_micro_op_source(instruction)
+    if body is None:
+        return None
+
+    # Avoid a cyclic import.
+    from starkware.cairo.lang.vm.vm_core import Operands
+
+    source = "def micro_op(vm):\n" + "".join(f"    {line}\n" for line in body)
+    exec_globals = dict(
+        instruction=instruction,
+        prime=prime,
+        Operands=Operands,
+        PureValueError=PureValueError,
+        RelocatableValue=RelocatableValue,
+        TraceEntry=TraceEntry,
+    )
+    exec(compile(source, f"<micro_op {encoded_instruction:#x}>", "exec"), exec_globals)
+    return exec_globals["micro_op"]
@@ -0,0 +1,79 @@
+"""
+A registry of native hints: Python functions that implement well-known hints (such as the hints of
+the Cairo common library), and are called instead of executing the hint's code with exec().
+
+A native hint function is called with the following keyword arguments:
+  vm - the VirtualMachine.
+  ids - the VmConsts object of the hint (None if the hint was registered with uses_ids=False).
+  memory, ap, fp - as in the hint's code.
+  scope - the globals dictionary of the hint. It may be used to access the other values that are
+    available to the hint (e.g., scope["range_check_builtin"]) and the user-defined variables of
+    the current scope (see VirtualMachineBase.enter_scope()).
+A native hint must behave exactly as its code does.
+"""
+
+import collections
+import dataclasses
+from typing import Callable, Dict, Optional
+
+from starkware.cairo.lang.compiler.program import Program
+
+NativeHintFunction = Callable[..., None]
+
+
+@dataclasses.dataclass(frozen=True)
+class NativeHint:
+    code: str
+    func: NativeHintFunction
+    uses_ids: bool = True
+
+    def run(self, vm, scope: dict):
+        self.func(
+            vm=vm,
+            ids=scope.get("ids") if self.uses_ids else None,
+            memory=scope["memory"],
+            ap=scope["ap"],
+            fp=scope["fp"],
+            scope=scope,
+        )
+
+
+class NativeHintRegistry:
+    """
+    A mapping from the exact code of a hint to its native implementation.
+    """
+
+    def __init__(self):
+        self.hints: Dict[str, NativeHint] = {}
+
+    def register(
+        self, code: str, uses_ids: bool = True
+    ) -> Callable[[NativeHintFunction], NativeHintFunction]:
+        """
+        A decorator that registers the decorated function as the native implementation of the
+        hint with the given code.
+        """
+
+        def decorator(func: NativeHintFunction) -> NativeHintFunction:
+            assert code not in self.hints, f"A native hint is already registered for:\n{code}"
+            self.hints[code] = NativeHint(code=code, func=func, uses_ids=uses_ids)
+            return func
+
+        return decorator
+
+    def get(self, code: str) -> Optional[NativeHint]:
+        return self.hints.get(code)
+
+    def get_non_native_hints(self, program: Program) -> Dict[str, int]:
+        """
+        Returns the code of the hints in the given program that have no native implementation,
+        together with the number of times each of them appears in the program (most common
+        first).
+        """
+        counter = collections.Counter(
+            hint.code
+            for hints in program.hints.values()
+            for hint in hints
+            if hint.code not in self.hints
+        )
+        return dict(counter.most_common())
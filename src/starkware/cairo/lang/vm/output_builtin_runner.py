@@ -27,6 +27,12 @@ class OutputBuiltinRunner(BuiltinRunner):
         self._base = runner.segments.add()
         self.stop_ptr: Optional[RelocatableValue] = None
 
+    def reset(self):
+        self._base = None
+        self.stop_ptr = None
+        self.pages = {}
+        self.attributes = {}
+
     def get_needed_number_allocated_zeros(self) -> int:
         return 0
 
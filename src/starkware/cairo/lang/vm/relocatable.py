@@ -79,20 +79,33 @@ class RelocatableValue:
         1bit | num
         0    | num
         """
+        return RelocatableValue.to_int(value, n_bytes).to_bytes(n_bytes, byte_order)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, byte_order: Endianness) -> "MaybeRelocatable":
+        return cls.from_int(int.from_bytes(data, byte_order), len(data))
+
+    @staticmethod
+    def to_int(value: "MaybeRelocatable", n_bytes: int) -> int:
+        """
+        Returns the integer whose n_bytes-byte representation is the serialization of the given
+        value (see to_bytes()).
+        """
+        relocatable_flag = 1 << (8 * n_bytes - 1)
         if isinstance(value, int):
-            assert value < 2 ** (8 * n_bytes - 1)
-            return value.to_bytes(n_bytes, byte_order)
+            assert value < relocatable_flag
+            return value
         assert n_bytes * 8 > value.SEGMENT_BITS + value.OFFSET_BITS
-        num = 2 ** (8 * n_bytes - 1) + value.segment_index * 2**value.OFFSET_BITS + value.offset
-        return num.to_bytes(n_bytes, byte_order)
+        return relocatable_flag + (value.segment_index << value.OFFSET_BITS) + value.offset
 
     @classmethod
-    def from_bytes(cls, data: bytes, byte_order: Endianness) -> "MaybeRelocatable":
-        n_bytes = len(data)
-        num = int.from_bytes(data, byte_order)
-        if num & (2 ** (8 * n_bytes - 1)):
-            offset = num & (2**cls.OFFSET_BITS - 1)
-            segment_index = (num >> cls.OFFSET_BITS) & (2**cls.SEGMENT_BITS - 1)
+    def from_int(cls, num: int, n_bytes: int) -> "MaybeRelocatable":
+        """
+        The inverse of to_int().
+        """
+        if num >> (8 * n_bytes - 1):
+            offset = num & ((1 << cls.OFFSET_BITS) - 1)
+            segment_index = (num >> cls.OFFSET_BITS) & ((1 << cls.SEGMENT_BITS) - 1)
             return RelocatableValue(segment_index, offset)
         return num
 
@@ -1,12 +1,16 @@
-from typing import Optional
+from typing import Dict, Optional
 
 from starkware.cairo.lang.vm.cairo_runner import CairoRunner
+from starkware.cairo.lang.vm.memory_access_summary import MemoryAccessSummary
 from starkware.cairo.lang.vm.relocatable import RelocatableValue
 from starkware.cairo.lang.vm.vm_exceptions import SecurityError
 
 
 def verify_secure_runner(
-    runner: CairoRunner, verify_builtins: bool = True, program_segment_size: Optional[int] = None
+    runner: CairoRunner,
+    verify_builtins: bool = True,
+    program_segment_size: Optional[int] = None,
+    full_memory_scan: bool = False,
 ):
     """
     Verifies the complete run in runner is safe to relocate and run by another Cairo program.
@@ -19,6 +23,10 @@ def verify_secure_runner(
       can be used when additional data is added to the program
       segment (that is not part of the core program).
     Note: The continuity of builtin segments is checked in builtin specific checks.
+
+    If the memory maintains an access summary (see MemoryDict.enable_access_summary()), the
+    memory checks are done on the summary, in time proportional to the number of segments;
+    the memory is scanned only to report a violation, or if full_memory_scan is True.
     """
     if program_segment_size is None:
         program_segment_size = len(runner.program.data)
@@ -26,6 +34,76 @@ def verify_secure_runner(
     builtin_segments = runner.get_builtin_segments_info() if verify_builtins else {}
     builtin_segment_names = {seg.index: name for name, seg in builtin_segments.items()}
     builtin_segment_sizes = {seg.index: seg.size for seg in builtin_segments.values()}
+    access_summary = runner.vm_memory.access_summary
+    if (
+        full_memory_scan
+        or access_summary is None
+        or not is_secure_access_summary(
+            runner=runner,
+            access_summary=access_summary,
+            builtin_segment_sizes=builtin_segment_sizes,
+            program_segment_size=program_segment_size,
+        )
+    ):
+        verify_secure_memory(
+            runner=runner,
+            builtin_segment_names=builtin_segment_names,
+            builtin_segment_sizes=builtin_segment_sizes,
+            program_segment_size=program_segment_size,
+        )
+
+    # Builtin specific checks.
+    try:
+        for builtin_runner in runner.builtin_runners.values():
+            builtin_runner.run_security_checks(runner)
+    except Exception as exc:
+        raise SecurityError(str(exc))
+
+
+def is_secure_access_summary(
+    runner: CairoRunner,
+    access_summary: MemoryAccessSummary,
+    builtin_segment_sizes: Dict[int, int],
+    program_segment_size: int,
+) -> bool:
+    """
+    Returns True if the memory summarized by access_summary passes the checks of
+    verify_secure_memory(). A False result may be inconclusive (e.g., if the summary requires a
+    full scan).
+    """
+    if access_summary.requires_full_scan:
+        return False
+
+    if any(min_offset < 0 for min_offset in access_summary.min_addr_offsets.values()):
+        return False
+
+    max_addr_offsets = access_summary.max_addr_offsets
+    for segment_index, segment_size in builtin_segment_sizes.items():
+        if max_addr_offsets.get(segment_index, -1) >= segment_size:
+            return False
+    if max_addr_offsets.get(runner.program_base.segment_index, -1) >= program_segment_size:
+        return False
+
+    # Whether a relocatable value is valid depends on its segment and on the range of its
+    # offset; hence, it suffices to check the extreme offsets of each segment.
+    return all(
+        runner.segments.is_valid_memory_value(value=RelocatableValue(segment_index, min_offset))
+        and runner.segments.is_valid_memory_value(
+            value=RelocatableValue(segment_index, access_summary.max_value_offsets[segment_index])
+        )
+        for segment_index, min_offset in access_summary.min_value_offsets.items()
+    )
+
+
+def verify_secure_memory(
+    runner: CairoRunner,
+    builtin_segment_names: Dict[int, str],
+    builtin_segment_sizes: Dict[int, int],
+    program_segment_size: int,
+):
+    """
+    Scans the memory of the run and performs the memory checks of verify_secure_runner().
+    """
     for addr, value in runner.vm_memory.items():
         # Check pure addresses.
         if not isinstance(addr, RelocatableValue):
@@ -49,10 +127,3 @@ def verify_secure_runner(
         # Check memory value, to be consistent with the CairoPie validation done by SHARP.
         if not runner.segments.is_valid_memory_value(value=value):
             raise SecurityError(f"Invalid memory value at address {addr}: {value}.")
-
-    # Builtin specific checks.
-    try:
-        for builtin_runner in runner.builtin_runners.values():
-            builtin_runner.run_security_checks(runner)
-    except Exception as exc:
-        raise SecurityError(str(exc))
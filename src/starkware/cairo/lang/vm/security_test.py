@@ -1,36 +1,54 @@
 import pytest
 
 from starkware.cairo.lang.cairo_constants import DEFAULT_PRIME
-from starkware.cairo.lang.vm.cairo_runner import get_runner_from_code
+from starkware.cairo.lang.compiler.cairo_compile import compile_cairo
+from starkware.cairo.lang.vm import security
+from starkware.cairo.lang.vm.cairo_runner import CairoRunner, run_main_entrypoint
 from starkware.cairo.lang.vm.crypto import get_crypto_lib_context_manager
 from starkware.cairo.lang.vm.relocatable import RelocatableValue
 from starkware.cairo.lang.vm.security import verify_secure_runner
 from starkware.cairo.lang.vm.vm_exceptions import InconsistentAutoDeductionError, SecurityError
 
 
-def run_code_in_runner(code, layout="plain"):
-    return get_runner_from_code(code=code, layout=layout, prime=DEFAULT_PRIME)
+@pytest.fixture(params=[False, True], ids=["full_scan", "access_summary"])
+def access_summary(request) -> bool:
+    return request.param
 
 
-def test_completeness():
+def run_code_in_runner(code, layout="plain", access_summary: bool = False):
+    """
+    Runs the given code. If access_summary is True, the memory maintains an access summary, which
+    is used by verify_secure_runner().
+    """
+    program = compile_cairo(code=code, prime=DEFAULT_PRIME, debug_info=True)
+    runner = CairoRunner(program=program, layout=layout)
+    if access_summary:
+        runner.vm_memory.enable_access_summary()
+    run_main_entrypoint(runner=runner, hint_locals={})
+    return runner
+
+
+def test_completeness(access_summary: bool):
     verify_secure_runner(
         run_code_in_runner(
             """
 main:
 [ap] = 1;
 ret;
-"""
+""",
+            access_summary=access_summary,
         )
     )
 
 
-def test_negative_address():
+def test_negative_address(access_summary: bool):
     runner = run_code_in_runner(
         """
 main:
 [ap] = 0, ap++;
 ret;
-"""
+""",
+        access_summary=access_summary,
     )
     # Access negative offset manually, so it is not taken modulo prime.
     runner.vm_memory.set_without_checks(RelocatableValue(segment_index=0, offset=-17), 0)
@@ -38,7 +56,7 @@ ret;
         verify_secure_runner(runner)
 
 
-def test_out_of_program_bounds():
+def test_out_of_program_bounds(access_summary: bool):
     with pytest.raises(SecurityError, match="Out of bounds access to program segment"):
         verify_secure_runner(
             run_code_in_runner(
@@ -51,18 +69,20 @@ test:
 [ap] = [fp - 1];  // pc.
 [ap] = [[ap] + 4];  // Write right after end of program.
 ret;
-"""
+""",
+                access_summary=access_summary,
             )
         )
 
 
-def test_pure_address_access():
+def test_pure_address_access(access_summary: bool):
     runner = run_code_in_runner(
         """
 main:
 [fp - 1] = [fp - 1];  // nop.
 ret;
-"""
+""",
+        access_summary=access_summary,
     )
     # Access a pure address manually, because runner disallows it as well.
     runner.vm_memory.unfreeze_for_testing()
@@ -72,7 +92,42 @@ ret;
         verify_secure_runner(runner)
 
 
-def test_builtin_segment_access():
+def test_invalid_memory_value(access_summary: bool):
+    runner = run_code_in_runner(
+        """
+main:
+[ap] = 0, ap++;
+ret;
+""",
+        access_summary=access_summary,
+    )
+    # Write a pointer to a nonexistent segment manually.
+    runner.vm_memory.unfreeze_for_testing()
+    runner.vm_memory[runner.execution_base + 100] = RelocatableValue(segment_index=100, offset=0)
+    with pytest.raises(SecurityError, match="Invalid memory value at address 1:100: 100:0."):
+        verify_secure_runner(runner)
+
+
+def test_access_summary_avoids_memory_scan(monkeypatch):
+    runner = run_code_in_runner(
+        """
+main:
+[ap] = 1, ap++;
+ret;
+""",
+        access_summary=True,
+    )
+
+    def fail_memory_scan(**kwargs):
+        raise Exception("Unexpected memory scan.")
+
+    monkeypatch.setattr(security, "verify_secure_memory", fail_memory_scan)
+    verify_secure_runner(runner)
+    with pytest.raises(Exception, match="Unexpected memory scan."):
+        verify_secure_runner(runner, full_memory_scan=True)
+
+
+def test_builtin_segment_access(access_summary: bool):
     with get_crypto_lib_context_manager(flavor=None):
         verify_secure_runner(
             run_code_in_runner(
@@ -88,6 +143,7 @@ main:
 ret;
 """,
                 layout="small",
+                access_summary=access_summary,
             )
         )
 
@@ -102,6 +158,7 @@ main:
 ret;
 """,
         layout="small",
+        access_summary=access_summary,
     )
     # Access out of bounds manually, because runner disallows it as well.
     pedersen_base = runner.builtin_runners["pedersen_builtin"].base
@@ -126,6 +183,7 @@ func main{pedersen_ptr}() {
 }
 """,
                 layout="small",
+                access_summary=access_summary,
             )
         )
 
@@ -0,0 +1,79 @@
+from typing import Iterator, Mapping, Optional, Tuple
+
+import numpy as np
+
+from starkware.cairo.lang.vm.memory_dict import (
+    ADDR_SIZE_IN_BYTES,
+    MemoryDict,
+    UnknownMemoryError,
+    iter_serialized_cells,
+)
+from starkware.cairo.lang.vm.relocatable import MaybeRelocatable, RelocatableValue
+
+
+class SerializedMemoryView(Mapping[MaybeRelocatable, MaybeRelocatable]):
+    """
+    A read-only view of a serialized memory (see MemoryDict.serialize()), which decodes the cells
+    on demand, rather than building a MemoryDict of all of them.
+    The serialized memory may be given in any object that supports the buffer protocol (e.g., bytes
+    or an mmap of an extracted CairoPie memory file); it is not copied.
+    """
+
+    def __init__(self, data, field_bytes: int):
+        self.data = data
+        self.field_bytes = field_bytes
+        cell_dtype = np.dtype([("address", "<u8"), ("value", f"V{field_bytes}")])
+        assert (
+            len(data) % cell_dtype.itemsize == 0
+        ), f"Data must consist of pairs of address (8 bytes) and value ({field_bytes} bytes)."
+        self.cells = np.frombuffer(data, dtype=cell_dtype)
+
+        # An index of the cells by their (encoded) address; computed on the first lookup.
+        self._sorted_cell_indices: Optional[np.ndarray] = None
+        self._sorted_addresses: Optional[np.ndarray] = None
+
+    def __getitem__(self, addr: MaybeRelocatable) -> MaybeRelocatable:
+        cell_index = self._find_cell(addr=addr)
+        if cell_index is None:
+            raise UnknownMemoryError(addr)
+        value_bytes = self.cells[cell_index]["value"].tobytes()
+        return RelocatableValue.from_bytes(value_bytes, "little")
+
+    def __contains__(self, addr) -> bool:
+        return self._find_cell(addr=addr) is not None
+
+    def __iter__(self) -> Iterator[MaybeRelocatable]:
+        for addr_num in self.cells["address"].tolist():
+            yield RelocatableValue.from_int(addr_num, ADDR_SIZE_IN_BYTES)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def iter_cells(self) -> Iterator[Tuple[MaybeRelocatable, MaybeRelocatable]]:
+        """
+        Yields the (address, value) pairs, in the order they were serialized in.
+        """
+        return iter_serialized_cells(data=self.data, field_bytes=self.field_bytes)
+
+    def to_memory_dict(self) -> MemoryDict:
+        return MemoryDict(self.iter_cells())
+
+    def _find_cell(self, addr) -> Optional[int]:
+        """
+        Returns the index of the cell with the given address, or None if there is no such cell.
+        """
+        if not isinstance(addr, (int, RelocatableValue)) or isinstance(addr, bool):
+            return None
+        if isinstance(addr, int) and not 0 <= addr < 2 ** (8 * ADDR_SIZE_IN_BYTES - 1):
+            return None
+
+        if self._sorted_cell_indices is None or self._sorted_addresses is None:
+            addresses = self.cells["address"]
+            self._sorted_cell_indices = np.argsort(addresses, kind="stable")
+            self._sorted_addresses = addresses[self._sorted_cell_indices]
+
+        addr_num = np.uint64(RelocatableValue.to_int(addr, ADDR_SIZE_IN_BYTES))
+        position = int(np.searchsorted(self._sorted_addresses, addr_num))
+        if position == len(self._sorted_addresses) or self._sorted_addresses[position] != addr_num:
+            return None
+        return int(self._sorted_cell_indices[position])
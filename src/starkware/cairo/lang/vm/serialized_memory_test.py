@@ -0,0 +1,51 @@
+import pytest
+
+from starkware.cairo.lang.vm.memory_dict import MemoryDict, UnknownMemoryError
+from starkware.cairo.lang.vm.relocatable import RelocatableValue
+from starkware.cairo.lang.vm.serialized_memory import SerializedMemoryView
+
+MEMORY = MemoryDict(
+    {
+        5: 2**200,
+        RelocatableValue(3, 4): RelocatableValue(6, 7),
+        1: 2,
+        RelocatableValue(0, 8): 0,
+        RelocatableValue(1, 0): RelocatableValue(1, 2**40),
+    }
+)
+
+
+@pytest.fixture
+def memory_view() -> SerializedMemoryView:
+    return SerializedMemoryView(data=MEMORY.serialize(field_bytes=32), field_bytes=32)
+
+
+def test_lookup(memory_view: SerializedMemoryView):
+    for addr, value in MEMORY.items():
+        assert addr in memory_view
+        assert memory_view[addr] == value
+
+    for addr in [0, 2, RelocatableValue(3, 5), RelocatableValue(6, 7), -1, 2**64, "1", None]:
+        assert addr not in memory_view
+
+    with pytest.raises(UnknownMemoryError):
+        memory_view[RelocatableValue(3, 5)]
+
+
+def test_iteration(memory_view: SerializedMemoryView):
+    assert len(memory_view) == len(MEMORY)
+    assert list(memory_view) == list(MEMORY.keys())
+    assert list(memory_view.iter_cells()) == list(MEMORY.items())
+    assert memory_view.to_memory_dict() == MEMORY
+
+
+def test_empty_memory():
+    memory_view = SerializedMemoryView(data=b"", field_bytes=32)
+    assert len(memory_view) == 0
+    assert 1 not in memory_view
+    assert memory_view.to_memory_dict() == MemoryDict()
+
+
+def test_invalid_size():
+    with pytest.raises(AssertionError, match="Data must consist of pairs"):
+        SerializedMemoryView(data=bytes(41), field_bytes=32)
@@ -63,5 +63,15 @@ class ValidatedMemoryDict:
                 self.__validated_addresses |= validated_addresses
 
     def validate_existing_memory(self):
+        if self.__memory.access_summary is not None:
+            # Only the cells in segments with validation rules need to be validated.
+            for segment_index in list(self.__validation_rules.keys()):
+                for offset in sorted(
+                    self.__memory.get_segment_offsets(segment_index=segment_index)
+                ):
+                    addr = RelocatableValue(segment_index, offset)
+                    self._validate_memory_cell(addr, self.__memory.data[addr])
+            return
+
         for addr, value in self.__memory.items():
             self._validate_memory_cell(addr, value)
@@ -2,7 +2,8 @@ import dataclasses
 import re
 import sys
 from abc import ABC
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from types import CodeType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from typing_extensions import Protocol
 
@@ -21,7 +22,9 @@ from starkware.cairo.lang.compiler.program import Program, ProgramBase
 from starkware.cairo.lang.compiler.references import ApDeductionError
 from starkware.cairo.lang.compiler.scoped_name import ScopedName
 from starkware.cairo.lang.vm.builtin_runner import BuiltinRunner
+from starkware.cairo.lang.vm.hint_cache import hint_compilation_cache
 from starkware.cairo.lang.vm.memory_dict import MemoryDict
+from starkware.cairo.lang.vm.native_hints import NativeHint, NativeHintRegistry
 from starkware.cairo.lang.vm.relocatable import MaybeRelocatable, RelocatableValue
 from starkware.cairo.lang.vm.trace_entry import TraceEntry
 from starkware.cairo.lang.vm.utils import decimal_repr
@@ -73,6 +76,32 @@ class VmAttributeScope(AttributeBase):
 class CompiledHint:
     compiled: Any
     consts: Callable[..., VmConsts]
+    # Whether the code of the hint references 'ids'. If False, 'ids' is not constructed for the
+    # hint. Note that a function defined by a previous hint cannot access 'ids' when it is called
+    # from a hint that does not reference 'ids' itself.
+    uses_ids: bool = True
+
+
+# Names that allow a hint to access its global variables dynamically (and thus, to access 'ids'
+# without referencing it directly).
+DYNAMIC_ACCESS_NAMES = frozenset(["eval", "exec", "globals", "locals", "vars"])
+
+
+def may_reference_name(code: Any, name: str) -> bool:
+    """
+    Returns False if the given compiled code (including nested functions and comprehensions)
+    cannot access the global variable with the given name.
+    Returns True if it may access it, or if code is not a code object.
+    """
+    if not isinstance(code, CodeType):
+        return True
+    if name in code.co_names or not DYNAMIC_ACCESS_NAMES.isdisjoint(code.co_names):
+        return True
+    return any(
+        may_reference_name(code=const, name=name)
+        for const in code.co_consts
+        if isinstance(const, CodeType)
+    )
 
 
 class RunContextBase(ABC):
@@ -142,6 +171,7 @@ class VirtualMachineBase(ABC):
         static_locals: Optional[Dict[str, Any]],
         builtin_runners: Dict[str, BuiltinRunner],
         program_base: MaybeRelocatable,
+        native_hints: Optional[NativeHintRegistry] = None,
     ):
         """
         hints - a dictionary from memory addresses to an executable object.
@@ -154,9 +184,12 @@ class VirtualMachineBase(ABC):
         static_locals - dictionary holding static values for execution. They are available in all
           scopes.
         program_base - The pc of the first instruction in program.
+        native_hints - a registry of native implementations of hints (see native_hints.py). Hints
+          that are not found in it are executed with exec().
         """
         self.prime = program.prime
         self.builtin_runners = builtin_runners
+        self.native_hints = native_hints
         self.exec_scopes: List[dict] = []
         self.enter_scope(dict(hint_locals))
         self.hints: Dict[MaybeRelocatable, List[CompiledHint]] = {}
@@ -212,11 +245,17 @@ class VirtualMachineBase(ABC):
                 hint_id = len(self.hint_pc_and_index)
                 relocated_pc = pc + program_base
                 self.hint_pc_and_index[hint_id] = (relocated_pc, hint_index)
+                native_hint = self.get_native_hint(hint.code)
+                compiled = (
+                    native_hint
+                    if native_hint is not None
+                    else self.compile_hint(
+                        hint.code, f"<hint{hint_id}>", hint_index=hint_index, pc=relocated_pc
+                    )
+                )
                 compiled_hints.append(
                     CompiledHint(
-                        compiled=self.compile_hint(
-                            hint.code, f"<hint{hint_id}>", hint_index=hint_index, pc=relocated_pc
-                        ),
+                        compiled=compiled,
                         # Use hint=hint in the lambda's arguments to capture this value (otherwise,
                         # it will use the same hint object for all iterations).
                         consts=lambda pc, ap, fp, memory, hint=hint: VmConsts(
@@ -232,6 +271,11 @@ class VirtualMachineBase(ABC):
                             ),
                             accessible_scopes=hint.accessible_scopes,
                         ),
+                        uses_ids=(
+                            native_hint.uses_ids
+                            if native_hint is not None
+                            else may_reference_name(code=compiled, name="ids")
+                        ),
                     )
                 )
             self.hints[pc + program_base] = compiled_hints
@@ -279,10 +323,11 @@ class VirtualMachineBase(ABC):
     def compile_hint(self, source, filename, hint_index: int, pc: MaybeRelocatable):
         """
         Compiles the given python source code.
+        The compiled code objects are cached (see hint_cache.py).
         This function can be overridden by subclasses.
         """
         try:
-            return compile(source, filename, mode="exec")
+            return hint_compilation_cache.compile(source=source, filename=filename)
         except (IndentationError, SyntaxError):
             hint_exception = HintException(self, *sys.exc_info())
 
@@ -296,13 +341,26 @@ class VirtualMachineBase(ABC):
                 hint_index=hint_index,
             ) from None
 
+    def get_native_hint(self, code: str) -> Optional[NativeHint]:
+        """
+        Returns the native implementation of the hint with the given code, or None if the hint
+        should be compiled and executed with exec().
+        This function can be overridden by subclasses.
+        """
+        if self.native_hints is None:
+            return None
+        return self.native_hints.get(code)
+
     def exec_hint(self, code, globals_, hint_index):
         """
-        Executes the given code with the given globals.
+        Executes the given code (or native hint) with the given globals.
         This function can be overridden by subclasses.
         """
         try:
-            exec(code, globals_)
+            if isinstance(code, NativeHint):
+                code.run(vm=self, scope=globals_)
+            else:
+                exec(code, globals_)
         except Exception:
             hint_exception = HintException(self, *sys.exc_info())
             raise self.as_vm_exception(
@@ -471,6 +529,15 @@ class VirtualMachineBase(ABC):
         """
         Makes sure that all assigned memory cells are consistent with their auto deduction rules.
         """
+        if self.validated_memory.access_summary is not None:
+            # Only the cells in segments with auto deduction rules need to be verified.
+            for segment_index in list(self.auto_deduction.keys()):
+                for offset in sorted(
+                    self.validated_memory.get_segment_offsets(segment_index=segment_index)
+                ):
+                    self.verify_auto_deductions_for_addr(RelocatableValue(segment_index, offset))
+            return
+
         for addr in self.validated_memory:
             self.verify_auto_deductions_for_addr(addr)
 
@@ -509,7 +576,7 @@ class VirtualMachineBase(ABC):
 
 
 def get_perm_range_check_limits(
-    trace: List[TraceEntry[int]], memory: MemoryDict
+    trace: Iterable[TraceEntry[MaybeRelocatable]], memory: MemoryDict
 ) -> Tuple[int, int]:
     """
     Returns the minimum value and maximum value in the perm_range_check component.
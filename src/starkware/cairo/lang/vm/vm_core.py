@@ -1,19 +1,24 @@
 import copy
 import dataclasses
 from functools import lru_cache
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import AbstractSet, Any, Dict, List, Optional, Set, Tuple, Union
 
 from starkware.cairo.lang.compiler.encode import decode_instruction
 from starkware.cairo.lang.compiler.instruction import Instruction, Register
 from starkware.cairo.lang.compiler.program import ProgramBase
+from starkware.cairo.lang.vm.binary_trace import BinaryTrace
 from starkware.cairo.lang.vm.builtin_runner import BuiltinRunner
 from starkware.cairo.lang.vm.memory_dict import MemoryDict
+from starkware.cairo.lang.vm.micro_ops import MicroOp, get_micro_op
+from starkware.cairo.lang.vm.native_hints import NativeHintRegistry
 from starkware.cairo.lang.vm.relocatable import MaybeRelocatable, RelocatableValue
 from starkware.cairo.lang.vm.trace_entry import TraceEntry
 from starkware.cairo.lang.vm.virtual_machine_base import RunContextBase, VirtualMachineBase
 from starkware.cairo.lang.vm.vm_exceptions import PureValueError
 from starkware.python.math_utils import div_mod
 
+Trace = Union[List[TraceEntry[MaybeRelocatable]], BinaryTrace]
+
 
 @dataclasses.dataclass
 class Operands:
@@ -96,6 +101,23 @@ class RunContext(RunContextBase):
 class VirtualMachine(VirtualMachineBase):
     run_context: RunContext
 
+    # Methods that implement the execution of a single instruction. If a subclass overrides any of
+    # them, micro-ops (see micro_ops.py) are not used, since they bypass (or inline) these methods.
+    MICRO_OP_BYPASSED_METHODS = (
+        "compute_operands",
+        "compute_res",
+        "decode_current_instruction",
+        "opcode_assertions",
+        "run_instruction",
+        "update_registers",
+    )
+    # The methods of RunContext that micro-ops inline.
+    MICRO_OP_BYPASSED_RUN_CONTEXT_METHODS = (
+        "compute_dst_addr",
+        "compute_op0_addr",
+        "compute_op1_addr",
+    )
+
     def __init__(
         self,
         program: ProgramBase,
@@ -105,11 +127,18 @@ class VirtualMachine(VirtualMachineBase):
         builtin_runners: Optional[Dict[str, BuiltinRunner]] = None,
         program_base: Optional[MaybeRelocatable] = None,
         enable_instruction_trace: bool = True,
+        trace_sink: Optional[BinaryTrace] = None,
+        program_addresses: Optional[AbstractSet[MaybeRelocatable]] = None,
+        native_hints: Optional[NativeHintRegistry] = None,
     ):
         """
         See documentation in VirtualMachineBase.
 
         program_base - The pc of the first instruction in program (default is run_context.pc).
+        trace_sink - If given, the trace entries are written to it instead of to a list
+          (see BinaryTrace).
+        program_addresses - The addresses of the program's data, if already known (e.g., by a
+          runner that runs the same program repeatedly). Computed from program_base if not given.
         """
         self.run_context = copy.copy(run_context)  # Shallow copy.
         if program_base is None:
@@ -124,17 +153,18 @@ class VirtualMachine(VirtualMachineBase):
             static_locals=static_locals,
             builtin_runners=builtin_runners,
             program_base=program_base,
+            native_hints=native_hints,
         )
 
         # A set to track the memory addresses accessed by actual Cairo instructions (as opposed to
         # hints), necessary for accurate counting of memory holes.
-        self.accessed_addresses: Set[MaybeRelocatable] = {
-            program_base + i for i in range(len(self.program.data))
-        }
+        if program_addresses is None:
+            program_addresses = {program_base + i for i in range(len(self.program.data))}
+        self.accessed_addresses: Set[MaybeRelocatable] = set(program_addresses)
 
-        self._trace: Optional[List[TraceEntry[MaybeRelocatable]]] = (
-            [] if enable_instruction_trace else None
-        )
+        self._trace: Optional[Trace] = None
+        if enable_instruction_trace:
+            self._trace = [] if trace_sink is None else trace_sink
 
         # Current step.
         self.current_step = 0
@@ -151,8 +181,21 @@ class VirtualMachine(VirtualMachineBase):
         # it here.
         self.ecdsa_additional_data: Dict = {}
 
+        # A cache from pc to the micro-op of the instruction at that pc (or None if the instruction
+        # is executed using the generic flow). The cache is filled the first time each pc is
+        # executed, using the instruction in memory. Since memory cells cannot be changed once
+        # written, the cached micro-op remains valid for the rest of the run.
+        self.micro_ops: Dict[MaybeRelocatable, Optional[MicroOp]] = {}
+        self.enable_micro_ops = all(
+            getattr(type(self), name) is getattr(VirtualMachine, name)
+            for name in self.MICRO_OP_BYPASSED_METHODS
+        ) and all(
+            getattr(type(self.run_context), name) is getattr(RunContext, name)
+            for name in self.MICRO_OP_BYPASSED_RUN_CONTEXT_METHODS
+        )
+
     @property
-    def trace(self) -> List[TraceEntry[MaybeRelocatable]]:
+    def trace(self) -> Trace:
         assert self._trace is not None, "Trace is disabled."
         return self._trace
 
@@ -476,7 +519,8 @@ class VirtualMachine(VirtualMachineBase):
             exec_locals["fp"] = fp = self.run_context.fp
             exec_locals["pc"] = pc = self.run_context.pc
             exec_locals["current_step"] = self.current_step
-            exec_locals["ids"] = hint.consts(pc, ap, fp, memory)
+            if hint.uses_ids:
+                exec_locals["ids"] = hint.consts(pc, ap, fp, memory)
 
             exec_locals["vm_load_program"] = self.load_program
             exec_locals["vm_enter_scope"] = self.enter_scope
@@ -503,7 +547,8 @@ class VirtualMachine(VirtualMachineBase):
             del exec_locals["vm_exit_scope"]
             del exec_locals["vm_enter_scope"]
             del exec_locals["vm_load_program"]
-            del exec_locals["ids"]
+            if hint.uses_ids:
+                del exec_locals["ids"]
             del exec_locals["memory"]
             del exec_locals["is_accessed"]
             del exec_locals["vm_add_auto_deduction_rule"]
@@ -513,8 +558,33 @@ class VirtualMachine(VirtualMachineBase):
             if self.skip_instruction_execution:
                 return
 
+        if self.enable_micro_ops:
+            pc = self.run_context.pc
+            try:
+                micro_op = self.micro_ops[pc]
+            except KeyError:
+                micro_op = self.micro_ops[pc] = self.load_micro_op()
+            if micro_op is not None:
+                micro_op(self)
+                return
+
         # Decode.
         instruction = self.decode_current_instruction()
 
         # Run.
         self.run_instruction(instruction)
+
+    def load_micro_op(self) -> Optional[MicroOp]:
+        """
+        Returns the micro-op of the instruction at the current pc, or None if the instruction
+        should be executed using the generic flow.
+        """
+        # Decode the instruction to make sure it is valid (and raise the same errors as the generic
+        # flow otherwise).
+        try:
+            instruction_encoding, imm = self.run_context.get_instruction_encoding()
+            self.decode_instruction(instruction_encoding, imm)
+        except Exception as exc:
+            raise self.as_vm_exception(exc) from None
+
+        return get_micro_op(encoded_instruction=instruction_encoding, prime=self.prime)
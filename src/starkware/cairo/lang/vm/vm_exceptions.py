@@ -85,6 +85,11 @@ class HintException(VmExceptionBase):
         # First item in the traceback is the call to exec, remove it.
         assert tb_exception.stack[0].filename.endswith("virtual_machine_base.py")
         del tb_exception.stack[0]
+        # Remove the calls to the hint compilation cache (when the hint was compiled).
+        while len(tb_exception.stack) > 0 and tb_exception.stack[0].filename.endswith(
+            "hint_cache.py"
+        ):
+            del tb_exception.stack[0]
 
         # If we have location information, replace '<hint*>' entries with the correct filename
         # and line.
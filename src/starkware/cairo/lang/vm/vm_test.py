@@ -458,6 +458,60 @@ def test_hint_scopes():
         vm.step()
 
 
+def test_hint_vm_locals():
+    code = """
+%{
+    assert 'ap' in globals() and 'PRIME' in globals()
+    assert globals().get('memory') is memory
+    assert [ap + i for i in range(2)] == [100, 101]
+    x = 17
+    # Assignments to names provided by the VM only last until the end of the hint.
+    memory = None
+    PRIME = 0
+    assert memory is None and PRIME == 0
+%}
+[ap] = 1, ap++;
+%{
+    assert x == 17
+    assert memory is not None and PRIME != 0
+%}
+[ap] = 2, ap++;
+"""
+
+    vm = run_single(code, 2)
+    # Other than the registers and the current step, the values provided by the VM are not kept
+    # in the scope after the hints are executed.
+    exec_scope = vm.exec_scopes[-1]
+    assert exec_scope["x"] == 17
+    assert exec_scope["ap"] == vm.run_context.ap - 1
+    assert exec_scope["current_step"] == 1
+    assert "memory" not in exec_scope and "PRIME" not in exec_scope and "ids" not in exec_scope
+
+
+def test_hint_ids():
+    code = """
+func main() {
+    alloc_locals;
+    local x = 7;
+    %{
+        def get_x():
+            return ids.x
+    %}
+    %{ assert get_x() == ids.x == 7 %}
+    %{ assert all(ids.x == 7 for _ in range(3)) %}
+    %{ y = 1 %}
+    %{ assert globals()['ids'].x == 7 %}
+    ret;
+}
+"""
+    program = compile_cairo(code, PRIME, debug_info=True)
+    vm = run_program_in_vm(program=program, steps=3, pc=0, extra_mem={98: 0}, prime=PRIME)
+    assert "ids" not in vm.exec_scopes[-1]
+    # 'ids' is only constructed for hints that may reference it.
+    (hints,) = [hints for hints in vm.hints.values() if len(hints) == 5]
+    assert [hint.uses_ids for hint in hints] == [True, True, True, False, True]
+
+
 def test_skip_instruction_execution():
     code = """
 %{
@@ -658,6 +712,98 @@ def test_simple_deductions():
     ]
 
 
+def test_micro_ops():
+    code = """
+[ap] = 200, ap++;
+call compute;
+end:
+jmp end;
+
+func fib(a, b, n) -> felt {
+    if (n == 0) {
+        return a;
+    }
+    return fib(a=b, b=a + b, n=n - 1);
+}
+
+func compute(ptr: felt*) {
+    assert [ptr] = 7;
+    let res = fib(1, 1, 10);
+    assert [ptr + 1] = res * [ptr];
+    tempvar x = [ptr + 1] / 3;
+    [ap] = [[fp - 3] + 1], ap++;
+    ap += 3;
+    jmp rel 2;
+    ret;
+}
+"""
+    program = compile_cairo(code, PRIME, debug_info=True)
+
+    def run_vm(enable_micro_ops: bool) -> VirtualMachine:
+        program_base = RelocatableValue(0, 0)
+        execution_base = RelocatableValue(1, 100)
+        context = RunContext(
+            pc=program_base,
+            ap=execution_base,
+            fp=execution_base,
+            memory=MemoryDict(
+                {
+                    **{program_base + i: v for i, v in enumerate(program.data)},
+                    execution_base - 1: 1234,
+                }
+            ),
+            prime=PRIME,
+        )
+        vm = VirtualMachine(program, context, {})
+        vm.enable_micro_ops = enable_micro_ops
+        for _ in range(100):
+            vm.step()
+        return vm
+
+    generic_vm = run_vm(enable_micro_ops=False)
+    micro_ops_vm = run_vm(enable_micro_ops=True)
+    assert generic_vm.run_context.pc == RelocatableValue(0, program.get_label("end"))
+    assert len(generic_vm.micro_ops) == 0
+    assert len(micro_ops_vm.micro_ops) > 0
+    assert micro_ops_vm.trace == generic_vm.trace
+    assert micro_ops_vm.run_context == generic_vm.run_context
+    assert micro_ops_vm.accessed_addresses == generic_vm.accessed_addresses
+    assert micro_ops_vm.current_step == generic_vm.current_step
+
+
+def test_micro_ops_disabled_by_override():
+    class CustomVirtualMachine(VirtualMachine):
+        def compute_res(self, instruction, op0, op1):
+            return super().compute_res(instruction, op0, op1)
+
+    program = compile_cairo("[ap] = [ap - 1] + 2, ap++;", PRIME, debug_info=True)
+    context = RunContext(
+        pc=0,
+        ap=100,
+        fp=100,
+        memory=MemoryDict({**dict(enumerate(program.data)), 99: 3}),
+        prime=PRIME,
+    )
+    assert VirtualMachine(program, context, {}).enable_micro_ops
+    assert not CustomVirtualMachine(program, context, {}).enable_micro_ops
+
+    # Methods that micro-ops call only on failure, or inline, count as well.
+    class AssertingVirtualMachine(VirtualMachine):
+        def opcode_assertions(self, instruction, operands):
+            super().opcode_assertions(instruction, operands)
+
+    assert not AssertingVirtualMachine(program, context, {}).enable_micro_ops
+
+    class CustomRunContext(RunContext):
+        def compute_dst_addr(self, instruction):
+            return super().compute_dst_addr(instruction)
+
+    custom_context = CustomRunContext(
+        pc=context.pc, ap=context.ap, fp=context.fp, memory=context.memory, prime=PRIME
+    )
+    assert not VirtualMachine(program, custom_context, {}).enable_micro_ops
+
+
 def test_failing_assert_eq():
     code = """
 [ap] = [ap + 1] + [ap + 2];
@@ -1,3 +1,6 @@
+import functools
+from typing import Iterable, List, Optional, Sequence, Tuple
+
 from fastecdsa.curve import Curve
 from fastecdsa.point import Point
 
@@ -22,6 +25,15 @@ P_1 = Point(*CONSTANT_POINTS[2 + LOW_PART_BITS], curve=curve)
 P_2 = Point(*CONSTANT_POINTS[2 + N_ELEMENT_BITS_HASH], curve=curve)
 P_3 = Point(*CONSTANT_POINTS[2 + N_ELEMENT_BITS_HASH + LOW_PART_BITS], curve=curve)
 
+# The number of bits of each window of the precomputed tables of pedersen_hash_many().
+WINDOW_BITS = 8
+WINDOW_MASK = 2**WINDOW_BITS - 1
+N_LOW_PART_WINDOWS = -(-LOW_PART_BITS // WINDOW_BITS)
+
+AffinePoint = Tuple[int, int]
+# A table of multiples of a point: table[i][k] = k * 2**(WINDOW_BITS * i) * point (None for k = 0).
+WindowTable = List[List[Optional[AffinePoint]]]
+
 
 def process_single_element(element: int, p1, p2) -> Point:
     assert 0 <= element < FIELD_PRIME, "Element integer value is out of range"
@@ -50,3 +62,137 @@ def pedersen_hash_func(x: bytes, y: bytes) -> bytes:
     """
     assert len(x) == len(y) == 32, "Unexpected element length."
     return to_bytes(pedersen_hash(*(from_bytes(element) for element in (x, y))))
+
+
+def ec_add_affine(point1: AffinePoint, point2: AffinePoint) -> AffinePoint:
+    """
+    Adds two points, handling the doubling case. The result must not be the point at infinity.
+    """
+    x1, y1 = point1
+    x2, y2 = point2
+    if x1 == x2:
+        assert y1 == y2 != 0, "Unexpected point at infinity."
+        slope = (3 * x1 * x1 + ALPHA) * pow(2 * y1, -1, FIELD_PRIME) % FIELD_PRIME
+    else:
+        slope = (y2 - y1) * pow(x2 - x1, -1, FIELD_PRIME) % FIELD_PRIME
+    x3 = (slope * slope - x1 - x2) % FIELD_PRIME
+    return x3, (slope * (x1 - x3) - y1) % FIELD_PRIME
+
+
+def compute_window_tables(points: Sequence[AffinePoint], n_windows: int) -> List[WindowTable]:
+    """
+    Returns the window tables of the given points (computed together, using batch_add()).
+    """
+    # The bases of the windows: 2**(WINDOW_BITS * i) * point.
+    bases: List[AffinePoint] = []
+    for point in points:
+        base = point
+        for _ in range(n_windows):
+            bases.append(base)
+            for _ in range(WINDOW_BITS):
+                base = ec_add_affine(base, base)
+
+    rows: List[List[Optional[AffinePoint]]] = [
+        [None, base, ec_add_affine(base, base)] for base in bases
+    ]
+    for _ in range(WINDOW_MASK - 2):
+        multiples = [row[-1] for row in rows]
+        batch_add(points=multiples, addends=bases)
+        for row, multiple in zip(rows, multiples):
+            assert multiple is not None
+            row.append(multiple)
+
+    return [rows[i : i + n_windows] for i in range(0, len(rows), n_windows)]
+
+
+@functools.lru_cache(maxsize=None)
+def get_window_tables() -> Tuple[WindowTable, WindowTable, WindowTable, WindowTable]:
+    """
+    Returns the precomputed tables of P_0, P_1, P_2 and P_3 used by pedersen_hash_many().
+    The tables are computed on the first call.
+    """
+    p0_table, p2_table = compute_window_tables(
+        points=[(P_0.x, P_0.y), (P_2.x, P_2.y)], n_windows=N_LOW_PART_WINDOWS
+    )
+    p1_table, p3_table = compute_window_tables(points=[(P_1.x, P_1.y), (P_3.x, P_3.y)], n_windows=1)
+    return p0_table, p1_table, p2_table, p3_table
+
+
+def batch_add(points: List[Optional[AffinePoint]], addends: Sequence[Optional[AffinePoint]]):
+    """
+    Sets points[i] += addends[i] for every i, using a single field inversion for all the additions
+    (Montgomery's trick).
+    A None addend is skipped. If the addition is a doubling (or results in the point at infinity),
+    points[i] is set to None, and the hash is later computed by pedersen_hash().
+    """
+    indices = []
+    # The product of the denominators of the preceding additions.
+    prefix_products = []
+    product = 1
+    for i, addend in enumerate(addends):
+        point = points[i]
+        if addend is None or point is None:
+            continue
+        denominator = (addend[0] - point[0]) % FIELD_PRIME
+        if denominator == 0:
+            points[i] = None
+            continue
+        indices.append(i)
+        prefix_products.append(product)
+        product = product * denominator % FIELD_PRIME
+
+    if len(indices) == 0:
+        return
+
+    # The inverse of the product of the denominators of the additions that were not handled yet.
+    inverse = pow(product, -1, FIELD_PRIME)
+    for i, prefix_product in zip(reversed(indices), reversed(prefix_products)):
+        x1, y1 = points[i]  # type: ignore[misc]
+        x2, y2 = addends[i]  # type: ignore[misc]
+        slope = (y2 - y1) * inverse * prefix_product % FIELD_PRIME
+        inverse = inverse * (x2 - x1) % FIELD_PRIME
+        x3 = (slope * slope - x1 - x2) % FIELD_PRIME
+        points[i] = (x3, (slope * (x1 - x3) - y1) % FIELD_PRIME)
+
+
+def pedersen_hash_many(pairs: Iterable[Tuple[int, int]]) -> List[int]:
+    """
+    Computes pedersen_hash(x, y) for every pair (x, y) in the given pairs.
+    Much faster than calling pedersen_hash() for each pair, as it uses precomputed tables of the
+    multiples of P_0, ..., P_3 and computes the additions of all the hashes together, with
+    a single field inversion per round of additions.
+    """
+    pairs = list(pairs)
+    for x, y in pairs:
+        for element in (x, y):
+            assert 0 <= element < FIELD_PRIME, "Element integer value is out of range"
+
+    p0_table, p1_table, p2_table, p3_table = get_window_tables()
+    points: List[Optional[AffinePoint]] = [(SHIFT_POINT[0], SHIFT_POINT[1]) for _ in pairs]
+    for element_index, low_table, high_table in ((0, p0_table, p1_table), (1, p2_table, p3_table)):
+        elements = [pair[element_index] for pair in pairs]
+        batch_add(
+            points=points,
+            addends=[high_table[0][element >> LOW_PART_BITS] for element in elements],
+        )
+        for window_index, window_table in enumerate(low_table):
+            shift = window_index * WINDOW_BITS
+            batch_add(
+                points=points,
+                addends=[window_table[(element >> shift) & WINDOW_MASK] for element in elements],
+            )
+
+    return [
+        pedersen_hash(x, y) if point is None else point[0] for (x, y), point in zip(pairs, points)
+    ]
+
+
+def pedersen_hash_func_many(pairs: Iterable[Tuple[bytes, bytes]]) -> List[bytes]:
+    """
+    A variant of 'pedersen_hash_many', where the elements and their resulting hashes are in bytes.
+    """
+    int_pairs = []
+    for x, y in pairs:
+        assert len(x) == len(y) == 32, "Unexpected element length."
+        int_pairs.append((from_bytes(x), from_bytes(y)))
+    return [to_bytes(res) for res in pedersen_hash_many(int_pairs)]
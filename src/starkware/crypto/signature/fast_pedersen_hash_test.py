@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from starkware.crypto.signature.fast_pedersen_hash import (
+    P_0,
+    P_2,
+    batch_add,
+    ec_add_affine,
+    pedersen_hash,
+    pedersen_hash_func,
+    pedersen_hash_func_many,
+    pedersen_hash_many,
+)
+from starkware.crypto.signature.signature import FIELD_PRIME
+from starkware.python.random_test_utils import parametrize_random_object
+from starkware.python.utils import to_bytes
+
+
+@parametrize_random_object()
+def test_pedersen_hash_many(random_object: random.Random):
+    elements = [0, 1, 2**248 - 1, 2**248, FIELD_PRIME - 1] + [
+        random_object.randrange(FIELD_PRIME) for _ in range(20)
+    ]
+    pairs = [(x, y) for x in elements[:5] for y in elements[:5]] + list(
+        zip(elements[5:], reversed(elements))
+    )
+    assert pedersen_hash_many(pairs) == [pedersen_hash(x, y) for x, y in pairs]
+    assert pedersen_hash_many([]) == []
+
+    bytes_pairs = [(to_bytes(x), to_bytes(y)) for x, y in pairs]
+    assert pedersen_hash_func_many(bytes_pairs) == [
+        pedersen_hash_func(x, y) for x, y in bytes_pairs
+    ]
+
+
+def test_pedersen_hash_many_out_of_range():
+    with pytest.raises(AssertionError, match="Element integer value is out of range"):
+        pedersen_hash_many([(1, 2), (FIELD_PRIME, 0)])
+
+
+def test_batch_add():
+    p0 = (P_0.x, P_0.y)
+    p2 = (P_2.x, P_2.y)
+    points = [p0, p0, p2, p0]
+    batch_add(points=points, addends=[p2, p0, None, (p0[0], FIELD_PRIME - p0[1])])
+    # Doubling and the point at infinity are not handled by batch_add().
+    assert points == [ec_add_affine(p0, p2), None, p2, None]
@@ -0,0 +1,53 @@
+"""
+Compares the throughput of pedersen_hash() and pedersen_hash_many().
+"""
+
+import argparse
+import random
+import time
+
+from starkware.crypto.signature.fast_pedersen_hash import (
+    get_window_tables,
+    pedersen_hash,
+    pedersen_hash_many,
+)
+from starkware.crypto.signature.signature import FIELD_PRIME
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the Pedersen hash implementations.")
+    parser.add_argument("--n_hashes", type=int, default=1000)
+    parser.add_argument("--batch_size", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random_object = random.Random(args.seed)
+    pairs = [
+        (random_object.randrange(FIELD_PRIME), random_object.randrange(FIELD_PRIME))
+        for _ in range(args.n_hashes)
+    ]
+
+    start_time = time.perf_counter()
+    get_window_tables()
+    print(f"Precomputation: {time.perf_counter() - start_time:.3f}s.")
+
+    start_time = time.perf_counter()
+    expected = [pedersen_hash(x, y) for x, y in pairs]
+    single_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    res = []
+    for i in range(0, len(pairs), args.batch_size):
+        res += pedersen_hash_many(pairs[i : i + args.batch_size])
+    batch_time = time.perf_counter() - start_time
+
+    assert res == expected, "pedersen_hash_many() returned a wrong result."
+    print(f"pedersen_hash: {args.n_hashes / single_time:.0f} hashes/sec.")
+    print(
+        f"pedersen_hash_many (batch size {args.batch_size}): "
+        f"{args.n_hashes / batch_time:.0f} hashes/sec."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,17 @@
 import asyncio
 import bisect
 import contextlib
+import gc
 import itertools
 import logging
 import os
 import random
 import re
 import subprocess
+import tempfile
 import threading
 import time
-from collections import UserDict
+from collections import UserDict, deque
 from concurrent.futures import Executor
 from typing import (
     Any,
@@ -18,8 +20,10 @@ from typing import (
     AsyncIterable,
     AsyncIterator,
     Awaitable,
+    BinaryIO,
     Callable,
     Coroutine,
+    Deque,
     Dict,
     Generic,
     Iterable,
@@ -40,6 +44,8 @@ from starkware.python.math_utils import div_ceil
 # All functions with stubs are imported from this module.
 from starkware.python.utils_stub_module import *  # noqa
 
+logger = logging.getLogger(__name__)
+
 DIR = os.path.dirname(__file__)
 
 
@@ -507,6 +513,69 @@ async def gen_gather_in_chunks(
             yield element
 
 
+async def gather_with_concurrency(
+    awaitables: Iterable[Awaitable[T]], max_concurrency: int
+) -> List[T]:
+    """
+    Awaits on the given awaitables, such that at most max_concurrency of them are awaited at the
+    same time; Returns a list containing the results (in the order of the awaitables).
+    Unlike gather_in_chunks, a new awaitable is started as soon as any of the running ones is done,
+    and the awaitables are taken from the given iterable lazily.
+    """
+    assert max_concurrency > 0, f"max_concurrency must be greater than 0; got: {max_concurrency}."
+
+    results: Dict[int, T] = {}
+    indexed_awaitables = enumerate(awaitables)
+
+    async def worker():
+        # All the workers share the same iterator; each takes the next awaitable when it is free.
+        for index, awaitable in indexed_awaitables:
+            results[index] = await awaitable
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(max_concurrency)]
+    try:
+        await asyncio.gather(*workers)
+    except BaseException:
+        for future in workers:
+            future.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        raise
+
+    return [results[index] for index in range(len(results))]
+
+
+async def gen_gather_with_concurrency(
+    awaitables: Iterable[Awaitable[T]], max_concurrency: int
+) -> AsyncIterator[T]:
+    """
+    Same as gather_with_concurrency, but yields the results (in the order of the awaitables) as
+    soon as they are available. Up to max_concurrency awaitables are awaited ahead of the one whose
+    result is yielded next.
+    """
+    assert max_concurrency > 0, f"max_concurrency must be greater than 0; got: {max_concurrency}."
+
+    awaitables_iterator = iter(awaitables)
+    pending: Deque[asyncio.Future] = deque(
+        asyncio.ensure_future(awaitable)
+        for awaitable in itertools.islice(awaitables_iterator, max_concurrency)
+    )
+    try:
+        while len(pending) > 0:
+            result = await pending.popleft()
+            # Start the next awaitable before yielding, so that it runs while the caller handles
+            # the result.
+            pending.extend(
+                asyncio.ensure_future(awaitable)
+                for awaitable in itertools.islice(awaitables_iterator, 1)
+            )
+            yield result
+    finally:
+        # Reached if the caller stops the iteration early, or if an awaitable fails.
+        for future in pending:
+            future.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
 async def process_concurrently(
     func: Callable[[T], V], items: Sequence[T], n_chunks: int, executor: Optional[Executor] = None
 ) -> List[V]:
@@ -595,6 +664,71 @@ def log_time(logger: logging.Logger, name: str):
         logger.info(f"Ran '{name}'. Elapsed: {time.time() - start}.")
 
 
+@contextlib.contextmanager
+def gc_disabled() -> Iterator[None]:
+    """
+    Disables the garbage collector in the context; e.g., when unpickling, which creates many
+    objects and no garbage, so that the collections it triggers are wasted.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def write_file_atomically(path: str, write: Callable[[BinaryIO], None]) -> bool:
+    """
+    Writes the file at the given path using write(), e.g., an entry of an on-disk cache. The file
+    is written to a temporary file in the same directory (which is created if needed) and then
+    renamed, so that concurrent readers never see a partial file.
+    A failure (e.g., an OSError, or a PicklingError or RecursionError raised by write()) is logged
+    rather than raised, and the temporary file is removed. Returns whether the file was written.
+    """
+    tmp_path: Optional[str] = None
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory or os.curdir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fp:
+            write(fp)
+        os.replace(tmp_path, path)
+        tmp_path = None
+        return True
+    except Exception as exception:
+        logger.warning(f"Failed to write {path}: {get_exception_repr(exception=exception)}.")
+        return False
+    finally:
+        if tmp_path is not None:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+
+
+def remove_oldest_files(directory: str, suffix: str, max_files: int):
+    """
+    Removes the least recently written files with the given suffix in the given directory (e.g.,
+    the entries of an on-disk cache), so that at most max_files of them remain. Failures are
+    ignored, as the files may be removed concurrently.
+    """
+    files = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(suffix):
+                    with contextlib.suppress(OSError):
+                        files.append((entry.stat().st_mtime, entry.path))
+    except OSError:
+        return
+
+    files.sort()
+    for _, path in files[: max(len(files) - max_files, 0)]:
+        with contextlib.suppress(OSError):
+            os.unlink(path)
+
+
 def to_ascii_string(value: str) -> str:
     """
     Converts the given string to an ascii-encodeable one by replacing non-ascii characters with '?'.
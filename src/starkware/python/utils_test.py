@@ -1,6 +1,8 @@
 import asyncio
 import dataclasses
 import functools
+import os
+import pickle
 import random
 import re
 import string
@@ -10,6 +12,7 @@ import pytest
 
 from starkware.python.utils import (
     WriteOnceDict,
+    aclosing,
     aclosing_context_manager,
     all_subclasses,
     as_non_optional,
@@ -18,15 +21,19 @@ from starkware.python.utils import (
     composite,
     execute_coroutine_threadsafe,
     gather_in_chunks,
+    gather_with_concurrency,
+    gen_gather_with_concurrency,
     indent,
     is_in_sorted_sequence,
     iter_blockify,
     multiply_counter_by_scalar,
     process_concurrently,
+    remove_oldest_files,
     safe_zip,
     subtract_mappings,
     to_ascii_string,
     unique,
+    write_file_atomically,
 )
 
 
@@ -139,6 +146,65 @@ async def test_gather_in_chunks():
     assert result == list(range(n_awaitables))
 
 
+@pytest.mark.asyncio
+async def test_gather_with_concurrency():
+    n_running = 0
+    max_running = 0
+
+    async def foo(i: int):
+        nonlocal n_running, max_running
+        n_running += 1
+        max_running = max(max_running, n_running)
+        await asyncio.sleep(random.random() / 1000)
+        n_running -= 1
+        return i
+
+    n_awaitables = 20
+    result = await gather_with_concurrency(
+        awaitables=(foo(i) for i in range(n_awaitables)), max_concurrency=3
+    )
+    assert result == list(range(n_awaitables))
+    assert max_running == 3
+
+    async def fail(i: int):
+        raise Exception(f"Failure {i}.")
+
+    with pytest.raises(Exception, match="Failure 0."):
+        await gather_with_concurrency(awaitables=[fail(0)], max_concurrency=2)
+
+
+@pytest.mark.asyncio
+async def test_gen_gather_with_concurrency():
+    n_started = 0
+
+    async def foo(i: int):
+        nonlocal n_started
+        n_started += 1
+        await asyncio.sleep(random.random() / 1000)
+        return i
+
+    n_awaitables = 20
+    result = []
+    async for i in gen_gather_with_concurrency(
+        awaitables=(foo(i) for i in range(n_awaitables)), max_concurrency=3
+    ):
+        # At most 3 awaitables are started ahead of the current one.
+        assert n_started <= i + 1 + 3
+        result.append(i)
+    assert result == list(range(n_awaitables))
+
+    # Stop the iteration early.
+    n_started = 0
+    async with aclosing(
+        agen=gen_gather_with_concurrency(
+            awaitables=(foo(i) for i in range(n_awaitables)), max_concurrency=3
+        )
+    ) as gen:
+        async for i in gen:
+            break
+    assert n_started <= 4
+
+
 def test_all_subclasses():
     # Inheritance graph, the lower rows inherit from the upper rows.
     #   A   B
@@ -298,3 +364,39 @@ def test_subtract_mappings():
     a = {"red": 1, "green": 2, "blue": 3}
     b = {"yellow": 1, "green": 2, "blue": 4}
     assert subtract_mappings(a, b) == {"red": 1, "blue": 3}
+
+
+def test_write_file_atomically(tmp_path):
+    path = os.path.join(tmp_path, "dir", "file")
+    assert write_file_atomically(path=path, write=lambda fp: fp.write(b"value"))
+    with open(path, "rb") as fp:
+        assert fp.read() == b"value"
+
+    # Failures are not raised, and leave neither the file nor a temporary file behind.
+    def write_unpicklable(fp):
+        pickle.dump(lambda: None, fp)
+
+    other_path = os.path.join(tmp_path, "dir", "other_file")
+    assert not write_file_atomically(path=other_path, write=write_unpicklable)
+    assert os.listdir(os.path.join(tmp_path, "dir")) == ["file"]
+
+
+def test_write_file_atomically_relative_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert write_file_atomically(path="file", write=lambda fp: fp.write(b"value"))
+    assert os.listdir(tmp_path) == ["file"]
+
+
+def test_remove_oldest_files(tmp_path):
+    for i in range(4):
+        path = os.path.join(tmp_path, f"{i}.entry")
+        with open(path, "wb"):
+            pass
+        os.utime(path, (i, i))
+    with open(os.path.join(tmp_path, "other"), "wb"):
+        pass
+
+    remove_oldest_files(directory=str(tmp_path), suffix=".entry", max_files=2)
+    assert sorted(os.listdir(tmp_path)) == ["2.entry", "3.entry", "other"]
+    # A missing directory is ignored.
+    remove_oldest_files(directory=os.path.join(tmp_path, "missing"), suffix=".entry", max_files=0)
@@ -1,6 +1,5 @@
 import asyncio
 import contextlib
-import dataclasses
 import functools
 import logging
 from typing import Any, Dict, List, Optional, Union, cast
@@ -13,9 +12,6 @@ from starkware.cairo.lang.vm.security import SecurityError
 from starkware.cairo.lang.vm.utils import ResourcesError, RunResources
 from starkware.cairo.lang.vm.vm_exceptions import HintException, VmException, VmExceptionBase
 from starkware.python.utils import as_non_optional
-from starkware.starknet.builtins.segment_arena.segment_arena_builtin_runner import (
-    SegmentArenaBuiltinRunner,
-)
 from starkware.starknet.business_logic.execution.deprecated_objects import ExecutionResourcesManager
 from starkware.starknet.business_logic.execution.execute_entry_point_base import (
     ExecuteEntryPointBase,
@@ -28,6 +24,7 @@ from starkware.starknet.business_logic.execution.objects import (
     OrderedL2ToL1Message,
     TransactionExecutionContext,
 )
+from starkware.starknet.business_logic.execution.runner_pool import runner_pool
 from starkware.starknet.business_logic.state.state import ContractStorageState, StateSyncifier
 from starkware.starknet.business_logic.state.state_api import State, SyncState
 from starkware.starknet.business_logic.utils import (
@@ -238,33 +235,40 @@ class ExecuteEntryPoint(ExecuteEntryPointBase):
         tx_execution_context: TransactionExecutionContext,
         support_reverted: bool,
     ) -> CallInfo:
-        # Fix the current resources usage, in order to calculate the usage of this run at the end.
-        previous_cairo_usage = resources_manager.cairo_usage
-
-        # Create a dummy layout.
-        layout = dataclasses.replace(
-            STARKNET_LAYOUT_INSTANCE,
-            builtins={**STARKNET_LAYOUT_INSTANCE.builtins, "segment_arena": {}},
-        )
-
         # Prepare runner.
         entry_point = self._get_selected_entry_point(
             compiled_class=compiled_class, class_hash=class_hash
         )
-        program = compiled_class.get_runnable_program(
-            entrypoint_builtins=as_non_optional(entry_point.builtins)
-        )
-        with wrap_with_stark_exception(code=StarknetErrorCode.SECURITY_ERROR):
-            runner = CairoFunctionRunner(
-                program=program,
-                layout=layout,
-                additional_builtin_factories=dict(
-                    segment_arena=lambda name, included: SegmentArenaBuiltinRunner(
-                        included=included
-                    )
-                ),
+        with runner_pool.acquire(
+            compiled_class=compiled_class,
+            compiled_class_hash=state.get_compiled_class_hash(class_hash=class_hash),
+            entrypoint_builtins=as_non_optional(entry_point.builtins),
+        ) as runner:
+            return self._execute_with_runner(
+                runner=runner,
+                state=state,
+                entry_point=entry_point,
+                class_hash=class_hash,
+                resources_manager=resources_manager,
+                general_config=general_config,
+                tx_execution_context=tx_execution_context,
+                support_reverted=support_reverted,
             )
 
+    def _execute_with_runner(
+        self,
+        runner: CairoFunctionRunner,
+        state: SyncState,
+        entry_point: CompiledClassEntryPoint,
+        class_hash: int,
+        resources_manager: ExecutionResourcesManager,
+        general_config: StarknetGeneralConfig,
+        tx_execution_context: TransactionExecutionContext,
+        support_reverted: bool,
+    ) -> CallInfo:
+        # Fix the current resources usage, in order to calculate the usage of this run at the end.
+        previous_cairo_usage = resources_manager.cairo_usage
+
         # Prepare implicit arguments.
         initial_gas_call = self.initial_gas - GasCost.ENTRY_POINT_INITIAL_BUDGET.value
         if initial_gas_call < 0:
@@ -332,7 +336,7 @@ class ExecuteEntryPoint(ExecuteEntryPointBase):
         ]
 
         # Run.
-        with clean_leaks(runner=runner, syscall_handler=syscall_handler):
+        with clean_leaks(runner=runner, syscall_handler=syscall_handler, keep_runner=True):
             self._run(
                 runner=runner,
                 entry_point_offset=entry_point.offset,
@@ -637,14 +641,20 @@ class ExecuteEntryPoint(ExecuteEntryPointBase):
 def clean_leaks(
     runner: CairoFunctionRunner,
     syscall_handler: Union[DeprecatedBlSyscallHandler, BusinessLogicSyscallHandler],
+    keep_runner: bool = False,
 ):
+    """
+    If keep_runner is True, the runner itself remains usable (e.g., for a runner that is returned
+    to the runner pool); only the state of its VM is deleted.
+    """
     # There are memory leaks around these objects; delete some of them as a temporary fix.
     try:
         yield
     finally:
-        del runner.program
-        del runner.memory
-        del runner.segments
+        if not keep_runner:
+            del runner.program
+            del runner.memory
+            del runner.segments
         del runner.vm.hints
         del runner.vm.exec_scopes
         del runner.vm.program
@@ -0,0 +1,159 @@
+import contextlib
+import dataclasses
+import threading
+from collections import OrderedDict
+from typing import Iterator, List, Tuple
+
+from starkware.cairo.common.cairo_function_runner import CairoFunctionRunner
+from starkware.cairo.lang.compiler.program import Program
+from starkware.starknet.builtins.segment_arena.segment_arena_builtin_runner import (
+    SegmentArenaBuiltinRunner,
+)
+from starkware.starknet.definitions.error_codes import StarknetErrorCode
+from starkware.starknet.definitions.general_config import STARKNET_LAYOUT_INSTANCE
+from starkware.starknet.services.api.contract_class.contract_class import CompiledClass
+from starkware.starkware_utils.error_handling import wrap_with_stark_exception
+
+# The layout used to run Cairo 1.0 entry points; a dummy layout that also contains the
+# segment_arena builtin.
+ENTRY_POINT_LAYOUT = dataclasses.replace(
+    STARKNET_LAYOUT_INSTANCE,
+    builtins={**STARKNET_LAYOUT_INSTANCE.builtins, "segment_arena": {}},
+)
+
+# The default limits of a RunnerPool; every idle runner keeps the memory of its program.
+DEFAULT_MAX_PROGRAMS = 64
+DEFAULT_MAX_IDLE_RUNNERS_PER_PROGRAM = 2
+
+# A (compiled class hash, entry point builtins) pair.
+RunnerPoolKey = Tuple[int, Tuple[str, ...]]
+
+
+@dataclasses.dataclass
+class RunnerPoolMetrics:
+    # The number of runners that were taken from the pool.
+    reused_runners: int = 0
+    # The number of runners that were created.
+    created_runners: int = 0
+
+
+@dataclasses.dataclass
+class RunnerPoolEntry:
+    program: Program
+    # Runners that are not in use, ready to run the program.
+    idle_runners: List[CairoFunctionRunner] = dataclasses.field(default_factory=list)
+
+
+class RunnerPool:
+    """
+    A pool of CairoFunctionRunners for the execution of Cairo 1.0 entry points, keyed by the
+    compiled class hash and the builtins of the entry point.
+    The pool keeps the runnable program of each key, and runners that were used to run it; a
+    returned runner is reset (see CairoRunner.reset()), so the next run of the same program does
+    not need to create the program, the builtin runners, or to load the program into memory.
+    """
+
+    def __init__(
+        self,
+        max_programs: int = DEFAULT_MAX_PROGRAMS,
+        max_idle_runners_per_program: int = DEFAULT_MAX_IDLE_RUNNERS_PER_PROGRAM,
+    ):
+        """
+        max_programs - the maximal number of programs kept in the pool (the least recently used
+          ones are evicted first, together with their runners). If 0, nothing is pooled.
+        max_idle_runners_per_program - the maximal number of idle runners kept for each program.
+        """
+        self.metrics = RunnerPoolMetrics()
+        self.entries: "OrderedDict[RunnerPoolKey, RunnerPoolEntry]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.resize(
+            max_programs=max_programs, max_idle_runners_per_program=max_idle_runners_per_program
+        )
+
+    def resize(self, max_programs: int, max_idle_runners_per_program: int):
+        """
+        Sets the limits of the pool (see __init__()), and evicts the programs and runners beyond
+        them.
+        """
+        assert max_programs >= 0, "max_programs must be non-negative."
+        assert (
+            max_idle_runners_per_program >= 0
+        ), "max_idle_runners_per_program must be non-negative."
+        with self.lock:
+            self.max_programs = max_programs
+            self.max_idle_runners_per_program = max_idle_runners_per_program
+            while len(self.entries) > max_programs:
+                self.entries.popitem(last=False)
+            for entry in self.entries.values():
+                del entry.idle_runners[max_idle_runners_per_program:]
+
+    @contextlib.contextmanager
+    def acquire(
+        self,
+        compiled_class: CompiledClass,
+        compiled_class_hash: int,
+        entrypoint_builtins: List[str],
+    ) -> Iterator[CairoFunctionRunner]:
+        """
+        Yields a runner for the given entry point of the given compiled class. The runner is
+        returned to the pool when the context exits.
+        A runner is never shared by two callers; e.g., a nested call to the same contract gets
+        another runner.
+        """
+        key: RunnerPoolKey = (compiled_class_hash, tuple(entrypoint_builtins))
+        with self.lock:
+            entry = self.entries.get(key)
+            runner = None
+            if entry is not None:
+                self.entries.move_to_end(key)
+                if len(entry.idle_runners) > 0:
+                    runner = entry.idle_runners.pop()
+                    self.metrics.reused_runners += 1
+
+        if runner is None:
+            if entry is None:
+                entry = RunnerPoolEntry(
+                    program=compiled_class.get_runnable_program(
+                        entrypoint_builtins=entrypoint_builtins
+                    )
+                )
+            with wrap_with_stark_exception(code=StarknetErrorCode.SECURITY_ERROR):
+                runner = create_entry_point_runner(program=entry.program)
+            with self.lock:
+                self.metrics.created_runners += 1
+
+        yield runner
+
+        # Runners of failed runs are not returned to the pool; this is the uncommon case.
+        runner.reset()
+        with self.lock:
+            entry = self.entries.setdefault(key, entry)
+            self.entries.move_to_end(key)
+            if len(entry.idle_runners) < self.max_idle_runners_per_program:
+                entry.idle_runners.append(runner)
+            if len(self.entries) > self.max_programs:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all the programs and runners from the pool and resets the metrics.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.metrics = RunnerPoolMetrics()
+
+
+def create_entry_point_runner(program: Program) -> CairoFunctionRunner:
+    return CairoFunctionRunner(
+        program=program,
+        layout=ENTRY_POINT_LAYOUT,
+        additional_builtin_factories=dict(
+            segment_arena=lambda name, included: SegmentArenaBuiltinRunner(included=included)
+        ),
+    )
+
+
+# The pool used by ExecuteEntryPoint. It lives as long as the process; use runner_pool.resize() to
+# change its limits (e.g., resize(max_programs=0, max_idle_runners_per_program=0) disables it),
+# and runner_pool.clear() to release the runners it holds.
+runner_pool = RunnerPool()
@@ -0,0 +1,86 @@
+"""
+Compares running a short entry point with a fresh CairoFunctionRunner per call, as
+ExecuteEntryPoint used to do, to running it with runners taken from a RunnerPool.
+The program is padded to the size of a typical contract (e.g., an ERC20 contract), since loading
+the program into memory is a major part of the cost of a short call.
+"""
+
+import argparse
+import dataclasses
+import time
+from typing import Callable, List
+
+from starkware.cairo.common.cairo_function_runner import CairoFunctionRunner
+from starkware.cairo.lang.cairo_constants import DEFAULT_PRIME
+from starkware.cairo.lang.compiler.cairo_compile import compile_cairo
+from starkware.cairo.lang.compiler.program import Program
+from starkware.starknet.business_logic.execution.runner_pool import (
+    RunnerPool,
+    create_entry_point_runner,
+)
+
+BENCHMARK_CODE = """\
+func transfer(from_balance: felt, to_balance: felt, amount: felt) -> (felt, felt) {
+    return (from_balance - amount, to_balance + amount);
+}
+"""
+
+
+class BenchmarkCompiledClass:
+    def __init__(self, program: Program):
+        self.program = program
+
+    def get_runnable_program(self, entrypoint_builtins: List[str]) -> Program:
+        return dataclasses.replace(self.program, builtins=entrypoint_builtins)
+
+
+def run_transfer(runner: CairoFunctionRunner, entrypoint: int):
+    runner.run_from_entrypoint(entrypoint, 100, 5, 30, verify_secure=True)
+    assert runner.get_return_values(2) == [70, 35]
+
+
+def measure(func: Callable[[], None], n_calls: int) -> float:
+    start_time = time.perf_counter()
+    for _ in range(n_calls):
+        func()
+    return (time.perf_counter() - start_time) / n_calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the entry point runner pool.")
+    parser.add_argument("--program_size", type=int, default=20000)
+    parser.add_argument("--n_calls", type=int, default=200)
+    args = parser.parse_args()
+
+    program = compile_cairo(code=BENCHMARK_CODE, prime=DEFAULT_PRIME)
+    program = dataclasses.replace(
+        program, data=program.data + [0] * max(0, args.program_size - len(program.data))
+    )
+    compiled_class = BenchmarkCompiledClass(program=program)
+    entrypoint = program.get_label("transfer")
+    builtins = ["range_check"]
+    pool = RunnerPool()
+
+    def fresh_runner_call():
+        runner = create_entry_point_runner(
+            program=compiled_class.get_runnable_program(entrypoint_builtins=builtins)
+        )
+        run_transfer(runner=runner, entrypoint=entrypoint)
+
+    def pooled_runner_call():
+        with pool.acquire(
+            compiled_class=compiled_class, compiled_class_hash=0, entrypoint_builtins=builtins
+        ) as runner:
+            run_transfer(runner=runner, entrypoint=entrypoint)
+
+    fresh_time = measure(fresh_runner_call, n_calls=args.n_calls)
+    pooled_time = measure(pooled_runner_call, n_calls=args.n_calls)
+    print(
+        f"Fresh runner: {fresh_time * 1000:.3f}ms per call, "
+        f"pooled runner: {pooled_time * 1000:.3f}ms per call "
+        f"({fresh_time / pooled_time:.1f}x; {pool.metrics})."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import dataclasses
+from typing import List
+
+import pytest
+
+from starkware.cairo.lang.cairo_constants import DEFAULT_PRIME
+from starkware.cairo.lang.compiler.cairo_compile import compile_cairo
+from starkware.cairo.lang.compiler.program import Program
+from starkware.starknet.business_logic.execution.runner_pool import RunnerPool
+
+PROGRAM = compile_cairo(
+    code="""
+func transfer(from_balance: felt, to_balance: felt, amount: felt) -> (felt, felt) {
+    return (from_balance - amount, to_balance + amount);
+}
+""",
+    prime=DEFAULT_PRIME,
+)
+
+
+class DummyCompiledClass:
+    """
+    A stand-in for CompiledClass, which counts the calls to get_runnable_program().
+    """
+
+    def __init__(self):
+        self.n_runnable_programs = 0
+
+    def get_runnable_program(self, entrypoint_builtins: List[str]) -> Program:
+        self.n_runnable_programs += 1
+        return dataclasses.replace(PROGRAM, builtins=entrypoint_builtins)
+
+
+@pytest.fixture
+def pool() -> RunnerPool:
+    return RunnerPool(max_programs=2, max_idle_runners_per_program=2)
+
+
+def run_transfer(pool: RunnerPool, compiled_class, compiled_class_hash: int = 1234) -> List[int]:
+    with pool.acquire(
+        compiled_class=compiled_class,
+        compiled_class_hash=compiled_class_hash,
+        entrypoint_builtins=["range_check"],
+    ) as runner:
+        runner.run_from_entrypoint(PROGRAM.get_label("transfer"), 100, 5, 30, verify_secure=True)
+        return runner.get_return_values(2)
+
+
+def test_runner_reuse(pool: RunnerPool):
+    compiled_class = DummyCompiledClass()
+    for _ in range(3):
+        assert run_transfer(pool=pool, compiled_class=compiled_class) == [70, 35]
+
+    assert compiled_class.n_runnable_programs == 1
+    assert pool.metrics.created_runners == 1
+    assert pool.metrics.reused_runners == 2
+
+
+def test_nested_acquire(pool: RunnerPool):
+    compiled_class = DummyCompiledClass()
+    with pool.acquire(
+        compiled_class=compiled_class, compiled_class_hash=1234, entrypoint_builtins=[]
+    ) as outer_runner:
+        with pool.acquire(
+            compiled_class=compiled_class, compiled_class_hash=1234, entrypoint_builtins=[]
+        ) as inner_runner:
+            assert inner_runner is not outer_runner
+
+    assert pool.metrics.created_runners == 2
+    assert len(pool.entries[(1234, ())].idle_runners) == 2
+
+
+def test_failed_run_is_not_reused(pool: RunnerPool):
+    compiled_class = DummyCompiledClass()
+    with pytest.raises(Exception, match="Run failed."):
+        with pool.acquire(
+            compiled_class=compiled_class, compiled_class_hash=1234, entrypoint_builtins=[]
+        ):
+            raise Exception("Run failed.")
+
+    assert run_transfer(pool=pool, compiled_class=compiled_class) == [70, 35]
+    assert pool.metrics.created_runners == 2
+
+
+def test_program_eviction(pool: RunnerPool):
+    compiled_class = DummyCompiledClass()
+    for compiled_class_hash in [1, 2, 1, 3, 1, 2]:
+        run_transfer(
+            pool=pool, compiled_class=compiled_class, compiled_class_hash=compiled_class_hash
+        )
+
+    # The class hash 2 was evicted when 3 was added (1 was used more recently).
+    assert [key[0] for key in pool.entries.keys()] == [1, 2]
+    assert compiled_class.n_runnable_programs == 4
+
+
+def test_resize(pool: RunnerPool):
+    compiled_class = DummyCompiledClass()
+    with pool.acquire(
+        compiled_class=compiled_class, compiled_class_hash=1, entrypoint_builtins=[]
+    ), pool.acquire(compiled_class=compiled_class, compiled_class_hash=1, entrypoint_builtins=[]):
+        pass
+    run_transfer(pool=pool, compiled_class=compiled_class, compiled_class_hash=2)
+    assert [len(entry.idle_runners) for entry in pool.entries.values()] == [2, 1]
+
+    pool.resize(max_programs=1, max_idle_runners_per_program=1)
+    assert [key[0] for key in pool.entries.keys()] == [2]
+    assert len(pool.entries[(2, ("range_check",))].idle_runners) == 1
+
+    # A pool without programs does not keep runners.
+    pool.resize(max_programs=0, max_idle_runners_per_program=1)
+    run_transfer(pool=pool, compiled_class=compiled_class, compiled_class_hash=2)
+    assert len(pool.entries) == 0
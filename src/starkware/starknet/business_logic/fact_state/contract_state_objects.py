@@ -1,22 +1,27 @@
 import dataclasses
+import struct
 from dataclasses import field
 from typing import ClassVar, FrozenSet, Iterable, Mapping, Optional
 
 import marshmallow_dataclass
 
 from services.everest.business_logic.state import StateSelectorBase
-from starkware.python.utils import to_bytes
+from starkware.python.utils import from_bytes, to_bytes
 from starkware.starknet.definitions import fields
 from starkware.starknet.definitions.error_codes import StarknetErrorCode
-from starkware.starknet.storage.starknet_storage import StorageLeaf
+from starkware.starknet.storage.starknet_storage import STORAGE_LEAF_CODEC, StorageLeaf
 from starkware.starkware_utils.commitment_tree.leaf_fact import LeafFact
-from starkware.starkware_utils.commitment_tree.patricia_tree.nodes import EmptyNodeFact
+from starkware.starkware_utils.commitment_tree.patricia_tree.nodes import (
+    PATRICIA_NODE_CODEC,
+    EmptyNodeFact,
+)
 from starkware.starkware_utils.commitment_tree.patricia_tree.patricia_tree import PatriciaTree
 from starkware.starkware_utils.error_handling import stark_assert
 from starkware.starkware_utils.validated_dataclass import (
     ValidatedDataclass,
     ValidatedMarshmallowDataclass,
 )
+from starkware.storage.compact_fact_storage import FactCodec
 from starkware.storage.storage import HASH_BYTES, FactFetchingContext, HashFunctionType
 
 
@@ -35,6 +40,11 @@ class ContractState(ValidatedMarshmallowDataclass, LeafFact):
 
     UNINITIALIZED_CLASS_HASH: ClassVar[bytes] = bytes(HASH_BYTES)
     CONTRACT_STATE_HASH_VERSION: ClassVar[int] = 0
+    # The compact serialization: the contract hash, the storage root, the storage tree height and
+    # the nonce.
+    COMPACT_STRUCT: ClassVar[struct.Struct] = struct.Struct(
+        f">{HASH_BYTES}s{HASH_BYTES}sH{HASH_BYTES}s"
+    )
 
     @classmethod
     async def create(
@@ -60,6 +70,30 @@ class ContractState(ValidatedMarshmallowDataclass, LeafFact):
             nonce=0,
         )
 
+    def serialize_compact(self) -> bytes:
+        return self.COMPACT_STRUCT.pack(
+            self.contract_hash,
+            self.storage_commitment_tree.root,
+            self.storage_commitment_tree.height,
+            to_bytes(self.nonce),
+        )
+
+    @classmethod
+    def deserialize(cls, data: bytes) -> "ContractState":
+        """
+        Deserializes either the compact serialization or the (JSON) serialization; the compact
+        serialization starts with the contract hash, which never starts with "{".
+        """
+        if data[:1] == b"{":
+            return super().deserialize(data=data)
+
+        contract_hash, root, height, nonce = cls.COMPACT_STRUCT.unpack(data)
+        return cls(
+            contract_hash=contract_hash,
+            storage_commitment_tree=PatriciaTree(root=root, height=height),
+            nonce=from_bytes(nonce),
+        )
+
     @property
     def is_empty(self) -> bool:
         return (
@@ -149,6 +183,18 @@ class ContractState(ValidatedMarshmallowDataclass, LeafFact):
         )
 
 
+def compact_contract_state_value(data: bytes) -> bytes:
+    return ContractState.deserialize(data=data).serialize_compact()
+
+
+CONTRACT_STATE_CODEC = FactCodec(
+    prefix=ContractState.prefix(), tag=3, compact_value=compact_contract_state_value
+)
+
+# The codecs of the facts of the Starknet state commitment trees (see CompactFactStorage).
+STARKNET_FACT_CODECS = (PATRICIA_NODE_CODEC, STORAGE_LEAF_CODEC, CONTRACT_STATE_CODEC)
+
+
 @dataclasses.dataclass(frozen=True)
 class ContractCarriedState(ValidatedDataclass):
     """
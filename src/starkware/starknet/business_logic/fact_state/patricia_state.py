@@ -1,6 +1,7 @@
-from typing import Dict, Optional
+import asyncio
+from typing import Collection, Dict, List, Optional
 
-from starkware.python.utils import from_bytes, to_bytes
+from starkware.python.utils import from_bytes, safe_zip, to_bytes
 from starkware.starknet.business_logic.fact_state.contract_class_objects import (
     CompiledClassFact,
     ContractClassFact,
@@ -11,6 +12,7 @@ from starkware.starknet.business_logic.fact_state.contract_class_objects import
 from starkware.starknet.business_logic.fact_state.contract_state_objects import ContractState
 from starkware.starknet.business_logic.state.state_api import (
     StateReader,
+    StorageEntry,
     get_stark_exception_on_undeclared_contract,
 )
 from starkware.starknet.definitions import fields
@@ -22,9 +24,14 @@ from starkware.starknet.services.api.contract_class.contract_class import (
     DeprecatedCompiledClass,
 )
 from starkware.starknet.storage.starknet_storage import StorageLeaf
+from starkware.starkware_utils.commitment_tree.patricia_tree.nodes import EmptyNodeFact
 from starkware.starkware_utils.commitment_tree.patricia_tree.patricia_tree import PatriciaTree
+from starkware.storage.dict_storage import AnyCachedStorage, CachedStorage
 from starkware.storage.storage import FactFetchingContext, Storage
 
+# The number of facts kept by the node cache of a PatriciaStateReader, if it is not given one.
+DEFAULT_NODE_CACHE_SIZE = 2**16
+
 
 class PatriciaStateReader(StateReader):
     """
@@ -37,10 +44,22 @@ class PatriciaStateReader(StateReader):
         contract_class_root: Optional[PatriciaTree],
         ffc: FactFetchingContext,
         contract_class_storage: Storage,
+        node_cache: Optional[AnyCachedStorage] = None,
     ):
+        """
+        node_cache - a read-through cache (over ffc.storage) of the facts read from the trees
+          (nodes and leaves). As facts are immutable, the caller may share the same cache between
+          readers of different roots (e.g., a ShardedCachedStorage). If not given, the reader uses
+          its own cache of DEFAULT_NODE_CACHE_SIZE facts.
+        """
+        if node_cache is None:
+            node_cache = CachedStorage(storage=ffc.storage, max_size=DEFAULT_NODE_CACHE_SIZE)
+        assert node_cache.storage is ffc.storage, "The node cache must wrap the storage of ffc."
+        self.node_cache = node_cache
+
         # Members related to dynamic retrieval of facts during transaction execution.
-        self.ffc = ffc
-        self.ffc_for_class_hash = get_ffc_for_contract_class_facts(ffc=ffc)
+        self.ffc = ffc.with_storage(storage=node_cache)
+        self.ffc_for_class_hash = get_ffc_for_contract_class_facts(ffc=self.ffc)
         self.contract_class_storage = contract_class_storage
 
         # Last committed state roots.
@@ -95,17 +114,66 @@ class PatriciaStateReader(StateReader):
     ) -> int:
         data_availability_mode.assert_l1()
         contract_state = await self._get_contract_state(contract_address=contract_address)
-
-        contract_storage_tree_height = contract_state.storage_commitment_tree.height
-        assert 0 <= key < 2**contract_storage_tree_height, (
-            f"The address {fields.L2AddressField.format(key)} is out of range: [0, "
-            f"2**{contract_storage_tree_height})."
-        )
+        self._assert_storage_key_in_range(contract_state=contract_state, key=key)
 
         storage_leaf = await self._fetch_storage_leaf(contract_state=contract_state, key=key)
 
         return storage_leaf.value
 
+    async def get_class_hashes_many(self, contract_addresses: Collection[int]) -> Dict[int, int]:
+        contract_states = await self._get_contract_states(contract_addresses=contract_addresses)
+        return {
+            contract_address: from_bytes(contract_state.contract_hash)
+            for contract_address, contract_state in contract_states.items()
+        }
+
+    async def get_nonces_many(
+        self, data_availability_mode: DataAvailabilityMode, contract_addresses: Collection[int]
+    ) -> Dict[int, int]:
+        data_availability_mode.assert_l1()
+        contract_states = await self._get_contract_states(contract_addresses=contract_addresses)
+        return {
+            contract_address: contract_state.nonce
+            for contract_address, contract_state in contract_states.items()
+        }
+
+    async def get_storage_at_many(
+        self,
+        data_availability_mode: DataAvailabilityMode,
+        storage_entries: Collection[StorageEntry],
+    ) -> Dict[StorageEntry, int]:
+        data_availability_mode.assert_l1()
+        address_to_keys: Dict[int, List[int]] = {}
+        for contract_address, key in storage_entries:
+            address_to_keys.setdefault(contract_address, []).append(key)
+
+        contract_states = await self._get_contract_states(contract_addresses=address_to_keys)
+        storage_values = await asyncio.gather(
+            *(
+                self._fetch_storage_values(
+                    contract_state=contract_states[contract_address], keys=keys
+                )
+                for contract_address, keys in address_to_keys.items()
+            )
+        )
+        return {
+            (contract_address, key): value
+            for contract_address, values in safe_zip(address_to_keys, storage_values)
+            for key, value in values.items()
+        }
+
+    async def prefetch_storage(
+        self, contract_address: int, keys: Collection[int]
+    ) -> Dict[int, int]:
+        """
+        Fetches the nodes on the paths to the given storage keys of the given contract into the
+        node cache, with a single storage read per layer of the tree (rather than a read per node
+        in each call to get_storage_at()).
+        Returns the values at the given keys.
+        """
+        contract_state = await self._get_contract_state(contract_address=contract_address)
+        return await self._fetch_storage_values(contract_state=contract_state, keys=keys)
+
     async def get_sierra_class(self, class_hash: int) -> ContractClass:
         contract_class_fact = await ContractClassFact.get(
             storage=self.contract_class_storage, suffix=to_bytes(class_hash)
@@ -132,6 +200,63 @@ class PatriciaStateReader(StateReader):
             ffc=self.ffc, index=contract_address, fact_cls=ContractState
         )
 
+    async def _get_contract_states(
+        self, contract_addresses: Collection[int]
+    ) -> Dict[int, ContractState]:
+        """
+        Same as _get_contract_state(), for many contracts. The states that are not cached are
+        fetched together, with a single storage read per layer of the tree.
+        """
+        missing_addresses = sorted(set(contract_addresses) - self.contract_states.keys())
+        if len(missing_addresses) > 0:
+            empty_contract_state = await ContractState.get_or_fail(
+                storage=self.ffc.storage, suffix=EmptyNodeFact.EMPTY_NODE_HASH
+            )
+            self.contract_states.update(
+                await self.contract_state_root.fetch_witnesses(
+                    ffc=self.ffc,
+                    sorted_leaf_indices=missing_addresses,
+                    fact_cls=ContractState,
+                    empty_leaf=empty_contract_state,
+                )
+            )
+
+        return {
+            contract_address: self.contract_states[contract_address]
+            for contract_address in contract_addresses
+        }
+
+    async def _fetch_storage_values(
+        self, contract_state: ContractState, keys: Collection[int]
+    ) -> Dict[int, int]:
+        """
+        Fetches the values at the given storage keys of the given contract, with a single storage
+        read per layer of the tree. The fetched nodes are kept in the node cache.
+        """
+        for key in keys:
+            self._assert_storage_key_in_range(contract_state=contract_state, key=key)
+
+        leaves = await contract_state.storage_commitment_tree.fetch_witnesses(
+            ffc=self.ffc,
+            sorted_leaf_indices=sorted(set(keys)),
+            fact_cls=StorageLeaf,
+            empty_leaf=StorageLeaf.empty(),
+        )
+        if any(leaf.is_empty for leaf in leaves.values()):
+            # Empty leaves are read by get_storage_at() as a fact of their own.
+            await StorageLeaf.get_or_fail(
+                storage=self.ffc.storage, suffix=EmptyNodeFact.EMPTY_NODE_HASH
+            )
+        return {key: leaf.value for key, leaf in leaves.items()}
+
+    @staticmethod
+    def _assert_storage_key_in_range(contract_state: ContractState, key: int):
+        contract_storage_tree_height = contract_state.storage_commitment_tree.height
+        assert 0 <= key < 2**contract_storage_tree_height, (
+            f"The address {fields.L2AddressField.format(key)} is out of range: [0, "
+            f"2**{contract_storage_tree_height})."
+        )
+
     async def _fetch_storage_leaf(self, contract_state: ContractState, key: int) -> StorageLeaf:
         return await contract_state.storage_commitment_tree.get_leaf(
             ffc=self.ffc, index=key, fact_cls=StorageLeaf
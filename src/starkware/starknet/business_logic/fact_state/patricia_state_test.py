@@ -0,0 +1,253 @@
+from typing import Dict, Optional, Sequence, Tuple
+
+import pytest
+
+from starkware.cairo.lang.vm.crypto import pedersen_hash_func
+from starkware.starknet.business_logic.fact_state.contract_state_objects import (
+    STARKNET_FACT_CODECS,
+    ContractState,
+)
+from starkware.starknet.business_logic.fact_state.patricia_state import PatriciaStateReader
+from starkware.starknet.business_logic.state.state import CachedState
+from starkware.starknet.business_logic.state.state_api_objects import BlockInfo
+from starkware.starknet.definitions.data_availability_mode import DataAvailabilityMode
+from starkware.starkware_utils.commitment_tree.patricia_tree.patricia_tree import PatriciaTree
+from starkware.storage.compact_fact_storage import CompactFactStorage
+from starkware.storage.dict_storage import AnyCachedStorage, CachedStorage, ShardedCachedStorage
+from starkware.storage.storage import FactFetchingContext
+from starkware.storage.test_utils import MockStorage
+
+HEIGHT = 251
+CONTRACT_ADDRESS = 17
+UNDEPLOYED_CONTRACT_ADDRESS = 18
+STORAGE_UPDATES = {1: 10, 2: 20, 12345: 50, 2**250: 30, 2**250 + 1: 40}
+
+
+class ReadCountingStorage(MockStorage):
+    def __init__(self):
+        super().__init__()
+        # The number of keys read from the storage.
+        self.n_reads = 0
+
+    async def get_value(self, key: bytes) -> Optional[bytes]:
+        self.n_reads += 1
+        return await super().get_value(key=key)
+
+    async def mget(self, keys: Sequence[bytes]) -> Tuple[Optional[bytes], ...]:
+        self.n_reads += len(keys)
+        return await super().mget(keys=keys)
+
+
+@pytest.fixture
+def ffc() -> FactFetchingContext:
+    return FactFetchingContext(storage=ReadCountingStorage(), hash_func=pedersen_hash_func)
+
+
+async def create_contract_state_root(
+    ffc: FactFetchingContext, updates: Dict[int, int]
+) -> PatriciaTree:
+    empty_contract_state = await ContractState.empty(storage_commitment_tree_height=HEIGHT, ffc=ffc)
+    contract_state = await empty_contract_state.update(
+        ffc=ffc, updates=updates, nonce=1, class_hash=1234
+    )
+    contract_states = await PatriciaTree.empty_tree(
+        ffc=ffc, height=HEIGHT, leaf_fact=empty_contract_state
+    )
+    return await contract_states.update_efficiently(
+        ffc=ffc, modifications=[(CONTRACT_ADDRESS, contract_state)]
+    )
+
+
+def create_reader(
+    ffc: FactFetchingContext, root: PatriciaTree, node_cache: Optional[AnyCachedStorage] = None
+) -> PatriciaStateReader:
+    return PatriciaStateReader(
+        contract_state_root=root,
+        contract_class_root=None,
+        ffc=ffc,
+        contract_class_storage=ffc.storage,
+        node_cache=node_cache,
+    )
+
+
+@pytest.mark.asyncio
+async def test_prefetch_storage(ffc: FactFetchingContext):
+    storage = ffc.storage
+    assert isinstance(storage, ReadCountingStorage)
+    root = await create_contract_state_root(ffc=ffc, updates=STORAGE_UPDATES)
+    reader = create_reader(ffc=ffc, root=root)
+
+    keys = [*STORAGE_UPDATES.keys(), 3, 2**250 + 2]
+    values = await reader.prefetch_storage(contract_address=CONTRACT_ADDRESS, keys=keys)
+    assert values == {key: STORAGE_UPDATES.get(key, 0) for key in keys}
+
+    # All the values are served from the node cache.
+    n_reads = storage.n_reads
+    for key in keys:
+        value = await reader.get_storage_at(
+            data_availability_mode=DataAvailabilityMode.L1,
+            contract_address=CONTRACT_ADDRESS,
+            key=key,
+        )
+        assert value == values[key]
+    assert storage.n_reads == n_reads
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("node_cache_type", ["cached", "sharded_cached"])
+async def test_shared_node_cache(ffc: FactFetchingContext, node_cache_type: str):
+    storage = ffc.storage
+    assert isinstance(storage, ReadCountingStorage)
+    old_root = await create_contract_state_root(ffc=ffc, updates=STORAGE_UPDATES)
+    new_root = await create_contract_state_root(ffc=ffc, updates={**STORAGE_UPDATES, 1: 11})
+    node_cache: AnyCachedStorage = {
+        "cached": CachedStorage(storage=storage, max_size=2**10),
+        "sharded_cached": ShardedCachedStorage(storage=storage, max_bytes=2**20),
+    }[node_cache_type]
+
+    n_reads = storage.n_reads
+    old_reader = create_reader(ffc=ffc, root=old_root, node_cache=node_cache)
+    await old_reader.prefetch_storage(contract_address=CONTRACT_ADDRESS, keys=STORAGE_UPDATES)
+    n_reads_old_root = storage.n_reads - n_reads
+    n_reads = storage.n_reads
+
+    # The subtrees that did not change between the roots are read from the shared cache.
+    new_reader = create_reader(ffc=ffc, root=new_root, node_cache=node_cache)
+    values = await new_reader.prefetch_storage(
+        contract_address=CONTRACT_ADDRESS, keys=STORAGE_UPDATES
+    )
+    assert values == {**STORAGE_UPDATES, 1: 11}
+    assert storage.n_reads - n_reads < n_reads_old_root
+
+
+def test_reader_ffc(ffc: FactFetchingContext):
+    ffc = FactFetchingContext(
+        storage=ffc.storage,
+        hash_func=pedersen_hash_func,
+        fact_write_batch_size=10,
+        known_fact_keys_cache_size=100,
+    )
+    root = PatriciaTree(root=b"\x00" * 32, height=HEIGHT)
+    reader = create_reader(ffc=ffc, root=root)
+    assert isinstance(reader.node_cache, CachedStorage)
+    assert reader.node_cache.storage is ffc.storage
+    assert reader.ffc.storage is reader.node_cache
+    # Unless the caller shares a node cache, each reader has its own.
+    assert create_reader(ffc=ffc, root=root).node_cache is not reader.node_cache
+    assert reader.ffc.fact_write_batch_size == 10
+    # The known fact keys of the context are not valid for the node cache.
+    assert reader.ffc.known_fact_keys is not ffc.known_fact_keys
+    assert reader.ffc.known_fact_keys is not None
+    assert reader.ffc.known_fact_keys.maxsize == 100
+
+
+def test_node_cache_must_wrap_ffc_storage(ffc: FactFetchingContext):
+    with pytest.raises(AssertionError, match="must wrap the storage of ffc"):
+        create_reader(
+            ffc=ffc,
+            root=PatriciaTree(root=b"\x00" * 32, height=HEIGHT),
+            node_cache=CachedStorage(storage=MockStorage(), max_size=1),
+        )
+
+
+@pytest.mark.asyncio
+async def test_batched_reads(ffc: FactFetchingContext):
+    root = await create_contract_state_root(ffc=ffc, updates=STORAGE_UPDATES)
+    reader = create_reader(ffc=ffc, root=root)
+    addresses = [CONTRACT_ADDRESS, UNDEPLOYED_CONTRACT_ADDRESS]
+    storage_entries = [
+        *((address, key) for address in addresses for key in STORAGE_UPDATES),
+        (CONTRACT_ADDRESS, 3),
+    ]
+
+    da_mode = DataAvailabilityMode.L1
+    class_hashes = await reader.get_class_hashes_many(contract_addresses=addresses)
+    nonces = await reader.get_nonces_many(
+        data_availability_mode=da_mode, contract_addresses=addresses
+    )
+    values = await reader.get_storage_at_many(
+        data_availability_mode=da_mode, storage_entries=storage_entries
+    )
+    assert class_hashes == {CONTRACT_ADDRESS: 1234, UNDEPLOYED_CONTRACT_ADDRESS: 0}
+    assert nonces == {CONTRACT_ADDRESS: 1, UNDEPLOYED_CONTRACT_ADDRESS: 0}
+
+    # Compare with the single-key API, using a fresh reader.
+    reader = create_reader(ffc=ffc, root=root)
+    for address, key in storage_entries:
+        assert values[address, key] == await reader.get_storage_at(
+            data_availability_mode=da_mode, contract_address=address, key=key
+        )
+
+
+@pytest.mark.asyncio
+async def test_cached_state_batched_reads(ffc: FactFetchingContext):
+    storage = ffc.storage
+    assert isinstance(storage, ReadCountingStorage)
+    root = await create_contract_state_root(ffc=ffc, updates=STORAGE_UPDATES)
+    state = CachedState(
+        block_info=BlockInfo.empty(sequencer_address=None),
+        state_reader=create_reader(ffc=ffc, root=root),
+        compiled_class_cache={},
+    )
+    da_mode = DataAvailabilityMode.L1
+    await state.set_storage_at(
+        data_availability_mode=da_mode, contract_address=CONTRACT_ADDRESS, key=1, value=100
+    )
+    storage_entries = [(CONTRACT_ADDRESS, key) for key in STORAGE_UPDATES]
+
+    with state.copy_and_apply() as child_state:
+        values = await child_state.get_storage_at_many(
+            data_availability_mode=da_mode, storage_entries=storage_entries
+        )
+    expected_values = {entry: STORAGE_UPDATES[entry[1]] for entry in storage_entries}
+    assert values == {**expected_values, (CONTRACT_ADDRESS, 1): 100}
+    assert await state.get_nonces_many(
+        data_availability_mode=da_mode, contract_addresses=[CONTRACT_ADDRESS]
+    ) == {CONTRACT_ADDRESS: 1}
+
+    # The values are cached by the parent state.
+    n_reads = storage.n_reads
+    cached_values = await state.get_storage_at_many(
+        data_availability_mode=da_mode, storage_entries=storage_entries
+    )
+    assert cached_values == values
+    assert storage.n_reads == n_reads
+
+
+@pytest.mark.asyncio
+async def test_compact_fact_storage(ffc: FactFetchingContext):
+    storage = ffc.storage
+    assert isinstance(storage, ReadCountingStorage)
+    root = await create_contract_state_root(ffc=ffc, updates=STORAGE_UPDATES)
+
+    compact_storage = CompactFactStorage(storage=MockStorage(), codecs=STARKNET_FACT_CODECS)
+    compact_ffc = FactFetchingContext(storage=compact_storage, hash_func=pedersen_hash_func)
+    compact_root = await create_contract_state_root(ffc=compact_ffc, updates=STORAGE_UPDATES)
+    assert compact_root == root
+
+    # All the facts are written in the compact format.
+    compact_db = compact_storage.storage.db
+    assert all(key[0] <= 3 for key in compact_db.keys())
+    assert sum(len(key) + len(value) for key, value in compact_db.items()) < sum(
+        len(key) + len(value) for key, value in storage.db.items()
+    )
+
+    # The state is read from either format; a compact storage reads facts written without it.
+    new_root = await create_contract_state_root(ffc=ffc, updates={**STORAGE_UPDATES, 1: 11})
+    legacy_ffc = FactFetchingContext(
+        storage=CompactFactStorage(storage=storage, codecs=STARKNET_FACT_CODECS),
+        hash_func=pedersen_hash_func,
+    )
+    for reader_ffc, reader_root, updates in (
+        (compact_ffc, compact_root, STORAGE_UPDATES),
+        (legacy_ffc, new_root, {**STORAGE_UPDATES, 1: 11}),
+    ):
+        reader = create_reader(ffc=reader_ffc, root=reader_root)
+        values = await reader.prefetch_storage(contract_address=CONTRACT_ADDRESS, keys=updates)
+        assert values == updates
+        assert (
+            await reader.get_nonce_at(
+                data_availability_mode=DataAvailabilityMode.L1, contract_address=CONTRACT_ADDRESS
+            )
+            == 1
+        )
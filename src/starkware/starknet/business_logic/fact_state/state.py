@@ -42,6 +42,7 @@ from starkware.starknet.definitions.general_config import StarknetGeneralConfig
 from starkware.starkware_utils.commitment_tree.binary_fact_tree import BinaryFactDict
 from starkware.starkware_utils.commitment_tree.patricia_tree.patricia_tree import PatriciaTree
 from starkware.starkware_utils.config_base import Config
+from starkware.storage.dict_storage import AnyCachedStorage
 from starkware.storage.storage import DBObject, FactFetchingContext, IndexedDBObject, Storage
 
 logger = logging.getLogger(__name__)
@@ -269,7 +270,13 @@ class SharedState(SharedStateBase):
         )
         return hash_value
 
-    def to_carried_state(self, ffc: FactFetchingContext) -> CarriedState:
+    def to_carried_state(
+        self, ffc: FactFetchingContext, node_cache: Optional[AnyCachedStorage] = None
+    ) -> CarriedState:
+        """
+        node_cache, if given, is used by the state reader to cache the facts it reads (see
+        PatriciaStateReader); it may be shared with the readers of other states over ffc.storage.
+        """
         state = CachedState(
             block_info=self.block_info,
             state_reader=PatriciaStateReader(
@@ -277,6 +284,7 @@ class SharedState(SharedStateBase):
                 contract_class_root=self.contract_classes,
                 ffc=ffc,
                 contract_class_storage=ffc.storage,
+                node_cache=node_cache,
             ),
         )
         return CarriedState(parent_state=None, state=state)
@@ -4,6 +4,7 @@ from collections import ChainMap
 from typing import (
     Awaitable,
     Callable,
+    Collection,
     Dict,
     Iterator,
     List,
@@ -12,6 +13,7 @@ from typing import (
     Optional,
     Set,
     Tuple,
+    TypeVar,
 )
 
 from starkware.python.utils import (
@@ -23,6 +25,7 @@ from starkware.python.utils import (
 from starkware.starknet.business_logic.state.state_api import (
     State,
     StateReader,
+    StorageEntry,
     SyncState,
     SyncStateReader,
 )
@@ -43,7 +46,8 @@ CompiledClassCache = MutableMapping[int, CompiledClassBase]
 RawCompiledClassCache = MutableMapping[int, RawCompiledClass]
 RawVersionedCompiledClassCache = MutableMapping[int, VersionedRawCompiledClass]
 GetCompiledClassCallback = Callable[[int], Awaitable[CompiledClassBase]]
-StorageEntry = Tuple[int, int]  # (contract_address, key).
+
+K = TypeVar("K")
 
 
 class StateSyncifier(SyncState):
@@ -114,6 +118,35 @@ class StateSyncifier(SyncState):
             loop=self.loop,
         )
 
+    def get_class_hashes_many(self, contract_addresses: Collection[int]) -> Dict[int, int]:
+        return execute_coroutine_threadsafe(
+            coroutine=self.async_state.get_class_hashes_many(contract_addresses=contract_addresses),
+            loop=self.loop,
+        )
+
+    def get_nonces_many(
+        self, data_availability_mode: DataAvailabilityMode, contract_addresses: Collection[int]
+    ) -> Dict[int, int]:
+        return execute_coroutine_threadsafe(
+            coroutine=self.async_state.get_nonces_many(
+                data_availability_mode=data_availability_mode,
+                contract_addresses=contract_addresses,
+            ),
+            loop=self.loop,
+        )
+
+    def get_storage_at_many(
+        self,
+        data_availability_mode: DataAvailabilityMode,
+        storage_entries: Collection[StorageEntry],
+    ) -> Dict[StorageEntry, int]:
+        return execute_coroutine_threadsafe(
+            coroutine=self.async_state.get_storage_at_many(
+                data_availability_mode=data_availability_mode, storage_entries=storage_entries
+            ),
+            loop=self.loop,
+        )
+
     def set_compiled_class_hash(self, class_hash: int, compiled_class_hash: int):
         return execute_coroutine_threadsafe(
             coroutine=self.async_state.set_compiled_class_hash(
@@ -238,6 +271,17 @@ class StateCache:
         }
 
 
+def _get_missing_keys(keys: Collection[K], cached: Mapping[K, int]) -> List[K]:
+    """
+    Returns the (unique) keys that are not in the given cache, in their original order.
+    """
+    return [key for key in dict.fromkeys(keys) if key not in cached]
+
+
+def _get_values(keys: Collection[K], cached: Mapping[K, int]) -> Dict[K, int]:
+    return {key: cached[key] for key in keys}
+
+
 class CachedState(State):
     """
     A cached implementation of the State API. See State's documentation.
@@ -375,6 +419,50 @@ class CachedState(State):
 
         return self.cache.storage_view[address_key_pair]
 
+    async def get_class_hashes_many(self, contract_addresses: Collection[int]) -> Dict[int, int]:
+        missing_addresses = _get_missing_keys(
+            keys=contract_addresses, cached=self.cache.address_to_class_hash
+        )
+        if len(missing_addresses) > 0:
+            self.cache._class_hash_initial_values.update(
+                await self.state_reader.get_class_hashes_many(contract_addresses=missing_addresses)
+            )
+
+        return _get_values(keys=contract_addresses, cached=self.cache.address_to_class_hash)
+
+    async def get_nonces_many(
+        self, data_availability_mode: DataAvailabilityMode, contract_addresses: Collection[int]
+    ) -> Dict[int, int]:
+        data_availability_mode.assert_l1()
+        missing_addresses = _get_missing_keys(
+            keys=contract_addresses, cached=self.cache.address_to_nonce
+        )
+        if len(missing_addresses) > 0:
+            self.cache._nonce_initial_values.update(
+                await self.state_reader.get_nonces_many(
+                    data_availability_mode=data_availability_mode,
+                    contract_addresses=missing_addresses,
+                )
+            )
+
+        return _get_values(keys=contract_addresses, cached=self.cache.address_to_nonce)
+
+    async def get_storage_at_many(
+        self,
+        data_availability_mode: DataAvailabilityMode,
+        storage_entries: Collection[StorageEntry],
+    ) -> Dict[StorageEntry, int]:
+        data_availability_mode.assert_l1()
+        missing_entries = _get_missing_keys(keys=storage_entries, cached=self.cache.storage_view)
+        if len(missing_entries) > 0:
+            self.cache._storage_initial_values.update(
+                await self.state_reader.get_storage_at_many(
+                    data_availability_mode=data_availability_mode, storage_entries=missing_entries
+                )
+            )
+
+        return _get_values(keys=storage_entries, cached=self.cache.storage_view)
+
     async def set_compiled_class_hash(self, class_hash: int, compiled_class_hash: int):
         self.cache._compiled_class_hash_writes[class_hash] = compiled_class_hash
 
@@ -532,6 +620,50 @@ class CachedSyncState(SyncState):
 
         return self.cache.storage_view[address_key_pair]
 
+    def get_class_hashes_many(self, contract_addresses: Collection[int]) -> Dict[int, int]:
+        missing_addresses = _get_missing_keys(
+            keys=contract_addresses, cached=self.cache.address_to_class_hash
+        )
+        if len(missing_addresses) > 0:
+            self.cache._class_hash_initial_values.update(
+                self.state_reader.get_class_hashes_many(contract_addresses=missing_addresses)
+            )
+
+        return _get_values(keys=contract_addresses, cached=self.cache.address_to_class_hash)
+
+    def get_nonces_many(
+        self, data_availability_mode: DataAvailabilityMode, contract_addresses: Collection[int]
+    ) -> Dict[int, int]:
+        data_availability_mode.assert_l1()
+        missing_addresses = _get_missing_keys(
+            keys=contract_addresses, cached=self.cache.address_to_nonce
+        )
+        if len(missing_addresses) > 0:
+            self.cache._nonce_initial_values.update(
+                self.state_reader.get_nonces_many(
+                    data_availability_mode=data_availability_mode,
+                    contract_addresses=missing_addresses,
+                )
+            )
+
+        return _get_values(keys=contract_addresses, cached=self.cache.address_to_nonce)
+
+    def get_storage_at_many(
+        self,
+        data_availability_mode: DataAvailabilityMode,
+        storage_entries: Collection[StorageEntry],
+    ) -> Dict[StorageEntry, int]:
+        data_availability_mode.assert_l1()
+        missing_entries = _get_missing_keys(keys=storage_entries, cached=self.cache.storage_view)
+        if len(missing_entries) > 0:
+            self.cache._storage_initial_values.update(
+                self.state_reader.get_storage_at_many(
+                    data_availability_mode=data_availability_mode, storage_entries=missing_entries
+                )
+            )
+
+        return _get_values(keys=storage_entries, cached=self.cache.storage_view)
+
     def set_compiled_class_hash(self, class_hash: int, compiled_class_hash: int):
         self.cache._compiled_class_hash_writes[class_hash] = compiled_class_hash
 
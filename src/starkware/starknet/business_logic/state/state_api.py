@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
+from typing import Collection, Dict, Tuple
 
 from services.everest.business_logic.state_api import StateProxy
-from starkware.python.utils import to_bytes
+from starkware.python.utils import gather_in_chunks, safe_zip, to_bytes
 from starkware.starknet.business_logic.state.state_api_objects import BlockInfo
 from starkware.starknet.definitions import constants, fields
 from starkware.starknet.definitions.constants import DUMMY_SIERRA_VERSION_FOR_CAIRO0_CLASS_INFO
@@ -18,6 +19,8 @@ from starkware.starknet.services.api.contract_class.contract_class import (
 )
 from starkware.starkware_utils.error_handling import StarkException, stark_assert
 
+StorageEntry = Tuple[int, int]  # (contract_address, key).
+
 
 class StateReader(ABC):
     """
@@ -82,6 +85,61 @@ class StateReader(ABC):
         Returns the storage value under the given key in the given contract instance.
         """
 
+    async def get_class_hashes_many(self, contract_addresses: Collection[int]) -> Dict[int, int]:
+        """
+        Returns the class hashes of the contract classes at the given addresses.
+        Implementations may override this to read the values in a batch.
+        """
+        contract_addresses = list(contract_addresses)
+        class_hashes = await gather_in_chunks(
+            awaitables=(
+                self.get_class_hash_at(contract_address=contract_address)
+                for contract_address in contract_addresses
+            )
+        )
+        return dict(safe_zip(contract_addresses, class_hashes))
+
+    async def get_nonces_many(
+        self, data_availability_mode: DataAvailabilityMode, contract_addresses: Collection[int]
+    ) -> Dict[int, int]:
+        """
+        Returns the nonces of the given contract instances.
+        Implementations may override this to read the values in a batch.
+        """
+        contract_addresses = list(contract_addresses)
+        nonces = await gather_in_chunks(
+            awaitables=(
+                self.get_nonce_at(
+                    data_availability_mode=data_availability_mode,
+                    contract_address=contract_address,
+                )
+                for contract_address in contract_addresses
+            )
+        )
+        return dict(safe_zip(contract_addresses, nonces))
+
+    async def get_storage_at_many(
+        self,
+        data_availability_mode: DataAvailabilityMode,
+        storage_entries: Collection[StorageEntry],
+    ) -> Dict[StorageEntry, int]:
+        """
+        Returns the storage values under the given (contract_address, key) pairs.
+        Implementations may override this to read the values in a batch.
+        """
+        storage_entries = list(storage_entries)
+        values = await gather_in_chunks(
+            awaitables=(
+                self.get_storage_at(
+                    data_availability_mode=data_availability_mode,
+                    contract_address=contract_address,
+                    key=key,
+                )
+                for contract_address, key in storage_entries
+            )
+        )
+        return dict(safe_zip(storage_entries, values))
+
     async def get_fee_token_balance(
         self,
         data_availability_mode: DataAvailabilityMode,
@@ -261,6 +319,36 @@ class SyncStateReader(ABC):
     ) -> int:
         pass
 
+    def get_class_hashes_many(self, contract_addresses: Collection[int]) -> Dict[int, int]:
+        return {
+            contract_address: self.get_class_hash_at(contract_address=contract_address)
+            for contract_address in contract_addresses
+        }
+
+    def get_nonces_many(
+        self, data_availability_mode: DataAvailabilityMode, contract_addresses: Collection[int]
+    ) -> Dict[int, int]:
+        return {
+            contract_address: self.get_nonce_at(
+                data_availability_mode=data_availability_mode, contract_address=contract_address
+            )
+            for contract_address in contract_addresses
+        }
+
+    def get_storage_at_many(
+        self,
+        data_availability_mode: DataAvailabilityMode,
+        storage_entries: Collection[StorageEntry],
+    ) -> Dict[StorageEntry, int]:
+        return {
+            (contract_address, key): self.get_storage_at(
+                data_availability_mode=data_availability_mode,
+                contract_address=contract_address,
+                key=key,
+            )
+            for contract_address, key in storage_entries
+        }
+
     def get_compiled_class_by_class_hash(self, class_hash: int) -> CompiledClassBase:
         compiled_class_hash = self.get_compiled_class_hash(class_hash=class_hash)
         if compiled_class_hash != 0:
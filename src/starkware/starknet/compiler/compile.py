@@ -9,9 +9,13 @@ from starkware.cairo.lang.compiler.assembler import assemble
 from starkware.cairo.lang.compiler.cairo_compile import (
     cairo_compile_add_common_args,
     cairo_compile_common,
+    close_file_args,
     compile_cairo_ex,
     get_codes,
     get_module_reader,
+    get_parse_cache,
+    get_parse_executor,
+    get_preprocessed_program_cache,
 )
 from starkware.cairo.lang.compiler.error_handling import LocationError
 from starkware.cairo.lang.compiler.filter_unused_identifiers import filter_unused_identifiers
@@ -220,8 +224,12 @@ def main():
             read_module=module_reader.read,
             opt_unused_functions=args.opt_unused_functions,
             disable_hint_validation=args.disable_hint_validation,
+            parse_cache=get_parse_cache(args=args),
+            parse_executor=get_parse_executor(args=args),
+            cache=get_preprocessed_program_cache(args=args),
         )
 
+    args: Optional[argparse.Namespace] = None
     try:
         cairo_compile_add_common_args(parser)
         args = parser.parse_args()
@@ -242,6 +250,9 @@ def main():
     except LocationError as err:
         print(err, file=sys.stderr)
         return 1
+    finally:
+        if args is not None:
+            close_file_args(args=args)
     return 0
 
 
@@ -0,0 +1,83 @@
+"""
+A thin client of the compile server (see compile_server.py). Runs a compilation with the same
+flags, output and exit code as the given compiler, e.g.:
+    starknet-compile-client --socket /tmp/compile.sock starknet-compile-deprecated contract.cairo \
+        --output contract.json
+
+The client does not import the compiler, so that it starts fast.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+from typing import Any, Dict, List, Optional
+
+CAIRO_COMPILE = "cairo-compile"
+STARKNET_COMPILE = "starknet-compile-deprecated"
+COMPILERS = (CAIRO_COMPILE, STARKNET_COMPILE)
+# The environment variables that the compilers read (see LIBS_DIR_ENVVAR); they are sent with the
+# job, as the compilation runs in the environment of the server.
+FORWARDED_ENV_VARS = ("CAIRO_PATH",)
+
+
+def create_compile_job(
+    compiler: str, args: List[str], job_id: Optional[Any] = None, cwd: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Returns a compile job, as sent to the compile server: compiling with the given compiler and
+    command line arguments, in the given directory (by default, the current one).
+    """
+    assert compiler in COMPILERS, f"Unexpected compiler: {compiler}."
+    return {
+        "id": job_id,
+        "compiler": compiler,
+        "args": args,
+        "cwd": os.getcwd() if cwd is None else cwd,
+        "env": {name: os.environ[name] for name in FORWARDED_ENV_VARS if name in os.environ},
+    }
+
+
+def send_compile_jobs(socket_path: str, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Sends the given jobs to the compile server listening on socket_path, and returns their
+    results, in the order of the jobs. The server runs the jobs concurrently.
+    """
+    indexed_jobs = [dict(job, id=i) for i, job in enumerate(jobs)]
+    results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client_socket:
+        client_socket.connect(socket_path)
+        client_socket.sendall(b"".join(json.dumps(job).encode() + b"\n" for job in indexed_jobs))
+        with client_socket.makefile("rb") as responses:
+            for _ in jobs:
+                line = responses.readline()
+                assert len(line) > 0, "The compile server closed the connection."
+                result = json.loads(line)
+                results[result["id"]] = result
+
+    return [dict(result, id=job.get("id")) for job, result in zip(jobs, results)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compiles using a compile server.")
+    parser.add_argument(
+        "--socket", type=str, required=True, help="The unix socket of the compile server."
+    )
+    parser.add_argument("compiler", choices=COMPILERS)
+    parser.add_argument(
+        "compiler_args", nargs=argparse.REMAINDER, help="The arguments of the compiler."
+    )
+    args = parser.parse_args()
+
+    (result,) = send_compile_jobs(
+        socket_path=args.socket,
+        jobs=[create_compile_job(compiler=args.compiler, args=args.compiler_args)],
+    )
+    sys.stdout.write(result["stdout"])
+    sys.stderr.write(result["stderr"])
+    return result["returncode"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""
+A long-lived compile server, which runs cairo-compile and starknet-compile-deprecated jobs
+without paying the startup time of the compilers (importing the compiler and loading the grammar)
+for each of them.
+
+The server reads compile jobs, one JSON object per line, from stdin or from the connections to a
+unix socket, runs them in a pool of worker processes, and writes a JSON line with the result of
+each job (in the order in which the jobs end). A job is
+    {"id": ..., "compiler": "starknet-compile-deprecated", "args": [...], "cwd": ..., "env": {}}
+where args are the command line arguments of the compiler (see compile_client.py), and its result
+is
+    {"id": ..., "returncode": ..., "stdout": ..., "stderr": ...}
+which are the exit code and outputs of the compiler; outputs written to files (e.g., --output)
+are written by the server.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import io
+import json
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from starkware.cairo.lang.compiler import cairo_compile
+from starkware.cairo.lang.compiler.constants import LIBS_DIR_ENVVAR
+from starkware.cairo.lang.compiler.parse_cache import ParseCache
+from starkware.starknet.compiler import compile as starknet_compile
+from starkware.starknet.compiler.compile_client import (
+    CAIRO_COMPILE,
+    FORWARDED_ENV_VARS,
+    STARKNET_COMPILE,
+)
+
+assert LIBS_DIR_ENVVAR in FORWARDED_ENV_VARS
+
+# The permissions of the unix socket of the server (read and write, for the owner only).
+SOCKET_PERMISSIONS = 0o600
+
+COMPILER_MAINS: Dict[str, Callable[[], int]] = {
+    CAIRO_COMPILE: cairo_compile.main,
+    STARKNET_COMPILE: starknet_compile.main,
+}
+
+# The packages of the standard library, whose modules are parsed when a worker starts.
+STDLIB_PACKAGES = ["starkware.cairo.common", "starkware.starknet.common"]
+
+
+@dataclasses.dataclass
+class CompileJob:
+    compiler: str
+    args: List[str]
+    cwd: str
+    env: Dict[str, str] = dataclasses.field(default_factory=dict)
+    # The default arguments of the server, which precede the arguments of the job (so that the
+    # latter take precedence).
+    default_args: List[str] = dataclasses.field(default_factory=list)
+
+    def __post_init__(self):
+        assert self.compiler in COMPILER_MAINS, f"Unexpected compiler: {self.compiler}."
+        assert isinstance(self.args, list) and all(
+            isinstance(arg, str) for arg in self.args
+        ), "Compile job arguments must be a list of strings."
+
+
+def run_compile_job(job: CompileJob) -> Dict[str, Any]:
+    """
+    Runs the given job in the current process, as if the compiler was invoked from the command
+    line in job.cwd, and returns its exit code and outputs.
+    Changes the state of the process (e.g., the working directory) while the job runs, so jobs
+    must not run concurrently in the same process.
+    """
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    original_argv = sys.argv
+    original_cwd = os.getcwd()
+    original_env = {name: os.environ.get(name) for name in FORWARDED_ENV_VARS}
+    try:
+        os.chdir(job.cwd)
+        for name in FORWARDED_ENV_VARS:
+            if name in job.env:
+                os.environ[name] = job.env[name]
+            else:
+                os.environ.pop(name, None)
+        sys.argv = [job.compiler] + job.default_args + job.args
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                returncode = COMPILER_MAINS[job.compiler]()
+            except SystemExit as exception:
+                # Raised by argparse.
+                returncode = exception.code if isinstance(exception.code, int) else 1
+            except Exception:
+                traceback.print_exc()
+                returncode = 1
+    finally:
+        sys.argv = original_argv
+        os.chdir(original_cwd)
+        for name, value in original_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+    return {"returncode": returncode, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+def init_worker(parse_cache_dir: Optional[str]):
+    """
+    Prepares a worker process of the server before its first job, regardless of the start method
+    of the process: importing this module loads the compilers and the grammar, and if
+    parse_cache_dir is given, the modules of the standard library are parsed into the parse cache
+    (unless they are already there), so that the jobs do not parse them.
+    """
+    if parse_cache_dir is None:
+        return
+
+    parse_cache = ParseCache(cache_dir=parse_cache_dir)
+    # The files are named as when they are imported by a job (see get_module_reader()).
+    stdlib_dir = cairo_compile.get_module_reader(cairo_path=[]).paths[-1]
+    for package in STDLIB_PACKAGES:
+        for dirpath, _, filenames in os.walk(os.path.join(stdlib_dir, *package.split("."))):
+            for filename in sorted(filenames):
+                if not filename.endswith(".cairo"):
+                    continue
+                path = os.path.join(dirpath, filename)
+                with open(path, "r") as code_file:
+                    code = code_file.read()
+                parse_cache.parse_file(code=code, filename=path)
+
+
+class CompileServer:
+    """
+    Runs compile jobs in a pool of n_workers processes; each of them runs one job at a time.
+    The workers are initialized by init_worker() when they start, so that they are warm for their
+    first job.
+    default_args are added to the arguments of every job.
+    If parse_cache_dir is given, it is the --parse_cache_dir of every job, so that the jobs share
+    the parsed modules (including the standard library, which the workers parse when they start).
+    """
+
+    def __init__(
+        self,
+        n_workers: int,
+        default_args: Optional[List[str]] = None,
+        parse_cache_dir: Optional[str] = None,
+    ):
+        self.executor = ProcessPoolExecutor(
+            max_workers=n_workers, initializer=init_worker, initargs=(parse_cache_dir,)
+        )
+        self.default_args = [] if default_args is None else list(default_args)
+        if parse_cache_dir is not None:
+            self.default_args += ["--parse_cache_dir", parse_cache_dir]
+
+    async def run_job(self, request: bytes) -> Dict[str, Any]:
+        job_id = None
+        try:
+            job_dict = json.loads(request)
+            job_id = job_dict.pop("id", None)
+            job = CompileJob(**job_dict, default_args=self.default_args)
+        except Exception as exception:
+            return {
+                "id": job_id,
+                "returncode": 2,
+                "stdout": "",
+                "stderr": f"Invalid compile job: {exception}\n",
+            }
+
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self.executor, run_compile_job, job
+            )
+        except Exception as exception:
+            # E.g., a worker process was terminated.
+            result = {
+                "returncode": 1,
+                "stdout": "",
+                "stderr": f"Compile server error: {exception}\n",
+            }
+        return dict(result, id=job_id)
+
+    async def serve(self, reader: asyncio.StreamReader, write: Callable[[bytes], None]):
+        """
+        Runs the jobs that are read from the given reader until it is closed, and writes their
+        results using the given function.
+        """
+
+        async def run(request: bytes):
+            result = await self.run_job(request=request)
+            write(json.dumps(result).encode() + b"\n")
+
+        tasks = []
+        while True:
+            request = await reader.readline()
+            if len(request) == 0:
+                break
+            if len(request.strip()) > 0:
+                tasks.append(asyncio.create_task(run(request=request)))
+        await asyncio.gather(*tasks)
+
+    async def serve_stdio(self):
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+        def write(response: bytes):
+            sys.stdout.buffer.write(response)
+            sys.stdout.buffer.flush()
+
+        await self.serve(reader=reader, write=write)
+
+    async def serve_unix_socket(self, path: str):
+        # The tasks that handle the open connections; they are cancelled when the server stops.
+        connection_tasks: Set[asyncio.Task] = set()
+
+        async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            task = asyncio.current_task()
+            assert task is not None
+            connection_tasks.add(task)
+            try:
+                await self.serve(reader=reader, write=writer.write)
+                await writer.drain()
+            finally:
+                writer.close()
+                await writer.wait_closed()
+                connection_tasks.discard(task)
+
+        # Only the owner of the server may connect to the socket, as jobs write files as the owner.
+        # The socket is created with these permissions, rather than changed after it is bound.
+        original_umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(handle_connection, path=path)
+        finally:
+            os.umask(original_umask)
+        os.chmod(path, SOCKET_PERMISSIONS)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in connection_tasks:
+                task.cancel()
+            await asyncio.gather(*connection_tasks, return_exceptions=True)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="A server that runs cairo-compile and starknet-compile-deprecated jobs."
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        help="A unix socket to listen on. By default, jobs are read from stdin.",
+    )
+    parser.add_argument("--n_workers", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "--parse_cache_dir", type=str, help="The default --parse_cache_dir of the jobs."
+    )
+    parser.add_argument(
+        "--preprocessed_cache_dir",
+        type=str,
+        help="The default --preprocessed_cache_dir of the jobs.",
+    )
+    args = parser.parse_args()
+
+    default_args = []
+    if args.preprocessed_cache_dir is not None:
+        default_args += ["--preprocessed_cache_dir", os.path.abspath(args.preprocessed_cache_dir)]
+
+    server = CompileServer(
+        n_workers=args.n_workers,
+        default_args=default_args,
+        parse_cache_dir=(
+            None if args.parse_cache_dir is None else os.path.abspath(args.parse_cache_dir)
+        ),
+    )
+    try:
+        if args.socket is None:
+            await server.serve_stdio()
+        else:
+            await server.serve_unix_socket(path=args.socket)
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,153 @@
+import asyncio
+import builtins
+import contextlib
+import json
+import os
+import stat
+
+import pytest
+
+from starkware.starknet.compiler.compile_client import (
+    CAIRO_COMPILE,
+    STARKNET_COMPILE,
+    create_compile_job,
+    send_compile_jobs,
+)
+from starkware.starknet.compiler.compile_server import (
+    SOCKET_PERMISSIONS,
+    CompileJob,
+    CompileServer,
+    init_worker,
+    run_compile_job,
+)
+
+CAIRO_CODE = """
+func main() {
+    [ap] = 1, ap++;
+    ret;
+}
+"""
+
+CONTRACT_CODE = """
+%lang starknet
+
+@view
+func get_value() -> (res: felt) {
+    return (res=1);
+}
+"""
+
+
+@pytest.fixture
+def cwd(tmp_path) -> str:
+    for filename, code in [("main.cairo", CAIRO_CODE), ("contract.cairo", CONTRACT_CODE)]:
+        with open(os.path.join(tmp_path, filename), "w") as code_file:
+            code_file.write(code)
+    return str(tmp_path)
+
+
+def test_run_compile_job(cwd: str, monkeypatch):
+    result = run_compile_job(
+        job=CompileJob(compiler=CAIRO_COMPILE, args=["main.cairo", "--no_debug_info"], cwd=cwd)
+    )
+    assert result["returncode"] == 0 and result["stderr"] == ""
+    assert json.loads(result["stdout"])["data"] == [
+        "0x480680017fff8000",
+        "0x1",
+        "0x208b7fff7fff7ffe",
+    ]
+
+    # Compilation errors are reported as by the command line tool.
+    result = run_compile_job(
+        job=CompileJob(compiler=CAIRO_COMPILE, args=["contract.cairo"], cwd=cwd)
+    )
+    assert result["returncode"] == 1 and result["stdout"] == ""
+    assert "Unsupported %lang directive." in result["stderr"]
+
+    # The output files are closed when the job ends, including on errors.
+    opened_files = []
+    original_open = builtins.open
+
+    def recording_open(*args, **kwargs):
+        opened_file = original_open(*args, **kwargs)
+        opened_files.append(opened_file)
+        return opened_file
+
+    monkeypatch.setattr(builtins, "open", recording_open)
+    for compiler, args, expected_returncode in [
+        (STARKNET_COMPILE, ["contract.cairo", "--abi", "abi.json"], 0),
+        (CAIRO_COMPILE, ["contract.cairo"], 1),
+    ]:
+        result = run_compile_job(
+            job=CompileJob(compiler=compiler, args=args + ["--output", "out.json"], cwd=cwd)
+        )
+        assert result["returncode"] == expected_returncode
+    monkeypatch.undo()
+    output_files = [
+        opened_file
+        for opened_file in opened_files
+        if os.path.basename(opened_file.name) in ("out.json", "abi.json")
+    ]
+    assert len(output_files) == 3 and all(output_file.closed for output_file in output_files)
+
+    result = run_compile_job(
+        job=CompileJob(compiler=CAIRO_COMPILE, args=["main.cairo", "--bad_flag"], cwd=cwd)
+    )
+    assert result["returncode"] == 2
+    assert "unrecognized arguments: --bad_flag" in result["stderr"]
+
+
+@pytest.mark.asyncio
+async def test_compile_server(cwd: str):
+    server = CompileServer(n_workers=1)
+    socket_path = os.path.join(cwd, "compile_server.sock")
+    server_task = asyncio.create_task(server.serve_unix_socket(path=socket_path))
+    while not os.path.exists(socket_path):
+        await asyncio.sleep(0.01)
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) == SOCKET_PERMISSIONS
+
+    jobs = [
+        create_compile_job(
+            compiler=STARKNET_COMPILE,
+            args=["contract.cairo", "--output", "contract.json", "--abi", "abi.json"],
+            cwd=cwd,
+        ),
+        create_compile_job(compiler=CAIRO_COMPILE, args=["main.cairo"], cwd=cwd),
+        {"compiler": "unknown-compile", "args": [], "cwd": cwd},
+    ]
+    try:
+        (
+            contract_result,
+            cairo_result,
+            invalid_result,
+        ) = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: send_compile_jobs(socket_path=socket_path, jobs=jobs)
+        )
+    finally:
+        server_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await server_task
+        server.close()
+
+    assert contract_result["returncode"] == 0 and contract_result["stdout"] == ""
+    with open(os.path.join(cwd, "abi.json")) as abi_file:
+        assert [entry["name"] for entry in json.load(abi_file)] == ["get_value"]
+    with open(os.path.join(cwd, "contract.json")) as contract_file:
+        assert "entry_points_by_type" in json.load(contract_file)
+
+    assert cairo_result["returncode"] == 0
+    assert "data" in json.loads(cairo_result["stdout"])
+
+    assert invalid_result["returncode"] == 2
+    assert "Unexpected compiler: unknown-compile." in invalid_result["stderr"]
+
+
+def test_init_worker(tmp_path):
+    parse_cache_dir = str(tmp_path / "parse_cache")
+    init_worker(parse_cache_dir=parse_cache_dir)
+    n_entries = len(os.listdir(parse_cache_dir))
+    assert n_entries > 0
+
+    # A worker that starts later finds the standard library in the parse cache.
+    init_worker(parse_cache_dir=parse_cache_dir)
+    assert len(os.listdir(parse_cache_dir)) == n_entries
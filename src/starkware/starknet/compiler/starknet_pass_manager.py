@@ -1,10 +1,16 @@
-from typing import Callable, Tuple
+from concurrent.futures import Executor
+from typing import Callable, Optional, Tuple
 
+from starkware.cairo.lang.compiler.parse_cache import ParseCache
 from starkware.cairo.lang.compiler.preprocessor.default_pass_manager import (
     ModuleCollector,
     default_pass_manager,
 )
-from starkware.cairo.lang.compiler.preprocessor.pass_manager import PassManager, VisitorStage
+from starkware.cairo.lang.compiler.preprocessor.pass_manager import (
+    PassManager,
+    PassManagerCache,
+    VisitorStage,
+)
 from starkware.starknet.compiler.contract_interface import (
     ContractInterfaceDeclVisitor,
     ContractInterfaceImplementationVisitor,
@@ -29,6 +35,9 @@ def starknet_pass_manager(
     read_module: Callable[[str], Tuple[str, str]],
     opt_unused_functions: bool = True,
     disable_hint_validation: bool = False,
+    parse_cache: Optional[ParseCache] = None,
+    parse_executor: Optional[Executor] = None,
+    cache: Optional[PassManagerCache] = None,
 ) -> PassManager:
     hint_whitelist = None if disable_hint_validation else get_hints_whitelist()
     manager = default_pass_manager(
@@ -38,7 +47,11 @@ def starknet_pass_manager(
         opt_unused_functions=opt_unused_functions,
         preprocessor_kwargs=dict(hint_whitelist=hint_whitelist),
         additional_scopes_to_compile={WRAPPER_SCOPE},
+        parse_cache=parse_cache,
+        parse_executor=parse_executor,
+        cache=cache,
     )
+    manager.config.update(disable_hint_validation=disable_hint_validation)
     # Use ModuleCollector.additional_modules to import necessary modules, whose import line
     # may be added after the module_collector phase.
     manager.replace(
@@ -54,6 +67,8 @@ def starknet_pass_manager(
                 "starkware.starknet.common.syscalls",
                 "starkware.starknet.common.storage",
             ],
+            parse_cache=parse_cache,
+            parse_executor=parse_executor,
         ),
     )
 
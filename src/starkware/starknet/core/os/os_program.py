@@ -4,6 +4,7 @@ import cachetools
 
 from starkware.cairo.bootloaders.hash_program import HashFunction, compute_program_hash_chain
 from starkware.cairo.lang.compiler.program import Program
+from starkware.cairo.lang.compiler.program_snapshot import get_snapshot_cache_dir, load_program
 
 STARKNET_OS_COMPILED_PATH = os.path.join(os.path.dirname(__file__), "starknet_os_compiled.json")
 
@@ -16,7 +17,11 @@ def get_os_casm() -> str:
 
 @cachetools.cached(cache={})
 def get_os_program() -> Program:
-    return Program.loads(get_os_casm())
+    """
+    Returns the OS program; if a snapshot cache directory is configured (see
+    get_snapshot_cache_dir()), the program is loaded from its snapshot.
+    """
+    return load_program(data=get_os_casm(), cache_dir=get_snapshot_cache_dir())
 
 
 @cachetools.cached(cache={})
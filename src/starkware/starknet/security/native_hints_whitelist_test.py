@@ -0,0 +1,16 @@
+from starkware.cairo.common.native_hints import common_library_native_hints
+from starkware.starknet.security.hints_whitelist import get_hints_whitelist
+
+
+def test_native_hints_are_whitelisted():
+    """
+    Checks that the hints that have a native implementation are whitelisted, so that native
+    implementations are only provided for hints that may appear in Starknet contracts and the OS.
+    """
+    whitelist = get_hints_whitelist()
+    non_whitelisted_hints = [
+        code
+        for code in common_library_native_hints.hints
+        if code not in whitelist.allowed_reference_expressions_for_hint
+    ]
+    assert non_whitelisted_hints == []
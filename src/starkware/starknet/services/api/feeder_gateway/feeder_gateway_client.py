@@ -1,10 +1,14 @@
+import asyncio
 import json
-from typing import Dict, List, Optional, Union
+from concurrent.futures import Executor
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar, Union
 
 from services.everest.api.feeder_gateway.feeder_gateway_client import EverestFeederGatewayClient
 from services.external_api.client import JsonObject
+from starkware.python.utils import gen_gather_with_concurrency
 from starkware.starknet.definitions import fields
 from starkware.starknet.services.api.feeder_gateway.request_objects import CallFunction
+from starkware.starknet.services.api.feeder_gateway.response_cache import RawResponseCache
 from starkware.starknet.services.api.feeder_gateway.response_objects import (
     BlockIdentifier,
     BlockSignature,
@@ -17,6 +21,10 @@ from starkware.starknet.services.api.feeder_gateway.response_objects import (
 from starkware.starkware_utils.validated_fields import RangeValidatedField
 
 CastableToHash = Union[int, str]
+T = TypeVar("T")
+
+# The default number of blocks fetched ahead by the iter_* methods of FeederGatewayClient.
+DEFAULT_PREFETCH_CONCURRENCY = 8
 
 
 # Simulation-related.
@@ -118,6 +126,74 @@ class FeederGatewayClient(EverestFeederGatewayClient):
         )
         return json.loads(raw_response)
 
+    async def iter_blocks(
+        self,
+        start: int,
+        end: int,
+        concurrency: int = DEFAULT_PREFETCH_CONCURRENCY,
+        response_cache: Optional[RawResponseCache] = None,
+        executor: Optional[Executor] = None,
+    ) -> AsyncIterator[StarknetBlock]:
+        """
+        Yields the blocks in the range [start, end), in order; see _iter_block_range().
+        """
+        async for block in self._iter_block_range(
+            endpoint="get_block",
+            parse=StarknetBlock.loads,
+            start=start,
+            end=end,
+            concurrency=concurrency,
+            response_cache=response_cache,
+            executor=executor,
+        ):
+            yield block
+
+    async def iter_block_traces(
+        self,
+        start: int,
+        end: int,
+        concurrency: int = DEFAULT_PREFETCH_CONCURRENCY,
+        response_cache: Optional[RawResponseCache] = None,
+        executor: Optional[Executor] = None,
+    ) -> AsyncIterator[BlockTransactionTraces]:
+        """
+        Yields the traces of the blocks in the range [start, end), in order; see
+        _iter_block_range().
+        """
+        async for block_traces in self._iter_block_range(
+            endpoint="get_block_traces",
+            parse=BlockTransactionTraces.loads,
+            start=start,
+            end=end,
+            concurrency=concurrency,
+            response_cache=response_cache,
+            executor=executor,
+        ):
+            yield block_traces
+
+    async def iter_state_updates(
+        self,
+        start: int,
+        end: int,
+        concurrency: int = DEFAULT_PREFETCH_CONCURRENCY,
+        response_cache: Optional[RawResponseCache] = None,
+        executor: Optional[Executor] = None,
+    ) -> AsyncIterator[JsonObject]:
+        """
+        Yields the state updates of the blocks in the range [start, end), in order; see
+        _iter_block_range().
+        """
+        async for state_update in self._iter_block_range(
+            endpoint="get_state_update",
+            parse=json.loads,
+            start=start,
+            end=end,
+            concurrency=concurrency,
+            response_cache=response_cache,
+            executor=executor,
+        ):
+            yield state_update
+
     async def get_code(
         self,
         contract_address: int,
@@ -303,6 +379,88 @@ class FeederGatewayClient(EverestFeederGatewayClient):
         )
         return BlockSignature.loads(data=raw_response)
 
+    async def _iter_block_range(
+        self,
+        endpoint: str,
+        parse: Callable[[str], T],
+        start: int,
+        end: int,
+        concurrency: int,
+        response_cache: Optional[RawResponseCache],
+        executor: Optional[Executor],
+    ) -> AsyncIterator[T]:
+        """
+        Yields the parsed responses of the given endpoint for the blocks in the range [start, end),
+        in order. Up to `concurrency` blocks are fetched ahead of the one that is yielded, over a
+        shared connection pool.
+        If response_cache is given, the raw responses are read from it, and the responses for the
+        blocks that are at least response_cache.min_block_depth blocks below the latest block are
+        written to it (the responses for the recent blocks may still change, e.g., if the block is
+        reverted before it is accepted on L1).
+        If executor is given, the responses are parsed in it (a ProcessPoolExecutor avoids stalling
+        the event loop on large responses); otherwise, they are parsed in the event loop.
+        """
+        assert concurrency > 0, f"concurrency must be greater than 0; got: {concurrency}."
+        # The latest block number is requested once, on the first cache miss.
+        latest_block_number: Optional[asyncio.Future] = None
+
+        async def is_final(block_number: int) -> bool:
+            nonlocal latest_block_number
+            assert response_cache is not None
+            if latest_block_number is None:
+                latest_block_number = asyncio.ensure_future(self._get_latest_block_number())
+            return block_number <= await latest_block_number - response_cache.min_block_depth
+
+        async def fetch(block_number: int) -> T:
+            raw_response = await self._get_raw_block_response(
+                endpoint=endpoint,
+                block_number=block_number,
+                response_cache=response_cache,
+                is_final=is_final,
+            )
+            if executor is None:
+                return parse(raw_response)
+            return await asyncio.get_running_loop().run_in_executor(executor, parse, raw_response)
+
+        async with self:
+            async for result in gen_gather_with_concurrency(
+                awaitables=(fetch(block_number) for block_number in range(start, end)),
+                max_concurrency=concurrency,
+            ):
+                yield result
+
+    async def _get_latest_block_number(self) -> int:
+        raw_response = await self._send_request(
+            send_method="GET",
+            uri="/get_block?blockNumber=latest",
+        )
+        return json.loads(raw_response)["block_number"]
+
+    async def _get_raw_block_response(
+        self,
+        endpoint: str,
+        block_number: int,
+        response_cache: Optional[RawResponseCache],
+        is_final: Callable[[int], Awaitable[bool]],
+    ) -> str:
+        """
+        Returns the raw response of the given endpoint for the given block number, using
+        response_cache if given; the response is only cached if is_final(block_number).
+        """
+        formatted_block_named_argument = get_formatted_block_named_argument(
+            block_hash=None, block_number=block_number
+        )
+        uri = f"/{endpoint}?{formatted_block_named_argument}"
+        if response_cache is not None:
+            cached_response = response_cache.get(base_url=self.url, uri=uri)
+            if cached_response is not None:
+                return cached_response
+
+        raw_response = await self._send_request(send_method="GET", uri=uri)
+        if response_cache is not None and await is_final(block_number):
+            response_cache.set(base_url=self.url, uri=uri, raw_response=raw_response)
+        return raw_response
+
 
 def format_hash(hash_value: CastableToHash, hash_field: RangeValidatedField) -> str:
     if isinstance(hash_value, int):
@@ -0,0 +1,107 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import pytest
+
+from starkware.starknet.services.api.feeder_gateway.feeder_gateway_client import (
+    FeederGatewayClient,
+)
+from starkware.starknet.services.api.feeder_gateway.response_cache import RawResponseCache
+
+
+class DummyFeederGatewayClient(FeederGatewayClient):
+    """
+    A FeederGatewayClient that answers get_state_update requests locally, and records the
+    requested URIs (other than those of the latest block).
+    """
+
+    def __init__(self, latest_block_number: int = 100, url: str = "http://localhost"):
+        super().__init__(url=url)
+        self.latest_block_number = latest_block_number
+        self.requested_uris: List[str] = []
+
+    async def _send_request(self, send_method: str, uri: str, data=None, params=None) -> str:
+        assert send_method == "GET"
+        if uri == "/get_block?blockNumber=latest":
+            return json.dumps({"block_number": self.latest_block_number})
+        self.requested_uris.append(uri)
+        assert uri.startswith("/get_state_update?blockNumber=")
+        block_number = int(uri[len("/get_state_update?blockNumber=") :])
+        return json.dumps({"block_number": block_number, "url": self.url})
+
+
+async def get_state_updates(
+    client: FeederGatewayClient,
+    start: int,
+    end: int,
+    response_cache: Optional[RawResponseCache] = None,
+) -> List[int]:
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        return [
+            state_update["block_number"]
+            async for state_update in client.iter_state_updates(
+                start=start,
+                end=end,
+                concurrency=3,
+                response_cache=response_cache,
+                executor=executor,
+            )
+        ]
+
+
+@pytest.mark.asyncio
+async def test_iter_state_updates(tmp_path):
+    client = DummyFeederGatewayClient()
+    response_cache = RawResponseCache(cache_dir=str(tmp_path), min_block_depth=10)
+
+    block_numbers = await get_state_updates(
+        client=client, start=5, end=15, response_cache=response_cache
+    )
+    assert block_numbers == list(range(5, 15))
+    assert len(client.requested_uris) == 10
+
+    # Only the blocks that are not in the cache are requested.
+    client.requested_uris.clear()
+    block_numbers = await get_state_updates(
+        client=client, start=10, end=20, response_cache=response_cache
+    )
+    assert block_numbers == list(range(10, 20))
+    assert sorted(client.requested_uris) == sorted(
+        f"/get_state_update?blockNumber={block_number}" for block_number in range(15, 20)
+    )
+
+
+@pytest.mark.asyncio
+async def test_iter_state_updates_recent_blocks_not_cached(tmp_path):
+    client = DummyFeederGatewayClient(latest_block_number=20)
+    response_cache = RawResponseCache(cache_dir=str(tmp_path), min_block_depth=5)
+
+    for _ in range(2):
+        client.requested_uris.clear()
+        block_numbers = await get_state_updates(
+            client=client, start=10, end=21, response_cache=response_cache
+        )
+        assert block_numbers == list(range(10, 21))
+
+    # Only the blocks that are at least 5 blocks below the latest block were cached.
+    assert sorted(client.requested_uris) == sorted(
+        f"/get_state_update?blockNumber={block_number}" for block_number in range(16, 21)
+    )
+
+
+@pytest.mark.asyncio
+async def test_iter_state_updates_cache_per_gateway(tmp_path):
+    response_cache = RawResponseCache(cache_dir=str(tmp_path), min_block_depth=10)
+    for url in ["http://mainnet", "http://testnet"]:
+        client = DummyFeederGatewayClient(url=url)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            state_updates = [
+                state_update
+                async for state_update in client.iter_state_updates(
+                    start=0, end=5, response_cache=response_cache, executor=executor
+                )
+            ]
+        # The responses of the other gateway are not used.
+        assert len(client.requested_uris) == 5
+        assert all(state_update["url"] == url for state_update in state_updates)
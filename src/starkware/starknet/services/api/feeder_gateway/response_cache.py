@@ -0,0 +1,68 @@
+import hashlib
+import os
+from typing import Optional
+
+from starkware.python.utils import remove_oldest_files, write_file_atomically
+
+ENTRY_SUFFIX = ".json"
+
+# The default number of blocks below the latest block from which responses for a block number are
+# cached; the recent blocks are not yet accepted on L1, and their responses may still change.
+DEFAULT_MIN_BLOCK_DEPTH = 1000
+
+
+class RawResponseCache:
+    """
+    An on-disk cache of raw (unparsed) FeederGateway responses, keyed by the hash of the base URL
+    of the gateway and the request URI (e.g., "/get_block?blockNumber=5").
+    Only responses that do not change over time should be stored; for example, responses for a
+    given block hash, or for a block number of a block that is already accepted on L1.
+    FeederGatewayClient only stores the responses for the blocks that are at least
+    min_block_depth blocks below the latest block.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        min_block_depth: int = DEFAULT_MIN_BLOCK_DEPTH,
+        max_entries: Optional[int] = None,
+    ):
+        """
+        max_entries - if given, the oldest responses beyond max_entries are removed before the
+          first response is stored.
+        """
+        assert (
+            min_block_depth >= 0
+        ), f"min_block_depth must be non-negative; got: {min_block_depth}."
+        self.cache_dir = cache_dir
+        self.min_block_depth = min_block_depth
+        self.max_entries = max_entries
+        self.removed_old_entries = False
+
+    def get_path(self, base_url: str, uri: str) -> str:
+        """
+        Returns the path of the response for the given URI of the gateway at base_url; the base URL
+        is a part of the key, so that gateways of different networks may share a cache directory.
+        """
+        key = f"{base_url}\0{uri}"
+        return os.path.join(
+            self.cache_dir, f"{hashlib.sha256(key.encode()).hexdigest()}{ENTRY_SUFFIX}"
+        )
+
+    def get(self, base_url: str, uri: str) -> Optional[str]:
+        try:
+            with open(self.get_path(base_url=base_url, uri=uri), "r", encoding="utf-8") as fp:
+                return fp.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, base_url: str, uri: str, raw_response: str):
+        if not self.removed_old_entries and self.max_entries is not None:
+            self.removed_old_entries = True
+            remove_oldest_files(
+                directory=self.cache_dir, suffix=ENTRY_SUFFIX, max_files=self.max_entries
+            )
+        write_file_atomically(
+            path=self.get_path(base_url=base_url, uri=uri),
+            write=lambda fp: fp.write(raw_response.encode("utf-8")),
+        )
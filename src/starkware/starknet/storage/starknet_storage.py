@@ -13,6 +13,7 @@ from starkware.starkware_utils.commitment_tree.leaf_fact_utils import FeltLeaf
 from starkware.starkware_utils.commitment_tree.patricia_tree.patricia_tree import PatriciaTree
 from starkware.starkware_utils.marshmallow_dataclass_fields import IntAsHex
 from starkware.starkware_utils.validated_dataclass import ValidatedMarshmallowDataclass
+from starkware.storage.compact_fact_storage import FactCodec
 from starkware.storage.storage import FactFetchingContext
 
 logger = logging.getLogger(__name__)
@@ -30,6 +31,10 @@ class StorageLeaf(FeltLeaf):
         return b"starknet_storage_leaf"
 
 
+# Storage leaves are already serialized compactly; only their keys are compacted.
+STORAGE_LEAF_CODEC = FactCodec(prefix=StorageLeaf.prefix(), tag=2)
+
+
 @marshmallow_dataclass.dataclass(frozen=True)
 class CommitmentInfo(ValidatedMarshmallowDataclass):
     """
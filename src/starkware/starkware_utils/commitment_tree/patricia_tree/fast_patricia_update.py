@@ -1,19 +1,27 @@
+import asyncio
 import dataclasses
 from bisect import bisect_left, bisect_right
+from concurrent.futures import Executor
 from typing import Collection, Dict, List, Optional, Tuple, Type
 
-from starkware.python.utils import process_concurrently, safe_zip
+from starkware.python.utils import process_concurrently, safe_zip, to_bytes
 from starkware.starkware_utils.commitment_tree.binary_fact_tree import TLeafFact
 from starkware.starkware_utils.commitment_tree.patricia_tree.nodes import (
     BinaryNodeFact,
     EdgeNodeFact,
     EmptyNodeFact,
     PatriciaNodeFact,
+    add_edge_length,
     deserialize_edge,
-    hash_edge,
     serialize_edge,
 )
-from starkware.storage.storage import HASH_BYTES, FactFetchingContext, HashFunctionType
+from starkware.storage.storage import (
+    HASH_BYTES,
+    FactFetchingContext,
+    FactWriter,
+    HashFunctionType,
+    HashManyFunctionType,
+)
 
 # Utility classes.
 
@@ -56,6 +64,10 @@ Facts = Dict[bytes, bytes]
 EMPTY_NODE = Node.from_value(value=EmptyNodeFact.EMPTY_NODE_HASH)
 BINARY_NODE = Node.from_value(value=None)
 
+# The depth of the roots of the subtrees that are hashed separately when a hash executor is used
+# (see calculate_subtree_facts_in_executor()); up to 2**DEFAULT_SPLIT_DEPTH independent subtrees.
+DEFAULT_SPLIT_DEPTH = 8
+
 
 @dataclasses.dataclass
 class TreeContext:
@@ -131,27 +143,28 @@ class SubTree:
 # Hash calculation.
 
 
-async def calculate_inner_node_facts(
-    nodes_by_dependency_layer: List[List[IndexedNode]], hash_func: HashFunctionType, n_workers: int
-) -> Tuple[bytes, Facts]:
+@dataclasses.dataclass
+class HashContext:
     """
-    Calculates the facts corresponding to the given nodes.
-    Returns the new root hash and the facts of the updated inner nodes
-    (leaf facts should be added separatly).
+    Context for calculating the hashes and facts of updated nodes.
     """
-    inner_node_facts: Facts = {}
-    index_to_hash: Dict[int, bytes] = {}
 
-    def calculate_fact(indexed_node: IndexedNode):
+    # Index to node hash; may be initialized with the hashes of nodes calculated elsewhere (e.g.,
+    # the roots of subtrees hashed in another process).
+    index_to_hash: Dict[int, bytes] = dataclasses.field(default_factory=dict)
+    inner_node_facts: Facts = dataclasses.field(default_factory=dict)
+
+    def get_hash_input(self, indexed_node: IndexedNode) -> Optional[Tuple[bytes, bytes]]:
+        """
+        Returns the input of the hash function for the given node; for an edge node, the hash of
+        the node is the result plus the length of the edge (see hash_edge()).
+        Returns None if the node has no fact to calculate.
+        """
         index, node = indexed_node
-        # Used as the basis for the db_key of the fact.
-        node_hash: bytes
-        # Used as the value of the fact (equals `None` when the fact is not to be set).
-        serialized_node_value: Optional[bytes]
+        index_to_hash = self.index_to_hash
         if node.is_binary:
-            left, right = index_to_hash[(left_index := index << 1)], index_to_hash[left_index ^ 1]
-            node_hash = hash_func(left, right)
-            serialized_node_value = left + right
+            left_index = index << 1
+            return index_to_hash[left_index], index_to_hash[left_index ^ 1]
         elif node.is_edge:
             if node.value is not None:
                 # Edge holds the bottom hash value.
@@ -160,30 +173,235 @@ async def calculate_inner_node_facts(
                 # Indirection.
                 bottom_index = (index << node.length) | node.path
                 bottom = index_to_hash[bottom_index]
+            return bottom, to_bytes(node.path)
 
-            node_hash = hash_edge(
-                bottom=bottom, path=node.path, length=node.length, hash_func=hash_func
-            )
+        assert node.length == 0 and node.value is not None
+        # Either a leaf or an unchanged node - the hash is the value itself and there's no need
+        # to set the fact: leaf facts are set elsewhere, and unchanged node facts are not set.
+        index_to_hash[index] = node.value
+        return None
+
+    def set_fact(
+        self, indexed_node: IndexedNode, hash_input: Tuple[bytes, bytes], hash_result: bytes
+    ):
+        index, node = indexed_node
+        # Used as the basis for the db_key of the fact.
+        node_hash: bytes
+        # Used as the value of the fact.
+        serialized_node_value: bytes
+        if node.is_binary:
+            left, right = hash_input
+            node_hash = hash_result
+            serialized_node_value = left + right
+        else:
+            bottom, _ = hash_input
+            node_hash = add_edge_length(bottom_path_hash=hash_result, length=node.length)
             serialized_node_value = serialize_edge(
                 bottom=bottom, path=node.path, length=node.length
             )
+
+        self.index_to_hash[index] = node_hash
+        self.inner_node_facts[PatriciaNodeFact.db_key(suffix=node_hash)] = serialized_node_value
+
+    def calculate_fact(self, indexed_node: IndexedNode, hash_func: HashFunctionType):
+        hash_input = self.get_hash_input(indexed_node=indexed_node)
+        if hash_input is not None:
+            self.set_fact(
+                indexed_node=indexed_node,
+                hash_input=hash_input,
+                hash_result=hash_func(*hash_input),
+            )
+
+    def calculate_layer_facts(self, nodes: List[IndexedNode], hash_many_func: HashManyFunctionType):
+        """
+        Calculates the facts of the given nodes with a single call to hash_many_func.
+        """
+        hashed_nodes = []
+        hash_inputs = []
+        for indexed_node in nodes:
+            hash_input = self.get_hash_input(indexed_node=indexed_node)
+            if hash_input is not None:
+                hashed_nodes.append(indexed_node)
+                hash_inputs.append(hash_input)
+
+        if len(hash_inputs) == 0:
+            return
+        hash_results = hash_many_func(hash_inputs)
+        for indexed_node, hash_input, hash_result in safe_zip(
+            hashed_nodes, hash_inputs, hash_results
+        ):
+            self.set_fact(indexed_node=indexed_node, hash_input=hash_input, hash_result=hash_result)
+
+
+async def calculate_inner_node_facts(
+    nodes_by_dependency_layer: List[List[IndexedNode]],
+    hash_func: HashFunctionType,
+    n_workers: int,
+    hash_many_func: Optional[HashManyFunctionType] = None,
+    hash_executor: Optional[Executor] = None,
+    split_depth: int = DEFAULT_SPLIT_DEPTH,
+    fact_writer: Optional[FactWriter] = None,
+) -> Tuple[bytes, Facts]:
+    """
+    Calculates the facts corresponding to the given nodes.
+    Returns the new root hash and the facts of the updated inner nodes
+    (leaf facts should be added separatly).
+    If hash_many_func is given, the hashes of each layer are computed with a single call to it.
+    If hash_executor is given, the subtrees rooted at depth split_depth are hashed in it (see
+    calculate_subtree_facts()), and only the nodes above them are hashed in this process.
+    If fact_writer is given, the facts are written with it as they are calculated (layer by layer),
+    rather than returned.
+    """
+    context = HashContext()
+
+    async def write_facts():
+        if fact_writer is not None:
+            facts, context.inner_node_facts = context.inner_node_facts, {}
+            await fact_writer.write(facts=facts)
+
+    if hash_executor is not None:
+        nodes_by_dependency_layer = await calculate_subtree_facts_in_executor(
+            nodes_by_dependency_layer=nodes_by_dependency_layer,
+            hash_func=hash_func,
+            hash_many_func=hash_many_func,
+            hash_executor=hash_executor,
+            split_depth=split_depth,
+            n_tasks=n_workers,
+            context=context,
+            fact_writer=fact_writer,
+        )
+
+    def calculate_fact(indexed_node: IndexedNode):
+        context.calculate_fact(indexed_node=indexed_node, hash_func=hash_func)
+
+    loop = asyncio.get_event_loop()
+    for nodes in nodes_by_dependency_layer:
+        if hash_many_func is None:
+            # Calculate layer facts with threads (assuming the hash function does not take the
+            # GIL).
+            # Note that `caclculate_hash` is not suitable for multi-processing; see
+            # calculate_subtree_facts_in_executor() for that.
+            await process_concurrently(func=calculate_fact, items=nodes, n_chunks=n_workers)
         else:
-            assert node.length == 0 and node.value is not None
-            # Either a leaf or an unchanged node - the hash is the value itself and there's no need
-            # to set the fact: leaf facts are set elsewhere, and unchanged node facts are not set.
-            node_hash = node.value
-            serialized_node_value = None
+            await loop.run_in_executor(None, context.calculate_layer_facts, nodes, hash_many_func)
+        await write_facts()
+
+    return context.index_to_hash[1], context.inner_node_facts
 
-        index_to_hash[index] = node_hash
-        if serialized_node_value is not None:
-            inner_node_facts[PatriciaNodeFact.db_key(suffix=node_hash)] = serialized_node_value
 
+def calculate_subtree_facts(
+    nodes_by_dependency_layer: List[List[IndexedNode]],
+    root_indices: List[int],
+    hash_func: HashFunctionType,
+    hash_many_func: Optional[HashManyFunctionType],
+) -> Tuple[Dict[int, bytes], Facts]:
+    """
+    Calculates the facts of the nodes of independent subtrees, given ordered and grouped by
+    dependency. Runs synchronously, and is meant to run in a separate process.
+    Returns the hashes of the given roots of the subtrees, and the facts of their inner nodes.
+    """
+    context = HashContext()
     for nodes in nodes_by_dependency_layer:
-        # Calculate layer facts with threads (assuming the hash function does not take the GIL).
-        # Note that `caclculate_hash` is not suitable for multi-processing.
-        await process_concurrently(func=calculate_fact, items=nodes, n_chunks=n_workers)
+        if hash_many_func is not None:
+            context.calculate_layer_facts(nodes=nodes, hash_many_func=hash_many_func)
+            continue
+
+        for indexed_node in nodes:
+            context.calculate_fact(indexed_node=indexed_node, hash_func=hash_func)
+
+    root_hashes = {index: context.index_to_hash[index] for index in root_indices}
+    return root_hashes, context.inner_node_facts
+
+
+async def calculate_subtree_facts_in_executor(
+    nodes_by_dependency_layer: List[List[IndexedNode]],
+    hash_func: HashFunctionType,
+    hash_many_func: Optional[HashManyFunctionType],
+    hash_executor: Executor,
+    split_depth: int,
+    n_tasks: int,
+    context: HashContext,
+    fact_writer: Optional[FactWriter] = None,
+) -> List[List[IndexedNode]]:
+    """
+    Partitions the given nodes to the subtrees rooted at depth split_depth, and calculates their
+    facts in the given executor (see calculate_subtree_facts()); the hashes of the roots of the
+    subtrees are added to the given context, and so are the facts (or they are written with
+    fact_writer, if given, as each task completes).
+    A node only depends on its descendants, so the subtrees are independent of each other; the
+    topmost updated node of each subtree (the only one the nodes above it depend on) is either its
+    root or the bottom of an edge that crosses split_depth.
+    Returns the remaining nodes (above split_depth), ordered and grouped by dependency.
+    """
+    assert split_depth > 0, "The root must be hashed by the caller."
+    top_nodes_by_dependency_layer: List[List[IndexedNode]] = []
+    # Maps the index of the root of a subtree at depth split_depth to its nodes, by layer.
+    subtrees: Dict[int, List[List[IndexedNode]]] = {}
+    for layer, nodes in enumerate(nodes_by_dependency_layer):
+        top_nodes = []
+        for indexed_node in nodes:
+            index, _ = indexed_node
+            depth = index.bit_length() - 1
+            if depth < split_depth:
+                top_nodes.append(indexed_node)
+                continue
+
+            subtree_layers = subtrees.setdefault(index >> (depth - split_depth), [])
+            while len(subtree_layers) <= layer:
+                subtree_layers.append([])
+            subtree_layers[layer].append(indexed_node)
 
-    return index_to_hash[1], inner_node_facts
+        top_nodes_by_dependency_layer.append(top_nodes)
+
+    if len(subtrees) == 0:
+        return top_nodes_by_dependency_layer
+
+    # Split the subtrees into tasks of roughly the same number of nodes; the nodes of the subtrees
+    # of a task are merged by layer, so that each layer is hashed at once.
+    n_tasks = min(n_tasks, len(subtrees))
+    task_layers: List[List[List[IndexedNode]]] = [[] for _ in range(n_tasks)]
+    task_root_indices: List[List[int]] = [[] for _ in range(n_tasks)]
+    task_sizes = [0] * n_tasks
+    for subtree_layers in sorted(
+        subtrees.values(), key=lambda layers: sum(map(len, layers)), reverse=True
+    ):
+        task_index = task_sizes.index(min(task_sizes))
+        layers = task_layers[task_index]
+        for layer, nodes in enumerate(subtree_layers):
+            if len(layers) == layer:
+                layers.append([])
+            layers[layer].extend(nodes)
+        task_root_indices[task_index].append(
+            min(
+                (index for nodes in subtree_layers for index, _ in nodes),
+                key=lambda index: index.bit_length(),
+            )
+        )
+        task_sizes[task_index] += sum(map(len, subtree_layers))
+
+    loop = asyncio.get_event_loop()
+    results = asyncio.as_completed(
+        [
+            loop.run_in_executor(
+                hash_executor,
+                calculate_subtree_facts,
+                layers,
+                root_indices,
+                hash_func,
+                hash_many_func,
+            )
+            for layers, root_indices in safe_zip(task_layers, task_root_indices)
+        ]
+    )
+    for result in results:
+        root_hashes, facts = await result
+        context.index_to_hash.update(root_hashes)
+        if fact_writer is None:
+            context.inner_node_facts.update(facts)
+        else:
+            await fact_writer.write(facts=facts)
+
+    return top_nodes_by_dependency_layer
 
 
 # Traversal logic.
@@ -275,7 +493,9 @@ async def fetch_nodes(
             next_subtrees += [left_subtree, right_subtree]
 
         else:
-            assert len(value) == EdgeNodeFact.PREIMAGE_LENGTH
+            assert (
+                EdgeNodeFact.MIN_PREIMAGE_LENGTH <= len(value) <= EdgeNodeFact.PREIMAGE_LENGTH
+            ), f"Unexpected Patricia node length: {len(value)}."
             # Update.
             bottom_hash, path, length = deserialize_edge(data=value)
             context.prefetched_nodes[subtree.index] = Node(
@@ -640,16 +860,22 @@ async def update_tree(
     nodes_by_dependency_layer = await update_structure(
         height=height, root=root, leaves=leaves, ffc=ffc
     )
-    # Calculate facts.
-    updated_root, inner_node_facts = await calculate_inner_node_facts(
-        nodes_by_dependency_layer=nodes_by_dependency_layer,
-        hash_func=ffc.hash_func,
-        n_workers=n_hash_workers,
-    )
-    leaf_facts = {
-        leaf.db_key(suffix=leaf_hash): leaf.serialize()
-        for leaf_hash, leaf in safe_zip(leaf_hashes, modification_values)
-    }
-    # Write facts to DB.
-    await ffc.storage.mset(updates=inner_node_facts | leaf_facts)
+    # Calculate facts and write them to DB, as they are calculated.
+    async with ffc.fact_writer() as fact_writer:
+        await fact_writer.write(
+            facts={
+                leaf.db_key(suffix=leaf_hash): leaf.serialize()
+                for leaf_hash, leaf in safe_zip(leaf_hashes, modification_values)
+            }
+        )
+        updated_root, _ = await calculate_inner_node_facts(
+            nodes_by_dependency_layer=nodes_by_dependency_layer,
+            hash_func=ffc.hash_func,
+            n_workers=n_hash_workers,
+            hash_many_func=ffc.hash_many_func,
+            hash_executor=ffc.hash_executor,
+            split_depth=min(DEFAULT_SPLIT_DEPTH, height),
+            fact_writer=fact_writer,
+        )
+
     return updated_root
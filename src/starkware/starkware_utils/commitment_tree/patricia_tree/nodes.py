@@ -2,8 +2,9 @@ import dataclasses
 from abc import abstractmethod
 from typing import ClassVar, List, Tuple, Type
 
-from starkware.python.utils import blockify, from_bytes, to_bytes
+from starkware.python.utils import from_bytes, to_bytes
 from starkware.starkware_utils.commitment_tree.inner_node_fact import InnerNodeFact
+from starkware.storage.compact_fact_storage import FactCodec
 from starkware.storage.storage import HASH_BYTES, HashFunctionType
 
 
@@ -130,6 +131,8 @@ class EdgeNodeFact(PatriciaNodeFact):
 
     # Class variables.
     PREIMAGE_LENGTH: ClassVar[int] = 2 * HASH_BYTES + 1
+    # The length of the compact serialization of an edge of length 1 (see serialize_edge()).
+    MIN_PREIMAGE_LENGTH: ClassVar[int] = HASH_BYTES + 2
 
     def __post_init__(self):
         assert (
@@ -171,25 +174,63 @@ def get_node_type(fact_preimage: bytes) -> Type["PatriciaNodeFact"]:
         if preimage_length == node_fact_cls.PREIMAGE_LENGTH:
             return node_fact_cls
 
+    # Compact edges (see serialize_edge()).
+    if EdgeNodeFact.MIN_PREIMAGE_LENGTH <= preimage_length < BinaryNodeFact.PREIMAGE_LENGTH:
+        return EdgeNodeFact
+
     raise NotImplementedError(f"Unsupported fact preimage length: {preimage_length}.")
 
 
 # Shared code with another Patricia implementation.
 
 
-def serialize_edge(bottom: bytes, path: int, length: int) -> bytes:
-    return bottom + to_bytes(path) + to_bytes(length, length=1)
+def serialize_edge(bottom: bytes, path: int, length: int, compact: bool = False) -> bytes:
+    """
+    Serializes an edge as bottom + path + length, where the path takes HASH_BYTES bytes.
+    If compact is True, the path takes only the ceil(length / 8) bytes it needs, unless the result
+    would then have the length of a binary node.
+    """
+    path_bytes = HASH_BYTES
+    if compact:
+        path_bytes = (length + 7) // 8
+        if HASH_BYTES + path_bytes + 1 == BinaryNodeFact.PREIMAGE_LENGTH:
+            path_bytes = HASH_BYTES
+
+    return bottom + to_bytes(path, length=path_bytes) + to_bytes(length, length=1)
 
 
 def deserialize_edge(data: bytes) -> Tuple[bytes, int, int]:
-    bottom, path, length = blockify(data=data, chunk_size=EdgeNodeFact.HASH_BYTES_LENGTH)
-    return bottom, from_bytes(path), from_bytes(length)
+    """
+    Deserializes an edge serialized by serialize_edge(), either compact or not.
+    """
+    return data[:HASH_BYTES], from_bytes(data[HASH_BYTES:-1]), data[-1]
+
+
+def compact_patricia_node_value(data: bytes) -> bytes:
+    """
+    Returns the compact serialization of a serialized Patricia node (only edges are changed).
+    """
+    if len(data) != EdgeNodeFact.PREIMAGE_LENGTH:
+        return data
+
+    bottom, path, length = deserialize_edge(data=data)
+    return serialize_edge(bottom=bottom, path=path, length=length, compact=True)
+
+
+PATRICIA_NODE_CODEC = FactCodec(
+    prefix=PatriciaNodeFact.prefix(), tag=1, compact_value=compact_patricia_node_value
+)
 
 
 def hash_edge(bottom: bytes, path: int, length: int, hash_func: HashFunctionType) -> bytes:
     bottom_path_hash = hash_func(bottom, to_bytes(path))
+    return add_edge_length(bottom_path_hash=bottom_path_hash, length=length)
+
 
-    # Add the edge length.
+def add_edge_length(bottom_path_hash: bytes, length: int) -> bytes:
+    """
+    Returns the hash of an edge node, given the hash of its bottom and path (see hash_edge()).
+    """
     hash_value = from_bytes(bottom_path_hash) + length
 
     return to_bytes(hash_value)
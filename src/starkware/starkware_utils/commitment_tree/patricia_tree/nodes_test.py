@@ -5,6 +5,7 @@ from starkware.starkware_utils.commitment_tree.patricia_tree.nodes import (
     BinaryNodeFact,
     EdgeNodeFact,
     EmptyNodeFact,
+    compact_patricia_node_value,
     get_node_type,
 )
 from starkware.storage.test_utils import hash_func
@@ -56,3 +57,26 @@ async def test_empty_node():
 
     # Test hash.
     assert empty_node._hash(hash_func=hash_func) == EmptyNodeFact.EMPTY_NODE_HASH
+
+
+@pytest.mark.parametrize("edge_length", [1, 8, 9, 100, 240, 241, 248, 249, 251])
+def test_compact_edge_node(edge_length: int):
+    edge_path = (1 << edge_length) - 1
+    edge_node = EdgeNodeFact(
+        bottom_node=to_bytes(0x1234ABCD), edge_path=edge_path, edge_length=edge_length
+    )
+    serialized_node = edge_node.serialize()
+    compact_node = compact_patricia_node_value(data=serialized_node)
+    assert len(compact_node) <= len(serialized_node)
+    if edge_length <= 240:
+        assert len(compact_node) == 33 + (edge_length + 7) // 8
+    else:
+        # A compact edge may not have the length of a binary node.
+        assert compact_node == serialized_node
+
+    assert get_node_type(fact_preimage=compact_node) is EdgeNodeFact
+    assert EdgeNodeFact.deserialize(data=compact_node) == edge_node
+
+    # Other nodes are not changed.
+    binary_node = BinaryNodeFact(left_node=to_bytes(1), right_node=to_bytes(2)).serialize()
+    assert compact_patricia_node_value(data=binary_node) == binary_node
@@ -1,11 +1,15 @@
 import asyncio
 import random
+from concurrent.futures import ProcessPoolExecutor
 from typing import Iterable, Set, Tuple
 
 import pytest
 from queue import Queue
 
-from starkware.crypto.signature.fast_pedersen_hash import pedersen_hash_func
+from starkware.crypto.signature.fast_pedersen_hash import (
+    pedersen_hash_func,
+    pedersen_hash_func_many,
+)
 from starkware.python.random_test_utils import parametrize_random_object
 from starkware.python.utils import from_bytes, to_bytes
 from starkware.starkware_utils.commitment_tree.binary_fact_tree import BinaryFactDict
@@ -109,3 +113,102 @@ async def test_update_and_decommit(
 
     # Verify that the root can be reached using the preimages, from every leaf.
     verify_leaves_are_reachable_from_root(root=root, leaf_hashes=leaf_hashes, preimages=preimages)
+
+
+@pytest.mark.asyncio
+@parametrize_random_object()
+@pytest.mark.parametrize("height,n_leaves", [(10, 5), (10, 2**10 // 2), (60, 20)])
+async def test_update_efficiently_with_hash_many_func(
+    random_object: random.Random, height: int, n_leaves: int
+):
+    """
+    Tests that update_efficiently() writes the same facts with and without hash_many_func.
+    """
+    modifications = [
+        (index, SimpleLeafFact(value=random_object.randrange(1, 1000)))
+        for index in random_object.sample(range(2**height), k=n_leaves)
+    ]
+    storages = []
+    roots = []
+    for hash_many_func in (None, pedersen_hash_func_many):
+        ffc = FactFetchingContext(
+            storage=MockStorage(), hash_func=pedersen_hash_func, hash_many_func=hash_many_func
+        )
+        tree = await PatriciaTree.empty_tree(
+            ffc=ffc, height=height, leaf_fact=SimpleLeafFact(value=0)
+        )
+        tree = await tree.update_efficiently(ffc=ffc, modifications=modifications)
+        storages.append(ffc.storage.db)  # type: ignore[attr-defined]
+        roots.append(tree.root)
+
+    assert roots[0] == roots[1]
+    assert storages[0] == storages[1]
+
+
+@pytest.mark.asyncio
+@parametrize_random_object()
+@pytest.mark.parametrize("hash_many_func", [None, pedersen_hash_func_many])
+@pytest.mark.parametrize("height,n_leaves", [(4, 10), (10, 5), (10, 100), (60, 50)])
+async def test_update_efficiently_with_hash_executor(
+    random_object: random.Random, hash_many_func, height: int, n_leaves: int
+):
+    """
+    Tests that update_efficiently() writes the same facts with and without a process pool hash
+    executor, on both an empty and a non-empty tree.
+    """
+    modifications_list = [
+        [
+            (index, SimpleLeafFact(value=random_object.randrange(0, 1000)))
+            for index in random_object.sample(range(2**height), k=n_leaves)
+        ]
+        for _ in range(2)
+    ]
+    storages = []
+    roots = []
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        for hash_executor in (None, executor):
+            ffc = FactFetchingContext(
+                storage=MockStorage(),
+                hash_func=pedersen_hash_func,
+                hash_many_func=hash_many_func,
+                hash_executor=hash_executor,
+            )
+            tree = await PatriciaTree.empty_tree(
+                ffc=ffc, height=height, leaf_fact=SimpleLeafFact(value=0)
+            )
+            for modifications in modifications_list:
+                tree = await tree.update_efficiently(ffc=ffc, modifications=modifications)
+            storages.append(ffc.storage.db)  # type: ignore[attr-defined]
+            roots.append(tree.root)
+
+    assert roots[0] == roots[1]
+    assert storages[0] == storages[1]
+
+
+@pytest.mark.asyncio
+@parametrize_random_object()
+@pytest.mark.parametrize("update_method", ["update", "update_efficiently"])
+async def test_update_with_batched_fact_writes(random_object: random.Random, update_method: str):
+    """
+    Tests that the tree updates write the same facts when the facts are written in small batches.
+    """
+    height = 10
+    modifications = [
+        (index, SimpleLeafFact(value=random_object.randrange(1, 1000)))
+        for index in random_object.sample(range(2**height), k=50)
+    ]
+    storages = []
+    for fact_write_batch_size in (None, 7):
+        ffc = FactFetchingContext(
+            storage=MockStorage(),
+            hash_func=pedersen_hash_func,
+            fact_write_batch_size=fact_write_batch_size,
+            known_fact_keys_cache_size=1000,
+        )
+        tree = await PatriciaTree.empty_tree(
+            ffc=ffc, height=height, leaf_fact=SimpleLeafFact(value=0)
+        )
+        await getattr(tree, update_method)(ffc=ffc, modifications=modifications)
+        storages.append(ffc.storage.db)  # type: ignore[attr-defined]
+
+    assert storages[0] == storages[1]
@@ -0,0 +1,79 @@
+"""
+Compares the time of PatriciaTree.update_efficiently() with the hashes calculated in threads, to
+the time with the subtrees hashed in a process pool (see FactFetchingContext.hash_executor).
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from starkware.crypto.signature.fast_pedersen_hash import (
+    pedersen_hash_func,
+    pedersen_hash_func_many,
+)
+from starkware.starkware_utils.commitment_tree.patricia_tree.patricia_tree import PatriciaTree
+from starkware.storage.storage import FactFetchingContext
+from starkware.storage.storage_utils import SimpleLeafFact
+from starkware.storage.test_utils import MockStorage
+
+
+async def measure_update(
+    modifications: List[Tuple[int, SimpleLeafFact]],
+    height: int,
+    use_hash_many_func: bool,
+    hash_executor: Optional[ProcessPoolExecutor],
+) -> Tuple[float, bytes]:
+    ffc = FactFetchingContext(
+        storage=MockStorage(),
+        hash_func=pedersen_hash_func,
+        hash_many_func=pedersen_hash_func_many if use_hash_many_func else None,
+        hash_executor=hash_executor,
+    )
+    tree = await PatriciaTree.empty_tree(ffc=ffc, height=height, leaf_fact=SimpleLeafFact(value=0))
+    start_time = time.perf_counter()
+    tree = await tree.update_efficiently(ffc=ffc, modifications=modifications)
+    return time.perf_counter() - start_time, tree.root
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the Patricia commitment.")
+    parser.add_argument("--n_leaves", type=int, default=100000)
+    parser.add_argument("--height", type=int, default=251)
+    parser.add_argument("--n_processes", type=int, default=8)
+    parser.add_argument("--use_hash_many_func", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random_object = random.Random(args.seed)
+    indices = {random_object.randrange(2**args.height) for _ in range(args.n_leaves)}
+    modifications = [
+        (index, SimpleLeafFact(value=random_object.randrange(1, 2**64))) for index in indices
+    ]
+
+    threads_time, threads_root = await measure_update(
+        modifications=modifications,
+        height=args.height,
+        use_hash_many_func=args.use_hash_many_func,
+        hash_executor=None,
+    )
+    with ProcessPoolExecutor(max_workers=args.n_processes) as executor:
+        processes_time, processes_root = await measure_update(
+            modifications=modifications,
+            height=args.height,
+            use_hash_many_func=args.use_hash_many_func,
+            hash_executor=executor,
+        )
+
+    assert threads_root == processes_root, "The roots are different."
+    print(
+        f"{args.n_leaves} leaves: threads={threads_time:.3f}s, "
+        f"{args.n_processes} processes={processes_time:.3f}s "
+        f"({threads_time / processes_time:.1f}x)."
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,6 +1,7 @@
+import asyncio
 from typing import Any, AsyncIterator, Collection, Dict, NamedTuple, Optional, Tuple, Type, Union
 
-from starkware.python.utils import from_bytes, gather_in_chunks
+from starkware.python.utils import from_bytes
 from starkware.starkware_utils.commitment_tree.binary_fact_tree import BinaryFactDict
 from starkware.starkware_utils.commitment_tree.binary_fact_tree_node import (
     BinaryFactTreeNode,
@@ -168,7 +169,13 @@ def build_update_tree(height: int, modifications: Collection[Tuple[int, LeafFact
 
 
 async def write_fact_nodes(ffc: FactFetchingContext, fact_nodes: NodeFactDict):
-    await gather_in_chunks(
-        root_node.set(storage=ffc.storage, suffix=root_hash)
-        for root_hash, root_node in fact_nodes.items()
-    )
+    def serialize_fact_nodes() -> Dict[bytes, bytes]:
+        return dict(
+            root_node.get_update_for_mset(suffix=root_hash)
+            for root_hash, root_node in fact_nodes.items()
+        )
+
+    # Serialize the nodes in an executor, so that the event loop is not blocked.
+    facts = await asyncio.get_event_loop().run_in_executor(None, serialize_fact_nodes)
+    async with ffc.fact_writer() as fact_writer:
+        await fact_writer.write(facts=facts)
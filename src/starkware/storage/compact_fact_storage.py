@@ -0,0 +1,141 @@
+import dataclasses
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from starkware.python.utils import safe_zip
+from starkware.starkware_utils.config_base import get_object_by_path
+from starkware.storage.storage import Storage
+
+# Compact keys start with a tag of at most this value, so that they never collide with the keys of
+# DBObjects, which start with a (printable) textual prefix.
+MAX_FACT_CODEC_TAG = 0x1F
+
+
+@dataclasses.dataclass(frozen=True)
+class FactCodec:
+    """
+    The compact storage format of the objects of a DBObject class (e.g., a fact class), identified
+    by the prefix of their keys.
+    The key prefix + b":" + suffix is stored as tag + suffix; if compact_value is given, it is
+    applied to the values that are written. The deserialize() method of the class must accept
+    both the compact value and the original one.
+    """
+
+    prefix: bytes
+    tag: int
+    compact_value: Optional[Callable[[bytes], bytes]] = None
+
+    def __post_init__(self):
+        assert 0 < self.tag <= MAX_FACT_CODEC_TAG, f"Illegal fact codec tag: {self.tag}."
+
+
+class CompactFactStorage(Storage):
+    """
+    A storage that keeps the objects of the given codecs in their compact format (see FactCodec);
+    other keys are passed to the underlying storage unchanged.
+
+    If read_legacy_keys is True, an object that is not found under its compact key is read from
+    its original key; this allows using the storage over a database that was written without it,
+    while new objects are written in the compact format (see also migrate()).
+    """
+
+    def __init__(
+        self, storage: Storage, codecs: Sequence[FactCodec], read_legacy_keys: bool = True
+    ):
+        self.storage = storage
+        self.read_legacy_keys = read_legacy_keys
+        self.codecs: Dict[bytes, FactCodec] = {}
+        tags = set()
+        for codec in codecs:
+            assert (
+                codec.prefix not in self.codecs
+            ), f"Duplicate fact codec prefix: {codec.prefix!r}."
+            assert codec.tag not in tags, f"Duplicate fact codec tag: {codec.tag}."
+            self.codecs[codec.prefix] = codec
+            tags.add(codec.tag)
+
+    @classmethod
+    async def create_from_config(
+        cls, storage_config: Dict[str, Any], codecs: str, read_legacy_keys: bool = True
+    ) -> "CompactFactStorage":
+        """
+        codecs - the path of a sequence of FactCodecs (e.g., "module.CODECS").
+        """
+        return cls(
+            storage=await Storage.create_instance_from_config(config=storage_config),
+            codecs=get_object_by_path(path=codecs),
+            read_legacy_keys=read_legacy_keys,
+        )
+
+    def _get_codec(self, key: bytes) -> Tuple[Optional[FactCodec], bytes]:
+        """
+        Returns the codec of the given (original) key and the suffix of the key, or None and the
+        key, if the key has no codec.
+        """
+        prefix, separator, suffix = key.partition(b":")
+        codec = self.codecs.get(prefix) if len(separator) > 0 else None
+        return (codec, suffix) if codec is not None else (None, key)
+
+    def compact_key(self, key: bytes) -> bytes:
+        codec, suffix = self._get_codec(key=key)
+        return key if codec is None else bytes([codec.tag]) + suffix
+
+    def compact_item(self, key: bytes, value: bytes) -> Tuple[bytes, bytes]:
+        codec, suffix = self._get_codec(key=key)
+        if codec is None:
+            return key, value
+
+        compact_value = value if codec.compact_value is None else codec.compact_value(value)
+        return bytes([codec.tag]) + suffix, compact_value
+
+    async def set_value(self, key: bytes, value: bytes):
+        await self.storage.set_value(*self.compact_item(key=key, value=value))
+
+    async def setnx_value(self, key: bytes, value: bytes) -> bool:
+        return await self.storage.setnx_value(*self.compact_item(key=key, value=value))
+
+    async def get_value(self, key: bytes) -> Optional[bytes]:
+        (value,) = await self.mget(keys=[key])
+        return value
+
+    async def del_value(self, key: bytes):
+        compact_key = self.compact_key(key=key)
+        await self.storage.del_value(key=compact_key)
+        if self.read_legacy_keys and compact_key != key:
+            await self.storage.del_value(key=key)
+
+    async def mset(self, updates: Dict[bytes, bytes]):
+        await self.storage.mset(
+            updates=dict(self.compact_item(key=key, value=value) for key, value in updates.items())
+        )
+
+    async def mget(self, keys: Sequence[bytes]) -> Tuple[Optional[bytes], ...]:
+        compact_keys = [self.compact_key(key=key) for key in keys]
+        values: List[Optional[bytes]] = list(await self.storage.mget(keys=compact_keys))
+        if not self.read_legacy_keys:
+            return tuple(values)
+
+        legacy_indices = [
+            i
+            for i, (value, key, compact_key) in enumerate(safe_zip(values, keys, compact_keys))
+            if value is None and compact_key != key
+        ]
+        if len(legacy_indices) > 0:
+            legacy_values = await self.storage.mget(keys=[keys[i] for i in legacy_indices])
+            for i, value in safe_zip(legacy_indices, legacy_values):
+                values[i] = value
+
+        return tuple(values)
+
+    async def migrate(self, keys: Sequence[bytes]) -> int:
+        """
+        Rewrites the objects under the given original keys in the compact format, and deletes the
+        original keys. Returns the number of migrated objects.
+        """
+        keys = [key for key in keys if self.compact_key(key=key) != key]
+        values = await self.storage.mget(keys=keys)
+        updates = {key: value for key, value in safe_zip(keys, values) if value is not None}
+        await self.mset(updates=updates)
+        for key in updates.keys():
+            await self.storage.del_value(key=key)
+
+        return len(updates)
@@ -0,0 +1,89 @@
+import pytest
+
+from starkware.storage.compact_fact_storage import CompactFactStorage, FactCodec
+from starkware.storage.dict_storage import DictStorage
+from starkware.storage.storage import Storage
+from starkware.storage.test_utils import MockStorage
+
+CODECS = (
+    FactCodec(prefix=b"node", tag=1),
+    FactCodec(prefix=b"leaf", tag=2, compact_value=lambda value: value.lstrip(b"0")),
+)
+
+
+@pytest.fixture
+def mock_storage() -> MockStorage:
+    return MockStorage()
+
+
+@pytest.fixture
+def db(mock_storage: MockStorage) -> dict:
+    return mock_storage.db
+
+
+@pytest.fixture
+def storage(mock_storage: MockStorage) -> CompactFactStorage:
+    return CompactFactStorage(storage=mock_storage, codecs=CODECS)
+
+
+@pytest.mark.asyncio
+async def test_compact_keys_and_values(storage: CompactFactStorage, db: dict):
+    await storage.set_value(key=b"node:abc", value=b"0012")
+    await storage.mset(updates={b"leaf:abc": b"0034", b"other:abc": b"0056"})
+    assert await storage.setnx_value(key=b"leaf:def", value=b"0078") is True
+    assert await storage.setnx_value(key=b"leaf:def", value=b"0078") is False
+    assert db == {b"\x01abc": b"0012", b"\x02abc": b"34", b"other:abc": b"0056", b"\x02def": b"78"}
+
+    assert await storage.mget(keys=[b"node:abc", b"leaf:abc", b"other:abc", b"node:xyz"]) == (
+        b"0012",
+        b"34",
+        b"0056",
+        None,
+    )
+    await storage.del_value(key=b"leaf:abc")
+    assert await storage.get_value(key=b"leaf:abc") is None
+
+
+@pytest.mark.asyncio
+async def test_legacy_keys(storage: CompactFactStorage, db: dict):
+    db.update({b"node:abc": b"0012", b"leaf:abc": b"0034"})
+    await storage.set_value(key=b"leaf:def", value=b"0056")
+    assert await storage.mget(keys=[b"node:abc", b"leaf:abc", b"leaf:def"]) == (
+        b"0012",
+        b"0034",
+        b"56",
+    )
+
+    # Legacy keys are not read if read_legacy_keys is False.
+    compact_only_storage = CompactFactStorage(
+        storage=DictStorage(db=db), codecs=CODECS, read_legacy_keys=False
+    )
+    assert await compact_only_storage.get_value(key=b"node:abc") is None
+
+    assert await storage.migrate(keys=[b"node:abc", b"leaf:abc", b"leaf:xyz"]) == 2
+    assert db == {b"\x01abc": b"0012", b"\x02abc": b"34", b"\x02def": b"56"}
+    assert await compact_only_storage.get_value(key=b"leaf:abc") == b"34"
+
+
+@pytest.mark.asyncio
+async def test_create_from_config():
+    storage = await Storage.create_instance_from_config(
+        config={
+            "class": "starkware.storage.compact_fact_storage.CompactFactStorage",
+            "config": {
+                "storage_config": {"class": "starkware.storage.dict_storage.DictStorage"},
+                "codecs": "starkware.storage.compact_fact_storage_test.CODECS",
+            },
+        }
+    )
+    assert isinstance(storage, CompactFactStorage)
+    assert storage.compact_key(key=b"node:abc") == b"\x01abc"
+
+
+def test_codec_validation():
+    with pytest.raises(AssertionError, match="Illegal fact codec tag"):
+        FactCodec(prefix=b"node", tag=ord("a"))
+    with pytest.raises(AssertionError, match="Duplicate fact codec tag"):
+        CompactFactStorage(
+            storage=DictStorage(), codecs=[FactCodec(prefix=b"a", tag=1), FactCodec(b"b", tag=1)]
+        )
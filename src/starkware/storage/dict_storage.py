@@ -1,4 +1,6 @@
-from typing import Any, Dict, Optional, Sequence, Tuple
+import asyncio
+import dataclasses
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import cachetools
 
@@ -137,3 +139,252 @@ class CachedStorage(Storage):
         )
 
         return tuple(values)
+
+
+class SizedLRUCache(cachetools.LRUCache):
+    """
+    An LRU cache of bytes values, bounded by the total size of the values (plus a fixed overhead
+    per entry, for the key and the bookkeeping); counts the evicted values.
+    """
+
+    ENTRY_OVERHEAD_BYTES = 128
+
+    def __init__(self, max_bytes: int):
+        super().__init__(maxsize=max_bytes, getsizeof=self.get_entry_size)
+        self.n_evictions = 0
+
+    @classmethod
+    def get_entry_size(cls, value: bytes) -> int:
+        return len(value) + cls.ENTRY_OVERHEAD_BYTES
+
+    def popitem(self):
+        item = super().popitem()
+        self.n_evictions += 1
+        return item
+
+
+@dataclasses.dataclass
+class CacheShard:
+    cache: SizedLRUCache
+    # The keys that are known not to exist in the storage.
+    negative_cache: Optional[cachetools.LRUCache]
+
+
+class ShardedCachedStorage(Storage):
+    """
+    A read-through cache over a storage of immutable values (e.g., facts), similar to
+    CachedStorage, with the following differences:
+    * The cache is bounded by the total size of the values (max_bytes) rather than by the number
+      of values, and is split to n_shards shards (by key), so that a large value only evicts
+      values of its own shard.
+    * Concurrent reads of a key that is not cached are coalesced into a single read from the
+      storage.
+    * If negative_cache_size is given, up to this number of keys that do not exist in the
+      storage are cached as well.
+    """
+
+    def __init__(
+        self,
+        storage: Storage,
+        max_bytes: int,
+        n_shards: int = 16,
+        negative_cache_size: Optional[int] = None,
+        metric_active: Optional[bool] = None,
+    ):
+        assert n_shards > 0, "n_shards must be positive."
+        self.storage = storage
+        self.shards = [
+            CacheShard(
+                cache=SizedLRUCache(max_bytes=max_bytes // n_shards),
+                negative_cache=(
+                    None
+                    if negative_cache_size is None
+                    else cachetools.LRUCache(maxsize=max(1, negative_cache_size // n_shards))
+                ),
+            )
+            for _ in range(n_shards)
+        ]
+        self.metric_active = False if metric_active is None else metric_active
+        # Maps a key that is being read from the storage to the task that reads it.
+        self.pending_reads: Dict[bytes, asyncio.Task] = {}
+
+    @classmethod
+    async def create_from_config(
+        cls,
+        storage_config: Dict[str, Any],
+        max_bytes: int,
+        n_shards: int,
+        negative_cache_size: Optional[int],
+        metric_active: bool,
+    ) -> "ShardedCachedStorage":
+        return cls(
+            storage=await Storage.create_instance_from_config(config=storage_config),
+            max_bytes=max_bytes,
+            n_shards=n_shards,
+            negative_cache_size=negative_cache_size,
+            metric_active=metric_active,
+        )
+
+    @property
+    def cached_bytes(self) -> int:
+        return sum(shard.cache.currsize for shard in self.shards)
+
+    @property
+    def n_evictions(self) -> int:
+        return sum(shard.cache.n_evictions for shard in self.shards)
+
+    def get_shard(self, key: bytes) -> CacheShard:
+        return self.shards[hash(key) % len(self.shards)]
+
+    async def set_value(self, key: bytes, value: bytes):
+        await self.mset(updates={key: value})
+
+    async def setnx_value(self, key: bytes, value: bytes) -> bool:
+        assert value is not None
+        # Don't check the cache here to avoid race conditions.
+        self._invalidate(key=key)
+        result = await self.storage.setnx_value(key=key, value=value)
+        if result:
+            self.pending_reads.pop(key, None)
+            self._cache_value(key=key, value=value)
+        return result
+
+    async def get_value(self, key: bytes) -> Optional[bytes]:
+        (value,) = await self.mget(keys=[key])
+        return value
+
+    async def del_value(self, key: bytes):
+        raise NotImplementedError("ShardedCachedStorage is expected to handle only immutable items")
+
+    async def mset(self, updates: Dict[bytes, bytes]):
+        assert all(value is not None for value in updates.values())
+        new_updates = {
+            key: value
+            for key, value in updates.items()
+            if self.get_shard(key=key).cache.get(key, None) != value
+        }
+        for key in new_updates.keys():
+            self._invalidate(key=key)
+        # On failure, the cache is not updated; a partial write is fine since the keys were
+        # invalidated.
+        await self.storage.mset(updates=new_updates)
+        for key, value in new_updates.items():
+            # Reads that started during the write may have read the previous value.
+            self.pending_reads.pop(key, None)
+            self._cache_value(key=key, value=value)
+
+    async def mget(self, keys: Sequence[bytes]) -> Tuple[Optional[bytes], ...]:
+        values: List[Optional[bytes]] = [None] * len(keys)
+        # Maps a key that is not cached to its indices in keys.
+        missing_key_indices: Dict[bytes, List[int]] = {}
+        n_hits = n_negative_hits = 0
+        for i, key in enumerate(keys):
+            shard = self.get_shard(key=key)
+            value = shard.cache.get(key, None)
+            if value is not None:
+                n_hits += 1
+                values[i] = value
+            elif shard.negative_cache is not None and key in shard.negative_cache:
+                n_negative_hits += 1
+            else:
+                missing_key_indices.setdefault(key, []).append(i)
+
+        keys_to_read = [key for key in missing_key_indices.keys() if key not in self.pending_reads]
+        if self.metric_active:
+            storage_metrics.SHARDED_CACHED_STORAGE_HIT.inc(n_hits)
+            storage_metrics.SHARDED_CACHED_STORAGE_NEGATIVE_HIT.inc(n_negative_hits)
+            storage_metrics.SHARDED_CACHED_STORAGE_MISS.inc(len(keys_to_read))
+            storage_metrics.SHARDED_CACHED_STORAGE_COALESCED.inc(
+                len(missing_key_indices) - len(keys_to_read)
+            )
+
+        if len(missing_key_indices) == 0:
+            return tuple(values)
+
+        if len(keys_to_read) > 0:
+            read_task = asyncio.ensure_future(self._read(keys=keys_to_read))
+            for key in keys_to_read:
+                self.pending_reads[key] = read_task
+
+        # Wait for the reads of the missing keys (including reads started by other callers);
+        # shield them, so that cancelling this call does not cancel the reads of other callers.
+        read_tasks = {
+            id(read_task): read_task
+            for read_task in (self.pending_reads[key] for key in missing_key_indices.keys())
+        }
+        read_values: Dict[bytes, Optional[bytes]] = {}
+        for read_result in await asyncio.gather(
+            *(asyncio.shield(read_task) for read_task in read_tasks.values())
+        ):
+            read_values.update(read_result)
+
+        for key, indices in missing_key_indices.items():
+            for i in indices:
+                values[i] = read_values[key]
+
+        return tuple(values)
+
+    async def _read(self, keys: List[bytes]) -> Dict[bytes, Optional[bytes]]:
+        """
+        Reads the given keys from the storage and caches their values (unless the keys were written
+        in the meantime).
+        """
+        read_task = asyncio.current_task()
+        try:
+            values: Sequence[Optional[bytes]]
+            if len(keys) == 1:
+                values = [await self.storage.get_value(key=keys[0])]
+            else:
+                values = await self.storage.mget(keys=keys)
+        finally:
+            still_pending_keys = {
+                key for key in keys if self.pending_reads.get(key, None) is read_task
+            }
+            for key in still_pending_keys:
+                del self.pending_reads[key]
+
+        for key, value in safe_zip(keys, values):
+            if key in still_pending_keys:
+                self._cache_value(key=key, value=value)
+
+        if self.metric_active:
+            storage_metrics.SHARDED_CACHED_STORAGE_FETCHED_BYTES.inc(
+                sum(len(value) for value in values if value is not None)
+            )
+        return dict(safe_zip(keys, values))
+
+    def _cache_value(self, key: bytes, value: Optional[bytes]):
+        shard = self.get_shard(key=key)
+        if value is None:
+            if shard.negative_cache is not None and key not in shard.cache:
+                shard.negative_cache[key] = None
+            return
+
+        if shard.negative_cache is not None:
+            shard.negative_cache.pop(key, None)
+        if shard.cache.get_entry_size(value=value) > shard.cache.maxsize:
+            # Too large to be cached.
+            return
+
+        n_evictions = shard.cache.n_evictions
+        shard.cache[key] = value
+        if self.metric_active:
+            storage_metrics.SHARDED_CACHED_STORAGE_EVICTION.inc(
+                shard.cache.n_evictions - n_evictions
+            )
+            storage_metrics.SHARDED_CACHED_STORAGE_CACHED_BYTES.set(self.cached_bytes)
+
+    def _invalidate(self, key: bytes):
+        """
+        Removes the given key from the cache, before it is written; a pending read of the key
+        will not cache the value it read.
+        """
+        shard = self.get_shard(key=key)
+        shard.cache.pop(key, None)
+        if shard.negative_cache is not None:
+            shard.negative_cache.pop(key, None)
+        self.pending_reads.pop(key, None)
+
+
+# A read-through cache over a storage of immutable values.
+AnyCachedStorage = Union[CachedStorage, ShardedCachedStorage]
@@ -15,3 +15,50 @@ CACHED_STORAGE_GET_CACHE = prometheus_client.Counter(
 # Metric names may diverge on client argument.
 CACHED_STORAGE_GET_TOTAL_NAME = getattr(CACHED_STORAGE_GET_TOTAL, "_name")
 CACHED_STORAGE_GET_CACHE_NAME = getattr(CACHED_STORAGE_GET_CACHE, "_name")
+
+SHARDED_CACHED_STORAGE_HIT = prometheus_client.Counter(
+    name="starkware_sharded_cached_storage_hit_count",
+    documentation="Count of keys read from ShardedCachedStorage that were found in the cache",
+    labelnames=(),
+)
+
+SHARDED_CACHED_STORAGE_NEGATIVE_HIT = prometheus_client.Counter(
+    name="starkware_sharded_cached_storage_negative_hit_count",
+    documentation=(
+        "Count of keys read from ShardedCachedStorage that were known not to exist in the storage"
+    ),
+    labelnames=(),
+)
+
+SHARDED_CACHED_STORAGE_MISS = prometheus_client.Counter(
+    name="starkware_sharded_cached_storage_miss_count",
+    documentation="Count of keys read from ShardedCachedStorage that were fetched from the storage",
+    labelnames=(),
+)
+
+SHARDED_CACHED_STORAGE_COALESCED = prometheus_client.Counter(
+    name="starkware_sharded_cached_storage_coalesced_count",
+    documentation=(
+        "Count of keys read from ShardedCachedStorage that were already being fetched by another "
+        "read"
+    ),
+    labelnames=(),
+)
+
+SHARDED_CACHED_STORAGE_EVICTION = prometheus_client.Counter(
+    name="starkware_sharded_cached_storage_eviction_count",
+    documentation="Count of values evicted from the cache of ShardedCachedStorage",
+    labelnames=(),
+)
+
+SHARDED_CACHED_STORAGE_FETCHED_BYTES = prometheus_client.Counter(
+    name="starkware_sharded_cached_storage_fetched_bytes",
+    documentation="Total size of the values ShardedCachedStorage fetched from the storage",
+    labelnames=(),
+)
+
+SHARDED_CACHED_STORAGE_CACHED_BYTES = prometheus_client.Gauge(
+    name="starkware_sharded_cached_storage_cached_bytes",
+    documentation="The size of the values in the cache of ShardedCachedStorage",
+    labelnames=(),
+)
@@ -0,0 +1,186 @@
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from starkware.python.utils import blockify
+from starkware.storage.storage import Storage
+
+T = TypeVar("T")
+
+# The maximal number of keys in a single SELECT statement (SQLite limits the number of variables
+# in a statement).
+MGET_CHUNK_SIZE = 500
+SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
+class SqliteStorage(Storage):
+    """
+    A persistent local storage, kept in a single SQLite database file.
+
+    The database is opened in WAL mode, so that reads do not block writes (and vice versa), and
+    multiple processes may read it concurrently, while one of them writes; reads are served from a
+    memory mapping of the database file (of up to mmap_size bytes).
+    mset() and mget() are each performed in a single transaction.
+
+    If read_only is True, the database is opened in read-only mode (e.g., by reader processes of a
+    database that is written by another process); writes raise an exception.
+
+    SQLite calls are blocking, so they are performed in threads: writes in a single thread, and
+    reads in up to n_reader_threads threads, each with a connection of its own.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        read_only: bool = False,
+        mmap_size: int = 2**30,
+        n_reader_threads: int = 4,
+        synchronous: str = "NORMAL",
+    ):
+        """
+        synchronous - the SQLite synchronous mode of the writes. In WAL mode, NORMAL guarantees
+          consistency, but a commit may be rolled back following a power loss; use FULL for
+          durability.
+        """
+        assert synchronous in SYNCHRONOUS_MODES, f"Unexpected synchronous mode: {synchronous}."
+        self.path = path
+        self.read_only = read_only
+        self.mmap_size = mmap_size
+        self.synchronous = synchronous
+
+        self.write_connection: Optional[sqlite3.Connection] = None
+        self.write_executor: Optional[ThreadPoolExecutor] = None
+        if not read_only:
+            self.write_connection = self._connect()
+            self.write_connection.execute("PRAGMA journal_mode=WAL")
+            self.write_connection.execute(f"PRAGMA synchronous={synchronous}")
+            self.write_connection.execute(
+                "CREATE TABLE IF NOT EXISTS kv (key BLOB PRIMARY KEY, value BLOB NOT NULL) "
+                "WITHOUT ROWID"
+            )
+            self.write_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="sqlite_storage_writer"
+            )
+
+        self.read_executor = ThreadPoolExecutor(
+            max_workers=n_reader_threads, thread_name_prefix="sqlite_storage_reader"
+        )
+        # Each reader thread has a connection of its own, so that reads run concurrently.
+        self.read_connections = threading.local()
+        self.all_read_connections: List[sqlite3.Connection] = []
+        self.lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.read_only:
+            connection = sqlite3.connect(
+                f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+            )
+        else:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+        # Transactions are managed explicitly.
+        connection.isolation_level = None
+        connection.execute(f"PRAGMA mmap_size={self.mmap_size}")
+        return connection
+
+    def _get_read_connection(self) -> sqlite3.Connection:
+        connection = getattr(self.read_connections, "connection", None)
+        if connection is None:
+            connection = self._connect()
+            self.read_connections.connection = connection
+            with self.lock:
+                self.all_read_connections.append(connection)
+        return connection
+
+    async def _run_read(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        def run() -> T:
+            return func(self._get_read_connection())
+
+        return await asyncio.get_event_loop().run_in_executor(self.read_executor, run)
+
+    async def _run_write(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        assert not self.read_only, "Cannot write to a read-only SqliteStorage."
+        assert self.write_connection is not None
+
+        def run() -> T:
+            connection = self.write_connection
+            assert connection is not None
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                result = func(connection)
+            except:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+            return result
+
+        return await asyncio.get_event_loop().run_in_executor(self.write_executor, run)
+
+    async def set_value(self, key: bytes, value: bytes):
+        await self.mset(updates={key: value})
+
+    async def setnx_value(self, key: bytes, value: bytes) -> bool:
+        def setnx(connection: sqlite3.Connection) -> bool:
+            cursor = connection.execute(
+                "INSERT OR IGNORE INTO kv (key, value) VALUES (?, ?)", (key, value)
+            )
+            return cursor.rowcount == 1
+
+        return await self._run_write(setnx)
+
+    async def get_value(self, key: bytes) -> Optional[bytes]:
+        (value,) = await self.mget(keys=[key])
+        return value
+
+    async def del_value(self, key: bytes):
+        def delete(connection: sqlite3.Connection):
+            connection.execute("DELETE FROM kv WHERE key=?", (key,))
+
+        await self._run_write(delete)
+
+    async def mset(self, updates: Dict[bytes, bytes]):
+        if len(updates) == 0:
+            return
+
+        items = list(updates.items())
+
+        def mset(connection: sqlite3.Connection):
+            connection.executemany("INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)", items)
+
+        await self._run_write(mset)
+
+    async def mget(self, keys: Sequence[bytes]) -> Tuple[Optional[bytes], ...]:
+        if len(keys) == 0:
+            return ()
+
+        def mget(connection: sqlite3.Connection) -> Tuple[Optional[bytes], ...]:
+            values: Dict[bytes, bytes] = {}
+            connection.execute("BEGIN")
+            try:
+                for keys_chunk in blockify(data=list(set(keys)), chunk_size=MGET_CHUNK_SIZE):
+                    placeholders = ", ".join("?" * len(keys_chunk))
+                    values.update(
+                        connection.execute(
+                            f"SELECT key, value FROM kv WHERE key IN ({placeholders})", keys_chunk
+                        )
+                    )
+            finally:
+                connection.execute("COMMIT")
+            return tuple(values.get(key) for key in keys)
+
+        return await self._run_read(mget)
+
+    def close(self):
+        """
+        Closes the connections to the database; the storage may not be used afterwards.
+        """
+        if self.write_executor is not None:
+            self.write_executor.shutdown(wait=True)
+        self.read_executor.shutdown(wait=True)
+        if self.write_connection is not None:
+            self.write_connection.close()
+        with self.lock:
+            for connection in self.all_read_connections:
+                connection.close()
+            self.all_read_connections.clear()
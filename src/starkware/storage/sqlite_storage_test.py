@@ -0,0 +1,90 @@
+import os
+from typing import Iterator
+
+import pytest
+
+from starkware.storage.sqlite_storage import MGET_CHUNK_SIZE, SqliteStorage
+from starkware.storage.storage import Storage
+
+
+@pytest.fixture
+def db_path(tmp_path) -> str:
+    return os.path.join(tmp_path, "storage.db")
+
+
+@pytest.fixture
+def storage(db_path: str) -> Iterator[SqliteStorage]:
+    storage = SqliteStorage(path=db_path)
+    yield storage
+    storage.close()
+
+
+@pytest.mark.asyncio
+async def test_set_and_get(storage: SqliteStorage):
+    assert await storage.get_value(key=b"a") is None
+    await storage.set_value(key=b"a", value=b"1")
+    assert await storage.get_value(key=b"a") == b"1"
+    await storage.set_value(key=b"a", value=b"2")
+    assert await storage.get_value(key=b"a") == b"2"
+
+    assert await storage.setnx_value(key=b"a", value=b"3") is False
+    assert await storage.setnx_value(key=b"b", value=b"3") is True
+    assert await storage.get_value(key=b"b") == b"3"
+
+    await storage.del_value(key=b"a")
+    assert await storage.get_value(key=b"a") is None
+
+    # Integer helpers of the base class work on top of set_value/get_value.
+    await storage.set_int(key=b"int", value=5)
+    assert await storage.get_int(key=b"int") == 5
+
+
+@pytest.mark.asyncio
+async def test_mset_and_mget(storage: SqliteStorage):
+    n_keys = 2 * MGET_CHUNK_SIZE + 1
+    updates = {f"key{i}".encode("ascii"): f"value{i}".encode("ascii") for i in range(n_keys)}
+    await storage.mset(updates=updates)
+
+    keys = [b"missing", *updates.keys(), b"key0"]
+    assert await storage.mget(keys=keys) == (None, *updates.values(), b"value0")
+    assert await storage.mget(keys=[]) == ()
+
+
+@pytest.mark.asyncio
+async def test_persistence_and_read_only_mode(storage: SqliteStorage, db_path: str):
+    await storage.mset(updates={b"a": b"1", b"b": b"2"})
+
+    reader = SqliteStorage(path=db_path, read_only=True)
+    try:
+        assert await reader.mget(keys=[b"a", b"b"]) == (b"1", b"2")
+        # The reader sees later writes.
+        await storage.set_value(key=b"c", value=b"3")
+        assert await reader.get_value(key=b"c") == b"3"
+        with pytest.raises(AssertionError, match="read-only"):
+            await reader.set_value(key=b"d", value=b"4")
+    finally:
+        reader.close()
+
+    # The values are kept after the database is closed.
+    storage.close()
+    reopened_storage = SqliteStorage(path=db_path)
+    try:
+        assert await reopened_storage.mget(keys=[b"a", b"b", b"c"]) == (b"1", b"2", b"3")
+    finally:
+        reopened_storage.close()
+
+
+@pytest.mark.asyncio
+async def test_create_from_config(db_path: str):
+    storage = await Storage.create_instance_from_config(
+        config={
+            "class": "starkware.storage.sqlite_storage.SqliteStorage",
+            "config": {"path": db_path, "mmap_size": 2**20},
+        }
+    )
+    assert isinstance(storage, SqliteStorage)
+    try:
+        await storage.set_value(key=b"a", value=b"1")
+        assert await storage.get_value(key=b"a") == b"1"
+    finally:
+        storage.close()
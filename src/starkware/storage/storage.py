@@ -1,16 +1,21 @@
 import asyncio
 import codecs
+import collections
 import contextlib
 import dataclasses
+import itertools
 import logging
 from abc import ABC, abstractmethod
-from copy import deepcopy
+from concurrent.futures import Executor
+from copy import copy, deepcopy
 from typing import (
     Any,
     Callable,
+    Deque,
     Dict,
     Generic,
     List,
+    MutableMapping,
     Optional,
     Sequence,
     Tuple,
@@ -19,6 +24,8 @@ from typing import (
     cast,
 )
 
+import cachetools
+
 from starkware.python.object_utils import generic_object_repr
 from starkware.python.utils import from_bytes, get_exception_repr, to_bytes
 from starkware.starkware_utils.config_base import get_object_by_path
@@ -31,6 +38,8 @@ logger = logging.getLogger(__name__)
 HASH_BYTES = 32
 MAX_OBJECT_SIZE_FOR_LOADING_IN_MAIN_THREAD = 2**20  # 1MB.
 HashFunctionType = Callable[[bytes, bytes], bytes]
+# A function that computes a hash function on a list of pairs.
+HashManyFunctionType = Callable[[List[Tuple[bytes, bytes]]], List[bytes]]
 
 TDBObject = TypeVar("TDBObject", bound="DBObject")
 TSingletonDBObject = TypeVar("TSingletonDBObject", bound="SingletonDBObject")
@@ -570,6 +579,121 @@ class StringToIntMapping(IntMapping[str]):
         return key.encode("ascii")
 
 
+class FactWriter:
+    """
+    Writes facts to a storage in batches, while the caller continues to calculate the next facts
+    (write-behind): a batch is written as soon as it reaches batch_size facts. At most
+    max_pending_batches batches are written concurrently; a write that would exceed this waits for
+    the oldest batch to be written (back-pressure), which bounds the memory held by unwritten facts.
+
+    The key of a fact is derived from its value, so a fact whose key is in known_keys (a cache of
+    keys that are known to be in the storage, shared with other writers) is not written again.
+
+    Use as an async context manager; the remaining facts are written when the context exits.
+    A failure to write a batch is raised when the writer is flushed (after all the pending batches
+    are done), rather than from an unrelated write(); no more batches are written after it.
+    """
+
+    def __init__(
+        self,
+        storage: Storage,
+        batch_size: Optional[int] = None,
+        max_pending_batches: int = 2,
+        known_keys: Optional[MutableMapping[bytes, None]] = None,
+    ):
+        """
+        batch_size - the number of facts in a batch; if None, all the facts are written in a single
+          batch when the writer is flushed.
+        """
+        assert batch_size is None or batch_size > 0, "batch_size must be positive."
+        assert max_pending_batches > 0, "max_pending_batches must be positive."
+        self.storage = storage
+        self.batch_size = batch_size
+        self.max_pending_batches = max_pending_batches
+        self.known_keys = known_keys
+        self.batch: Dict[bytes, bytes] = {}
+        self.pending_batches: Deque[asyncio.Future] = collections.deque()
+        # The exceptions raised by the batches that failed to be written.
+        self.failures: List[Exception] = []
+        # Statistics.
+        self.n_written_facts = 0
+        self.n_known_facts = 0
+
+    async def __aenter__(self) -> "FactWriter":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            await self.flush()
+        else:
+            # Drop the facts that were not written yet; the exception of the context takes
+            # precedence over the failures of the writer.
+            self.batch = {}
+            await self._wait_for_pending_batches()
+
+    async def write(self, facts: Dict[bytes, bytes]):
+        """
+        Adds the given facts (a mapping from DB key to serialized value) to the current batch, and
+        writes the full batches.
+        """
+        known_keys = self.known_keys
+        if known_keys is None:
+            self.batch.update(facts)
+        else:
+            new_facts = {key: value for key, value in facts.items() if key not in known_keys}
+            self.n_known_facts += len(facts) - len(new_facts)
+            self.batch.update(new_facts)
+
+        if self.batch_size is None or len(self.batch) < self.batch_size:
+            return
+
+        items = iter(self.batch.items())
+        for _ in range(len(self.batch) // self.batch_size):
+            await self._write_batch(batch=dict(itertools.islice(items, self.batch_size)))
+        self.batch = dict(items)
+
+    async def flush(self):
+        """
+        Writes the current batch, and waits until all the batches are written. Raises the first
+        failure to write a batch, if any.
+        """
+        if len(self.batch) > 0:
+            batch, self.batch = self.batch, {}
+            await self._write_batch(batch=batch)
+        await self._wait_for_pending_batches()
+        if len(self.failures) == 0:
+            return
+
+        failures, self.failures = self.failures, []
+        for failure in failures[1:]:
+            logger.error(f"Failed to write facts: {get_exception_repr(exception=failure)}.")
+        raise failures[0]
+
+    async def _write_batch(self, batch: Dict[bytes, bytes]):
+        while len(self.pending_batches) >= self.max_pending_batches:
+            try:
+                await self.pending_batches.popleft()
+            except Exception as exception:
+                self.failures.append(exception)
+        if len(self.failures) > 0:
+            # The writer already failed; the facts are dropped.
+            return
+        self.pending_batches.append(asyncio.ensure_future(self._mset(batch=batch)))
+
+    async def _mset(self, batch: Dict[bytes, bytes]):
+        await self.storage.mset(updates=batch)
+        self.n_written_facts += len(batch)
+        if self.known_keys is not None:
+            for key in batch.keys():
+                self.known_keys[key] = None
+
+    async def _wait_for_pending_batches(self):
+        pending_batches = list(self.pending_batches)
+        self.pending_batches.clear()
+        results = await asyncio.gather(*pending_batches, return_exceptions=True)
+        self.failures.extend(result for result in results if isinstance(result, Exception))
+
+
 class FactFetchingContext:
     """
     Information needed to fetch and store facts from a storage.
@@ -582,15 +706,65 @@ class FactFetchingContext:
         hash_func: HashFunctionType,
         n_workers: Optional[int] = None,
         n_hash_workers: Optional[int] = None,
+        hash_many_func: Optional[HashManyFunctionType] = None,
+        hash_executor: Optional[Executor] = None,
+        fact_write_batch_size: Optional[int] = None,
+        max_pending_fact_batches: int = 2,
+        known_fact_keys_cache_size: Optional[int] = None,
     ):
+        """
+        hash_many_func, if given, must compute hash_func on each of the given pairs. It is used to
+        compute many hashes at once (e.g., the inner nodes of a Patricia tree layer).
+        hash_executor, if given, is used to hash independent subtrees of a Patricia tree in
+        parallel (see update_tree() in fast_patricia_update.py). A ProcessPoolExecutor gives real
+        multi-core scaling for hash functions that hold the GIL; in that case, hash_func and
+        hash_many_func must be picklable (e.g., module-level functions).
+        fact_write_batch_size, max_pending_fact_batches - the configuration of the FactWriters
+          used to write the facts of tree updates (see FactWriter); by default, all the facts of an
+          update are written at once.
+        known_fact_keys_cache_size - if given, the keys of the last written facts are kept (up to
+          this number), and facts with these keys are not written again.
+        """
         self.storage = storage
         self.hash_func = hash_func
         self.n_workers = n_workers
         self.n_hash_workers = n_hash_workers
+        self.hash_many_func = hash_many_func
+        self.hash_executor = hash_executor
+        self.fact_write_batch_size = fact_write_batch_size
+        self.max_pending_fact_batches = max_pending_fact_batches
+        self.known_fact_keys: Optional[cachetools.LRUCache[bytes, None]] = (
+            None
+            if known_fact_keys_cache_size is None
+            else cachetools.LRUCache(maxsize=known_fact_keys_cache_size)
+        )
 
     def __repr__(self) -> str:
         return generic_object_repr(obj=self)
 
+    def with_storage(self, storage: Storage) -> "FactFetchingContext":
+        """
+        Returns a copy of this context that uses the given storage. The copy shares the other
+        members of this context (e.g., hash_executor), except for the known fact keys, which are
+        only valid for the storage they were written to.
+        """
+        ffc = copy(self)
+        ffc.storage = storage
+        if self.known_fact_keys is not None:
+            ffc.known_fact_keys = cachetools.LRUCache(maxsize=self.known_fact_keys.maxsize)
+        return ffc
+
+    def fact_writer(self) -> FactWriter:
+        """
+        Returns a FactWriter for the storage of this context.
+        """
+        return FactWriter(
+            storage=self.storage,
+            batch_size=self.fact_write_batch_size,
+            max_pending_batches=self.max_pending_fact_batches,
+            known_keys=self.known_fact_keys,
+        )
+
 
 class Fact(DBObject):
     """
@@ -1,11 +1,21 @@
 import asyncio
-from typing import Any, Dict
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
 import pytest
 
-from starkware.storage.dict_storage import CachedStorage, DictStorage
-from starkware.storage.storage import IntToIntMapping, Storage
-from starkware.storage.test_utils import DummyLockManager, MockLargeStorage
+from starkware.storage.dict_storage import (
+    CachedStorage,
+    DictStorage,
+    ShardedCachedStorage,
+    SizedLRUCache,
+)
+from starkware.storage.storage import FactFetchingContext, FactWriter, IntToIntMapping, Storage
+from starkware.storage.test_utils import (
+    DummyLockManager,
+    MockLargeStorage,
+    MockStorage,
+    hash_func,
+)
 
 
 @pytest.mark.asyncio
@@ -87,3 +97,176 @@ async def test_get_bucket_and_key():
         test_bucket,
         "files/" + test_prefix + "/" + test_key,
     )
+
+
+class RecordingStorage(MockStorage):
+    """
+    A MockStorage that records the batches written with mset, and the maximal number of batches
+    that were written concurrently.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.batches: List[Dict[bytes, bytes]] = []
+        self.n_pending_batches = 0
+        self.max_pending_batches = 0
+
+    async def mset(self, updates: Mapping[bytes, bytes]):
+        self.n_pending_batches += 1
+        self.max_pending_batches = max(self.max_pending_batches, self.n_pending_batches)
+        await asyncio.sleep(0.001)
+        self.batches.append(dict(updates))
+        await super().mset(updates=updates)
+        self.n_pending_batches -= 1
+
+
+@pytest.mark.asyncio
+async def test_fact_writer():
+    storage = RecordingStorage()
+    ffc = FactFetchingContext(
+        storage=storage,
+        hash_func=hash_func,
+        fact_write_batch_size=3,
+        max_pending_fact_batches=2,
+        known_fact_keys_cache_size=100,
+    )
+    facts = {str(i).encode("ascii"): b"value" for i in range(10)}
+    async with ffc.fact_writer() as fact_writer:
+        for key, value in facts.items():
+            await fact_writer.write(facts={key: value})
+            assert len(fact_writer.pending_batches) <= 2
+
+    assert storage.db == facts
+    assert [len(batch) for batch in storage.batches] == [3, 3, 3, 1]
+    assert storage.max_pending_batches == 2
+    assert fact_writer.n_written_facts == 10
+
+    # Known facts are not written again.
+    async with ffc.fact_writer() as fact_writer:
+        await fact_writer.write(facts={b"0": b"value", b"new": b"value"})
+    assert storage.batches[-1] == {b"new": b"value"}
+    assert fact_writer.n_known_facts == 1
+
+
+@pytest.mark.asyncio
+async def test_fact_writer_without_batches():
+    storage = RecordingStorage()
+    async with FactWriter(storage=storage) as fact_writer:
+        await fact_writer.write(facts={b"1": b"1", b"2": b"2"})
+        await fact_writer.write(facts={b"3": b"3"})
+        assert storage.batches == []
+
+    assert storage.batches == [{b"1": b"1", b"2": b"2", b"3": b"3"}]
+
+
+@pytest.mark.asyncio
+async def test_fact_writer_failure():
+    class FailingStorage(MockStorage):
+        async def mset(self, updates: Mapping[bytes, bytes]):
+            raise Exception("Write failed.")
+
+    fact_writer = FactWriter(storage=FailingStorage(), batch_size=1, max_pending_batches=1)
+    with pytest.raises(Exception, match="Write failed."):
+        async with fact_writer:
+            # The failures of the previous batches are only raised when the writer is flushed.
+            await fact_writer.write(facts={b"1": b"1", b"2": b"2", b"3": b"3"})
+            await fact_writer.write(facts={b"4": b"4"})
+            assert len(fact_writer.failures) == 1
+    assert len(fact_writer.pending_batches) == 0
+
+    # Facts that failed to be written are not considered known.
+    known_keys: Dict[bytes, None] = {}
+    with pytest.raises(Exception, match="Write failed."):
+        async with FactWriter(storage=FailingStorage(), known_keys=known_keys) as fact_writer:
+            await fact_writer.write(facts={b"1": b"1"})
+    assert known_keys == {}
+
+
+class CountingStorage(MockStorage):
+    """
+    A MockStorage that counts the keys read from it; reads return after a short while, so that
+    concurrent reads and writes overlap.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.n_reads = 0
+
+    async def get_value(self, key: bytes) -> Optional[bytes]:
+        self.n_reads += 1
+        value = await super().get_value(key=key)
+        await asyncio.sleep(0.001)
+        return value
+
+    async def mget(self, keys: Sequence[bytes]) -> Tuple[Optional[bytes], ...]:
+        self.n_reads += len(keys)
+        values = await super().mget(keys=keys)
+        await asyncio.sleep(0.001)
+        return values
+
+
+@pytest.mark.asyncio
+async def test_sharded_cached_storage_coalesces_reads():
+    storage = CountingStorage()
+    storage.db = {b"1": b"A", b"2": b"B"}
+    cached_storage = ShardedCachedStorage(storage=storage, max_bytes=2**20, metric_active=True)
+
+    results = await asyncio.gather(
+        cached_storage.get_value(key=b"1"),
+        cached_storage.get_value(key=b"1"),
+        cached_storage.mget(keys=[b"2", b"1", b"2", b"3"]),
+    )
+    assert results == [b"A", b"A", (b"B", b"A", b"B", None)]
+    assert storage.n_reads == 3
+    assert cached_storage.pending_reads == {}
+
+    # Cached values are not read again; missing keys are (there is no negative cache).
+    assert await cached_storage.mget(keys=[b"1", b"2", b"3"]) == (b"A", b"B", None)
+    assert storage.n_reads == 4
+
+
+@pytest.mark.asyncio
+async def test_sharded_cached_storage_negative_cache():
+    storage = CountingStorage()
+    cached_storage = ShardedCachedStorage(storage=storage, max_bytes=2**20, negative_cache_size=100)
+
+    for _ in range(2):
+        assert await cached_storage.get_value(key=b"1") is None
+    assert storage.n_reads == 1
+
+    # Writing a key removes it from the negative cache.
+    await cached_storage.set_value(key=b"1", value=b"A")
+    assert await cached_storage.get_value(key=b"1") == b"A"
+    assert storage.n_reads == 1
+
+    # A read that started before a write does not cache the (previous) value it read.
+    read_task = asyncio.ensure_future(cached_storage.get_value(key=b"2"))
+    while storage.n_reads == 1:
+        await asyncio.sleep(0)
+    await cached_storage.mset(updates={b"2": b"B"})
+    assert await read_task is None
+    assert await cached_storage.get_value(key=b"2") == b"B"
+
+
+@pytest.mark.asyncio
+async def test_sharded_cached_storage_byte_budget():
+    storage = MockStorage()
+    entry_size = SizedLRUCache.get_entry_size(value=b"")
+    cached_storage = ShardedCachedStorage(
+        storage=storage, max_bytes=3 * entry_size + 100, n_shards=1
+    )
+
+    await cached_storage.mset(updates={b"1": b"", b"2": b"", b"3": b""})
+    assert cached_storage.cached_bytes == 3 * entry_size
+    assert cached_storage.n_evictions == 0
+
+    # A large value evicts the least recently used values.
+    assert await cached_storage.get_value(key=b"1") == b""
+    await cached_storage.set_value(key=b"4", value=b"x" * 101)
+    assert set(cached_storage.shards[0].cache.keys()) == {b"1", b"4"}
+    assert cached_storage.n_evictions == 2
+
+    # A value that is larger than the cache is written, but not cached.
+    await cached_storage.set_value(key=b"5", value=b"x" * (4 * entry_size))
+    assert b"5" not in cached_storage.shards[0].cache
+    assert await cached_storage.get_value(key=b"5") == b"x" * (4 * entry_size)